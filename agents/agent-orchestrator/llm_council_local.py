@@ -16,8 +16,15 @@ Based on karpathy's llm-council but adapted for local Ollama.
 import requests
 import json
 import asyncio
-from typing import List, Dict, Any
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import List, Dict, Any, Callable
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
@@ -38,49 +45,205 @@ COUNCIL_MODELS = [
 
 CHAIRMAN_MODEL = "deepseek-r1:latest"  # Deep reasoning for synthesis
 
-def query_ollama(model: str, prompt: str, system: str = None) -> str:
-    """Query local Ollama model"""
+# Concurrency limits - keep in line with how many models the host can hold
+# resident at once (Ollama's OLLAMA_MAX_LOADED_MODELS / OLLAMA_NUM_PARALLEL).
+# Below the council size a stage takes a multiple of the slowest call.
+MAX_PARALLEL_REQUESTS = int(os.environ.get("COUNCIL_MAX_PARALLEL", len(COUNCIL_MODELS)))
+PER_MODEL_CONCURRENCY = int(os.environ.get("COUNCIL_PER_MODEL_PARALLEL", 1))
+
+# Quorum mode - proceed once QUORUM of the council has answered, or when the
+# per-stage deadline passes, instead of waiting on the slowest model.
+# QUORUM=0 means wait for every model (up to the deadline). The deadline
+# covers waiting for a concurrency slot as well as the request itself, and
+# applies to each of the three stages.
+REQUEST_TIMEOUT = 120
+QUORUM = int(os.environ.get("COUNCIL_QUORUM", 0))
+STAGE_DEADLINE = float(os.environ.get("COUNCIL_STAGE_DEADLINE", REQUEST_TIMEOUT))
+
+# Shared HTTP session so fan-out requests reuse pooled connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=len(COUNCIL_MODELS) + 1,
+                                     pool_maxsize=max(MAX_PARALLEL_REQUESTS, len(COUNCIL_MODELS))))
+
+_global_slots = threading.BoundedSemaphore(MAX_PARALLEL_REQUESTS)
+_model_slots: Dict[str, threading.BoundedSemaphore] = {}
+_model_slots_lock = threading.Lock()
+
+def _model_slot(model: str) -> threading.BoundedSemaphore:
+    """Return the per-model semaphore, creating it on first use"""
+    with _model_slots_lock:
+        if model not in _model_slots:
+            _model_slots[model] = threading.BoundedSemaphore(PER_MODEL_CONCURRENCY)
+        return _model_slots[model]
+
+def query_ollama(model: str, prompt: str, system: str = None,
+                 timeout: float = None, cancel: threading.Event = None) -> str:
+    """Query local Ollama model
+
+    `timeout` bounds the whole call: time spent waiting for a concurrency
+    slot is taken out of what's left for the request. A call whose `cancel`
+    event is set gives up - without querying if it is still waiting for a
+    slot, otherwise at the next streamed chunk, releasing its slots.
+    """
+    ends = time.monotonic() + (REQUEST_TIMEOUT if timeout is None else timeout)
+    held = []
     try:
         payload = {
             "model": model,
             "prompt": prompt,
-            "stream": False
+            "stream": True
         }
 
         if system:
             payload["system"] = system
 
-        response = requests.post(
+        # Per-model slot first so a busy model doesn't hold a global slot
+        for slot in (_model_slot(model), _global_slots):
+            if not slot.acquire(timeout=max(0.0, ends - time.monotonic())):
+                return f"[Error: no slot for {model} before the deadline]"
+            held.append(slot)
+        if cancel is not None and cancel.is_set():
+            return f"[Error: {model} cancelled]"
+
+        # Streamed so a call that is cancelled mid-generation can hang up
+        # between chunks - closing the connection stops Ollama generating
+        # and frees the model's slot for the next stage instead of holding
+        # it until this call's own deadline
+        response = SESSION.post(
             f"{OLLAMA_HOST}/api/generate",
             json=payload,
-            timeout=120
+            stream=True,
+            timeout=max(0.001, ends - time.monotonic())
         )
 
-        if response.status_code == 200:
-            result = response.json()
-            return result.get('response', '')
-        else:
-            return f"[Error querying {model}]"
+        with response:
+            if response.status_code != 200:
+                return f"[Error querying {model}]"
+
+            parts = []
+            for line in response.iter_lines():
+                if cancel is not None and cancel.is_set():
+                    return f"[Error: {model} cancelled]"
+                if time.monotonic() > ends:
+                    return f"[Error: {model} timed out]"
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    return f"[Error querying {model}]"
+                parts.append(chunk.get('response', ''))
+                if chunk.get('done'):
+                    break
+            return ''.join(parts)
 
     except Exception as e:
         return f"[Error: {str(e)}]"
+    finally:
+        for slot in reversed(held):
+            slot.release()
+
+def is_error_response(text: str) -> bool:
+    """True if query_ollama returned one of its error placeholders"""
+    return not text or text.startswith("[Error")
+
+def fan_out(models: List[str], call: Callable[[str], Any],
+            timings: Dict[str, float] = None,
+            quorum: int = None, deadline: float = None,
+            ok: Callable[[Any], bool] = None,
+            dropped: List[Dict[str, str]] = None,
+            cancel: threading.Event = None) -> Dict[str, Any]:
+    """Run call(model) for every model concurrently, preserving model order.
+
+    Concurrency is bounded by the global and per-model semaphores inside
+    query_ollama, so the pool itself can be sized to the council.
+
+    Quorum mode: returns as soon as `quorum` models have produced a result
+    accepted by `ok`, or when `deadline` seconds have elapsed, whichever
+    comes first. Models that failed, timed out or were cut off are left out
+    of the result and appended to `dropped` with a reason. `cancel` is set
+    on return so stragglers - waiting for a slot or still generating - give
+    up instead of occupying a slot after the stage is over.
+    """
+    quorum = len(models) if quorum is None else min(quorum, len(models))
+    ok = ok or (lambda result: True)
+
+    def timed(model: str):
+        start = time.perf_counter()
+        result = call(model)
+        return result, time.perf_counter() - start
+
+    pool = ThreadPoolExecutor(max_workers=max(len(models), 1))
+    futures = {pool.submit(timed, model): model for model in models}
+    arrived = {}
+    failed = {}
 
-def stage1_collect_responses(query: str) -> Dict[str, str]:
-    """Stage 1: Collect initial responses from all council models"""
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            model = futures[future]
+            result, elapsed = future.result()
+            if timings is not None:
+                timings[model] = round(elapsed, 3)
+            if ok(result):
+                arrived[model] = result
+            else:
+                failed[model] = result
+            if len(arrived) >= quorum:
+                break
+    except FuturesTimeout:
+        pass
+    finally:
+        # Don't wait on stragglers - their threads finish in the background,
+        # bounded by the timeout each call was given
+        if cancel is not None:
+            cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if dropped is not None:
+        for model in models:
+            if model in arrived:
+                continue
+            if model in failed:
+                reason = "error"
+            elif len(arrived) >= quorum:
+                reason = "quorum_reached"
+            else:
+                reason = "deadline"
+            dropped.append({"model": model, "reason": reason})
+
+    return {model: arrived[model] for model in models if model in arrived}
+
+def stage1_collect_responses(query: str, timings: Dict[str, float] = None,
+                             quorum: int = None, deadline: float = None,
+                             dropped: List[Dict[str, str]] = None) -> Dict[str, str]:
+    """Stage 1: Collect initial responses from council models.
+
+    With quorum/deadline set, only the models that answered in time are
+    returned; the rest are recorded in `dropped`.
+    """
     print("📊 Stage 1: Collecting responses from council members...")
 
-    responses = {}
     system_prompt = "You are a financial and private equity expert. Provide detailed, insightful analysis."
+    ends = time.monotonic() + (deadline or REQUEST_TIMEOUT)
+    cancel = threading.Event()
 
-    for model in COUNCIL_MODELS:
+    def ask(model: str) -> str:
         print(f"  Querying {model}...")
-        response = query_ollama(model, query, system_prompt)
-        responses[model] = response
-
-    return responses
-
-def stage2_collect_rankings(query: str, stage1_responses: Dict[str, str]) -> Dict[str, Any]:
-    """Stage 2: Models review and rank each other's work (anonymized)"""
+        return query_ollama(model, query, system_prompt,
+                            timeout=ends - time.monotonic(), cancel=cancel)
+
+    return fan_out(COUNCIL_MODELS, ask, timings, quorum=quorum, deadline=deadline,
+                   ok=lambda text: not is_error_response(text), dropped=dropped,
+                   cancel=cancel)
+
+def stage2_collect_rankings(query: str, stage1_responses: Dict[str, str],
+                            timings: Dict[str, float] = None,
+                            quorum: int = None, deadline: float = None,
+                            dropped: List[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Stage 2: Models review and rank each other's work (anonymized)
+
+    Only the responses that arrived in stage 1 are ranked, and only the
+    models that produced them act as evaluators.
+    """
     print("🔍 Stage 2: Collecting peer reviews...")
 
     # Anonymize responses
@@ -115,17 +278,24 @@ FINAL RANKING:
 3. Response Z
 (etc.)"""
 
-    rankings = {}
     system_prompt = "You are an expert evaluator. Be objective and thorough in your assessment."
+    ends = time.monotonic() + (deadline or REQUEST_TIMEOUT)
+    cancel = threading.Event()
 
-    for model in COUNCIL_MODELS:
+    def evaluate(model: str) -> Dict[str, Any]:
         print(f"  {model} evaluating...")
-        evaluation = query_ollama(model, eval_prompt, system_prompt)
-        rankings[model] = {
+        evaluation = query_ollama(model, eval_prompt, system_prompt,
+                                  timeout=ends - time.monotonic(), cancel=cancel)
+        return {
             "raw_evaluation": evaluation,
             "parsed_ranking": parse_ranking(evaluation)
         }
 
+    evaluators = list(stage1_responses.keys())
+    rankings = fan_out(evaluators, evaluate, timings, quorum=quorum, deadline=deadline,
+                       ok=lambda data: not is_error_response(data["raw_evaluation"]),
+                       dropped=dropped, cancel=cancel)
+
     return {
         "rankings": rankings,
         "label_to_model": label_to_model
@@ -152,28 +322,48 @@ def parse_ranking(evaluation: str) -> List[str]:
     return ranking
 
 def calculate_aggregate_rankings(stage2_results: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Calculate aggregate rankings across all evaluations"""
+    """Calculate aggregate rankings across all evaluations
+
+    Handles partial ballots: labels a ballot doesn't know about (e.g. from a
+    dropped model) and repeats are ignored, and responses a ballot left
+    unranked share the average of the remaining positions, so a short
+    ballot neither rewards nor punishes the responses it skipped.
+    """
     rankings = stage2_results["rankings"]
     label_to_model = stage2_results["label_to_model"]
+    n_labels = len(label_to_model)
 
     # Count positions for each response
-    position_sums = {}
-    vote_counts = {}
+    position_sums = {label: 0.0 for label in label_to_model}
+    vote_counts = {label: 0 for label in label_to_model}
+    ballots = {label: 0 for label in label_to_model}
 
     for model, ranking_data in rankings.items():
-        parsed = ranking_data["parsed_ranking"]
+        parsed = []
+        for label in ranking_data["parsed_ranking"]:
+            if label in label_to_model and label not in parsed:
+                parsed.append(label)
+
+        if not parsed:
+            continue
+
         for position, label in enumerate(parsed, 1):
-            if label not in position_sums:
-                position_sums[label] = 0
-                vote_counts[label] = 0
             position_sums[label] += position
             vote_counts[label] += 1
+            ballots[label] += 1
+
+        # Unranked labels take the mean of the positions left over
+        unranked_position = (len(parsed) + 1 + n_labels) / 2
+        for label in label_to_model:
+            if label not in parsed:
+                position_sums[label] += unranked_position
+                ballots[label] += 1
 
     # Calculate averages
     aggregated = []
     for label in label_to_model.keys():
-        if label in position_sums and vote_counts[label] > 0:
-            avg_position = position_sums[label] / vote_counts[label]
+        if vote_counts[label] > 0:
+            avg_position = position_sums[label] / ballots[label]
             aggregated.append({
                 "label": label,
                 "model": label_to_model[label],
@@ -187,8 +377,9 @@ def calculate_aggregate_rankings(stage2_results: Dict[str, Any]) -> List[Dict[st
     return aggregated
 
 def stage3_synthesize_final(query: str, stage1_responses: Dict[str, str],
-                            stage2_results: Dict[str, Any]) -> str:
-    """Stage 3: Chairman synthesizes final answer"""
+                            stage2_results: Dict[str, Any],
+                            deadline: float = None) -> str:
+    """Stage 3: Chairman synthesizes final answer within `deadline` seconds"""
     print("🎯 Stage 3: Chairman synthesizing final answer...")
 
     # Prepare context for chairman
@@ -217,7 +408,8 @@ Provide a clear, actionable recommendation for private equity decision-making.""
 
     system_prompt = "You are the Chairman of an expert council. Synthesize the collective wisdom into clear recommendations."
 
-    final_answer = query_ollama(CHAIRMAN_MODEL, synthesis_prompt, system_prompt)
+    final_answer = query_ollama(CHAIRMAN_MODEL, synthesis_prompt, system_prompt,
+                                timeout=deadline or REQUEST_TIMEOUT)
 
     return final_answer
 
@@ -230,6 +422,10 @@ def health_check():
         "port": PORT,
         "council_models": COUNCIL_MODELS,
         "chairman": CHAIRMAN_MODEL,
+        "max_parallel_requests": MAX_PARALLEL_REQUESTS,
+        "per_model_concurrency": PER_MODEL_CONCURRENCY,
+        "quorum": QUORUM or len(COUNCIL_MODELS),
+        "stage_deadline": STAGE_DEADLINE,
         "backend": "Ollama Local"
     })
 
@@ -248,14 +444,47 @@ def query():
         print(f"{'='*70}")
         print(f"Query: {user_query}\n")
 
-        # Stage 1: Initial responses
-        stage1 = stage1_collect_responses(user_query)
-
-        # Stage 2: Peer reviews
-        stage2 = stage2_collect_rankings(user_query, stage1)
+        # Quorum mode - request body may override the configured defaults
+        try:
+            quorum = int(data.get('quorum', QUORUM))
+            deadline = float(data.get('deadline', STAGE_DEADLINE))
+        except (TypeError, ValueError):
+            return jsonify({"error": "quorum must be an integer and deadline a number of seconds"}), 400
+        if quorum < 0:
+            return jsonify({"error": f"quorum must be 0 or more (got {quorum})"}), 400
+        if not (math.isfinite(deadline) and deadline > 0):
+            return jsonify({"error": f"deadline must be a positive number of seconds (got {deadline})"}), 400
+        quorum = quorum or len(COUNCIL_MODELS)
+
+        timings = {"stage1_models": {}, "stage2_models": {}}
+        dropped = {"stage1": [], "stage2": []}
+        started = time.perf_counter()
+
+        # Stage 1: Initial responses (models queried concurrently)
+        stage1 = stage1_collect_responses(user_query, timings["stage1_models"],
+                                          quorum=quorum, deadline=deadline,
+                                          dropped=dropped["stage1"])
+        timings["stage1"] = round(time.perf_counter() - started, 3)
+
+        if not stage1:
+            return jsonify({
+                "error": "No council member answered before the deadline",
+                "dropped": dropped,
+                "timings": timings
+            }), 504
+
+        # Stage 2: Peer reviews of the responses that arrived
+        mark = time.perf_counter()
+        stage2 = stage2_collect_rankings(user_query, stage1, timings["stage2_models"],
+                                         quorum=min(quorum, len(stage1)), deadline=deadline,
+                                         dropped=dropped["stage2"])
+        timings["stage2"] = round(time.perf_counter() - mark, 3)
 
         # Stage 3: Final synthesis
-        stage3 = stage3_synthesize_final(user_query, stage1, stage2)
+        mark = time.perf_counter()
+        stage3 = stage3_synthesize_final(user_query, stage1, stage2, deadline=deadline)
+        timings["stage3"] = round(time.perf_counter() - mark, 3)
+        timings["total"] = round(time.perf_counter() - started, 3)
 
         # Calculate aggregate rankings
         aggregate = calculate_aggregate_rankings(stage2)
@@ -270,6 +499,13 @@ def query():
             "stage2": stage2,
             "stage3": stage3,
             "aggregate_rankings": aggregate,
+            "quorum": {
+                "required": quorum,
+                "deadline": deadline,
+                "met": len(stage1) >= quorum
+            },
+            "dropped": dropped,
+            "timings": timings,
             "timestamp": datetime.now().isoformat()
         })
 
@@ -286,6 +522,7 @@ def main():
 🎯 Multi-model deliberation system for IC memo analysis
 🧠 Council: {len(COUNCIL_MODELS)} local models
 👔 Chairman: {CHAIRMAN_MODEL}
+⚡ Parallelism: {MAX_PARALLEL_REQUESTS} concurrent requests ({PER_MODEL_CONCURRENCY} per model)
 🌐 Port: {PORT}
 💰 Cost: $0 (all local!)
 
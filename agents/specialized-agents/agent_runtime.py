@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+NEWCO Agent Runtime
+===================
+
+Shared Ollama client and request scheduler for the specialized PE agents.
+
+Every agent used to POST straight to Ollama with no timeout, no connection
+reuse and no queueing, so running several agents together flooded the host.
+All agents now go through one OllamaClient per Ollama host:
+
+- Connection pool: one requests.Session with pooled keep-alive connections
+- Retry: only connection errors are retried (with backoff); a generation
+  that reached Ollama is never re-sent, so a slow or failing host isn't
+  given the same work again
+- Priority queue: interactive requests jump ahead of batch work
+- Concurrency limits: global and per-model caps on in-flight generations,
+  enforced across processes (START_ALL_SPECIALIZED_AGENTS.sh runs each
+  agent in its own) by flock'd slot files in AGENT_LLM_SLOT_DIR
+- Backpressure: submit() blocks (then raises SchedulerBusy) when the queue is full
+
+The priority order applies within a process; across processes, requests
+take free slots in arrival order.
+
+Usage:
+    from agent_runtime import get_client, PRIORITY_BATCH
+
+    client = get_client()
+    text = client.generate("qwen2.5:14b", "Summarize ...")
+    future = client.submit("phi4:latest", "...", priority=PRIORITY_BATCH)
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import heapq
+import itertools
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Configuration
+OLLAMA_HOST = "http://localhost:11434"
+MAX_PARALLEL_REQUESTS = int(os.environ.get("AGENT_LLM_MAX_PARALLEL", 2))
+PER_MODEL_CONCURRENCY = int(os.environ.get("AGENT_LLM_PER_MODEL", 1))
+MAX_QUEUE_DEPTH = int(os.environ.get("AGENT_LLM_MAX_QUEUE", 64))
+REQUEST_TIMEOUT = float(os.environ.get("AGENT_LLM_TIMEOUT", 300))
+SLOT_DIR = os.environ.get("AGENT_LLM_SLOT_DIR",
+                          os.path.join(tempfile.gettempdir(), "newco-ollama-slots"))
+SLOT_POLL_SECONDS = 0.05
+
+# Lower number = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+
+class SchedulerBusy(RuntimeError):
+    """Raised when the request queue stays full past the submit timeout"""
+
+
+class _Slots:
+    """
+    N slots shared by every process using the same directory: a slot is
+    held by holding an exclusive flock on one of N files. The kernel drops
+    the lock if the holder dies, so a crashed agent never leaks a slot.
+    """
+
+    def __init__(self, directory: str, name: str, count: int):
+        os.makedirs(directory, exist_ok=True)
+        self.paths = [os.path.join(directory, f"{name}.{i}") for i in range(max(1, count))]
+
+    def acquire(self) -> int:
+        """Block until a slot is free; returns its file descriptor"""
+        while True:
+            for path in self.paths:
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except BlockingIOError:
+                    os.close(fd)
+            time.sleep(SLOT_POLL_SECONDS)
+
+    @staticmethod
+    def release(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class _Job:
+    __slots__ = ("model", "payload", "timeout", "future")
+
+    def __init__(self, model: str, payload: Dict, timeout: float):
+        self.model = model
+        self.payload = payload
+        self.timeout = timeout
+        self.future = Future()
+
+
+class OllamaClient:
+    """Pooled, rate-limited Ollama client with a priority request queue"""
+
+    def __init__(self, ollama_host: str = OLLAMA_HOST,
+                 max_parallel: int = MAX_PARALLEL_REQUESTS,
+                 per_model: int = PER_MODEL_CONCURRENCY,
+                 max_queue: int = MAX_QUEUE_DEPTH,
+                 timeout: float = REQUEST_TIMEOUT,
+                 slot_dir: str = SLOT_DIR):
+        self.ollama_host = ollama_host.rstrip("/")
+        self.max_parallel = max_parallel
+        self.per_model = per_model
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        # One slot directory per Ollama host, shared by every agent process
+        host_key = hashlib.sha1(self.ollama_host.encode()).hexdigest()[:12]
+        self.slot_dir = os.path.join(slot_dir, host_key)
+        self._global_slots = _Slots(self.slot_dir, "global", max_parallel)
+        self._model_slots: Dict[str, _Slots] = {}
+
+        # Connection errors only: the POST never reached Ollama, so resending is safe
+        retry = Retry(total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.5,
+                      allowed_methods=None, raise_on_status=False)
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=4,
+                                                  pool_maxsize=max_parallel,
+                                                  max_retries=retry))
+        self.session.mount("https://", HTTPAdapter(pool_connections=4,
+                                                   pool_maxsize=max_parallel,
+                                                   max_retries=retry))
+
+        self._queue = []                      # heap of (priority, seq, job)
+        self._seq = itertools.count()
+        self._active: Dict[str, int] = {}     # model -> in-flight count
+        self._cond = threading.Condition()
+
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"ollama-worker-{i}", daemon=True)
+            for i in range(max_parallel)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, model: str, prompt: str, system: Optional[str] = None,
+               priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None,
+               options: Optional[Dict] = None, queue_timeout: Optional[float] = 30) -> Future:
+        """Queue a generation and return a Future resolving to the response text"""
+        payload = {"model": model, "prompt": prompt, "stream": False}
+        if system:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+
+        job = _Job(model, payload, timeout or self.timeout)
+
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._queue) < self.max_queue,
+                                       timeout=queue_timeout):
+                raise SchedulerBusy(
+                    f"LLM queue full ({self.max_queue} pending requests)"
+                )
+            heapq.heappush(self._queue, (priority, next(self._seq), job))
+            self._cond.notify_all()
+
+        return job.future
+
+    def generate(self, model: str, prompt: str, system: Optional[str] = None,
+                 priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None,
+                 options: Optional[Dict] = None) -> str:
+        """Blocking generation through the shared queue"""
+        return self.submit(model, prompt, system=system, priority=priority,
+                           timeout=timeout, options=options).result()
+
+    async def agenerate(self, model: str, prompt: str, system: Optional[str] = None,
+                        priority: int = PRIORITY_INTERACTIVE,
+                        timeout: Optional[float] = None,
+                        options: Optional[Dict] = None) -> str:
+        """Awaitable generation through the shared queue"""
+        future = await asyncio.to_thread(self.submit, model, prompt, system,
+                                         priority, timeout, options)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict:
+        """Current queue depth and in-flight requests per model"""
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "in_flight": dict(self._active),
+                "max_parallel": self.max_parallel,
+                "per_model": self.per_model,
+                "max_queue": self.max_queue,
+                "slot_dir": self.slot_dir,
+            }
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _next_runnable(self) -> Optional[_Job]:
+        """Pop the highest-priority job whose model has a free slot.
+
+        Jobs for a saturated model are skipped rather than blocking the
+        worker, so one busy model can't stall requests for the others.
+        """
+        for entry in sorted(self._queue):
+            job = entry[2]
+            if self._active.get(job.model, 0) < self.per_model:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                return job
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    job = self._next_runnable()
+                    if job is None:
+                        self._cond.wait()
+                self._active[job.model] = self._active.get(job.model, 0) + 1
+                # A queue slot opened up for blocked submitters
+                self._cond.notify_all()
+
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    job.future.set_result(self._post(job))
+            except Exception as e:
+                job.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._active[job.model] -= 1
+                    self._cond.notify_all()
+
+    def _post(self, job: _Job) -> str:
+        # Model slot first, then a global one: the same order in every
+        # process, so two processes can't each hold what the other waits for
+        model_slot = self._slots_for(job.model).acquire()
+        try:
+            global_slot = self._global_slots.acquire()
+            try:
+                response = self.session.post(f"{self.ollama_host}/api/generate",
+                                             json=job.payload, timeout=job.timeout)
+            finally:
+                _Slots.release(global_slot)
+        finally:
+            _Slots.release(model_slot)
+        response.raise_for_status()
+        return response.json()['response']
+
+    def _slots_for(self, model: str) -> _Slots:
+        with self._cond:
+            slots = self._model_slots.get(model)
+            if slots is None:
+                name = "model-" + re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+                slots = self._model_slots[model] = _Slots(self.slot_dir, name, self.per_model)
+            return slots
+
+
+_clients: Dict[str, OllamaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(ollama_host: str = OLLAMA_HOST) -> OllamaClient:
+    """Return the process-wide client for an Ollama host"""
+    with _clients_lock:
+        if ollama_host not in _clients:
+            _clients[ollama_host] = OllamaClient(ollama_host)
+        return _clients[ollama_host]
+
+
+if __name__ == "__main__":
+    client = get_client()
+    print("✅ Agent Runtime Ready")
+    print(f"   Host: {client.ollama_host}")
+    print(f"   Max parallel: {client.max_parallel} ({client.per_model} per model)")
+    print(f"   Queue depth: {client.max_queue}")
+    print(f"   Shared slots: {client.slot_dir}")
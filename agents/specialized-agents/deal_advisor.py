@@ -7,23 +7,26 @@ Investment analysis and due diligence automation.
 Uses XGBoost (96% accuracy) + local LLMs.
 """
 
-import requests
 import json
+import os
 import sys
 sys.path.append('../learning-projects/xgboost-ipo-predictor')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_runtime import get_client, PRIORITY_INTERACTIVE
 
 class DealAdvisorAgent:
-    def __init__(self, ollama_host="http://localhost:11434"):
+    def __init__(self, ollama_host="http://localhost:11434", priority=PRIORITY_INTERACTIVE):
         self.ollama_host = ollama_host
         self.model = "deepseek-r1:latest"  # Best for deep reasoning
-
-    def query_llm(self, prompt):
-        response = requests.post(f"{self.ollama_host}/api/generate", json={
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        })
-        return response.json()['response']
+        self.priority = priority
+        self.client = get_client(ollama_host)
+
+    def query_llm(self, prompt, priority=None):
+        return self.client.generate(
+            self.model, prompt,
+            priority=self.priority if priority is None else priority
+        )
 
     def investment_thesis(self, company_data):
         """Generate initial point of view on investment"""
@@ -15,25 +15,30 @@ Capabilities:
 Uses local LLMs via Ollama (no API costs)
 """
 
-import requests
 import json
+import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_runtime import get_client, PRIORITY_INTERACTIVE
+
 class DealScoutAgent:
-    def __init__(self, ollama_host="http://localhost:11434"):
+    def __init__(self, ollama_host="http://localhost:11434", priority=PRIORITY_INTERACTIVE):
         self.ollama_host = ollama_host
         self.model = "qwen2.5:14b"  # Best for market analysis
+        self.priority = priority
+        self.client = get_client(ollama_host)
         self.pipeline = []
 
-    def query_llm(self, prompt, system_prompt="You are an expert PE deal sourcing analyst."):
-        """Query local LLM via Ollama"""
-        response = requests.post(f"{self.ollama_host}/api/generate", json={
-            "model": self.model,
-            "prompt": prompt,
-            "system": system_prompt,
-            "stream": False
-        })
-        return response.json()['response']
+    def query_llm(self, prompt, system_prompt="You are an expert PE deal sourcing analyst.",
+                  priority=None):
+        """Query local LLM via the shared agent runtime queue"""
+        return self.client.generate(
+            self.model, prompt, system=system_prompt,
+            priority=self.priority if priority is None else priority
+        )
 
     def identify_targets(self, sector, criteria):
         """Identify hidden investment targets in a sector"""
@@ -6,21 +6,26 @@ NEWCO Exit Advisor Agent
 Exit strategy, valuation modeling, execution support.
 """
 
-import requests
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_runtime import get_client, PRIORITY_INTERACTIVE
 
 class ExitAdvisorAgent:
-    def __init__(self, ollama_host="http://localhost:11434"):
+    def __init__(self, ollama_host="http://localhost:11434", priority=PRIORITY_INTERACTIVE):
         self.ollama_host = ollama_host
         self.model = "qwen2.5:14b"
-
-    def query_llm(self, prompt):
-        response = requests.post(f"{self.ollama_host}/api/generate", json={
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        })
-        return response.json()['response']
+        self.priority = priority
+        self.client = get_client(ollama_host)
+
+    def query_llm(self, prompt, priority=None):
+        return self.client.generate(
+            self.model, prompt,
+            priority=self.priority if priority is None else priority
+        )
 
     def exit_strategy(self, company, company_data):
         """Recommend optimal exit strategy"""
@@ -6,20 +6,25 @@ NEWCO Operational Advisor Agent
 Operational improvements and value creation.
 """
 
-import requests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_runtime import get_client, PRIORITY_INTERACTIVE
 
 class OperationalAdvisorAgent:
-    def __init__(self, ollama_host="http://localhost:11434"):
+    def __init__(self, ollama_host="http://localhost:11434", priority=PRIORITY_INTERACTIVE):
         self.ollama_host = ollama_host
         self.model = "mistral:latest"
+        self.priority = priority
+        self.client = get_client(ollama_host)
 
-    def query_llm(self, prompt):
-        response = requests.post(f"{self.ollama_host}/api/generate", json={
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        })
-        return response.json()['response']
+    def query_llm(self, prompt, priority=None):
+        return self.client.generate(
+            self.model, prompt,
+            priority=self.priority if priority is None else priority
+        )
 
     def operational_assessment(self, company, metrics):
         """Assess operational efficiency"""
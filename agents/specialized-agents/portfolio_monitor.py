@@ -7,22 +7,27 @@ Real-time tracking of 42 portfolio companies.
 KPIs, valuations, risk management.
 """
 
-import requests
 import json
+import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_runtime import get_client, PRIORITY_INTERACTIVE
+
 class PortfolioMonitorAgent:
-    def __init__(self, ollama_host="http://localhost:11434"):
+    def __init__(self, ollama_host="http://localhost:11434", priority=PRIORITY_INTERACTIVE):
         self.ollama_host = ollama_host
         self.model = "phi4:latest"  # Fast for real-time analysis
-
-    def query_llm(self, prompt):
-        response = requests.post(f"{self.ollama_host}/api/generate", json={
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        })
-        return response.json()['response']
+        self.priority = priority
+        self.client = get_client(ollama_host)
+
+    def query_llm(self, prompt, priority=None):
+        return self.client.generate(
+            self.model, prompt,
+            priority=self.priority if priority is None else priority
+        )
 
     def performance_tracking(self, company, metrics):
         """Track portco performance in real-time"""
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator - Realistic GTM and Portfolio Data at Scale
+
+Writes a data directory in the same CSV layout as core/data, sized by a
+number of contacts (1k / 10k / 100k / 1m, or any count):
+
+- contacts: weighted pipeline statuses, tiers and categories; last_contact
+  matches the contact's latest interaction
+- interactions: ~3 per contact, skewed (a few contacts get most of the
+  activity), over the last 180 days, in chronological id order
+- relationships: ~2 per contact by preferential attachment, so the degree
+  distribution follows a power law (a few hubs, a long tail)
+- portfolio funds (1 per 100 contacts, at least 10), with capital calls,
+  distributions and quarterly NAVs from each fund's vintage
+- portfolio companies: ~1 holding per 2 contacts; popular companies are
+  held by several funds, so look-through overlap is realistic
+
+The same scale and seed always give the same rows; dates are relative to
+--today (default: today) because the engines measure recency from now.
+Files are streamed, so 1m contacts needs well under 1 GB of memory.
+
+Usage:
+    python3 benchmarks/generate.py 10k --out /tmp/bench-10k
+    python3 benchmarks/generate.py 1m --seed 7 --out benchmarks/data/1m
+"""
+
+import argparse
+import csv
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+GENERATOR_VERSION = 1
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+INTERACTIONS_PER_CONTACT = 3
+EDGES_PER_CONTACT = 2
+CONTACTS_PER_FUND = 100
+MIN_FUNDS = 10
+CONTACTS_PER_HOLDING = 2
+ACTIVITY_DAYS = 180
+CHUNK_ROWS = 50_000
+
+STATUSES = {
+    'Cold': 30, 'Warm Intro Requested': 8, 'Warm Intro Received': 6,
+    'Initial Outreach Sent': 14, 'Meeting Scheduled': 7, 'Meeting Completed': 6,
+    'Follow-up Sent': 6, 'Active Conversation': 8, 'Committed/Closed': 3,
+    'Not Interested': 8, 'Future Follow-up': 4,
+}
+TIERS = {'0': 5, '1': 10, '2': 25, '3': 35, '4': 25}
+CATEGORIES = {
+    'Platform Gatekeeper': 10, 'Family Office CIO': 25, 'VC Partner': 25,
+    'Foundation Leader': 15, 'Network Multiplier': 10, 'Strategic Connector': 15,
+}
+INTERACTION_TYPES = {'email_sent': 45, 'email_received': 20, 'meeting': 12, 'call': 13, 'note': 10}
+OUTCOMES = ['', '', '', 'positive', 'neutral', 'no_response', 'declined']
+RELATIONSHIP_TYPES = {'knows': 50, 'worked_with': 20, 'introduced_by': 10,
+                      'co_investor': 12, 'board_member': 8}
+
+FIRST_NAMES = ['Alex', 'Blair', 'Casey', 'Dana', 'Eli', 'Fran', 'Gale', 'Harper', 'Indra',
+               'Jordan', 'Kai', 'Lee', 'Morgan', 'Noor', 'Oren', 'Pat', 'Quinn', 'Riley',
+               'Sam', 'Taylor', 'Uma', 'Val', 'Wren', 'Yael', 'Zion']
+LAST_NAMES = ['Adams', 'Baker', 'Chen', 'Diaz', 'Evans', 'Fischer', 'Garcia', 'Haddad',
+              'Ito', 'Jensen', 'Kim', 'Lopez', 'Mehta', 'Novak', 'Okafor', 'Park', 'Rossi',
+              'Singh', 'Tanaka', 'Urban', 'Vargas', 'Weber', 'Xu', 'Young', 'Zhou']
+FIRMS = ['Capital', 'Partners', 'Ventures', 'Family Office', 'Foundation', 'Advisors',
+         'Holdings', 'Investments', 'Group', 'Endowment']
+TITLES = ['Managing Director', 'Partner', 'Principal', 'CIO', 'Director', 'Vice President',
+          'Founder', 'Investment Officer', 'CEO', 'Head of Private Markets']
+SECTORS = ['SaaS', 'Fintech', 'Healthcare', 'Climate', 'Consumer', 'AI/ML', 'Security',
+           'Industrial Tech', 'Marketplaces', 'Biotech']
+STAGES = ['Seed', 'Series A', 'Series B', 'Growth']
+GEOGRAPHIES = ['US', 'US', 'US', 'Europe', 'Global', 'Asia']
+
+CONTACT_FIELDS = ['id', 'name', 'company', 'title', 'category', 'tier', 'linkedin_url', 'email',
+                  'phone', 'status', 'last_contact', 'next_action', 'next_action_date',
+                  'priority_score', 'notes', 'tags']
+INTERACTION_FIELDS = ['id', 'contact_id', 'date', 'type', 'subject', 'notes', 'outcome', 'next_steps']
+RELATIONSHIP_FIELDS = ['id', 'contact_id_1', 'contact_id_2', 'relationship_type', 'strength',
+                       'notes', 'mutual_connections', 'created_date']
+FUND_FIELDS = ['fund_id', 'fund_name', 'manager_name', 'commitment_amount', 'commitment_date',
+               'vintage_year', 'stage_focus', 'sector_focus', 'geography', 'status',
+               'manager_contact_id', 'notes']
+CALL_FIELDS = ['call_id', 'fund_id', 'call_date', 'amount', 'due_date', 'paid_date', 'status', 'notes']
+DISTRIBUTION_FIELDS = ['dist_id', 'fund_id', 'dist_date', 'amount', 'type', 'notes']
+NAV_FIELDS = ['nav_id', 'fund_id', 'nav_date', 'nav_value', 'notes']
+COMPANY_FIELDS = ['company_id', 'company_name', 'fund_id', 'fund_name', 'gp_name', 'sector', 'stage',
+                  'status', 'investment_date', 'exit_date', 'exit_type', 'valuation_estimate',
+                  'description']
+
+
+def parse_scale(value):
+    """'10k' -> 10000; plain integers are accepted too"""
+    text = str(value).strip().lower()
+    if text in SCALES:
+        return SCALES[text]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    try:
+        count = int(float(text.rstrip('km')) * multiplier)
+    except ValueError:
+        raise ValueError(f"Unknown scale: {value} (use {', '.join(SCALES)} or a contact count)")
+    if count < 10:
+        raise ValueError(f"Scale must be at least 10 contacts: {value}")
+    return count
+
+
+def _choices(rng, weights, size):
+    """`size` draws from a {value: weight} table"""
+    values = list(weights)
+    p = np.array([weights[v] for v in values], dtype=float)
+    return np.array(values, dtype=object)[rng.choice(len(values), size=size, p=p / p.sum())]
+
+
+class _Writer:
+    """csv.writer over a new file, counting rows"""
+
+    def __init__(self, path, fields):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(fields)
+        self.rows = 0
+
+    def write(self, rows):
+        rows = list(rows)
+        self.writer.writerows(rows)
+        self.rows += len(rows)
+
+    def close(self):
+        self.file.close()
+        return self.rows
+
+
+class DatasetGenerator:
+    """Seeded generator for one dataset"""
+
+    def __init__(self, contacts, seed=42, today=None):
+        self.contacts = int(contacts)
+        self.seed = seed
+        self.today = today or date.today()
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)
+
+    def generate(self, out):
+        """Write every file into `out`; returns the manifest (also written as manifest.json)"""
+        out = Path(out)
+        out.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        timings, counts = {}, {}
+
+        for name, step in [('interactions', self._interactions), ('contacts', self._contacts),
+                           ('relationships', self._relationships), ('funds', self._funds),
+                           ('portfolio_companies', self._portfolio_companies)]:
+            step_start = time.perf_counter()
+            counts.update(step(out))
+            timings[name] = round(time.perf_counter() - step_start, 3)
+
+        manifest = {
+            'generator_version': GENERATOR_VERSION,
+            'contacts': self.contacts,
+            'seed': self.seed,
+            'today': self.today.isoformat(),
+            'rows': counts,
+            'seconds': round(time.perf_counter() - start, 3),
+            'step_seconds': timings,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        (out / 'manifest.json').write_text(json.dumps(manifest, indent=2) + '\n')
+        return manifest
+
+    # ------------------------------------------------------------------
+    # GTM: interactions, contacts, relationships
+    # ------------------------------------------------------------------
+
+    def _interactions(self, out):
+        n = self.contacts
+        total = n * INTERACTIONS_PER_CONTACT
+        # Lognormal activity per contact: most see one or two touches, a few see dozens
+        activity = self.rng.lognormal(0.0, 1.2, n)
+        contact_ids = self.rng.choice(n, size=total, p=activity / activity.sum()) + 1
+        # Seconds before the end of today, oldest first
+        ages = np.sort(self.rng.integers(0, ACTIVITY_DAYS * 86400, size=total))[::-1]
+        end = np.datetime64(self.today.isoformat() + 'T23:59:59', 's')
+        types = _choices(self.rng, INTERACTION_TYPES, total)
+        outcomes = self.rng.integers(0, len(OUTCOMES), size=total)
+
+        # Latest touch per contact (seconds ago), for contacts.last_contact
+        self._last_touch = np.full(n + 1, -1, dtype=np.int64)
+        latest = np.full(n + 1, np.iinfo(np.int64).max)
+        np.minimum.at(latest, contact_ids, ages)
+        touched = latest != np.iinfo(np.int64).max
+        self._last_touch[touched] = latest[touched]
+
+        writer = _Writer(out / 'interactions.csv', INTERACTION_FIELDS)
+        for chunk in range(0, total, CHUNK_ROWS):
+            stamps = np.datetime_as_string(end - ages[chunk:chunk + CHUNK_ROWS].astype('timedelta64[s]'))
+            writer.write(
+                (i + 1, int(contact_ids[i]), stamps[i - chunk].replace('T', ' '),
+                 types[i], f"{types[i].replace('_', ' ').title()} #{i + 1}", '',
+                 OUTCOMES[outcomes[i]], '')
+                for i in range(chunk, min(chunk + CHUNK_ROWS, total)))
+        return {'interactions': writer.close()}
+
+    def _contacts(self, out):
+        n = self.contacts
+        statuses = _choices(self.rng, STATUSES, n)
+        tiers = _choices(self.rng, TIERS, n)
+        categories = _choices(self.rng, CATEGORIES, n)
+        # Zipf-like firm sizes: a few large firms employ many contacts
+        firms = np.minimum(self.rng.zipf(1.6, n), max(10, n // 5))
+        scores = self.rng.integers(10, 101, n)
+        action_offsets = self.rng.integers(-14, 15, n)
+        has_action = self.rng.random(n) < 0.4
+        first = self.rng.integers(0, len(FIRST_NAMES), n)
+        last = self.rng.integers(0, len(LAST_NAMES), n)
+        title = self.rng.integers(0, len(TITLES), n)
+
+        writer = _Writer(out / 'contacts.csv', CONTACT_FIELDS)
+        for chunk in range(0, n, CHUNK_ROWS):
+            rows = []
+            for i in range(chunk, min(chunk + CHUNK_ROWS, n)):
+                contact_id = i + 1
+                firm = int(firms[i])
+                company = f"{LAST_NAMES[firm % len(LAST_NAMES)]} {FIRMS[firm % len(FIRMS)]} {firm}"
+                name = f"{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]} {contact_id}"
+                ago = self._last_touch[contact_id]
+                last_contact = ((self.today - timedelta(days=int(ago) // 86400)).isoformat()
+                                if ago >= 0 else '')
+                next_date = ((self.today + timedelta(days=int(action_offsets[i]))).isoformat()
+                             if has_action[i] else '')
+                rows.append((contact_id, name, company, TITLES[title[i]], categories[i], tiers[i],
+                             f"https://www.linkedin.com/in/contact-{contact_id}",
+                             f"contact{contact_id}@example.com", '', statuses[i], last_contact,
+                             'Follow up' if has_action[i] else '', next_date, int(scores[i]), '', ''))
+            writer.write(rows)
+        del self._last_touch
+        return {'contacts': writer.close()}
+
+    def _relationships(self, out):
+        """Preferential attachment: each new contact links to EDGES_PER_CONTACT existing ones"""
+        n = self.contacts
+        rng = self.random
+        types = _choices(self.rng, RELATIONSHIP_TYPES, n * EDGES_PER_CONTACT)
+        created = (self.today - timedelta(days=365)).isoformat()
+        # Every edge endpoint, so a uniform pick is a degree-weighted pick
+        endpoints = list(range(1, min(n, EDGES_PER_CONTACT + 1) + 1))
+
+        writer = _Writer(out / 'relationships.csv', RELATIONSHIP_FIELDS)
+        rows = []
+        edge_id = 0
+        for contact_id in range(len(endpoints) + 1, n + 1):
+            targets = set()
+            while len(targets) < EDGES_PER_CONTACT:
+                targets.add(endpoints[rng.randrange(len(endpoints))])
+            for target in sorted(targets):
+                edge_id += 1
+                rows.append((edge_id, target, contact_id, types[edge_id - 1],
+                             round(rng.betavariate(2, 3), 2), '', '', created))
+                endpoints.extend((target, contact_id))
+            if len(rows) >= CHUNK_ROWS:
+                writer.write(rows)
+                rows = []
+        writer.write(rows)
+        return {'relationships': writer.close()}
+
+    # ------------------------------------------------------------------
+    # Portfolio: funds, calls, distributions, NAVs, companies
+    # ------------------------------------------------------------------
+
+    def _funds(self, out):
+        rng = self.random
+        self._funds_list = []
+        funds = _Writer(out / 'portfolio_funds.csv', FUND_FIELDS)
+        calls = _Writer(out / 'capital_calls.csv', CALL_FIELDS)
+        dists = _Writer(out / 'distributions.csv', DISTRIBUTION_FIELDS)
+        navs = _Writer(out / 'fund_navs.csv', NAV_FIELDS)
+        counters = {'call': 0, 'dist': 0, 'nav': 0}
+
+        for i in range(1, max(MIN_FUNDS, self.contacts // CONTACTS_PER_FUND) + 1):
+            fund_id = f"F{i:05d}"
+            vintage = rng.randint(self.today.year - 10, self.today.year)
+            manager = f"{rng.choice(LAST_NAMES)} {rng.choice(FIRMS)} {i % 997}"
+            fund_name = f"{manager} Fund {rng.choice(['I', 'II', 'III', 'IV', 'V'])}"
+            commitment = rng.choice([1, 2, 2.5, 3, 5, 5, 10, 15, 25]) * 1_000_000
+            commitment_date = date(vintage, rng.randint(1, 12), 1)
+            if commitment_date > self.today:
+                commitment_date = self.today.replace(day=1)
+            self._funds_list.append((fund_id, fund_name, manager))
+            funds.write([(fund_id, fund_name, manager, f"{commitment:.0f}", commitment_date.isoformat(),
+                          vintage, rng.choice(STAGES), rng.choice(SECTORS), rng.choice(GEOGRAPHIES),
+                          'Active', '', '')])
+
+            # Calls front-loaded over the first ~5 years, up to ~90% called
+            age_days = (self.today - commitment_date).days
+            remaining, day, rows = commitment * rng.uniform(0.6, 0.9), commitment_date, []
+            while remaining > 0 and (day - commitment_date).days < min(age_days, 5 * 365):
+                amount = min(remaining, commitment * rng.uniform(0.05, 0.15))
+                remaining -= amount
+                counters['call'] += 1
+                due = day + timedelta(days=10)
+                rows.append((f"CC{counters['call']:07d}", fund_id, day.isoformat(), f"{amount:.0f}",
+                             due.isoformat(), due.isoformat() if due <= self.today else '',
+                             'Paid' if due <= self.today else 'Pending', ''))
+                day += timedelta(days=rng.randint(60, 240))
+            calls.write(rows)
+
+            # Distributions start around year 4
+            rows = []
+            day = commitment_date + timedelta(days=rng.randint(3 * 365, 5 * 365))
+            while day <= self.today:
+                counters['dist'] += 1
+                rows.append((f"D{counters['dist']:07d}", fund_id, day.isoformat(),
+                             f"{commitment * rng.uniform(0.02, 0.12):.0f}",
+                             rng.choice(['Return of Capital', 'Capital Gain', 'Capital Gain']), ''))
+                day += timedelta(days=rng.randint(120, 400))
+            dists.write(rows)
+
+            # Quarter-end NAVs from the first quarter after commitment
+            rows, nav = [], commitment * 0.1
+            year, quarter = commitment_date.year, (commitment_date.month - 1) // 3 + 1
+            while True:
+                quarter_end = (date(year, 3 * quarter, 1) + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+                if quarter_end > self.today:
+                    break
+                nav = max(0.0, nav * rng.uniform(0.95, 1.12) + commitment * rng.uniform(0.0, 0.05))
+                counters['nav'] += 1
+                rows.append((f"NAV{counters['nav']:08d}", fund_id, quarter_end.isoformat(), f"{nav:.0f}", ''))
+                year, quarter = (year + 1, 1) if quarter == 4 else (year, quarter + 1)
+            navs.write(rows)
+
+        return {'portfolio_funds': funds.close(), 'capital_calls': calls.close(),
+                'distributions': dists.close(), 'fund_navs': navs.close()}
+
+    def _portfolio_companies(self, out):
+        total = max(len(self._funds_list), self.contacts // CONTACTS_PER_HOLDING)
+        universe = max(20, total // 2)
+        # Zipf popularity: the hottest companies sit in many funds, most in one
+        companies = np.minimum(self.rng.zipf(1.4, total), universe)
+        funds = self.rng.integers(0, len(self._funds_list), total)
+        sectors = self.rng.integers(0, len(SECTORS), total)
+        stages = self.rng.integers(0, len(STAGES), total)
+        exited = self.rng.random(total) < 0.12
+        valuations = self.rng.lognormal(17.5, 1.5, total)
+        years = self.rng.integers(self.today.year - 9, self.today.year + 1, total)
+
+        writer = _Writer(out / 'portfolio_companies.csv', COMPANY_FIELDS)
+        for chunk in range(0, total, CHUNK_ROWS):
+            rows = []
+            for i in range(chunk, min(chunk + CHUNK_ROWS, total)):
+                company = int(companies[i])
+                fund_id, fund_name, manager = self._funds_list[funds[i]]
+                exit_year = min(self.today.year, int(years[i]) + 3)
+                rows.append((f"PC{i + 1:07d}", f"Company {company}", fund_id, fund_name, manager,
+                             SECTORS[(company + sectors[i] // 8) % len(SECTORS)], STAGES[stages[i]],
+                             'Exited' if exited[i] else 'Active', int(years[i]),
+                             exit_year if exited[i] else '', 'M&A' if exited[i] else '',
+                             f"{valuations[i]:.0f}", ''))
+            writer.write(rows)
+        del self._funds_list
+        return {'portfolio_companies': writer.close()}
+
+
+def generate(scale, out, seed=42, today=None):
+    """Generate a dataset of `scale` ('10k', 10000, ...) contacts into `out`; returns its manifest"""
+    return DatasetGenerator(parse_scale(scale), seed=seed, today=today).generate(out)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic NEWCO dataset')
+    parser.add_argument('scale', help=f"Contacts: {', '.join(SCALES)} or a count")
+    parser.add_argument('--out', required=True, help='Output data directory')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--today', type=date.fromisoformat, help='Reference date (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    manifest = generate(args.scale, args.out, seed=args.seed, today=args.today)
+    print(json.dumps(manifest, indent=2))
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner - Timed Engine Scenarios on Synthetic Data
+
+For each scale the runner generates (or reuses) a dataset with
+generate.py, copies it into a sandbox that mirrors core/ (scripts,
+config, templates and models linked, data/ a private copy) and runs each
+scenario in its own process:
+
+- setup: importing and constructing the engine
+- cold: the first call (CSV parses, shared cache builds)
+- warm: --repeat further calls (min / median / max)
+- CSV parses per file and peak RSS of the scenario process
+
+Files a scenario writes (caches, refreshed correlations) are reverted
+before the next one, so every scenario starts from the same data.
+Results are written as JSON to benchmarks/results/ with the git commit,
+so a change can be measured before and after:
+
+Usage:
+    python3 benchmarks/run.py                           # 1k and 10k, every scenario
+    python3 benchmarks/run.py --scales 100k,1m --only portfolio.,risk.
+    python3 benchmarks/run.py --list
+    python3 benchmarks/run.py --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+CORE_DIR = REPO_DIR / "core"
+DATA_DIR = BENCH_DIR / "data"
+RESULTS_DIR = BENCH_DIR / "results"
+
+# core/ directories the engines resolve relative to their scripts
+LINKED_DIRS = ('scripts', 'config', 'templates', 'models')
+
+RESULTS_VERSION = 1
+DEFAULT_SCALES = '1k,10k'
+DEFAULT_REPEAT = 5
+DEFAULT_TIMEOUT = 900
+
+
+# ----------------------------------------------------------------------
+# Datasets and sandboxes
+# ----------------------------------------------------------------------
+
+def dataset(scale, seed, data_dir=DATA_DIR):
+    """
+    Path and manifest of the dataset for a scale, generating it when
+    missing or stale (other generator version or reference date)
+
+    Returns:
+        (path, manifest, seconds spent generating or None)
+    """
+    from generate import GENERATOR_VERSION, generate
+
+    path = Path(data_dir) / f"{scale}-seed{seed}"
+    manifest_file = path / "manifest.json"
+    if manifest_file.exists():
+        manifest = json.loads(manifest_file.read_text())
+        if (manifest.get('generator_version') == GENERATOR_VERSION
+                and manifest.get('today') == date.today().isoformat()):
+            return path, manifest, None
+        shutil.rmtree(path)
+    start = time.perf_counter()
+    manifest = generate(scale, path, seed=seed)
+    return path, manifest, round(time.perf_counter() - start, 3)
+
+
+def _signature(path):
+    stat = path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def make_sandbox(source):
+    """A core/-shaped directory with its own copy of the dataset as data/"""
+    root = Path(tempfile.mkdtemp(prefix='newco-bench-'))
+    for name in LINKED_DIRS:
+        if (CORE_DIR / name).exists():
+            (root / name).symlink_to(CORE_DIR / name)
+    shutil.copytree(source, root / "data", ignore=shutil.ignore_patterns('manifest.json'))
+    (root / "reports").mkdir()
+    return root
+
+
+def restore_sandbox(root, source):
+    """Undo a scenario's writes: recopy changed files, remove new ones"""
+    data = root / "data"
+    for path in sorted(data.rglob('*'), reverse=True):
+        original = source / path.relative_to(data)
+        if path.is_dir():
+            if not original.is_dir():
+                shutil.rmtree(path)
+        elif not original.exists():
+            path.unlink()
+        elif _signature(path) != _signature(original):
+            shutil.copy2(original, path)
+    for path in source.iterdir():
+        if path.is_file() and path.name != 'manifest.json' and not (data / path.name).exists():
+            shutil.copy2(path, data / path.name)
+    shutil.rmtree(root / "reports", ignore_errors=True)
+    (root / "reports").mkdir()
+
+
+# ----------------------------------------------------------------------
+# Scenario process
+# ----------------------------------------------------------------------
+
+def _size(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def run_scenario(name, root, repeat):
+    """Run one scenario in this process (called in the per-scenario child)"""
+    import contextlib
+    import resource
+
+    sys.path.insert(0, str(Path(root) / "scripts"))
+    os.chdir(root)
+    from scenarios import SCENARIOS
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        call = SCENARIOS[name].setup()
+        setup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        value = call()
+        cold = time.perf_counter() - start
+
+        warm = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            warm.append(time.perf_counter() - start)
+
+    import metrics
+    loads = {}
+    for values, series in metrics.CSV_LOADS.series():
+        _, total, count, _ = series.snapshot()
+        loads[values[0]] = {'count': count, 'seconds': round(total, 6)}
+
+    result = {
+        'setup_s': round(setup, 6),
+        'cold_s': round(cold, 6),
+        'result_size': _size(value),
+        'csv_loads': loads,
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    if warm:
+        result['warm_s'] = {'min': round(min(warm), 6), 'median': round(statistics.median(warm), 6),
+                            'max': round(max(warm), 6), 'runs': len(warm)}
+    return result
+
+
+def _child(name, root, repeat, timeout):
+    """Run a scenario in a fresh interpreter; returns its result or an error entry"""
+    with tempfile.NamedTemporaryFile('r', suffix='.json') as out:
+        command = [sys.executable, str(Path(__file__).resolve()), '--worker', name,
+                   '--root', str(root), '--repeat', str(repeat), '--result', out.name]
+        start = time.perf_counter()
+        try:
+            process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                     text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {'error': f"timed out after {timeout}s"}
+        if process.returncode != 0:
+            lines = process.stderr.strip().splitlines()
+            return {'error': lines[-1] if lines else f"exit status {process.returncode}",
+                    'traceback': process.stderr[-4000:]}
+        result = json.load(out)
+        result['process_s'] = round(time.perf_counter() - start, 3)
+        return result
+
+
+# ----------------------------------------------------------------------
+# Suite
+# ----------------------------------------------------------------------
+
+def _git_revision():
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=REPO_DIR, capture_output=True, text=True,
+                                  timeout=60).stdout.strip()
+        except (OSError, subprocess.TimeoutExpired):
+            return ''
+    return {'commit': git('rev-parse', 'HEAD') or None,
+            'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))}
+
+
+def selected(only=None):
+    from scenarios import SCENARIOS
+    prefixes = [p for p in (only or '').split(',') if p]
+    return [s for name, s in SCENARIOS.items()
+            if not prefixes or any(name.startswith(p) for p in prefixes)]
+
+
+def run_suite(scales, seed=42, repeat=DEFAULT_REPEAT, only=None, timeout=DEFAULT_TIMEOUT,
+              data_dir=DATA_DIR, label=None, log=print):
+    """Run the selected scenarios at each scale; returns the results document"""
+    from generate import parse_scale
+
+    scenarios = selected(only)
+    results = {
+        'version': RESULTS_VERSION,
+        'label': label,
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'git': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'repeat': repeat,
+        'scales': {},
+    }
+
+    for scale in scales:
+        contacts = parse_scale(scale)
+        path, manifest, generated = dataset(scale, seed, data_dir)
+        log(f"\n📦 {scale}: {manifest['rows']['contacts']:,} contacts, "
+            f"{manifest['rows']['interactions']:,} interactions, "
+            f"{manifest['rows']['relationships']:,} relationships, "
+            f"{manifest['rows']['portfolio_funds']:,} funds"
+            + (f" (generated in {generated:.1f}s)" if generated is not None else ''))
+        entry = results['scales'][scale] = {'dataset': manifest, 'generate_s': generated, 'scenarios': {}}
+
+        root = make_sandbox(path)
+        try:
+            for s in scenarios:
+                if s.max_contacts and contacts > s.max_contacts:
+                    result = {'skipped': f"above {s.max_contacts:,} contacts"}
+                else:
+                    restore_sandbox(root, path)
+                    result = _child(s.name, root, repeat, timeout)
+                entry['scenarios'][s.name] = result
+                log(_format_line(s.name, result))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    results['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    return results
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:>10.1f}" if seconds is not None else f"{'-':>10}"
+
+
+def _format_line(name, result):
+    if 'skipped' in result:
+        return f"  {name:<28} skipped ({result['skipped']})"
+    if 'error' in result:
+        return f"  {name:<28} ERROR {result['error']}"
+    warm = result.get('warm_s', {}).get('median')
+    return (f"  {name:<28} setup {_ms(result['setup_s'])} ms  cold {_ms(result['cold_s'])} ms  "
+            f"warm {_ms(warm)} ms  rss {result['max_rss_mb']:>7.0f} MB")
+
+
+def save(results, out=None):
+    if out is None:
+        commit = (results['git']['commit'] or 'nogit')[:10]
+        stamp = results['started_at'].replace(':', '').replace('-', '')
+        out = RESULTS_DIR / f"{stamp}-{commit}{'-dirty' if results['git']['dirty'] else ''}.json"
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2) + '\n')
+    return out
+
+
+# ----------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------
+
+def compare(before, after, metric='median', threshold=0.10):
+    """
+    Print warm and cold timings of two result files side by side
+
+    Returns:
+        Number of scenarios whose warm time regressed by more than threshold
+    """
+    def load(path):
+        return json.loads(Path(path).read_text())
+
+    a, b = load(before), load(after)
+    print(f"before: {before} ({(a['git']['commit'] or '?')[:10]})")
+    print(f"after:  {after} ({(b['git']['commit'] or '?')[:10]})")
+    regressions = 0
+    for scale, entry in b['scales'].items():
+        old = a['scales'].get(scale, {}).get('scenarios', {})
+        print(f"\n{scale}")
+        print(f"  {'Scenario':<28} {'cold before':>12} {'cold after':>12} "
+              f"{'warm before':>12} {'warm after':>12} {'change':>8}")
+        for name, new in entry['scenarios'].items():
+            previous = old.get(name)
+            if previous is None or 'cold_s' not in previous or 'cold_s' not in new:
+                state = new.get('skipped') or new.get('error') or 'not in before'
+                print(f"  {name:<28} {state}")
+                continue
+            warm_a = previous.get('warm_s', {}).get(metric, previous['cold_s'])
+            warm_b = new.get('warm_s', {}).get(metric, new['cold_s'])
+            change = (warm_b - warm_a) / warm_a if warm_a else 0.0
+            flag = ''
+            if change > threshold:
+                flag, regressions = ' ▲', regressions + 1
+            elif change < -threshold:
+                flag = ' ▼'
+            print(f"  {name:<28} {_ms(previous['cold_s'])} ms {_ms(new['cold_s'])} ms "
+                  f"{_ms(warm_a)} ms {_ms(warm_b)} ms {change:>+7.0%}{flag}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='NEWCO engine benchmarks')
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help=f"Comma-separated scales: 1k, 10k, 100k, 1m or counts (default {DEFAULT_SCALES})")
+    parser.add_argument('--only', help='Comma-separated scenario name prefixes (e.g. portfolio.,risk.)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Warm calls after the cold one')
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help='Seconds per scenario')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR, help='Where generated datasets are kept')
+    parser.add_argument('--label', help='Free-form note stored with the results')
+    parser.add_argument('--out', type=Path, help='Results file (default: benchmarks/results/<time>-<commit>.json)')
+    parser.add_argument('--list', action='store_true', help='List scenarios and exit')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two result files')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Warm-time increase flagged as a regression by --compare (default 0.10)')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--root', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_scenario(args.worker, args.root, args.repeat)
+        Path(args.result).write_text(json.dumps(result))
+    elif args.list:
+        for s in selected(args.only):
+            limit = f" (up to {s.max_contacts:,} contacts)" if s.max_contacts else ''
+            print(f"  {s.name:<28} {s.description}{limit}")
+    elif args.compare:
+        sys.exit(1 if compare(*args.compare, threshold=args.threshold) else 0)
+    else:
+        results = run_suite([s.strip() for s in args.scales.split(',') if s.strip()], seed=args.seed,
+                            repeat=args.repeat, only=args.only, timeout=args.timeout,
+                            data_dir=args.data_dir, label=args.label)
+        print(f"\n💾 Results: {save(results, args.out)}")
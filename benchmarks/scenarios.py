@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark Scenarios - Engine Hot Paths
+
+Each scenario's setup imports and constructs what it needs (timed as
+setup) and returns the call to benchmark. run.py runs every scenario in a
+fresh process against a sandboxed copy of a generated dataset, so the
+first call is a true cold start (CSV parses, cache builds) and the
+repeats show the warm path.
+
+max_contacts skips scenarios whose algorithm is known not to finish in
+reasonable time above that scale (e.g. the ego-network betweenness
+approximation is cubic in hub degree).
+"""
+
+from pathlib import Path
+
+
+class Scenario:
+    def __init__(self, name, setup, max_contacts=None, description=''):
+        self.name = name
+        self.setup = setup
+        self.max_contacts = max_contacts
+        self.description = description
+
+
+SCENARIOS = {}
+
+
+def scenario(name, max_contacts=None):
+    """Register a setup function: () -> callable to time"""
+    def register(setup):
+        SCENARIOS[name] = Scenario(name, setup, max_contacts, (setup.__doc__ or '').strip())
+        return setup
+    return register
+
+
+def _data_dir():
+    # The sandbox's scripts directory is first on sys.path
+    import interaction_cube
+    return Path(interaction_cube.__file__).parent.parent / "data"
+
+
+# ----------------------------------------------------------------------
+# Contacts and GTM
+# ----------------------------------------------------------------------
+
+@scenario('contacts.list')
+def contacts_list():
+    """ContactManager.list_contacts filtered by status"""
+    from newco_cli import ContactManager
+    return lambda: ContactManager().list_contacts(status='Meeting Scheduled')
+
+
+@scenario('contacts.search')
+def contacts_search():
+    """ContactManager.search_contacts over name/company/notes"""
+    from newco_cli import ContactManager
+    return lambda: ContactManager().search_contacts('partners')
+
+
+@scenario('contacts.priority')
+def contacts_priority():
+    """ContactManager.get_priority_contacts (success-model scores)"""
+    from newco_cli import ContactManager
+    return lambda: ContactManager().get_priority_contacts(limit=20)
+
+
+@scenario('cube.contact_counts')
+def cube_contact_counts():
+    """InteractionCube roll-up by status and tier"""
+    from interaction_cube import get_cube
+    data = _data_dir()
+    return lambda: get_cube(data / "contacts.csv", data / "interactions.csv").contact_counts(by=('status', 'tier'))
+
+
+@scenario('priority.scores')
+def priority_scores():
+    """PriorityMaintainer.scores for every contact"""
+    from priority_maintainer import get_maintainer
+    data = _data_dir()
+    return lambda: get_maintainer(data / "contacts.csv", data / "interactions.csv").scores()
+
+
+@scenario('datastore.query')
+def datastore_query():
+    """TableIndex filter + sort + first page of contacts"""
+    from data_store import get_table
+    table = get_table(_data_dir() / "contacts.csv", 'id')
+    return lambda: table.query(where={'status': ['Meeting Scheduled', 'Active Conversation']},
+                               sort='-priority_score', limit=100)
+
+
+@scenario('automation.tasks_today')
+def automation_tasks_today():
+    """AutomationEngine.get_tasks_today"""
+    from automation import AutomationEngine
+    return AutomationEngine().get_tasks_today
+
+
+@scenario('automation.stale_contacts')
+def automation_stale_contacts():
+    """AutomationEngine.identify_stale_contacts"""
+    from automation import AutomationEngine
+    return AutomationEngine().identify_stale_contacts
+
+
+@scenario('analytics.funnel')
+def analytics_funnel():
+    """AnalyticsEngine.calculate_conversion_funnel"""
+    from analytics import AnalyticsEngine
+    return AnalyticsEngine().calculate_conversion_funnel
+
+
+@scenario('analytics.insights')
+def analytics_insights():
+    """AnalyticsEngine.generate_insights (response rate, velocity, stalled, predictions)"""
+    from analytics import AnalyticsEngine
+    return AnalyticsEngine().generate_insights
+
+
+@scenario('pipeline.weekly_stats')
+def pipeline_weekly_stats():
+    """PipelineManager.get_weekly_stats for the current week"""
+    from pipeline_manager import PipelineManager
+    return PipelineManager().get_weekly_stats
+
+
+# ----------------------------------------------------------------------
+# Network
+# ----------------------------------------------------------------------
+
+@scenario('network.degree_centrality')
+def network_degree_centrality():
+    """NetworkAnalysisEngine.calculate_degree_centrality"""
+    from network_analysis import NetworkAnalysisEngine
+    return NetworkAnalysisEngine().calculate_degree_centrality
+
+
+@scenario('network.betweenness', max_contacts=10_000)
+def network_betweenness():
+    """NetworkAnalysisEngine.calculate_betweenness_centrality (ego-network approximation)"""
+    from network_analysis import NetworkAnalysisEngine
+    return NetworkAnalysisEngine().calculate_betweenness_centrality
+
+
+@scenario('network.influence', max_contacts=10_000)
+def network_influence():
+    """NetworkAnalysisEngine.calculate_network_influence_score"""
+    from network_analysis import NetworkAnalysisEngine
+    return NetworkAnalysisEngine().calculate_network_influence_score
+
+
+@scenario('relationships.intro_paths', max_contacts=100_000)
+def relationships_intro_paths():
+    """RelationshipManager.suggest_warm_intro_paths to a low-degree contact"""
+    from relationship_manager import RelationshipManager
+    manager = RelationshipManager()
+    target = manager.load_contacts()[-1]['id']
+    return lambda: manager.suggest_warm_intro_paths(target)
+
+
+# ----------------------------------------------------------------------
+# Portfolio, risk, finance
+# ----------------------------------------------------------------------
+
+@scenario('portfolio.summary')
+def portfolio_summary():
+    """PortfolioManager.get_portfolio_summary (fund metrics view)"""
+    from portfolio_management import PortfolioManager
+    return PortfolioManager().get_portfolio_summary
+
+
+@scenario('portfolio.fund_metrics')
+def portfolio_fund_metrics():
+    """PortfolioManager.get_all_fund_metrics (IRR/TVPI/DPI per fund from the ledger)"""
+    from portfolio_management import PortfolioManager
+    return PortfolioManager().get_all_fund_metrics
+
+
+@scenario('portfolio.forecast')
+def portfolio_forecast():
+    """PortfolioManager.forecast_capital_calls over 12 months"""
+    from portfolio_management import PortfolioManager
+    return lambda: PortfolioManager().forecast_capital_calls(months=12)
+
+
+@scenario('risk.concentration')
+def risk_concentration():
+    """RiskManager.check_concentration_risk (incl. look-through exposure)"""
+    from risk_management import RiskManager
+    return RiskManager().check_concentration_risk
+
+
+@scenario('risk.correlation')
+def risk_correlation():
+    """RiskManager.analyze_correlation_risk (fund overlap refresh)"""
+    from risk_management import RiskManager
+    return RiskManager().analyze_correlation_risk
+
+
+@scenario('risk.dashboard')
+def risk_dashboard():
+    """RiskManager.get_risk_dashboard"""
+    from risk_management import RiskManager
+    return RiskManager().get_risk_dashboard
+
+
+@scenario('finance.simulate')
+def finance_simulate():
+    """FinancialModeler.simulate_cashflows, 5 years, seeded"""
+    from financial_modeling import FinancialModeler
+    modeler = FinancialModeler()
+    return lambda: modeler.simulate_cashflows(years=5, seed=1)
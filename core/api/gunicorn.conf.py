@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration for the Platform API (production serving)
+
+    cd core/api && gunicorn -c gunicorn.conf.py server:app
+
+Threaded workers: data endpoints are short and CPU-light, while each LLM
+request waits on an ollama process. LLM calls are bounded per worker by
+llm_config.yaml (max_concurrent + max_queued), which stays well below
+`threads`, so data requests always find a free thread. See load_test.py.
+
+Workers share state through data/: LLM job records (polled via
+/api/llm/jobs/<id>) live in jobs.db, so any worker can answer a poll.
+Each worker starts a background job pool, but only one at a time holds
+the supervisor lock (data/jobs.lock) and runs jobs; the rest are standby.
+
+Environment overrides: NEWCO_API_BIND, NEWCO_API_WORKERS, NEWCO_API_THREADS
+"""
+
+import os
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = os.environ.get('NEWCO_API_BIND', '0.0.0.0:5001')
+workers = int(os.environ.get('NEWCO_API_WORKERS', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('NEWCO_API_THREADS', 16))
+
+# LLM requests wait up to 130s for ollama (120s timeout)
+timeout = 180
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+LLM Jobs - Bounded Executor for the LLM Endpoints
+
+An LLM request holds an `ollama run` for up to 120 seconds. Run inline, a
+few concurrent ones occupy every server thread and stall the dashboard's
+data endpoints. Instead each LLM call is submitted as a job:
+
+- At most max_concurrent jobs run at once (one ollama process each)
+- At most max_queued more wait for a slot; beyond that, submit() raises
+  LLMBusy and the endpoint answers 503 straight away, so LLM traffic can
+  never hold more than max_concurrent + max_queued request threads
+- Clients either wait for the result (the default) or ask for
+  `Prefer: respond-async` and poll the job
+
+Calls run on the server process that accepted them, but job records live
+in SQLite (the llm_jobs table of data/jobs.db), so a poll answered by
+another gunicorn worker, or after a restart, still finds the job. A job
+whose process died before it finished is reported as failed. Finished
+jobs are kept (most recent `keep`) so results can be collected.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from pathlib import Path
+
+from job_queue import ClosingConnection, pid_alive
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    owner_pid INTEGER NOT NULL,
+    submitted_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS llm_jobs_by_status ON llm_jobs (status, submitted_at);
+"""
+
+FIELDS = ('job_id', 'status', 'submitted_at', 'started_at', 'finished_at', 'result', 'error')
+
+
+class LLMBusy(Exception):
+    """Raised when the LLM executor is at capacity"""
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class LLMJobs:
+    """Bounded pool of LLM calls with pollable job records"""
+
+    def __init__(self, db_file, max_concurrent=2, max_queued=4, keep=200):
+        self.db_file = Path(db_file)
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix='llm')
+        self._lock = threading.Lock()
+        self._futures = {}             # job_id -> Future (unfinished jobs of this process)
+        self._running = set()
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue an LLM call
+
+        Returns:
+            Job id
+
+        Raises:
+            LLMBusy: max_concurrent jobs are running and max_queued waiting
+        """
+        with self._lock:
+            if len(self._futures) >= self.max_concurrent + self.max_queued:
+                raise LLMBusy(f"LLM busy: {len(self._futures)} requests in flight, try again shortly")
+
+            job_id = uuid.uuid4().hex
+            with self._connect() as conn:
+                conn.execute("INSERT INTO llm_jobs (job_id, status, owner_pid, submitted_at) "
+                             "VALUES (?, 'queued', ?, ?)", (job_id, os.getpid(), _now()))
+            self._futures[job_id] = self._executor.submit(self._run, job_id, fn, args, kwargs)
+        self._trim()
+        return job_id
+
+    def status(self, job_id):
+        """Job record, or None for an unknown or expired job"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM llm_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row['status'] in ('queued', 'running') and not pid_alive(row['owner_pid']):
+                conn.execute("UPDATE llm_jobs SET status = 'failed', error = ?, finished_at = ? "
+                             "WHERE job_id = ? AND status IN ('queued', 'running')",
+                             ("Server process exited before the job finished", _now(), job_id))
+                row = conn.execute("SELECT * FROM llm_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        job = {key: row[key] for key in FIELDS}
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def wait(self, job_id, timeout=None):
+        """Block until a job finishes or timeout seconds pass; returns its record"""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except FutureTimeout:
+                pass
+        return self.status(job_id)
+
+    def stats(self):
+        """This process's executor load"""
+        with self._lock:
+            running = len(self._running)
+            return {'running': running, 'queued': len(self._futures) - running,
+                    'max_concurrent': self.max_concurrent, 'max_queued': self.max_queued}
+
+    def _run(self, job_id, fn, args, kwargs):
+        with self._lock:
+            self._running.add(job_id)
+        self._update(job_id, status='running', started_at=_now())
+        try:
+            result, error, status = json.dumps(fn(*args, **kwargs), default=str), None, 'done'
+        except Exception as e:
+            result, error, status = None, str(e), 'failed'
+        try:
+            self._update(job_id, status=status, result=result, error=error, finished_at=_now())
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
+                self._futures.pop(job_id, None)
+
+    def _update(self, job_id, **fields):
+        assignments = ', '.join(f"{key} = ?" for key in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE llm_jobs SET {assignments} WHERE job_id = ?",
+                         list(fields.values()) + [job_id])
+
+    def _trim(self):
+        """Drop the oldest finished jobs beyond `keep`"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_jobs WHERE job_id IN ("
+                         "SELECT job_id FROM llm_jobs WHERE status IN ('done', 'failed') "
+                         "ORDER BY submitted_at DESC, rowid DESC LIMIT -1 OFFSET ?)", (self.keep,))
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return ClosingConnection(conn)
+
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Load Test - Data Endpoint Latency under Concurrent LLM Requests
+
+Runs against a live server in two phases:
+1. Baseline: pollers request the data endpoints for --duration seconds
+2. Loaded: the same, while --llm-clients clients keep /api/llm/chat busy
+
+and reports p50/p95/p99/max latency of the data endpoints per phase, plus
+the status codes the LLM clients saw (200 done, 503 executor full).
+
+Usage:
+    gunicorn -c gunicorn.conf.py server:app &
+    python3 load_test.py --url http://localhost:5001 --llm-clients 8 --duration 30
+
+No dependencies beyond the standard library.
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+DATA_ENDPOINTS = [
+    '/api/portfolio/summary',
+    '/api/portfolio/funds',
+    '/api/risk/dashboard',
+    '/api/intel/manager-universe',
+    '/api/portfolio-companies/stats',
+    '/api/portfolio-companies?limit=50&sort=company_name',
+]
+
+
+def _request(url, data=None, timeout=300):
+    """(status, seconds) for one request"""
+    body = json.dumps(data).encode() if data is not None else None
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _poll(base_url, endpoints, stop, latencies, statuses):
+    i = 0
+    while not stop.is_set():
+        status, seconds = _request(base_url + endpoints[i % len(endpoints)], timeout=60)
+        latencies.append(seconds)
+        statuses[status] += 1
+        i += 1
+
+
+def _llm_client(base_url, model, stop, statuses):
+    while not stop.is_set():
+        status, _ = _request(base_url + '/api/llm/chat',
+                             {'prompt': 'Summarize the key risks of a fund-of-funds portfolio.',
+                              'model': model})
+        statuses[status] += 1
+        if status == 503:
+            time.sleep(1)   # Honour the busy signal instead of hammering
+
+
+def run_phase(base_url, duration, pollers, llm_clients=0, model='mistral', endpoints=DATA_ENDPOINTS):
+    """Run one phase; returns latency percentiles (ms) and status counts"""
+    stop = threading.Event()
+    latencies, data_statuses, llm_statuses = [], Counter(), Counter()
+
+    llm_threads = [threading.Thread(target=_llm_client, args=(base_url, model, stop, llm_statuses), daemon=True)
+                   for _ in range(llm_clients)]
+    for thread in llm_threads:
+        thread.start()
+    if llm_clients:
+        time.sleep(2)   # Let the LLM requests occupy the server first
+
+    poll_threads = [threading.Thread(target=_poll, args=(base_url, endpoints, stop, latencies, data_statuses),
+                                     daemon=True)
+                    for _ in range(pollers)]
+    for thread in poll_threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in poll_threads:
+        thread.join()
+
+    ms = [seconds * 1000 for seconds in latencies]
+    return {
+        'requests': len(ms),
+        'p50_ms': round(_percentile(ms, 50), 1),
+        'p95_ms': round(_percentile(ms, 95), 1),
+        'p99_ms': round(_percentile(ms, 99), 1),
+        'max_ms': round(max(ms), 1) if ms else 0.0,
+        'data_statuses': dict(data_statuses),
+        'llm_statuses': dict(llm_statuses)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Data endpoint latency under concurrent LLM load')
+    parser.add_argument('--url', default='http://localhost:5001', help='Server base URL')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds per phase')
+    parser.add_argument('--pollers', type=int, default=4, help='Concurrent data endpoint clients')
+    parser.add_argument('--llm-clients', type=int, default=8, help='Concurrent LLM clients in the loaded phase')
+    parser.add_argument('--model', default='mistral', help='Model for the LLM requests')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = {
+        'baseline': run_phase(args.url, args.duration, args.pollers),
+        'llm_load': run_phase(args.url, args.duration, args.pollers, args.llm_clients, args.model)
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Data endpoints: {len(DATA_ENDPOINTS)}, pollers: {args.pollers}, "
+          f"LLM clients: {args.llm_clients}, {args.duration:.0f}s per phase\n")
+    print(f"{'Phase':<10} {'Requests':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  LLM statuses")
+    for phase, r in results.items():
+        print(f"{phase:<10} {r['requests']:>9} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} "
+              f"{r['max_ms']:>8}  {r['llm_statuses'] or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Response Cache - Conditional GET for the API Server
+
+GET endpoints recompute from the CSVs on every request, and the dashboard
+polls them all. @cache.cached(...) wraps a view so that:
+
+- Responses are cached per (endpoint, view args, query args) together with
+  the signatures (mtime, size) of the data files the endpoint depends on;
+  a changed file changes the signature, so the entry is rebuilt on the
+  next request - no explicit invalidation
+- Endpoints whose output depends on today's date (recency windows,
+  as-of-today metrics) pass daily=True, which adds the date to the key;
+  views leave the current time out of the body
+- Each response carries a strong ETag (hash of the body), Last-Modified
+  (when the body was computed) and Cache-Control: no-cache, so clients
+  revalidate on every poll and get 304 Not Modified while nothing changed
+
+Dependencies are engines or paths. An engine stands for every data file
+it reads: its *_file path attributes, plus those of the engines it holds
+(RiskManager -> PortfolioManager, ...). Files under data/cache are
+derived state and are skipped.
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from functools import wraps
+from pathlib import Path
+
+from flask import make_response, request
+
+BASE_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = BASE_DIR / "scripts"
+
+
+def _file_signature(path):
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _is_engine(value):
+    """Objects defined in core/scripts (engines, views, aggregates)"""
+    module = sys.modules.get(type(value).__module__)
+    return str(getattr(module, '__file__', '')).startswith(str(SCRIPTS_DIR))
+
+
+def data_files(*sources):
+    """
+    Data files behind a set of engines and paths, in a stable order
+
+    Args:
+        *sources: Engines (expanded to their *_file attributes, recursively)
+            or paths
+    """
+    files, seen = [], set()
+
+    def add(path):
+        path = Path(path)
+        if 'cache' not in path.parts and path not in files:
+            files.append(path)
+
+    def visit(obj):
+        if isinstance(obj, (str, Path)):
+            add(obj)
+            return
+        if id(obj) in seen:
+            return
+        seen.add(id(obj))
+        for name, value in sorted(vars(obj).items()):
+            if isinstance(value, Path):
+                if name.endswith('_file'):
+                    add(value)
+            elif hasattr(value, '__dict__') and _is_engine(value):
+                visit(value)
+
+    for source in sources:
+        visit(source)
+    return tuple(files)
+
+
+class ResponseCache:
+    """Bounded LRU of rendered GET responses, validated by data file signatures"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (signature, body, mimetype, etag, computed_at)
+
+    def cached(self, *sources, daily=False):
+        """
+        Decorator for a GET view that depends on the given engines/paths
+        (and, with daily=True, on today's date)
+        """
+        def decorator(view):
+            files = None   # resolved on first request, once the engines are built
+
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                nonlocal files
+                if files is None:
+                    files = data_files(*sources)
+
+                # Taken before the view runs: a write during it leaves the entry stale
+                signature = tuple(_file_signature(path) for path in files)
+                key = (request.endpoint, tuple(sorted(kwargs.items())),
+                       tuple(sorted(request.args.items(multi=True))),
+                       date.today().isoformat() if daily else None)
+
+                entry = self._get(key, signature)
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.direct_passthrough:
+                        return response  # Errors and streams are not cached
+                    body = response.get_data()
+                    entry = (signature, body, response.mimetype, hashlib.sha256(body).hexdigest(),
+                             datetime.now(timezone.utc))
+                    self._put(key, entry)
+
+                _, body, mimetype, etag, computed_at = entry
+                response = make_response(body)
+                response.mimetype = mimetype
+                response.set_etag(etag)
+                response.last_modified = computed_at
+                response.cache_control.no_cache = True
+                return response.make_conditional(request)
+
+            return wrapper
+        return decorator
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'hits': self.hits, 'misses': self.misses}
+
+    def _get(self, key, signature):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -5,10 +5,13 @@ NEWCO Platform API Server
 Flask REST API that exposes NEWCO CLI data to the React frontend
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, url_for
 from flask_cors import CORS
+import os
 import sys
+import time
 from pathlib import Path
+from urllib.parse import urlencode
 
 # Add scripts to path
 BASE_DIR = Path(__file__).parent.parent
@@ -24,6 +27,13 @@ from financial_modeling import FinancialModeler
 from competitive_intelligence import CompetitiveIntelligence
 from risk_management import RiskManager
 from llm_service import LLMService
+from data_store import DEFAULT_PAGE_SIZE, get_table
+from job_queue import JobQueue, WorkerPool
+from llm_jobs import LLMBusy, LLMJobs
+from response_cache import ResponseCache
+from warmup import Warmup
+import metrics
+import profiling
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
@@ -39,12 +49,87 @@ intel = CompetitiveIntelligence()
 risk = RiskManager()
 llm = LLMService()
 
+# Background jobs (board decks, LP letters, DD memos, ...) run off the request path;
+# every process starts a pool, but only the holder of the supervisor lock runs jobs
+jobs = JobQueue()
+job_pool = WorkerPool(jobs).start()
+
+# GET responses, revalidated against the data files each endpoint reads
+cache = ResponseCache()
+PORTFOLIO_COMPANIES_FILE = BASE_DIR / "data" / "portfolio_companies.csv"
+
+# LLM calls run on a bounded executor so they can't tie up every request thread;
+# their records share jobs.db so any worker can answer a poll
+llm_jobs = LLMJobs(jobs.db_file, max_concurrent=llm.config.get('max_concurrent', 2),
+                   max_queued=llm.config.get('max_queued', 4))
+LLM_WAIT_SECONDS = 130   # ollama's own timeout is 120s
+
+# Indexed tables behind the list endpoints; filter names map to each table's columns
+LIST_FILTERS = ('sector', 'stage', 'status', 'fund_id', 'vintage')
+# Fields _fund_multiples adds to fund items (the fallback from the fund row has only the multiples)
+FUND_MULTIPLE_FIELDS = ('tvpi', 'dpi', 'rvpi', 'irr', 'paid_in', 'unfunded')
+companies_table = get_table(PORTFOLIO_COMPANIES_FILE, 'company_id', {'vintage': 'investment_date'})
+funds_table = get_table(portfolio.funds_file, 'fund_id', {
+    'sector': 'sector_focus', 'stage': 'stage_focus', 'vintage': 'vintage_year'
+})
+managers_table = get_table(managers.managers_file, 'manager_id', {
+    'sector': 'sector_focus', 'stage': 'stage_focus', 'status': 'pipeline_stage', 'vintage': 'vintage_year'
+})
+universe_table = get_table(intel.manager_universe_file, 'manager_id', {
+    'sector': 'sector_focus', 'stage': 'stage_focus', 'status': 'our_status'
+})
+
+
+def _list_response(table, enrich=None, enriched_fields=()):
+    """
+    Filtered, sorted and optionally paginated list from an indexed table
+
+    enrich adds computed fields to each item; enriched_fields names them
+    so they can be selected with `fields`.
+
+    Query args:
+        sector, stage, status, fund_id, vintage: Filters (repeat to OR values)
+        sort: Field to sort by, '-field' for descending
+        fields: Comma-separated fields to return (table columns or
+            enriched_fields)
+        limit, offset, cursor: Pagination; with any of these the response
+            is {'items', 'total', 'offset', 'limit', 'next_cursor'},
+            otherwise the plain list of every match
+    """
+    args = request.args
+    paginated = any(name in args for name in ('limit', 'offset', 'cursor'))
+    where = {name: args.getlist(name) for name in LIST_FILTERS if name in args}
+    fields = [field for field in args.get('fields', '').split(',') if field]
+
+    try:
+        known = table.fields()
+        unknown = [field for field in fields if field not in known and field not in enriched_fields]
+        if known and unknown:
+            raise ValueError(f"Unknown field: {', '.join(unknown)}")
+        page = table.query(where=where, sort=args.get('sort'),
+                           offset=args.get('offset', 0),
+                           limit=args.get('limit', DEFAULT_PAGE_SIZE) if paginated else None,
+                           cursor=args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    items = page['items']
+    if enrich:
+        items = [enrich(item) for item in items]
+    if fields:
+        items = [{field: item[field] for field in fields if field in item} for item in items]
+
+    if not paginated:
+        return jsonify(items)
+    return jsonify({**page, 'items': items})
+
 
 # ═══════════════════════════════════════════════════════
 # PORTFOLIO ENDPOINTS
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/portfolio/summary', methods=['GET'])
+@cache.cached(portfolio, daily=True)   # funds without a NAV mark are valued as of today
 def get_portfolio_summary():
     """Get portfolio summary metrics"""
     summary = portfolio.get_portfolio_summary()
@@ -52,51 +137,52 @@ def get_portfolio_summary():
 
 
 @app.route('/api/portfolio/funds', methods=['GET'])
+@cache.cached(portfolio, daily=True)
 def get_funds():
-    """Get all funds"""
-    funds = portfolio._load_csv(portfolio.funds_file)
-
-    # Calculate basic performance metrics for each fund
-    enriched_funds = []
-    for fund in funds:
-        # Calculate TVPI
-        committed = float(fund.get('commitment_amount', 0))
-        called = float(fund.get('total_called', 0))
-        distributed = float(fund.get('total_distributed', 0))
-        nav = float(fund.get('current_nav', 0))
+    """Get funds (filter/sort/paginate: see _list_response)"""
+    fund_metrics = portfolio.metrics_view.all()
 
-        tvpi = (distributed + nav) / called if called > 0 else 0
-        dpi = distributed / called if called > 0 else 0
-        rvpi = nav / called if called > 0 else 0
+    # Attach performance metrics from the materialized view
+    return _list_response(funds_table, lambda fund: {
+        **fund,
+        **_fund_multiples(fund, fund_metrics.get(fund['fund_id']))
+    }, enriched_fields=FUND_MULTIPLE_FIELDS)
+
+
+def _fund_multiples(fund, metrics):
+    """TVPI/DPI/RVPI for a fund, falling back to the summary columns on the fund row"""
+    if metrics:
+        return {
+            'tvpi': f"{metrics['tvpi']:.2f}",
+            'dpi': f"{metrics['dpi']:.2f}",
+            'rvpi': f"{metrics['rvpi']:.2f}",
+            'irr': 'n/a' if metrics['irr'] is None else f"{metrics['irr']:.2f}",
+            'paid_in': metrics['paid_in'],
+            'unfunded': metrics['unfunded']
+        }
+
+    called = float(fund.get('total_called', 0) or 0)
+    distributed = float(fund.get('total_distributed', 0) or 0)
+    nav = float(fund.get('current_nav', 0) or 0)
 
-        enriched_funds.append({
-            **fund,
-            'tvpi': f"{tvpi:.2f}",
-            'dpi': f"{dpi:.2f}",
-            'rvpi': f"{rvpi:.2f}"
-        })
+    tvpi = (distributed + nav) / called if called > 0 else 0
+    dpi = distributed / called if called > 0 else 0
+    rvpi = nav / called if called > 0 else 0
 
-    return jsonify(enriched_funds)
+    return {'tvpi': f"{tvpi:.2f}", 'dpi': f"{dpi:.2f}", 'rvpi': f"{rvpi:.2f}"}
 
 
 @app.route('/api/portfolio/funds/<fund_id>', methods=['GET'])
+@cache.cached(portfolio, PORTFOLIO_COMPANIES_FILE, daily=True)
 def get_fund_detail(fund_id):
     """Get single fund detail"""
-    funds = portfolio._load_csv(portfolio.funds_file)
-    fund = next((f for f in funds if f['fund_id'] == fund_id), None)
+    fund = funds_table.get(fund_id)
 
     if not fund:
         return jsonify({'error': 'Fund not found'}), 404
 
-    # Calculate performance metrics
-    committed = float(fund.get('commitment_amount', 0))
-    called = float(fund.get('total_called', 0))
-    distributed = float(fund.get('total_distributed', 0))
-    nav = float(fund.get('current_nav', 0))
-
-    tvpi = (distributed + nav) / called if called > 0 else 0
-    dpi = distributed / called if called > 0 else 0
-    rvpi = nav / called if called > 0 else 0
+    # Performance metrics from the materialized view
+    multiples = _fund_multiples(fund, portfolio.metrics_view.get(fund_id))
 
     # Add capital call history (if file exists)
     fund_calls = []
@@ -111,19 +197,11 @@ def get_fund_detail(fund_id):
         fund_distributions = [d for d in distributions if d['fund_id'] == fund_id]
 
     # Add portfolio companies (if file exists)
-    fund_companies = []
-    portfolio_companies_file = BASE_DIR / "data" / "portfolio_companies.csv"
-    if portfolio_companies_file.exists():
-        import csv
-        with open(portfolio_companies_file, 'r') as f:
-            reader = csv.DictReader(f)
-            fund_companies = [c for c in reader if c['fund_id'] == fund_id]
+    fund_companies = companies_table.query(where={'fund_id': fund_id})['items']
 
     return jsonify({
         **fund,
-        'tvpi': f"{tvpi:.2f}",
-        'dpi': f"{dpi:.2f}",
-        'rvpi': f"{rvpi:.2f}",
+        **multiples,
         'capital_calls': fund_calls,
         'distributions': fund_distributions,
         'portfolio_companies': fund_companies
@@ -131,6 +209,7 @@ def get_fund_detail(fund_id):
 
 
 @app.route('/api/portfolio/performance', methods=['GET'])
+@cache.cached(portfolio, daily=True)
 def get_portfolio_performance():
     """Get portfolio-level performance"""
     summary = portfolio.get_portfolio_summary()
@@ -142,23 +221,17 @@ def get_portfolio_performance():
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/managers', methods=['GET'])
+@cache.cached(managers)
 def get_managers():
-    """Get all managers"""
-    managers_list = managers._load_csv(managers.managers_file)
-
-    # Optionally filter by status
-    status = request.args.get('status')
-    if status:
-        managers_list = [m for m in managers_list if m['status'] == status]
-
-    return jsonify(managers_list)
+    """Get managers (filter/sort/paginate: see _list_response)"""
+    return _list_response(managers_table)
 
 
 @app.route('/api/managers/<manager_id>', methods=['GET'])
+@cache.cached(managers)
 def get_manager_detail(manager_id):
     """Get manager detail"""
-    mgr_data = managers._load_csv(managers.managers_file)
-    manager = next((m for m in mgr_data if m['manager_id'] == manager_id), None)
+    manager = managers_table.get(manager_id)
 
     if not manager:
         return jsonify({'error': 'Manager not found'}), 404
@@ -179,6 +252,7 @@ def get_manager_detail(manager_id):
 
 
 @app.route('/api/managers/pipeline', methods=['GET'])
+@cache.cached(managers)
 def get_manager_pipeline():
     """Get manager pipeline"""
     pipeline_stats = managers.get_pipeline_summary()
@@ -190,6 +264,7 @@ def get_manager_pipeline():
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/public/ticker', methods=['GET'])
+@cache.cached(public_markets)
 def get_ticker_status():
     """Get current ticker status"""
     ticker_data = public_markets._load_csv(public_markets.ticker_file)
@@ -209,6 +284,7 @@ def get_ticker_status():
 
 
 @app.route('/api/public/nav-history', methods=['GET'])
+@cache.cached(public_markets)
 def get_nav_history():
     """Get NAV history"""
     nav_data = public_markets._load_csv(public_markets.nav_file)
@@ -216,6 +292,7 @@ def get_nav_history():
 
 
 @app.route('/api/public/shareholders', methods=['GET'])
+@cache.cached(public_markets)
 def get_shareholders():
     """Get shareholder list"""
     shareholders = public_markets._load_csv(public_markets.shareholders_file)
@@ -227,6 +304,7 @@ def get_shareholders():
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/team/members', methods=['GET'])
+@cache.cached(team)
 def get_team_members():
     """Get team members"""
     members = team._load_csv(team.team_members_file)
@@ -234,6 +312,7 @@ def get_team_members():
 
 
 @app.route('/api/team/workload', methods=['GET'])
+@cache.cached(team)
 def get_team_workload():
     """Get team workload"""
     workload_data = team.get_team_workload()
@@ -241,6 +320,7 @@ def get_team_workload():
 
 
 @app.route('/api/team/capacity', methods=['GET'])
+@cache.cached(team)
 def get_team_capacity():
     """Get team capacity analysis"""
     capacity = team.capacity_analysis()
@@ -248,6 +328,7 @@ def get_team_capacity():
 
 
 @app.route('/api/team/ic-votes', methods=['GET'])
+@cache.cached(team)
 def get_ic_votes():
     """Get IC voting history"""
     votes = team._load_csv(team.ic_votes_file)
@@ -267,6 +348,7 @@ def get_ic_votes():
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/governance/ic-committee', methods=['GET'])
+@cache.cached(governance)
 def get_ic_committee():
     """Get IC committee composition"""
     ic_members = governance.get_ic_committee()
@@ -274,6 +356,7 @@ def get_ic_committee():
 
 
 @app.route('/api/governance/ic-meetings', methods=['GET'])
+@cache.cached(governance)
 def get_ic_meetings():
     """Get IC meeting history"""
     meetings = governance._load_csv(governance.ic_meetings_file)
@@ -281,6 +364,7 @@ def get_ic_meetings():
 
 
 @app.route('/api/governance/coinvest-pipeline', methods=['GET'])
+@cache.cached(governance)
 def get_coinvest_pipeline():
     """Get co-invest pipeline"""
     coinvest = governance._load_csv(governance.coinvest_decisions_file)
@@ -294,6 +378,7 @@ def get_coinvest_pipeline():
 
 
 @app.route('/api/governance/manager-contacts', methods=['GET'])
+@cache.cached(governance)
 def get_manager_contacts():
     """Get manager relationship tracking"""
     contacts = governance._load_csv(governance.manager_contacts_file)
@@ -307,6 +392,7 @@ def get_manager_contacts():
 
 
 @app.route('/api/governance/calendar', methods=['GET'])
+@cache.cached(governance)
 def get_governance_calendar():
     """Get governance calendar"""
     events = governance._load_csv(governance.governance_calendar_file)
@@ -323,6 +409,7 @@ def get_governance_calendar():
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/finance/scenarios', methods=['GET'])
+@cache.cached(finance)
 def get_scenarios():
     """Get scenario analysis"""
     scenarios = finance.scenario_analysis()
@@ -330,6 +417,7 @@ def get_scenarios():
 
 
 @app.route('/api/finance/projections', methods=['GET'])
+@cache.cached(finance)
 def get_cash_flow_projections():
     """Get cash flow projections"""
     years = int(request.args.get('years', 5))
@@ -337,7 +425,37 @@ def get_cash_flow_projections():
     return jsonify(projections)
 
 
+@app.route('/api/finance/simulation', methods=['GET'])
+@cache.cached(finance)
+def get_cash_flow_simulation():
+    """Get Monte Carlo cash flow percentile bands"""
+    try:
+        years = int(request.args.get('years', 5))
+        paths = min(int(request.args.get('paths', 10000)), 100000)
+        scenario = request.args.get('scenario', 'base')
+        seed = request.args.get('seed')
+        simulation = finance.simulate_cashflows(years=years, paths=paths, scenario=scenario,
+                                                seed=int(seed) if seed is not None else None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(simulation)
+
+
+@app.route('/api/finance/tornado', methods=['GET'])
+@cache.cached(finance)
+def get_sensitivity_tornado():
+    """Get one-at-a-time sensitivity of projected net cash flow"""
+    try:
+        years = int(request.args.get('years', 3))
+        scenario = request.args.get('scenario', 'base')
+        tornado = finance.tornado_analysis(years=years, scenario=scenario)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(tornado)
+
+
 @app.route('/api/finance/budget', methods=['GET'])
+@cache.cached(finance)
 def get_budget():
     """Get budget data"""
     budget = finance._load_csv(finance.budget_file)
@@ -345,6 +463,7 @@ def get_budget():
 
 
 @app.route('/api/finance/actuals', methods=['GET'])
+@cache.cached(finance)
 def get_actuals():
     """Get actual spending"""
     actuals = finance._load_csv(finance.actuals_file)
@@ -352,6 +471,7 @@ def get_actuals():
 
 
 @app.route('/api/finance/variance', methods=['GET'])
+@cache.cached(finance)
 def get_variance_analysis():
     """Get budget variance analysis"""
     month = request.args.get('month')
@@ -367,6 +487,7 @@ def get_variance_analysis():
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/intel/competitors', methods=['GET'])
+@cache.cached(intel)
 def get_competitors():
     """Get competitor landscape"""
     landscape = intel.get_competitor_landscape()
@@ -374,19 +495,14 @@ def get_competitors():
 
 
 @app.route('/api/intel/manager-universe', methods=['GET'])
+@cache.cached(intel)
 def get_manager_universe():
-    """Get manager universe"""
-    universe = intel._load_csv(intel.manager_universe_file)
-
-    # Optionally filter by status
-    status = request.args.get('status')
-    if status:
-        universe = [m for m in universe if m['our_status'] == status]
-
-    return jsonify(universe)
+    """Get manager universe (filter/sort/paginate: see _list_response)"""
+    return _list_response(universe_table)
 
 
 @app.route('/api/intel/fee-benchmarks', methods=['GET'])
+@cache.cached(intel)
 def get_fee_benchmarks():
     """Get fee benchmarks"""
     fees = intel._load_csv(intel.fee_benchmarks_file)
@@ -394,6 +510,7 @@ def get_fee_benchmarks():
 
 
 @app.route('/api/intel/lp-overlap', methods=['GET'])
+@cache.cached(intel)
 def get_lp_overlap():
     """Get LP overlap analysis"""
     overlap = intel._load_csv(intel.lp_overlap_file)
@@ -405,23 +522,29 @@ def get_lp_overlap():
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/risk/dashboard', methods=['GET'])
+@cache.cached(risk, daily=True)
 def get_risk_dashboard():
-    """Get risk dashboard"""
+    """Get risk dashboard (computed time: the Last-Modified header)"""
     dashboard = risk.get_risk_dashboard()
+    dashboard.pop('timestamp', None)
     return jsonify(dashboard)
 
 
 @app.route('/api/risk/concentration', methods=['GET'])
+@cache.cached(risk, daily=True)   # look-through exposure uses as-of-today fund metrics
 def get_concentration_risk():
     """Get concentration risk analysis"""
-    concentration = risk.analyze_concentration_risk()
+    concentration = risk.check_concentration_risk()
     return jsonify(concentration)
 
 
 @app.route('/api/risk/liquidity', methods=['GET'])
+@cache.cached(risk, daily=True)   # trailing 12-month distribution pace
 def get_liquidity_risk():
-    """Get liquidity risk analysis"""
-    liquidity = risk.check_liquidity_risk()
+    """Get liquidity risk analysis and stress tests (?cash=...&facility=...)"""
+    cash = request.args.get('cash', type=float)
+    facility = request.args.get('facility', type=float)
+    liquidity = risk.check_liquidity_risk(cash_balance=cash, credit_facility=facility)
     return jsonify(liquidity)
 
 
@@ -430,107 +553,55 @@ def get_liquidity_risk():
 # ═══════════════════════════════════════════════════════
 
 @app.route('/api/portfolio-companies', methods=['GET'])
+@cache.cached(PORTFOLIO_COMPANIES_FILE)
 def get_portfolio_companies():
-    """Get all portfolio companies"""
-    from pathlib import Path
-    import csv
-
-    portfolio_companies_file = BASE_DIR / "data" / "portfolio_companies.csv"
-
-    if not portfolio_companies_file.exists():
-        return jsonify([])
-
-    companies = []
-    with open(portfolio_companies_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            companies.append(row)
-
-    # Optional filters
-    fund_id = request.args.get('fund_id')
-    sector = request.args.get('sector')
-    status = request.args.get('status')
-
-    if fund_id:
-        companies = [c for c in companies if c['fund_id'] == fund_id]
-    if sector:
-        companies = [c for c in companies if c['sector'] == sector]
-    if status:
-        companies = [c for c in companies if c['status'] == status]
-
-    return jsonify(companies)
+    """Get portfolio companies (filter/sort/paginate: see _list_response)"""
+    return _list_response(companies_table)
 
 
 @app.route('/api/portfolio-companies/<company_id>', methods=['GET'])
+@cache.cached(PORTFOLIO_COMPANIES_FILE)
 def get_portfolio_company_detail(company_id):
     """Get single portfolio company detail"""
-    from pathlib import Path
-    import csv
-
-    portfolio_companies_file = BASE_DIR / "data" / "portfolio_companies.csv"
-
-    if not portfolio_companies_file.exists():
+    if not PORTFOLIO_COMPANIES_FILE.exists():
         return jsonify({'error': 'Portfolio companies file not found'}), 404
 
-    with open(portfolio_companies_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row['company_id'] == company_id:
-                return jsonify(row)
+    company = companies_table.get(company_id)
+    if not company:
+        return jsonify({'error': 'Company not found'}), 404
 
-    return jsonify({'error': 'Company not found'}), 404
+    return jsonify(company)
 
 
 @app.route('/api/portfolio-companies/fund/<fund_id>', methods=['GET'])
+@cache.cached(PORTFOLIO_COMPANIES_FILE)
 def get_fund_portfolio_companies(fund_id):
     """Get all portfolio companies for a specific fund"""
-    from pathlib import Path
-    import csv
-
-    portfolio_companies_file = BASE_DIR / "data" / "portfolio_companies.csv"
-
-    if not portfolio_companies_file.exists():
-        return jsonify([])
-
-    companies = []
-    with open(portfolio_companies_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row['fund_id'] == fund_id:
-                companies.append(row)
-
+    companies = companies_table.query(where={'fund_id': fund_id})['items']
     return jsonify(companies)
 
 
 @app.route('/api/portfolio-companies/stats', methods=['GET'])
+@cache.cached(PORTFOLIO_COMPANIES_FILE)
 def get_portfolio_companies_stats():
     """Get portfolio companies statistics"""
-    from pathlib import Path
-    import csv
-    from collections import Counter
-
-    portfolio_companies_file = BASE_DIR / "data" / "portfolio_companies.csv"
-
-    if not portfolio_companies_file.exists():
+    if not PORTFOLIO_COMPANIES_FILE.exists():
         return jsonify({'error': 'Portfolio companies file not found'}), 404
 
-    companies = []
-    with open(portfolio_companies_file, 'r') as f:
-        reader = csv.DictReader(f)
-        companies = list(reader)
+    companies = companies_table.rows()
 
     # Calculate statistics
     total_companies = len(companies)
-    by_sector = Counter(c['sector'] for c in companies)
-    by_stage = Counter(c['stage'] for c in companies)
-    by_status = Counter(c['status'] for c in companies)
+    by_sector = companies_table.counts('sector')
+    by_stage = companies_table.counts('stage')
+    by_status = companies_table.counts('status')
 
     # Count exits
     exits = [c for c in companies if c['exit_date']]
     total_exit_value = sum(float(c['valuation_estimate']) for c in exits if c['valuation_estimate'])
 
     # Count by fund
-    by_fund = Counter(c['fund_id'] for c in companies)
+    by_fund = companies_table.counts('fund_id')
 
     return jsonify({
         'total_companies': total_companies,
@@ -558,6 +629,40 @@ def get_llm_models():
     })
 
 
+def _llm_response(fn, *args, **kwargs):
+    """
+    Run an LLM call on the bounded executor
+
+    Waits for the result, unless the client sent `Prefer: respond-async`:
+    then answers 202 with the job record and a Location to poll. When the
+    executor is full, answers 503 with Retry-After.
+    """
+    try:
+        job_id = llm_jobs.submit(fn, *args, **kwargs)
+    except LLMBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 503, {'Retry-After': '10'}
+
+    location = {'Location': url_for('get_llm_job', job_id=job_id)}
+    if 'respond-async' in request.headers.get('Prefer', ''):
+        return jsonify(llm_jobs.status(job_id)), 202, location
+
+    job = llm_jobs.wait(job_id, timeout=LLM_WAIT_SECONDS)
+    if job['status'] == 'failed':
+        return jsonify({'success': False, 'error': job['error']}), 500
+    if job['status'] != 'done':
+        return jsonify(job), 202, location
+    return jsonify(job['result'])
+
+
+@app.route('/api/llm/jobs/<job_id>', methods=['GET'])
+def get_llm_job(job_id):
+    """Get an LLM job's status and, once done, its result"""
+    job = llm_jobs.status(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+
 @app.route('/api/llm/chat', methods=['POST'])
 def llm_chat():
     """Chat with LLM model"""
@@ -569,8 +674,7 @@ def llm_chat():
     if not prompt:
         return jsonify({'success': False, 'error': 'Prompt is required'}), 400
 
-    result = llm.chat(prompt=prompt, model=model, context=context)
-    return jsonify(result)
+    return _llm_response(llm.chat, prompt=prompt, model=model, context=context)
 
 
 @app.route('/api/llm/analyze/investment', methods=['POST'])
@@ -584,8 +688,7 @@ def analyze_investment():
     if not company_name:
         return jsonify({'success': False, 'error': 'company_name is required'}), 400
 
-    result = llm.analyze_investment(company_name, company_data, model)
-    return jsonify(result)
+    return _llm_response(llm.analyze_investment, company_name, company_data, model)
 
 
 @app.route('/api/llm/analyze/manager', methods=['POST'])
@@ -599,8 +702,7 @@ def analyze_manager():
     if not manager_name:
         return jsonify({'success': False, 'error': 'manager_name is required'}), 400
 
-    result = llm.analyze_manager(manager_name, manager_data, model)
-    return jsonify(result)
+    return _llm_response(llm.analyze_manager, manager_name, manager_data, model)
 
 
 @app.route('/api/llm/generate/email', methods=['POST'])
@@ -612,8 +714,7 @@ def generate_email():
     context = data.get('context')
     model = data.get('model', 'phi4')
 
-    result = llm.generate_email(contact_data, email_type, context, model)
-    return jsonify(result)
+    return _llm_response(llm.generate_email, contact_data, email_type, context, model)
 
 
 @app.route('/api/llm/summarize/market', methods=['POST'])
@@ -623,8 +724,7 @@ def summarize_market():
     market_data = data.get('market_data', {})
     model = data.get('model', 'qwen2.5')
 
-    result = llm.summarize_market_data(market_data, model)
-    return jsonify(result)
+    return _llm_response(llm.summarize_market_data, market_data, model)
 
 
 @app.route('/api/llm/extract/insights', methods=['POST'])
@@ -638,8 +738,160 @@ def extract_insights():
     if not text:
         return jsonify({'success': False, 'error': 'text is required'}), 400
 
-    result = llm.extract_insights_from_text(text, task_type, model)
-    return jsonify(result)
+    return _llm_response(llm.extract_insights_from_text, text, task_type, model)
+
+
+# ═══════════════════════════════════════════════════════
+# BACKGROUND JOB ENDPOINTS
+# ═══════════════════════════════════════════════════════
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Submit a background job: {"kind": "board_deck", "params": {...}}"""
+    data = request.json or {}
+    try:
+        job, deduplicated = jobs.submit(data.get('kind'), data.get('params'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({**job, 'deduplicated': deduplicated}), 202, {
+        'Location': url_for('get_job', job_id=job['job_id'])
+    }
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """List recent jobs (?status=&kind=&limit=)"""
+    return jsonify(jobs.list(status=request.args.get('status'), kind=request.args.get('kind'),
+                             limit=min(request.args.get('limit', 50, type=int), 500)))
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get job status"""
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Get a finished job's result (202 while queued/running, 409 if failed/cancelled)"""
+    job = jobs.get(job_id, with_result=True)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] in ('queued', 'running'):
+        return jsonify(job), 202
+    if job['status'] != 'done':
+        return jsonify(job), 409
+    return jsonify(job['result'])
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = jobs.cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+
+# ═══════════════════════════════════════════════════════
+# METRICS
+# ═══════════════════════════════════════════════════════
+
+RESPONSE_CACHE_GAUGE = metrics.Gauge('newco_response_cache', 'API response cache state', ('stat',))
+LLM_JOBS_GAUGE = metrics.Gauge('newco_llm_jobs', 'LLM executor jobs in flight', ('state',))
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _record_request_time(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.HTTP_REQUESTS.labels(route, request.method, response.status_code).observe(
+            time.perf_counter() - start)
+    return response
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Timing metrics in the Prometheus text format (?format=json for JSON)"""
+    for stat, value in cache.stats().items():
+        RESPONSE_CACHE_GAUGE.labels(stat).set(value)
+    llm_stats = llm_jobs.stats()
+    for state in ('running', 'queued'):
+        LLM_JOBS_GAUGE.labels(state).set(llm_stats[state])
+
+    if request.args.get('format') == 'json':
+        return jsonify(metrics.snapshot())
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+# ═══════════════════════════════════════════════════════
+# PROFILING
+# ═══════════════════════════════════════════════════════
+
+# `X-Newco-Profile: 1|cprofile|sample` (or ?_profile=) profiles one request
+# into reports/profiles/; off unless enabled, rate-limited (see profiling.py)
+PROFILE_HEADER = 'X-Newco-Profile'
+
+
+@app.before_request
+def _start_profile():
+    requested = request.headers.get(PROFILE_HEADER) or request.args.get('_profile')
+    if not requested:
+        return
+    mode = requested.lower() if requested.lower() in profiling.MODES else 'cprofile'
+    token = request.headers.get(f'{PROFILE_HEADER}-Token') or request.args.get('_profile_token')
+    if not profiling.api_allowed(token):
+        profiling.PROFILES.labels('api', 'forbidden').inc()
+        g.profile_refused = 'not allowed'
+        return
+    route = request.url_rule.rule if request.url_rule else request.path
+    try:
+        g.profile = profiling.begin(f"api {request.method} {route}", mode, source='api')
+    except profiling.ProfileRefused as e:
+        g.profile_refused = str(e)
+
+
+PROFILE_ARGS = ('_profile', '_profile_token')
+
+
+def _profiled_path():
+    # Recorded in the profile, so never with the profiling token
+    args = [(key, value) for key, value in request.args.items(multi=True) if key not in PROFILE_ARGS]
+    return f"{request.path}?{urlencode(args)}" if args else request.path
+
+
+def _finish_profile(status):
+    session = g.pop('profile', None)
+    if session is not None:
+        return session.finish(meta={'Request': f"{request.method} {_profiled_path()}",
+                                    'Status': status})
+
+
+@app.after_request
+def _write_profile(response):
+    profile = _finish_profile(response.status_code)
+    if profile:
+        response.headers[f'{PROFILE_HEADER}-Id'] = profile['name']
+    refused = g.pop('profile_refused', None)
+    if refused:
+        response.headers[f'{PROFILE_HEADER}-Refused'] = refused
+    return response
+
+
+@app.teardown_request
+def _discard_profile(error=None):
+    # A request that failed before after_request still ends its profile
+    _finish_profile('error')
 
 
 # ═══════════════════════════════════════════════════════
@@ -664,10 +916,71 @@ def health_check():
             'llm': True
         },
         'llm_models': len(llm.AVAILABLE_MODELS),
-        'default_llm': llm.config.get('default_model', 'deepseek-r1')
+        'default_llm': llm.config.get('default_model', 'deepseek-r1'),
+        'llm_jobs': llm_jobs.stats()
     })
 
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness: 200 once warm-up finished, with per-subsystem timings"""
+    report = warmup.report()
+    return jsonify(report), 200 if report['ready'] else 503
+
+
+# ═══════════════════════════════════════════════════════
+# WARM-UP
+# ═══════════════════════════════════════════════════════
+
+# Dashboard endpoints rendered into the response cache after warm-up
+WARM_ENDPOINTS = [
+    '/api/portfolio/summary',
+    '/api/portfolio/funds',
+    '/api/risk/dashboard',
+    '/api/portfolio-companies/stats',
+    '/api/intel/manager-universe',
+    '/api/managers/pipeline',
+    '/api/team/workload',
+]
+
+
+def _warm_data_store():
+    return {name: table.warm(LIST_FILTERS) for name, table in (
+        ('portfolio_companies', companies_table), ('funds', funds_table),
+        ('managers', managers_table), ('manager_universe', universe_table))}
+
+
+def _warm_fund_metrics():
+    version, _, totals = portfolio.aggregates.snapshot()
+    return {'funds': len(portfolio.metrics_view.all()), 'aggregates_version': version,
+            'aggregated_funds': totals['count']}
+
+
+def _warm_overlap_network():
+    correlation = risk.analyze_correlation_risk()
+    exposure = risk.check_concentration_risk()['top_company_exposure']
+    return {'fund_pairs': correlation['tracked_correlations'], 'top_exposures': len(exposure)}
+
+
+def _warm_responses():
+    client = app.test_client()
+    return {endpoint: client.get(endpoint).status_code for endpoint in WARM_ENDPOINTS}
+
+
+warmup = Warmup({
+    'data_store': _warm_data_store,
+    'fund_metrics': _warm_fund_metrics,
+    'overlap_network': _warm_overlap_network,
+}, then={'responses': _warm_responses})
+
+# Runs in the background; /api/ready answers 503 until it finishes, so a load balancer
+# holds traffic off a cold worker (NEWCO_API_WARMUP=0 skips)
+if os.environ.get('NEWCO_API_WARMUP', '1') != '0':
+    warmup.start()
+else:
+    warmup.ready = True
+
+
 # ═══════════════════════════════════════════════════════
 # RUN SERVER
 # ═══════════════════════════════════════════════════════
@@ -676,4 +989,5 @@ if __name__ == '__main__':
     print("Starting NEWCO Platform API Server...")
     print("API available at: http://localhost:5001")
     print("Health check: http://localhost:5001/api/health")
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    print("Production: gunicorn -c gunicorn.conf.py server:app")
+    app.run(host='0.0.0.0', port=5001, debug=True, threaded=True)
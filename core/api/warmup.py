@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Warm-up - Preload Shared State Before the API Takes Traffic
+
+Engines build their shared state lazily (data store tables, fund metrics
+view, fund overlap network, ...), so the first request to each endpoint
+pays for CSV parsing and graph building. Warmup runs named tasks in
+parallel threads, then optional follow-up tasks (e.g. rendering hot
+responses into the response cache), and records each task's timing for
+the /api/ready endpoint. start() runs it in a background thread, so the
+server answers (cold) requests while /api/ready reports 503 until done.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class Warmup:
+    """Timed, parallel warm-up tasks with a readiness report"""
+
+    def __init__(self, tasks, then=None):
+        """
+        Args:
+            tasks: Name -> callable, run in parallel
+            then: Name -> callable, run in parallel after all `tasks`
+        """
+        self.phases = [dict(tasks), dict(then or {})]
+        self.ready = False
+        self._lock = threading.Lock()
+        self._results = {}
+        self._started = None
+        self._seconds = None
+
+    def start(self):
+        """Run every phase in a background thread; returns self"""
+        threading.Thread(target=self.run, name='warmup', daemon=True).start()
+        return self
+
+    def run(self):
+        """Run every phase; returns the report"""
+        self._started = datetime.now()
+        start = time.perf_counter()
+        for tasks in self.phases:
+            if tasks:
+                with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix='warmup') as pool:
+                    list(pool.map(lambda item: self._run_task(*item), tasks.items()))
+        self._seconds = time.perf_counter() - start
+        self.ready = True
+        return self.report()
+
+    def report(self):
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'started_at': self._started.isoformat(timespec='seconds') if self._started else None,
+                'seconds': round(self._seconds, 3) if self._seconds is not None else None,
+                'subsystems': {name: dict(result) for name, result in self._results.items()}
+            }
+
+    def _run_task(self, name, task):
+        with self._lock:
+            self._results[name] = {'status': 'running'}
+        start = time.perf_counter()
+        try:
+            detail = task()
+            result = {'status': 'ok'}
+            if detail is not None:
+                result['detail'] = detail
+        except Exception as e:
+            # The subsystem stays cold and loads on first use instead
+            result = {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        with self._lock:
+            self._results[name] = result
@@ -9,16 +9,27 @@ from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 import json
 
+from interaction_cube import get_cube
+from success_model import MEETING, STATUS_STAGES, get_model
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
+OUTREACH_STATUSES = ['Warm Intro Requested', 'Warm Intro Received', 'Initial Outreach Sent']
+ACTIVE_STATUSES = ['Active Conversation', 'Meeting Scheduled', 'Meeting Completed']
+MEETING_STATUSES = ['Meeting Scheduled', 'Meeting Completed']
+
 
+@instrumented
 class AnalyticsEngine:
     """Advanced analytics and insights"""
 
     def __init__(self):
         self.contacts_file = DATA_DIR / "contacts.csv"
         self.interactions_file = DATA_DIR / "interactions.csv"
+        self.cube = get_cube(self.contacts_file, self.interactions_file)
+        self.model = get_model(self.contacts_file, self.interactions_file)
 
     def load_contacts(self):
         """Load all contacts"""
@@ -40,19 +51,15 @@ class AnalyticsEngine:
 
     def calculate_response_rate(self):
         """Calculate email response rate"""
-        interactions = self.load_interactions()
-
-        emails_sent = [i for i in interactions if i['type'] == 'email_sent']
-        emails_received = [i for i in interactions if i['type'] == 'email_received']
-
-        # Group by contact to find responses
-        contact_emails = defaultdict(lambda: {'sent': 0, 'received': 0})
-
-        for interaction in emails_sent:
-            contact_emails[interaction['contact_id']]['sent'] += 1
-
-        for interaction in emails_received:
-            contact_emails[interaction['contact_id']]['received'] += 1
+        activity = self.cube.contact_activity()
+
+        # Contacts we emailed or heard from, with per-contact counts
+        contact_emails = {
+            contact_id: {'sent': stats['types']['email_sent'],
+                         'received': stats['types']['email_received']}
+            for contact_id, stats in activity.items()
+            if stats['types']['email_sent'] or stats['types']['email_received']
+        }
 
         # Calculate response rate
         total_sent = sum(c['sent'] for c in contact_emails.values())
@@ -69,35 +76,19 @@ class AnalyticsEngine:
 
     def calculate_conversion_funnel(self):
         """Calculate full conversion funnel metrics"""
-        contacts = self.load_contacts()
+        status_counts = self.cube.contact_counts(by=('status',))
 
         funnel = {
-            'total': len(contacts),
-            'cold': 0,
-            'outreach_sent': 0,
+            'total': sum(status_counts.values()),
+            'cold': status_counts['Cold'],
+            'outreach_sent': sum(status_counts[s] for s in OUTREACH_STATUSES),
             'responded': 0,
-            'meeting_scheduled': 0,
-            'meeting_completed': 0,
-            'active_conversation': 0,
-            'committed': 0
+            'meeting_scheduled': status_counts['Meeting Scheduled'],
+            'meeting_completed': status_counts['Meeting Completed'],
+            'active_conversation': status_counts['Active Conversation'],
+            'committed': status_counts['Committed/Closed']
         }
 
-        for contact in contacts:
-            status = contact['status']
-
-            if status == 'Cold':
-                funnel['cold'] += 1
-            elif status in ['Warm Intro Requested', 'Warm Intro Received', 'Initial Outreach Sent']:
-                funnel['outreach_sent'] += 1
-            elif status == 'Meeting Scheduled':
-                funnel['meeting_scheduled'] += 1
-            elif status == 'Meeting Completed':
-                funnel['meeting_completed'] += 1
-            elif status == 'Active Conversation':
-                funnel['active_conversation'] += 1
-            elif status == 'Committed/Closed':
-                funnel['committed'] += 1
-
         # Calculate conversion rates
         if funnel['total'] > 0:
             funnel['outreach_rate'] = (funnel['outreach_sent'] / funnel['total']) * 100
@@ -106,102 +97,67 @@ class AnalyticsEngine:
 
         return funnel
 
-    def analyze_by_tier(self):
-        """Analyze performance by tier"""
-        contacts = self.load_contacts()
-        interactions = self.load_interactions()
-
-        tier_stats = defaultdict(lambda: {
+    def _stats_by(self, dimension):
+        """Pipeline stage counts per tier or category"""
+        stats = defaultdict(lambda: {
             'total': 0,
             'cold': 0,
             'active': 0,
             'meetings': 0,
-            'committed': 0,
-            'interactions': 0
+            'committed': 0
         })
 
-        # Count contacts by tier
-        for contact in contacts:
-            tier = contact['tier']
-            tier_stats[tier]['total'] += 1
+        for (group, status), n in self.cube.contact_counts(by=(dimension, 'status')).items():
+            stats[group]['total'] += n
+
+            if status == 'Cold':
+                stats[group]['cold'] += n
+            elif status in ACTIVE_STATUSES:
+                stats[group]['active'] += n
+            elif status == 'Committed/Closed':
+                stats[group]['committed'] += n
 
-            if contact['status'] == 'Cold':
-                tier_stats[tier]['cold'] += 1
-            elif contact['status'] in ['Active Conversation', 'Meeting Scheduled', 'Meeting Completed']:
-                tier_stats[tier]['active'] += 1
-            elif contact['status'] == 'Committed/Closed':
-                tier_stats[tier]['committed'] += 1
+            if status in MEETING_STATUSES:
+                stats[group]['meetings'] += n
 
-            if contact['status'] in ['Meeting Scheduled', 'Meeting Completed']:
-                tier_stats[tier]['meetings'] += 1
+        return stats
+
+    def analyze_by_tier(self):
+        """Analyze performance by tier"""
+        tier_stats = self._stats_by('tier')
 
         # Count interactions by tier
-        for interaction in interactions:
-            contact_id = interaction['contact_id']
-            contact = next((c for c in contacts if c['id'] == contact_id), None)
-            if contact:
-                tier_stats[contact['tier']]['interactions'] += 1
+        interactions = self.cube.interaction_counts(by=('tier',))
+        for tier, stats in tier_stats.items():
+            stats['interactions'] = interactions[tier]
 
         return dict(tier_stats)
 
     def analyze_by_category(self):
         """Analyze performance by category"""
-        contacts = self.load_contacts()
-
-        category_stats = defaultdict(lambda: {
-            'total': 0,
-            'cold': 0,
-            'active': 0,
-            'meetings': 0,
-            'committed': 0
-        })
-
-        for contact in contacts:
-            cat = contact['category']
-            category_stats[cat]['total'] += 1
-
-            if contact['status'] == 'Cold':
-                category_stats[cat]['cold'] += 1
-            elif contact['status'] in ['Active Conversation', 'Meeting Scheduled', 'Meeting Completed']:
-                category_stats[cat]['active'] += 1
-            elif contact['status'] == 'Committed/Closed':
-                category_stats[cat]['committed'] += 1
-
-            if contact['status'] in ['Meeting Scheduled', 'Meeting Completed']:
-                category_stats[cat]['meetings'] += 1
-
-        return dict(category_stats)
+        return dict(self._stats_by('category'))
 
     def calculate_velocity_metrics(self):
         """Calculate velocity (how fast contacts move through pipeline)"""
-        contacts = self.load_contacts()
-        interactions = self.load_interactions()
-
-        # Group interactions by contact
-        contact_interactions = defaultdict(list)
-        for interaction in interactions:
-            contact_interactions[interaction['contact_id']].append(interaction)
-
+        activity = self.cube.contact_activity()
         velocities = []
 
-        for contact in contacts:
+        for contact in self.cube.contacts():
             contact_id = contact['id']
-            if contact_id in contact_interactions:
-                ints = sorted(contact_interactions[contact_id],
-                            key=lambda x: x['date'])
-
-                if len(ints) >= 2:
-                    first = datetime.strptime(ints[0]['date'].split()[0], '%Y-%m-%d')
-                    last = datetime.strptime(ints[-1]['date'].split()[0], '%Y-%m-%d')
-                    days = (last - first).days
-
-                    velocities.append({
-                        'contact_id': contact_id,
-                        'contact_name': contact['name'],
-                        'days': days,
-                        'interactions': len(ints),
-                        'status': contact['status']
-                    })
+            stats = activity.get(contact_id)
+
+            if stats and stats['count'] >= 2 and stats['first']:
+                first = datetime.strptime(stats['first'].split()[0], '%Y-%m-%d')
+                last = datetime.strptime(stats['last'].split()[0], '%Y-%m-%d')
+                days = (last - first).days
+
+                velocities.append({
+                    'contact_id': contact_id,
+                    'contact_name': contact['name'],
+                    'days': days,
+                    'interactions': stats['count'],
+                    'status': contact['status']
+                })
 
         if velocities:
             avg_days = sum(v['days'] for v in velocities) / len(velocities)
@@ -218,31 +174,20 @@ class AnalyticsEngine:
 
     def identify_stalled_contacts(self, days_threshold=14):
         """Identify contacts that have stalled"""
-        contacts = self.load_contacts()
-        interactions = self.load_interactions()
-
-        # Get last interaction date for each contact
-        contact_last_interaction = {}
-        for interaction in interactions:
-            contact_id = interaction['contact_id']
-            try:
-                date = datetime.strptime(interaction['date'].split()[0], '%Y-%m-%d')
-                if contact_id not in contact_last_interaction or date > contact_last_interaction[contact_id]:
-                    contact_last_interaction[contact_id] = date
-            except:
-                pass
+        activity = self.cube.contact_activity()
 
         stalled = []
         today = datetime.now()
 
-        for contact in contacts:
+        for contact in self.cube.contacts():
             # Skip if already closed or not interested
             if contact['status'] in ['Committed/Closed', 'Not Interested', 'Cold']:
                 continue
 
             contact_id = contact['id']
-            if contact_id in contact_last_interaction:
-                last_date = contact_last_interaction[contact_id]
+            stats = activity.get(contact_id)
+            if stats and stats['last']:
+                last_date = datetime.strptime(stats['last'].split()[0], '%Y-%m-%d')
                 days_since = (today - last_date).days
 
                 if days_since >= days_threshold:
@@ -258,48 +203,12 @@ class AnalyticsEngine:
         return sorted(stalled, key=lambda x: x['days_since_last_interaction'], reverse=True)
 
     def calculate_success_probability(self, contact):
-        """Calculate probability of success for a contact"""
-        score = 50  # Base probability
-
-        # Tier influence
-        tier_scores = {0: 30, 1: 25, 2: 20, 3: 15, 4: 10}
-        score += tier_scores.get(int(contact.get('tier', 4)), 10)
-
-        # Status influence
-        status_scores = {
-            'Active Conversation': 25,
-            'Meeting Completed': 20,
-            'Meeting Scheduled': 15,
-            'Warm Intro Received': 12,
-            'Initial Outreach Sent': 8,
-            'Warm Intro Requested': 6,
-            'Cold': 0
-        }
-        score += status_scores.get(contact['status'], 0)
-
-        # Recency influence
-        if contact['last_contact']:
-            try:
-                last_contact = datetime.strptime(contact['last_contact'], '%Y-%m-%d')
-                days_since = (datetime.now() - last_contact).days
-
-                if days_since <= 7:
-                    score += 15
-                elif days_since <= 14:
-                    score += 10
-                elif days_since <= 30:
-                    score += 5
-                else:
-                    score -= 5  # Penalty for stale
-            except:
-                pass
-
-        return min(score, 100)  # Cap at 100
+        """Calculate probability of success for a contact (0-100)"""
+        return int(round(self.model.predict([contact])[0] * 100))
 
     def predict_week_12_outcomes(self):
         """Predict outcomes by week 12 based on current trajectory"""
-        contacts = self.load_contacts()
-        interactions = self.load_interactions()
+        contacts = self.cube.contacts()
 
         predictions = {
             'total_meetings_projected': 0,
@@ -308,17 +217,22 @@ class AnalyticsEngine:
             'at_risk_contacts': []
         }
 
-        for contact in contacts:
-            if contact['status'] in ['Committed/Closed', 'Not Interested']:
-                continue
+        contacts = [c for c in contacts if c['status'] not in ['Committed/Closed', 'Not Interested']]
+        probabilities = self.model.predict(contacts)
+        commit_rate = self.model.ensure_fitted()['commit_rate']
+        expected_commits = 0.0
 
-            prob = self.calculate_success_probability(contact)
+        for contact, p in zip(contacts, probabilities):
+            prob = int(round(p * 100))
 
             if contact['status'] in ['Meeting Scheduled', 'Meeting Completed']:
                 predictions['total_meetings_projected'] += 1
 
+            # Success at the meeting stage commits at the historical rate
+            if STATUS_STAGES.get(contact['status'], 0) == MEETING:
+                expected_commits += p * commit_rate
+
             if prob >= 70:
-                predictions['total_commits_projected'] += 1
                 predictions['high_probability_contacts'].append({
                     'name': contact['name'],
                     'company': contact['company'],
@@ -332,6 +246,7 @@ class AnalyticsEngine:
                     'status': contact['status']
                 })
 
+        predictions['total_commits_projected'] = int(round(expected_commits))
         return predictions
 
     def generate_insights(self):
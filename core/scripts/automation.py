@@ -7,18 +7,40 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import yaml
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 CONFIG_DIR = BASE_DIR / "config"
 
 
+@instrumented
 class AutomationEngine:
     """Automate workflows and task generation"""
 
-    def __init__(self):
+    def __init__(self, cached=False):
+        """
+        Args:
+            cached: Read contacts from the shared interaction cube instead of
+                the CSV (for long-lived processes such as the CLI daemon)
+        """
         self.contacts_file = DATA_DIR / "contacts.csv"
+        self.interactions_file = DATA_DIR / "interactions.csv"
+        self.cached = cached
         self.config = self.load_config()
 
+    @property
+    def model(self):
+        """Shared success model (imported and built on first use)"""
+        from success_model import get_model
+        return get_model(self.contacts_file, self.interactions_file)
+
+    @property
+    def priorities(self):
+        """Shared priority maintainer (imported on first use)"""
+        from priority_maintainer import get_maintainer
+        return get_maintainer(self.contacts_file, self.interactions_file)
+
     def load_config(self):
         """Load configuration"""
         config_file = CONFIG_DIR / "config.yaml"
@@ -29,6 +51,9 @@ class AutomationEngine:
 
     def load_contacts(self):
         """Load all contacts"""
+        if self.cached:
+            from interaction_cube import get_cube
+            return [dict(contact) for contact in get_cube(self.contacts_file, self.interactions_file).contacts()]
         contacts = []
         if self.contacts_file.exists():
             with open(self.contacts_file, 'r') as f:
@@ -196,58 +221,20 @@ class AutomationEngine:
         return None
 
     def calculate_priority_score(self, contact):
-        """Calculate priority score for a contact"""
-        score = 50  # Base score
-
-        # Tier weight (40 points max)
-        tier = int(contact.get('tier', 4))
-        tier_score = {0: 40, 1: 35, 2: 30, 3: 25, 4: 20}
-        score += tier_score.get(tier, 20)
-
-        # Recency weight (30 points max)
-        if contact['last_contact']:
-            try:
-                last_contact = datetime.strptime(contact['last_contact'], '%Y-%m-%d')
-                days_since = (datetime.now() - last_contact).days
-                if days_since <= 7:
-                    score += 30
-                elif days_since <= 14:
-                    score += 20
-                elif days_since <= 30:
-                    score += 10
-            except ValueError:
-                pass
-
-        # Status weight
-        status_scores = {
-            'Active Conversation': 20,
-            'Meeting Scheduled': 18,
-            'Meeting Completed': 15,
-            'Warm Intro Received': 12,
-            'Initial Outreach Sent': 10,
-            'Warm Intro Requested': 8,
-            'Cold': 5
-        }
-        score += status_scores.get(contact['status'], 5)
-
-        return min(score, 100)  # Cap at 100
-
-    def recalculate_priorities(self):
-        """Recalculate priority scores for all contacts"""
-        contacts = self.load_contacts()
-
-        for contact in contacts:
-            contact['priority_score'] = str(self.calculate_priority_score(contact))
-
-        # Save updated contacts
-        if contacts:
-            fieldnames = contacts[0].keys()
-            with open(self.contacts_file, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(contacts)
-
-        print(f"✓ Recalculated priorities for {len(contacts)} contacts")
+        """Calculate priority score for a contact (success probability, 0-100)"""
+        return int(round(self.model.predict([contact])[0] * 100))
+
+    def recalculate_priorities(self, full=False):
+        """
+        Bring priority scores up to date
+
+        Only contacts whose recency bucket changed since the last run are
+        rescored (activity and status changes are scored as they happen);
+        full=True rescores everyone.
+        """
+        result = self.priorities.refresh(full=full)
+        print(f"✓ Rescored {result['rescored']} contacts, "
+              f"updated {result['written']} priority scores")
 
     def generate_weekly_tasks(self, week_number):
         """Generate tasks for a specific week based on 90-day plan"""
@@ -20,12 +20,14 @@ from portfolio_management import PortfolioManager
 from manager_crm import ManagerCRM
 from risk_management import RiskManager
 from public_markets import PublicMarketsEngine
+from metrics import instrumented
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 REPORTS_DIR = BASE_DIR / "reports" / "board"
 
 
+@instrumented
 class BoardReportGenerator:
     """Generate automated board meeting materials"""
 
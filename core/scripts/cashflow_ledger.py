@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Cash Flow Ledger - Dated Fund Cash Flows & Performance Analytics
+
+Builds a per-fund ledger of dated cash flows from capital calls,
+distributions and NAVs, and computes timing-aware performance:
+- XIRR: batched Newton solver across all funds at once, with a vectorized
+  bisection fallback for funds where Newton doesn't converge
+- Pooled portfolio IRR from the combined flows of every fund
+- KS-PME (Kaplan-Schoar public market equivalent) and PME IRR
+- Time-weighted return, chain-linked between NAV marks (Modified Dietz)
+
+Sign convention (LP perspective): capital calls are negative, distributions
+and the terminal NAV are positive.
+"""
+
+import csv
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+
+import numpy as np
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+
+DAYS_PER_YEAR = 365.0
+RATE_FLOOR = -0.9999          # IRR can't go below -100%
+RATE_CEILING = 100.0          # 10,000% - bracket upper bound
+
+
+def _parse_date(value):
+    """Parse a YYYY-MM-DD string, returning None for blanks/bad values"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def _npv(rates, group, years, amounts, n_groups):
+    """Per-group NPV and its derivative for per-group rates"""
+    base = 1.0 + rates[group]
+    discount = base ** (-years)
+    npv = np.bincount(group, weights=amounts * discount, minlength=n_groups)
+    dnpv = np.bincount(group, weights=-years * amounts * discount / base, minlength=n_groups)
+    return npv, dnpv
+
+
+def xirr_batch(group, years, amounts, n_groups, guess=0.1, tol=1e-9, max_iter=50):
+    """
+    Solve XIRR for many cash-flow series at once
+
+    Args:
+        group: int array - series index of each flow
+        years: float array - time of each flow in years from its series start
+        amounts: float array - signed flow amounts
+        n_groups: number of series
+        guess: Newton starting rate
+        tol: convergence tolerance on the rate
+        max_iter: Newton iterations before falling back to bisection
+
+    Returns:
+        float array of annual IRRs (decimal), NaN where undefined (no sign
+        change in the flows, or no root in [-99.99%, 10,000%])
+    """
+    group = np.asarray(group, dtype=np.int64)
+    years = np.asarray(years, dtype=np.float64)
+    amounts = np.asarray(amounts, dtype=np.float64)
+
+    # IRR only exists with both inflows and outflows
+    has_pos = np.bincount(group, weights=(amounts > 0), minlength=n_groups) > 0
+    has_neg = np.bincount(group, weights=(amounts < 0), minlength=n_groups) > 0
+    solvable = has_pos & has_neg
+
+    rates = np.full(n_groups, guess, dtype=np.float64)
+    converged = ~solvable
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for _ in range(max_iter):
+            npv, dnpv = _npv(rates, group, years, amounts, n_groups)
+            step = np.where(dnpv != 0, npv / dnpv, np.nan)
+            active = ~converged & np.isfinite(step)
+            # Damped step: never jump more than halfway to the -100% floor
+            proposed = np.clip(rates - step, (rates + RATE_FLOOR) / 2, RATE_CEILING)
+            rates = np.where(active, proposed, rates)
+            converged |= active & (np.abs(step) < tol)
+            if converged.all():
+                break
+
+        # Verify Newton results; anything else goes to bisection
+        npv, _ = _npv(rates, group, years, amounts, n_groups)
+        scale = np.bincount(group, weights=np.abs(amounts), minlength=n_groups)
+        good = solvable & converged & np.isfinite(rates) & (rates > RATE_FLOOR) & \
+            (np.abs(npv) <= 1e-6 * np.maximum(scale, 1.0))
+
+        result = np.where(good, rates, np.nan)
+        pending = solvable & ~good
+
+        if pending.any():
+            lo = np.full(n_groups, RATE_FLOOR)
+            hi = np.full(n_groups, RATE_CEILING)
+            npv_lo, _ = _npv(lo, group, years, amounts, n_groups)
+            npv_hi, _ = _npv(hi, group, years, amounts, n_groups)
+            bracketed = pending & np.isfinite(npv_lo) & np.isfinite(npv_hi) & \
+                (np.sign(npv_lo) != np.sign(npv_hi))
+
+            for _ in range(200):
+                mid = (lo + hi) / 2
+                npv_mid, _ = _npv(mid, group, years, amounts, n_groups)
+                same_as_lo = np.sign(npv_mid) == np.sign(npv_lo)
+                lo = np.where(bracketed & same_as_lo, mid, lo)
+                npv_lo = np.where(bracketed & same_as_lo, npv_mid, npv_lo)
+                hi = np.where(bracketed & ~same_as_lo, mid, hi)
+                if np.all(np.abs(hi - lo)[bracketed] < tol):
+                    break
+
+            result = np.where(bracketed, (lo + hi) / 2, result)
+
+    return result
+
+
+def xirr(dates, amounts):
+    """XIRR of a single dated cash-flow series (decimal, NaN if undefined)"""
+    if not dates:
+        return float('nan')
+    start = min(dates)
+    years = [(d - start).days / DAYS_PER_YEAR for d in dates]
+    return float(xirr_batch(np.zeros(len(dates), dtype=np.int64), years, amounts, 1)[0])
+
+
+class BenchmarkIndex:
+    """
+    Public market index levels for PME calculations
+
+    Reads a date,close CSV when available (e.g. data/benchmark_index.csv);
+    otherwise compounds a constant annual rate so PME falls back to a
+    hurdle-rate comparison.
+    """
+
+    def __init__(self, path=None, annual_rate=0.10):
+        self.annual_rate = annual_rate
+        self.ordinals = None
+        self.levels = None
+
+        path = Path(path) if path else DATA_DIR / "benchmark_index.csv"
+        if path.exists():
+            points = []
+            with open(path, 'r') as f:
+                for row in csv.DictReader(f):
+                    date = _parse_date(row.get('date'))
+                    if date and row.get('close'):
+                        points.append((date.toordinal(), float(row['close'])))
+            if points:
+                points.sort()
+                self.ordinals = np.array([p[0] for p in points], dtype=np.float64)
+                self.levels = np.array([p[1] for p in points], dtype=np.float64)
+
+    def levels_at(self, ordinals):
+        """Index level at each date ordinal (linear interpolation, flat beyond range)"""
+        ordinals = np.asarray(ordinals, dtype=np.float64)
+        if self.levels is not None:
+            return np.interp(ordinals, self.ordinals, self.levels)
+        return (1.0 + self.annual_rate) ** (ordinals / DAYS_PER_YEAR)
+
+
+class CashFlowLedger:
+    """Dated cash flows for every fund, stored as flat NumPy arrays"""
+
+    def __init__(self, fund_ids, fund_idx, ordinals, amounts, kinds, nav_marks, as_of, dated=None):
+        """
+        Args:
+            fund_ids: list of fund ids (index position = group number)
+            fund_idx: int array - fund index of each flow
+            ordinals: int array - date ordinal of each flow
+            amounts: float array - signed amounts (calls < 0, dists > 0)
+            kinds: array of 'call' / 'dist'
+            nav_marks: {fund_id: [(ordinal, nav_value), ...]} sorted by date
+            as_of: valuation datetime
+            dated: bool array - False for flows with no date of their own
+                (placed at as_of); default all True
+        """
+        self.fund_ids = list(fund_ids)
+        self.index = {fund_id: i for i, fund_id in enumerate(self.fund_ids)}
+        self.fund_idx = fund_idx
+        self.ordinals = ordinals
+        self.amounts = amounts
+        self.kinds = kinds
+        self.nav_marks = nav_marks
+        self.as_of = as_of
+        self.dated = np.ones(len(amounts), dtype=bool) if dated is None else dated
+
+        n = len(self.fund_ids)
+        is_call = kinds == 'call'
+        self.paid_in = np.bincount(fund_idx, weights=np.where(is_call, -amounts, 0.0), minlength=n)
+        self.distributions = np.bincount(fund_idx, weights=np.where(is_call, 0.0, amounts), minlength=n)
+
+        # Terminal value: latest NAV mark, else cost basis (paid in) as of today
+        self.nav = np.zeros(n)
+        self.nav_ordinal = np.full(n, as_of.toordinal(), dtype=np.int64)
+        for fund_id, marks in nav_marks.items():
+            i = self.index.get(fund_id)
+            if i is not None and marks:
+                self.nav_ordinal[i], self.nav[i] = marks[-1]
+        has_nav = np.array([bool(nav_marks.get(fund_id)) for fund_id in self.fund_ids], dtype=bool)
+        self.nav = np.where(has_nav, self.nav, self.paid_in)
+        self.has_nav = has_nav
+
+    @classmethod
+    def from_records(cls, funds, calls, distributions, navs, as_of=None):
+        """
+        Build a ledger from CSV rows
+
+        Only paid capital calls count toward paid-in capital; a call is
+        dated by paid_date, falling back to due_date then call_date. Calls
+        and distributions without a usable date still count toward the
+        totals (dated as_of) but are left out of the IRR cash flows.
+        """
+        as_of = as_of or datetime.now()
+        fund_ids = [f['fund_id'] for f in funds]
+        index = {fund_id: i for i, fund_id in enumerate(fund_ids)}
+
+        fund_idx, ordinals, amounts, kinds, dated = [], [], [], [], []
+
+        for call in calls:
+            i = index.get(call.get('fund_id'))
+            if i is None or call.get('status') != 'Paid':
+                continue
+            date = (_parse_date(call.get('paid_date')) or _parse_date(call.get('due_date'))
+                    or _parse_date(call.get('call_date')))
+            fund_idx.append(i)
+            ordinals.append((date or as_of).toordinal())
+            amounts.append(-float(call['amount']))
+            kinds.append('call')
+            dated.append(date is not None)
+
+        for dist in distributions:
+            i = index.get(dist.get('fund_id'))
+            if i is None:
+                continue
+            date = _parse_date(dist.get('dist_date'))
+            fund_idx.append(i)
+            ordinals.append((date or as_of).toordinal())
+            amounts.append(float(dist['amount']))
+            kinds.append('dist')
+            dated.append(date is not None)
+
+        nav_marks = defaultdict(list)
+        for nav in navs:
+            date = _parse_date(nav.get('nav_date'))
+            if nav.get('fund_id') in index and date is not None:
+                nav_marks[nav['fund_id']].append((date.toordinal(), float(nav['nav_value'])))
+        for marks in nav_marks.values():
+            marks.sort()
+
+        return cls(
+            fund_ids,
+            np.array(fund_idx, dtype=np.int64),
+            np.array(ordinals, dtype=np.int64),
+            np.array(amounts, dtype=np.float64),
+            np.array(kinds, dtype=object),
+            dict(nav_marks),
+            as_of,
+            np.array(dated, dtype=bool)
+        )
+
+    # ------------------------------------------------------------------
+    # Flow assembly
+    # ------------------------------------------------------------------
+
+    def _flows_with_terminal(self, terminal=None):
+        """Dated flows plus one terminal value per fund, dated at its NAV date"""
+        n = len(self.fund_ids)
+        terminal = self.nav if terminal is None else terminal
+        group = np.concatenate([self.fund_idx[self.dated], np.arange(n)])
+        ordinals = np.concatenate([self.ordinals[self.dated], self.nav_ordinal])
+        amounts = np.concatenate([self.amounts[self.dated], terminal])
+        return group, ordinals, amounts
+
+    @staticmethod
+    def _years_from_start(group, ordinals, n_groups):
+        start = np.full(n_groups, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(start, group, ordinals)
+        return (ordinals - start[group]) / DAYS_PER_YEAR
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def fund_irrs(self):
+        """XIRR per fund (decimal array aligned with fund_ids, NaN if undefined)"""
+        n = len(self.fund_ids)
+        if n == 0:
+            return np.zeros(0)
+        group, ordinals, amounts = self._flows_with_terminal()
+        years = self._years_from_start(group, ordinals, n)
+        return xirr_batch(group, years, amounts, n)
+
+    def pooled_irr(self, fund_ids=None):
+        """IRR of the combined flows of the given funds (default: all)"""
+        group, ordinals, amounts = self._flows_with_terminal()
+        if fund_ids is not None:
+            wanted = np.isin(group, [self.index[f] for f in fund_ids if f in self.index])
+            ordinals, amounts = ordinals[wanted], amounts[wanted]
+        if len(amounts) == 0:
+            return float('nan')
+        years = (ordinals - ordinals.min()) / DAYS_PER_YEAR
+        return float(xirr_batch(np.zeros(len(amounts), dtype=np.int64), years, amounts, 1)[0])
+
+    def ks_pme(self, benchmark=None):
+        """
+        Kaplan-Schoar PME per fund and for the pooled portfolio
+
+        KS-PME = (sum of index-adjusted distributions + NAV) /
+                 sum of index-adjusted contributions
+        > 1.0 means the fund beat the benchmark.
+
+        Returns:
+            (per-fund array, pooled float) - NaN where nothing was paid in
+        """
+        benchmark = benchmark or BenchmarkIndex()
+        n = len(self.fund_ids)
+        # Future-value every flow to its fund's valuation date
+        growth = benchmark.levels_at(self.nav_ordinal[self.fund_idx]) / benchmark.levels_at(self.ordinals)
+        is_call = self.kinds == 'call'
+
+        fv_calls = np.bincount(self.fund_idx, weights=np.where(is_call, -self.amounts * growth, 0.0),
+                               minlength=n)
+        fv_dists = np.bincount(self.fund_idx, weights=np.where(is_call, 0.0, self.amounts * growth),
+                               minlength=n)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_fund = np.where(fv_calls > 0, (fv_dists + self.nav) / fv_calls, np.nan)
+
+        # Pooled: bring every fund's value to the latest valuation date
+        if n:
+            latest = self.nav_ordinal.max()
+            to_latest = benchmark.levels_at(latest) / benchmark.levels_at(self.nav_ordinal)
+            total_calls = float((fv_calls * to_latest).sum())
+            total_value = float(((fv_dists + self.nav) * to_latest).sum())
+            pooled = total_value / total_calls if total_calls > 0 else float('nan')
+        else:
+            pooled = float('nan')
+
+        return per_fund, pooled
+
+    def pme_irrs(self, benchmark=None):
+        """
+        Long-Nickels PME IRR per fund: the IRR of investing the same calls
+        and distributions in the benchmark index (NAV replaced by the index
+        equivalent). Compare with fund_irrs() for the excess return.
+        """
+        benchmark = benchmark or BenchmarkIndex()
+        n = len(self.fund_ids)
+        if n == 0:
+            return np.zeros(0)
+        growth = benchmark.levels_at(self.nav_ordinal[self.fund_idx]) / benchmark.levels_at(self.ordinals)
+        # Index-equivalent NAV: calls compounded minus distributions compounded
+        # (dated flows only, matching the IRR cash flows)
+        pme_nav = np.bincount(self.fund_idx, weights=np.where(self.dated, -self.amounts * growth, 0.0),
+                              minlength=n)
+        pme_nav = np.maximum(pme_nav, 0.0)
+        group, ordinals, amounts = self._flows_with_terminal(pme_nav)
+        years = self._years_from_start(group, ordinals, n)
+        return xirr_batch(group, years, amounts, n)
+
+    def time_weighted_returns(self):
+        """
+        Annualized time-weighted return per fund (decimal, NaN if < 1 NAV mark)
+
+        Sub-period returns between consecutive NAV marks use Modified Dietz,
+        weighting each flow by the time it was invested; the first period
+        starts at the fund's first cash flow with zero value.
+        """
+        results = np.full(len(self.fund_ids), np.nan)
+        order = np.lexsort((self.ordinals, self.fund_idx))
+        flows_by_fund = defaultdict(list)
+        for k in order:
+            flows_by_fund[int(self.fund_idx[k])].append((int(self.ordinals[k]), -float(self.amounts[k])))
+
+        for i, fund_id in enumerate(self.fund_ids):
+            marks = self.nav_marks.get(fund_id)
+            flows = flows_by_fund.get(i, [])
+            if not marks or not flows:
+                continue
+
+            start_ord = min(flows[0][0], marks[0][0])
+            start_value = 0.0
+            growth = 1.0
+            cursor = 0
+
+            for mark_ord, mark_value in marks:
+                period = mark_ord - start_ord
+                net = 0.0
+                weighted = 0.0
+                while cursor < len(flows) and flows[cursor][0] <= mark_ord:
+                    flow_ord, contribution = flows[cursor]
+                    net += contribution
+                    if period > 0:
+                        weighted += contribution * (mark_ord - flow_ord) / period
+                    cursor += 1
+
+                denominator = start_value + (weighted if period > 0 else net)
+                if denominator > 0:
+                    growth *= 1 + (mark_value - start_value - net) / denominator
+                start_value = mark_value
+                start_ord = mark_ord
+
+            total_years = (marks[-1][0] - min(flows[0][0], marks[0][0])) / DAYS_PER_YEAR
+            if total_years > 0 and growth > 0:
+                results[i] = growth ** (1 / total_years) - 1
+            elif total_years == 0:
+                results[i] = growth - 1
+
+        return results
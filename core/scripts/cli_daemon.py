@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+CLI Daemon - Warm newco_cli Process on a Unix Socket
+
+Every `newco_cli.py` call pays for the interpreter, the engine imports and
+the first read of each CSV. The daemon is one long-lived NewcoCLI process:
+engines stay constructed and the shared caches (interaction cube,
+priority scores, data store tables, fund metrics) stay warm between
+commands. newco_cli.py forwards its arguments here when the socket is up
+and streams back the output and exit status; otherwise it runs the
+command in-process as before.
+
+- Commands run one at a time, in the client's working directory
+- Caches are file-signature checked, so data written anywhere is seen
+- If a script or config file changes, the daemon answers "stale", exits,
+  and the client runs the command in-process
+- Long-running or interactive commands (`jobs worker`, `--wait`),
+  profiled commands (`--profile`) and `daemon` itself always run in-process
+- NEWCO_CLI_DAEMON=0 disables forwarding; NEWCO_CLI_SOCKET moves the socket
+
+Usage:
+    newco_cli.py daemon start|stop|status
+    python3 cli_daemon.py serve          # foreground
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+CONFIG_DIR = BASE_DIR / "config"
+SCRIPTS_DIR = BASE_DIR / "scripts"
+SOCKET_FILE = Path(os.environ.get('NEWCO_CLI_SOCKET', DATA_DIR / "newco_cli.sock"))
+LOG_FILE = DATA_DIR / "cli_daemon.log"
+
+# Commands (and flags) that always run in the calling process
+IN_PROCESS_COMMANDS = (('daemon',), ('jobs', 'worker'))
+IN_PROCESS_FLAGS = ('--wait', '--profile')
+
+FLUSH_BYTES = 64 * 1024
+FLUSH_SECONDS = 0.1
+
+
+# ----------------------------------------------------------------------
+# Client
+# ----------------------------------------------------------------------
+
+def _in_process(args):
+    return (any(tuple(args[:len(command)]) == command for command in IN_PROCESS_COMMANDS)
+            or any(arg.partition('=')[0] in IN_PROCESS_FLAGS for arg in args))
+
+
+def _connect(socket_file, timeout):
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(socket_file))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def _messages(sock):
+    with sock.makefile('r', encoding='utf-8') as lines:
+        for line in lines:
+            yield json.loads(line)
+
+
+def forward(argv, socket_file=None):
+    """
+    Run a newco_cli command in the daemon, streaming its output
+
+    Returns:
+        The command's exit status, or None if the command must run
+        in-process (no daemon, daemon stale, forwarding disabled)
+    """
+    socket_file = Path(socket_file or SOCKET_FILE)
+    if (os.environ.get('NEWCO_CLI_DAEMON') == '0' or _in_process(argv[1:])
+            or not socket_file.exists()):
+        return None
+    sock = _connect(socket_file, timeout=1)
+    if sock is None:
+        return None
+
+    request = {'op': 'run', 'argv': list(argv), 'cwd': os.getcwd(),
+               'isatty': sys.stdout.isatty()}
+    try:
+        sock.sendall((json.dumps(request) + '\n').encode())
+        for message in _messages(sock):
+            if 'out' in message:
+                sys.stdout.write(message['out'])
+                sys.stdout.flush()
+            elif 'err' in message:
+                sys.stderr.write(message['err'])
+                sys.stderr.flush()
+            elif 'exit' in message:
+                return message['exit']
+            elif message.get('stale'):
+                print("newco_cli daemon stopped (scripts or config changed); "
+                      "running in-process. Restart it with `daemon start`.", file=sys.stderr)
+                return None
+    except OSError as e:
+        print(f"newco_cli daemon connection lost: {e}", file=sys.stderr)
+        return 1
+    finally:
+        sock.close()
+    # The command was sent, so don't run it a second time in-process
+    print("newco_cli daemon closed the connection before the command finished", file=sys.stderr)
+    return 1
+
+
+def request(op, socket_file=None, timeout=5):
+    """Send a control request ('status' or 'stop'); returns the reply, or None if not running"""
+    sock = _connect(Path(socket_file or SOCKET_FILE), timeout)
+    if sock is None:
+        return None
+    try:
+        sock.settimeout(timeout)
+        sock.sendall((json.dumps({'op': op}) + '\n').encode())
+        return next(_messages(sock), None)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+
+def status(socket_file=None):
+    return request('status', socket_file)
+
+
+def stop(socket_file=None):
+    return request('stop', socket_file)
+
+
+def start(socket_file=None, timeout=120):
+    """
+    Start a background daemon and wait until it answers
+
+    Returns:
+        Its status, or None if it did not come up (see LOG_FILE)
+    """
+    import subprocess
+
+    socket_file = Path(socket_file or SOCKET_FILE)
+    running = status(socket_file)
+    if running:
+        return running
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_FILE, 'a') as log:
+        process = subprocess.Popen([sys.executable, str(Path(__file__).resolve()), 'serve',
+                                    '--socket', str(socket_file)],
+                                   stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                   start_new_session=True)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        running = status(socket_file)
+        if running:
+            return running
+        time.sleep(0.1)
+    return None
+
+
+# ----------------------------------------------------------------------
+# Server
+# ----------------------------------------------------------------------
+
+class _Stream:
+    """Text stream that sends what is written to the client, in batches"""
+
+    encoding = 'utf-8'
+    errors = 'strict'
+
+    def __init__(self, wfile, key, isatty=False):
+        self.wfile = wfile
+        self.key = key
+        self._isatty = isatty
+        self._buffer = []
+        self._size = 0
+        self._sent = 0.0
+        self.connected = True
+
+    def write(self, text):
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= FLUSH_BYTES or ('\n' in text and time.monotonic() - self._sent >= FLUSH_SECONDS):
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        text, self._buffer, self._size = ''.join(self._buffer), [], 0
+        self._sent = time.monotonic()
+        if self.connected:
+            try:
+                self.wfile.write((json.dumps({self.key: text}) + '\n').encode())
+            except OSError:
+                # Client went away; let the command finish rather than leave a half-done write
+                self.connected = False
+
+    def isatty(self):
+        return self._isatty
+
+    def writable(self):
+        return True
+
+
+class CLIDaemon:
+    """Serves newco_cli commands from one warm NewcoCLI instance"""
+
+    def __init__(self, socket_file=None):
+        from newco_cli import NewcoCLI, _Engine
+
+        self.socket_file = Path(socket_file or SOCKET_FILE)
+        self.cli = NewcoCLI(cached=True)
+        self.engines = [name for name, value in vars(NewcoCLI).items() if isinstance(value, _Engine)]
+        self.started = time.time()
+        self.commands = 0
+        self.warmup = {}
+        self._code = None
+        self._server = None
+
+    def warm(self):
+        """Construct every engine and build the contact caches; returns name -> seconds"""
+
+        tasks = [(name, lambda name=name: getattr(self.cli, name)) for name in self.engines]
+        tasks += [('interaction_cube', lambda: self.cli.contact_mgr.cube.contacts()),
+                  ('priority_scores', lambda: self.cli.contact_mgr.priorities.scores())]
+        for name, task in tasks:
+            start = time.perf_counter()
+            try:
+                task()
+                self.warmup[name] = round(time.perf_counter() - start, 3)
+            except Exception as e:
+                # Stays cold; the command that needs it will report the problem
+                self.warmup[name] = f"failed: {type(e).__name__}: {e}"
+        return self.warmup
+
+    def serve(self):
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            timeout = 10    # for reading the request line
+
+            def handle(self):
+                try:
+                    message = json.loads(self.rfile.readline() or 'null')
+                except ValueError:
+                    return
+                if isinstance(message, dict):
+                    self.connection.settimeout(None)
+                    daemon.handle(message, self.wfile)
+
+        if self.socket_file.exists():
+            if status(self.socket_file):
+                raise RuntimeError(f"A daemon is already listening on {self.socket_file}")
+            self.socket_file.unlink()
+
+        self.warm()
+        self._code = self._code_signature()
+        umask = os.umask(0o077)     # Owner-only socket
+        try:
+            self._server = socketserver.UnixStreamServer(str(self.socket_file), Handler)
+        finally:
+            os.umask(umask)
+        print(f"newco_cli daemon {os.getpid()} listening on {self.socket_file}", flush=True)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.socket_file.exists():
+                self.socket_file.unlink()
+
+    def handle(self, message, wfile):
+        op = message.get('op')
+        if op == 'status':
+            self._reply(wfile, self.status())
+        elif op == 'stop':
+            self._reply(wfile, {'stopping': True, 'pid': os.getpid()})
+            self._shutdown()
+        elif op == 'run':
+            code = self._code_signature()
+            if any(self._code.get(path, signature) != signature for path, signature in code.items()):
+                self._reply(wfile, {'stale': True})
+                self._shutdown()
+                return
+            self._code.update(code)     # Modules first imported since the last check
+            self._reply(wfile, {'exit': self.run(message, wfile)})
+
+    def run(self, message, wfile):
+        """Run one command with output streamed to the client; returns its exit status"""
+        import traceback
+        from contextlib import redirect_stderr, redirect_stdout
+
+        out = _Stream(wfile, 'out', message.get('isatty', False))
+        err = _Stream(wfile, 'err')
+        argv, cwd = sys.argv, os.getcwd()
+        code = 0
+        try:
+            sys.argv = list(message['argv'])
+            os.chdir(message.get('cwd') or cwd)
+            with redirect_stdout(out), redirect_stderr(err):
+                try:
+                    self.cli.run()
+                except SystemExit as e:
+                    if e.code is None or isinstance(e.code, int):
+                        code = e.code or 0
+                    else:
+                        print(e.code, file=sys.stderr)
+                        code = 1
+                except Exception:
+                    traceback.print_exc()
+                    code = 1
+        finally:
+            sys.argv = argv
+            os.chdir(cwd)
+            out.flush()
+            err.flush()
+            self.commands += 1
+        return code
+
+    def status(self):
+        return {'pid': os.getpid(), 'socket': str(self.socket_file),
+                'uptime_seconds': round(time.time() - self.started, 1),
+                'commands': self.commands,
+                'engines': sorted(name for name in self.engines if name in vars(self.cli)),
+                'warmup': self.warmup}
+
+    @staticmethod
+    def _reply(wfile, message):
+        try:
+            wfile.write((json.dumps(message) + '\n').encode())
+        except OSError:
+            pass
+
+    def _shutdown(self):
+        import threading
+        # serve_forever() is running this handler, so stop it from another thread
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    @staticmethod
+    def _code_signature():
+        """Signatures of the loaded scripts and the config files"""
+        scripts = str(SCRIPTS_DIR)
+        files = [Path(module.__file__) for module in list(sys.modules.values())
+                 if os.path.dirname(getattr(module, '__file__', None) or '') == scripts]
+        files += sorted(CONFIG_DIR.glob('*.yaml'))
+        signature = {}
+        for path in files:
+            try:
+                stat = path.stat()
+                signature[str(path)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signature[str(path)] = None
+        return signature
+
+
+if __name__ == '__main__':
+    import argparse
+
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    parser = argparse.ArgumentParser(description='newco_cli daemon')
+    parser.add_argument('command', choices=['serve', 'start', 'stop', 'status'])
+    parser.add_argument('--socket', help='Unix socket path')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        try:
+            CLIDaemon(args.socket).serve()
+        except KeyboardInterrupt:
+            pass
+    else:
+        result = {'start': start, 'stop': stop, 'status': status}[args.command](args.socket)
+        print(json.dumps(result, indent=2) if result else "newco_cli daemon is not running")
+        sys.exit(0 if result else 1)
@@ -15,11 +15,14 @@ from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 INTEL_DIR = DATA_DIR / "intelligence"
 
 
+@instrumented
 class CompetitiveIntelligence:
     """Competitive intelligence and market analysis"""
 
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Data Store - Indexed, Paginated Reads over CSV Tables
+
+List endpoints used to load a whole CSV per request and filter it with
+list comprehensions. A TableIndex keeps one parsed copy of a table per
+process and answers queries from indexes built lazily on first use:
+
+- Filters: column value -> row positions (hash index); several values
+  for one column are OR-ed, several columns AND-ed
+- Sorts: rows ordered by (value, key column) - numbers numerically,
+  blanks last - with the sorted keys kept for cursor lookups
+- Pages: offset/limit, or a keyset cursor (the last row's sort key), so
+  paging stays correct while rows are appended or removed
+
+The table is re-read (and the indexes dropped) when the CSV's signature
+changes, so writes made anywhere are picked up on the next query.
+"""
+
+import base64
+import bisect
+import csv
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from metrics import CSV_LOADS
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _file_signature(path):
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _sort_value(value):
+    """Comparable sort key: numbers before text, blanks last"""
+    if value is None or value == '':
+        return (2, 0.0, '')
+    try:
+        return (0, float(value), '')
+    except ValueError:
+        return (1, 0.0, value.lower())
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        sort_value, key, position = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return (tuple(sort_value), key, position)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def _page_number(name, value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid {name}: {value} (expected an integer)")
+
+
+class TableIndex:
+    """One CSV table with lazily built filter indexes and sort orders"""
+
+    def __init__(self, path, key_column, columns=None):
+        """
+        Args:
+            path: CSV file
+            key_column: Row identifier (tie-breaker for sorts and cursors)
+            columns: Query name -> CSV column, for names that differ from
+                the column (e.g. {'vintage': 'vintage_year'})
+        """
+        self.path = Path(path)
+        self.key_column = key_column
+        self.columns = dict(columns or {})
+        self.version = 0
+        self._lock = threading.RLock()
+        self._signature = None
+        self._rows = None
+        self._fields = []
+        self._by_key = {}
+        self._indexes = {}     # column -> {value: np.array of positions}
+        self._orders = {}      # column or None -> (positions in order, sorted keys)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def rows(self):
+        """All rows in file order (shared; do not modify)"""
+        with self._lock:
+            self._ensure()
+            return self._rows
+
+    def fields(self):
+        """Column names from the CSV header (empty if the file is missing)"""
+        with self._lock:
+            self._ensure()
+            return list(self._fields)
+
+    def get(self, key):
+        """Row with the given key column value, or None"""
+        with self._lock:
+            self._ensure()
+            return self._by_key.get(key)
+
+    def query(self, where=None, sort=None, offset=0, limit=None, cursor=None):
+        """
+        Filter, sort and page the table
+
+        Args:
+            where: Query name -> value or list of values
+            sort: Query name or column, prefixed with '-' for descending;
+                None keeps file order
+            offset: Rows to skip (after the cursor, if any)
+            limit: Page size (capped at MAX_PAGE_SIZE); None returns every match
+            cursor: next_cursor from a previous page
+
+        Returns:
+            Dict with 'items', 'total' (matches before paging), 'offset',
+            'limit' and 'next_cursor' (None on the last page)
+
+        Raises:
+            ValueError: Unknown sort column, non-integer offset or limit, or
+                malformed cursor
+        """
+        descending = bool(sort) and sort.startswith('-')
+        column = self._column(sort.lstrip('-')) if sort else None
+        if limit is not None:
+            limit = max(0, min(_page_number('limit', limit), MAX_PAGE_SIZE))
+        offset = max(0, _page_number('offset', offset or 0))
+
+        with self._lock:
+            self._ensure()
+            if column is not None and self._rows and column not in self._rows[0]:
+                raise ValueError(f"Unknown sort field: {sort.lstrip('-')}")
+
+            mask = self._match(where)
+            positions, keys = self._order(column)
+
+            if cursor:
+                cursor_key = decode_cursor(cursor)
+                if descending:
+                    positions = positions[:bisect.bisect_left(keys, cursor_key)]
+                else:
+                    positions = positions[bisect.bisect_right(keys, cursor_key):]
+            if descending:
+                positions = positions[::-1]
+            if mask is not None:
+                positions = positions[mask[positions]]
+
+            end = len(positions) if limit is None else offset + limit
+            page = positions[offset:end].tolist()
+
+            next_cursor = None
+            if limit and end < len(positions) and page:
+                next_cursor = encode_cursor(self._sort_key(page[-1], column))
+
+            return {
+                'items': [self._rows[i] for i in page],
+                'total': len(self._rows) if mask is None else int(mask.sum()),
+                'offset': offset,
+                'limit': limit,
+                'next_cursor': next_cursor
+            }
+
+    def warm(self, names=()):
+        """Load the table and build the file order and the indexes for `names`; returns the row count"""
+        with self._lock:
+            self._ensure()
+            self._order(None)
+            for name in names:
+                self._index(self._column(name))
+            return len(self._rows)
+
+    def counts(self, name):
+        """Value -> number of rows, for a query name or column"""
+        with self._lock:
+            self._ensure()
+            return {value: len(positions) for value, positions in self._index(self._column(name)).items()}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _column(self, name):
+        return self.columns.get(name, name)
+
+    def _ensure(self):
+        signature = _file_signature(self.path)
+        if self._rows is not None and signature == self._signature:
+            return
+        rows, fields = [], []
+        if signature is not None:
+            with CSV_LOADS.labels(self.path.name).time(), open(self.path, 'r') as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+                fields = reader.fieldnames or []
+        self._rows = rows
+        self._fields = fields
+        self._by_key = {}
+        for row in rows:
+            self._by_key.setdefault(row.get(self.key_column), row)
+        self._indexes = {}
+        self._orders = {}
+        self._signature = signature
+        self.version += 1
+
+    def _index(self, column):
+        index = self._indexes.get(column)
+        if index is None:
+            groups = {}
+            for position, row in enumerate(self._rows):
+                groups.setdefault(row.get(column, ''), []).append(position)
+            index = self._indexes[column] = {value: np.array(positions, dtype=np.int64)
+                                             for value, positions in groups.items()}
+        return index
+
+    def _match(self, where):
+        """Boolean mask of matching rows, or None for no filter"""
+        mask = None
+        for name, values in (where or {}).items():
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            index = self._index(self._column(name))
+            hits = np.zeros(len(self._rows), dtype=bool)
+            for value in values:
+                positions = index.get(value)
+                if positions is not None:
+                    hits[positions] = True
+            mask = hits if mask is None else mask & hits
+        return mask
+
+    def _sort_key(self, position, column):
+        row = self._rows[position]
+        value = _sort_value(row.get(column)) if column is not None else (0, float(position), '')
+        return (value, row.get(self.key_column) or '', position)
+
+    def _order(self, column):
+        """(positions sorted by column, their sort keys); None is file order"""
+        order = self._orders.get(column)
+        if order is None:
+            keys = sorted(self._sort_key(position, column) for position in range(len(self._rows)))
+            positions = np.fromiter((key[2] for key in keys), dtype=np.int64, count=len(keys))
+            order = self._orders[column] = (positions, keys)
+        return order
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_table(path, key_column, columns=None):
+    """Return the process-wide index for a CSV table"""
+    key = str(path)
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            table = _tables[key] = TableIndex(path, key_column, columns)
+        return table
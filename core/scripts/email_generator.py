@@ -7,11 +7,14 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 TEMPLATES_DIR = BASE_DIR / "templates" / "email"
 
 
+@instrumented
 class EmailGenerator:
     """Generate personalized emails from templates"""
 
@@ -5,24 +5,110 @@ Financial Modeling - Cash Flow Projections & Scenario Analysis
 Models portfolio financials over 3-5 year horizon:
 - Cash flow projections (capital calls, distributions, expenses)
 - Scenario analysis (bull, base, bear cases)
+- Monte Carlo cash flow simulation (Takahashi-Alexander model)
 - Budget vs actual tracking
 - Fundraising modeling (when to raise more capital)
-- What-if analysis
+- What-if analysis, parameter sweeps and tornado sensitivity
 """
 
+import copy
 import csv
+import itertools
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 import json
+import numpy as np
 from portfolio_management import PortfolioManager
 from public_markets import PublicMarketsEngine
+from cashflow_simulation import simulate, percentile_bands, DEFAULT_PARAMETERS, DEFAULT_PATHS
+from metrics import instrumented
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 MODELS_DIR = BASE_DIR / "models"
 
+# Default tornado drivers (varied +/-20%)
+TORNADO_PARAMETERS = [
+    'deployment_rates.year_1',
+    'deployment_rates.year_2',
+    'management_fees.fee_rate',
+    'operating_expenses.annual_base',
+    'new_commitments.avg_commitment_size',
+    'scenarios.{scenario}.new_commitments_per_year',
+    'scenarios.{scenario}.distribution_acceleration',
+    'scenarios.{scenario}.multiple_markup'
+]
+
+
+def assumption_paths(assumptions, prefix=''):
+    """Dotted paths of every value in the nested assumptions dict"""
+    paths = []
+    for key, value in assumptions.items():
+        if isinstance(value, dict):
+            paths.extend(assumption_paths(value, f"{prefix}{key}."))
+        else:
+            paths.append(f"{prefix}{key}")
+    return paths
+
+
+def _assumption_slot(assumptions, path):
+    """
+    (containing dict, key) for a dotted path
+
+    Raises:
+        ValueError: The path doesn't name a value (lists the valid paths)
+    """
+    *parents, key = path.split('.')
+    target = assumptions
+    for part in parents:
+        target = target.get(part) if isinstance(target, dict) else None
+    if not isinstance(target, dict) or key not in target or isinstance(target[key], dict):
+        raise ValueError(f"Unknown assumption: {path}. "
+                         f"Valid assumptions: {', '.join(assumption_paths(assumptions))}")
+    return target, key
+
+
+def _get_assumption(assumptions, path):
+    """Read a value from the nested assumptions dict by dotted path"""
+    target, key = _assumption_slot(assumptions, path)
+    return target[key]
+
+
+def _scenario_params(assumptions, scenario):
+    """A scenario's assumptions; ValueError naming the valid scenarios if unknown"""
+    scenarios = assumptions['scenarios']
+    if scenario not in scenarios:
+        raise ValueError(f"Unknown scenario: {scenario}. Valid scenarios: {', '.join(scenarios)}")
+    return scenarios[scenario]
+
+
+def _set_assumption(assumptions, path, value):
+    """Set a value in the nested assumptions dict by dotted path"""
+    target, key = _assumption_slot(assumptions, path)
+    target[key] = value
+
+
+def _grid_values(value, points):
+    """A projection figure (scalar or per-grid-point array) as one float per grid point"""
+    return np.broadcast_to(np.ravel(value), (points,)).astype(np.float64)
 
+
+# Keys of _summarize_projection, the metrics a sweep or tornado can report
+SUMMARY_METRICS = ('total_capital_calls', 'total_distributions', 'net_cashflow', 'ending_nav')
+
+
+def _summarize_projection(projection):
+    """Totals over a projection horizon"""
+    return {
+        'total_capital_calls': sum(p['capital_calls'] for p in projection),
+        'total_distributions': sum(p['distributions'] for p in projection),
+        'net_cashflow': sum(p['net_cashflow'] for p in projection),
+        'ending_nav': projection[-1]['nav_estimate']
+    }
+
+
+@instrumented
 class FinancialModeler:
     """Financial modeling and forecasting"""
 
@@ -90,7 +176,8 @@ class FinancialModeler:
                 "new_commitments": {
                     "avg_commitment_size": 3000000,  # $3M per fund
                     "commitments_per_year": 3
-                }
+                },
+                "monte_carlo": DEFAULT_PARAMETERS
             }
 
             with open(self.assumptions_file, 'w') as f:
@@ -106,75 +193,97 @@ class FinancialModeler:
         with open(self.assumptions_file, 'w') as f:
             json.dump(assumptions, f, indent=2)
 
-    def project_cashflow(self, years=3, scenario='base'):
+    def project_cashflow(self, years=3, scenario='base', assumptions=None, base=None):
         """
         Project cash flows over N years
 
         Args:
             years: Number of years to project
             scenario: 'bull', 'base', or 'bear'
+            assumptions: Assumptions dict (defaults to model_assumptions.json)
+            base: Precomputed portfolio base from portfolio_base()
 
         Returns:
             Dictionary with annual projections
         """
-        assumptions = self.load_assumptions()
-        scenario_params = assumptions['scenarios'][scenario]
+        if assumptions is None:
+            assumptions = self.load_assumptions()
+        if base is None:
+            base = self.portfolio_base()
+
+        return self._project(assumptions, base, years, scenario)
 
-        # Get current portfolio
+    def portfolio_base(self):
+        """
+        Current portfolio as per-fund arrays, the starting point for projections
+
+        Computed once and reused across scenarios and what-if grid points.
+        """
         portfolio_summary = self.portfolio.get_portfolio_summary()
+        funds = portfolio_summary['funds']
+
+        return {
+            'vintage_year': np.array([int(f['vintage_year']) for f in funds], dtype=np.int64),
+            'unfunded': np.array([f['unfunded'] for f in funds], dtype=np.float64),
+            'commitment': np.array([f['commitment'] for f in funds], dtype=np.float64),
+            'current_nav': np.array([f['current_nav'] for f in funds], dtype=np.float64),
+            'total_commitment': portfolio_summary['total_commitment'],
+            'total_nav': portfolio_summary['total_nav'],
+            'total_funds': portfolio_summary['total_funds']
+        }
+
+    @staticmethod
+    def _project(assumptions, base, years, scenario):
+        """Pure projection: no file I/O, vectorized across funds"""
+        return [
+            {key: value if key in ('year', 'scenario') else float(_grid_values(value, 1)[0])
+             for key, value in year.items()}
+            for year in FinancialModeler._project_grid(assumptions, base, years, scenario)
+        ]
+
+    @staticmethod
+    def _project_grid(assumptions, base, years, scenario):
+        """
+        Projection vectorized across funds and across grid points
+
+        Any assumption may be a (points, 1) array, one row per grid point;
+        it broadcasts against the per-fund arrays, so every grid point is
+        projected in the same pass. Per-year figures come back as scalars or
+        arrays; _grid_values gives one float per grid point.
+        """
+        scenario_params = _scenario_params(assumptions, scenario)
+        deployment = assumptions['deployment_rates']
+        years_to_first = assumptions['distribution_timing']['years_to_first_distribution']
         current_year = datetime.now().year
 
         projections = []
 
         for year_offset in range(years):
             year = current_year + year_offset
-            projection = {
-                'year': year,
-                'scenario': scenario,
-                'capital_calls': 0,
-                'distributions': 0,
-                'management_fees': 0,
-                'operating_expenses': 0,
-                'new_commitments': 0,
-                'net_cashflow': 0,
-                'nav_estimate': 0
-            }
+            projection = {'year': year, 'scenario': scenario}
+
+            fund_age = year - base['vintage_year']
 
-            # Existing funds - capital calls
-            for fund in portfolio_summary['funds']:
-                fund_age = year - int(fund['vintage_year'])
-                unfunded = fund['unfunded']
-
-                if unfunded > 0 and fund_age < 5:
-                    # Apply deployment curve
-                    if fund_age == 0:
-                        call_rate = assumptions['deployment_rates']['year_1']
-                    elif fund_age == 1:
-                        call_rate = assumptions['deployment_rates']['year_2']
-                    elif fund_age == 2:
-                        call_rate = assumptions['deployment_rates']['year_3']
-                    else:
-                        call_rate = assumptions['deployment_rates']['year_4_plus']
-
-                    annual_call = min(unfunded, fund['commitment'] * call_rate)
-                    projection['capital_calls'] += annual_call
-
-            # Existing funds - distributions
-            for fund in portfolio_summary['funds']:
-                fund_age = year - int(fund['vintage_year'])
-                years_to_first = assumptions['distribution_timing']['years_to_first_distribution']
-
-                if fund_age >= years_to_first:
-                    # Estimate distributions based on fund maturity
-                    years_distributing = fund_age - years_to_first + 1
-                    base_distribution_rate = 0.15 * years_distributing  # 15% per year
-
-                    # Apply scenario
-                    distribution_rate = base_distribution_rate * scenario_params['distribution_acceleration']
-                    distribution_rate = min(distribution_rate, 0.40)  # Cap at 40% per year
-
-                    estimated_dist = fund['current_nav'] * distribution_rate
-                    projection['distributions'] += estimated_dist
+            # Existing funds - capital calls (deployment curve)
+            call_rate = np.select(
+                [fund_age == 0, fund_age == 1, fund_age == 2],
+                [deployment['year_1'], deployment['year_2'], deployment['year_3']],
+                default=deployment['year_4_plus']
+            )
+            calling = (base['unfunded'] > 0) & (fund_age < 5)
+            annual_calls = np.minimum(base['unfunded'], base['commitment'] * call_rate)
+            projection['capital_calls'] = np.where(calling, annual_calls, 0.0).sum(axis=-1, keepdims=True)
+
+            # Existing funds - distributions based on fund maturity (15% per year)
+            years_distributing = fund_age - years_to_first + 1
+            distribution_rate = np.minimum(
+                0.15 * years_distributing * scenario_params['distribution_acceleration'],
+                0.40  # Cap at 40% per year
+            )
+            distributing = fund_age >= years_to_first
+            projection['distributions'] = np.where(
+                distributing, base['current_nav'] * distribution_rate, 0.0
+            ).sum(axis=-1, keepdims=True)
 
             # New commitments (scenario dependent)
             new_commits_count = scenario_params['new_commitments_per_year']
@@ -182,16 +291,14 @@ class FinancialModeler:
             projection['new_commitments'] = new_commits_count * avg_size
 
             # Management fees
-            if assumptions['management_fees']['on_commitment']:
-                fee_base = portfolio_summary['total_commitment'] + projection['new_commitments']
-            else:
-                fee_base = portfolio_summary['total_nav']
-
+            fee_base = np.where(assumptions['management_fees']['on_commitment'],
+                                base['total_commitment'] + projection['new_commitments'],
+                                base['total_nav'])
             projection['management_fees'] = fee_base * assumptions['management_fees']['fee_rate']
 
             # Operating expenses
             base_opex = assumptions['operating_expenses']['annual_base']
-            per_fund_opex = assumptions['operating_expenses']['per_fund'] * portfolio_summary['total_funds']
+            per_fund_opex = assumptions['operating_expenses']['per_fund'] * base['total_funds']
             inflation_factor = (1 + assumptions['operating_expenses']['inflation']) ** year_offset
             projection['operating_expenses'] = (base_opex + per_fund_opex) * inflation_factor
 
@@ -206,7 +313,7 @@ class FinancialModeler:
 
             # NAV estimate (simplified)
             if year_offset == 0:
-                projection['nav_estimate'] = portfolio_summary['total_nav']
+                projection['nav_estimate'] = base['total_nav']
             else:
                 prev_nav = projections[-1]['nav_estimate']
                 nav_growth = scenario_params['multiple_markup'] - 1.0
@@ -223,12 +330,107 @@ class FinancialModeler:
         Returns:
             Dictionary with all three scenarios
         """
+        assumptions = self.load_assumptions()
+        base = self.portfolio_base()
+
+        return {
+            scenario: self.project_cashflow(years, scenario, assumptions, base)
+            for scenario in ('bull', 'base', 'bear')
+        }
+
+    def simulate_cashflows(self, years=5, paths=DEFAULT_PATHS, scenario='base', seed=None):
+        """
+        Monte Carlo cash flow projection (Takahashi-Alexander model)
+
+        Every existing fund starts from its current unfunded commitment and
+        NAV; the scenario's new commitments enter as one cohort per year.
+        Fees and operating expenses follow the deterministic assumptions.
+
+        Args:
+            years: Years to project
+            paths: Number of simulated paths
+            scenario: 'bull', 'base', or 'bear' (distribution pacing and
+                      new commitment volume)
+            seed: RNG seed; defaults to monte_carlo.seed in the assumptions
+
+        Returns:
+            Dictionary with P5/P50/P95 bands per metric and year
+
+        Raises:
+            ValueError: Unknown scenario, or years or paths below 1
+        """
+        if years < 1:
+            raise ValueError(f"years must be at least 1 (got {years})")
+        if paths < 1:
+            raise ValueError(f"paths must be at least 1 (got {paths})")
+
+        assumptions = self.load_assumptions()
+        scenario_params = _scenario_params(assumptions, scenario)
+        parameters = {**DEFAULT_PARAMETERS, **assumptions.get('monte_carlo', {})}
+
+        funds = self.portfolio.get_portfolio_summary()['funds']
+        current_year = datetime.now().year
+
+        commitment = [f['commitment'] for f in funds]
+        unfunded = [max(f['unfunded'], 0) for f in funds]
+        nav = [f['current_nav'] for f in funds]
+        age = [current_year - int(f['vintage_year']) for f in funds]
+
+        # New commitments: one cohort per projection year, starting at age 0
+        new_per_year = (scenario_params['new_commitments_per_year']
+                        * assumptions['new_commitments']['avg_commitment_size'])
+        for year_offset in range(years):
+            commitment.append(new_per_year)
+            unfunded.append(new_per_year)
+            nav.append(0.0)
+            age.append(-year_offset)
+
+        opex_params = assumptions['operating_expenses']
+        base_opex = opex_params['annual_base'] + opex_params['per_fund'] * len(funds)
+        operating_expenses = base_opex * (1 + opex_params['inflation']) ** np.arange(years)
+
+        simulated = simulate(
+            commitment, unfunded, nav, age, years,
+            paths=paths,
+            parameters=parameters,
+            distribution_scale=scenario_params['distribution_acceleration'],
+            fee_rate=assumptions['management_fees']['fee_rate'],
+            fee_on_commitment=assumptions['management_fees']['on_commitment'],
+            operating_expenses=operating_expenses,
+            seed=seed
+        )
+
         return {
-            'bull': self.project_cashflow(years=years, scenario='bull'),
-            'base': self.project_cashflow(years=years, scenario='base'),
-            'bear': self.project_cashflow(years=years, scenario='bear')
+            'scenario': scenario,
+            'paths': paths,
+            'seed': parameters['seed'] if seed is None else seed,
+            'years': [current_year + i for i in range(years)],
+            'bands': percentile_bands(simulated)
         }
 
+    def show_simulation(self, years=5, paths=DEFAULT_PATHS, scenario='base', seed=None):
+        """Display Monte Carlo percentile bands"""
+        result = self.simulate_cashflows(years=years, paths=paths, scenario=scenario, seed=seed)
+        bands = result['bands']
+
+        print("\n" + "="*100)
+        print(f"MONTE CARLO CASH FLOW SIMULATION - {scenario.upper()} "
+              f"({result['paths']:,} paths, seed {result['seed']})")
+        print("="*100)
+
+        for label, key in [('Net Cash Flow', 'net_cashflow'),
+                           ('Cumulative Net Cash Flow', 'cumulative_net_cashflow'),
+                           ('Unfunded Exposure', 'unfunded'),
+                           ('Portfolio NAV', 'nav')]:
+            print(f"\n{label}")
+            print(f"{'Year':<10} {'P5':>20} {'P50':>20} {'P95':>20}")
+            print("-"*72)
+            for i, year in enumerate(result['years']):
+                print(f"{year:<10} ${bands[key]['p5'][i]:>19,.0f} "
+                      f"${bands[key]['p50'][i]:>19,.0f} ${bands[key]['p95'][i]:>19,.0f}")
+
+        print("\n" + "="*100 + "\n")
+
     def show_scenario_comparison(self, years=3):
         """Display scenario comparison table"""
         scenarios = self.scenario_analysis(years=years)
@@ -445,58 +647,148 @@ class FinancialModeler:
 
         print("\n" + "="*80 + "\n")
 
-    def what_if_analysis(self, parameter, values):
+    def what_if_analysis(self, parameter, values, assumptions=None, years=3, scenario='base'):
         """
         What-if analysis for a specific parameter
 
         Args:
-            parameter: Parameter to vary (e.g., 'new_commitments_per_year')
+            parameter: Parameter to vary, as a dotted path
+                       (e.g., 'scenarios.base.new_commitments_per_year')
             values: List of values to test
 
         Returns:
-            List of projections for each value
+            List of projection summaries for each value
+
+        Raises:
+            ValueError: Unknown parameter path or scenario
         """
-        assumptions = self.load_assumptions()
-        results = []
-
-        for value in values:
-            # Modify assumption
-            modified_assumptions = assumptions.copy()
-
-            # Navigate nested dict structure
-            if '.' in parameter:
-                parts = parameter.split('.')
-                target = modified_assumptions
-                for part in parts[:-1]:
-                    target = target[part]
-                target[parts[-1]] = value
-            else:
-                modified_assumptions[parameter] = value
-
-            # Temporarily save modified assumptions
-            original_assumptions = assumptions
-            self.save_assumptions(modified_assumptions)
-
-            # Run projection
-            projection = self.project_cashflow(years=3, scenario='base')
-
-            # Calculate summary metrics
-            total_calls = sum(p['capital_calls'] for p in projection)
-            total_distributions = sum(p['distributions'] for p in projection)
-            net_cashflow = sum(p['net_cashflow'] for p in projection)
-
-            results.append({
-                'parameter_value': value,
-                'total_capital_calls': total_calls,
-                'total_distributions': total_distributions,
-                'net_cashflow': net_cashflow,
-                'ending_nav': projection[-1]['nav_estimate']
+        return [
+            {'parameter_value': point['parameters'][parameter], **point['results']}
+            for point in self.sweep({parameter: values}, assumptions, years, scenario)
+        ]
+
+    def sweep(self, grid, assumptions=None, years=3, scenario='base', base=None):
+        """
+        Evaluate projections over a grid of one or two parameters
+
+        Side-effect free and batched: the swept parameters are set, as one
+        column of values per parameter, on a single deep copy of the
+        assumptions, and every grid point is projected in one vectorized
+        pass (see _project_grid). The portfolio base is computed once and
+        nothing is written to model_assumptions.json.
+
+        Args:
+            grid: Dict of dotted parameter path -> list of values (1 or 2 keys)
+            assumptions: Assumptions dict (defaults to model_assumptions.json)
+            base: Precomputed portfolio base (see portfolio_base)
+
+        Returns:
+            List of {'parameters': {path: value}, 'results': {...}} per grid point
+
+        Raises:
+            ValueError: More than two parameters, or an unknown parameter
+                path or scenario
+        """
+        if not 1 <= len(grid) <= 2:
+            raise ValueError("sweep supports one or two parameters")
+
+        if assumptions is None:
+            assumptions = self.load_assumptions()
+        _scenario_params(assumptions, scenario)
+        for name in grid:
+            _assumption_slot(assumptions, name)
+        if base is None:
+            base = self.portfolio_base()
+
+        names = list(grid)
+        combos = list(itertools.product(*(grid[name] for name in names)))
+
+        batched = copy.deepcopy(assumptions)
+        for i, name in enumerate(names):
+            _set_assumption(batched, name, np.array([combo[i] for combo in combos])[:, None])
+
+        summary = _summarize_projection(self._project_grid(batched, base, years, scenario))
+        results = {key: _grid_values(value, len(combos)) for key, value in summary.items()}
+
+        return [
+            {'parameters': dict(zip(names, combo)),
+             'results': {key: float(values[i]) for key, values in results.items()}}
+            for i, combo in enumerate(combos)
+        ]
+
+    def tornado_analysis(self, ranges=None, assumptions=None, years=3, scenario='base',
+                         metric='net_cashflow'):
+        """
+        One-at-a-time sensitivity of a projection metric
+
+        Args:
+            ranges: Dict of dotted parameter path -> (low, high); defaults to
+                    +/-20% on the main drivers
+            metric: Result key to rank by (see what_if_analysis results)
+
+        Returns:
+            Dict with the base value and per-parameter low/high results,
+            sorted by swing (largest first)
+
+        Raises:
+            ValueError: Unknown parameter path, scenario or metric
+        """
+        if metric not in SUMMARY_METRICS:
+            raise ValueError(f"Unknown metric: {metric}. Valid metrics: {', '.join(SUMMARY_METRICS)}")
+        if assumptions is None:
+            assumptions = self.load_assumptions()
+        _scenario_params(assumptions, scenario)
+        for name in ranges or ():
+            _assumption_slot(assumptions, name)
+        base = self.portfolio_base()
+
+        if ranges is None:
+            ranges = {}
+            for name in TORNADO_PARAMETERS:
+                name = name.format(scenario=scenario)
+                value = _get_assumption(assumptions, name)
+                ranges[name] = (value * 0.8, value * 1.2)
+
+        base_value = _summarize_projection(
+            self._project(assumptions, base, years, scenario)
+        )[metric]
+
+        bars = []
+        for name, (low, high) in ranges.items():
+            low_point, high_point = self.sweep({name: [low, high]}, assumptions, years,
+                                               scenario, base)
+            low_value = low_point['results'][metric]
+            high_value = high_point['results'][metric]
+            bars.append({
+                'parameter': name,
+                'low': low,
+                'high': high,
+                'low_value': low_value,
+                'high_value': high_value,
+                'swing': abs(high_value - low_value)
             })
 
-            # Restore original assumptions
-            self.save_assumptions(original_assumptions)
+        bars.sort(key=lambda bar: bar['swing'], reverse=True)
+
+        return {'metric': metric, 'scenario': scenario, 'base_value': base_value, 'bars': bars}
 
-        return results
+    def show_tornado(self, years=3, scenario='base', metric='net_cashflow'):
+        """Display tornado sensitivity table"""
+        tornado = self.tornado_analysis(years=years, scenario=scenario, metric=metric)
+
+        print("\n" + "="*100)
+        print(f"SENSITIVITY (TORNADO) - {metric.upper()} OVER {years} YEARS, {scenario.upper()} SCENARIO")
+        print("="*100)
+        print(f"\nBase: ${tornado['base_value']:,.0f}\n")
+
+        print(f"{'Parameter':<45} {'Low':>16} {'High':>16} {'Swing':>16}")
+        print("-"*100)
+
+        for bar in tornado['bars']:
+            print(f"{bar['parameter']:<45} ${bar['low_value']:>15,.0f} "
+                  f"${bar['high_value']:>15,.0f} ${bar['swing']:>15,.0f}")
+
+        print("\n" + "="*100 + "\n")
 
     def add_budget(self, year, category, amount, notes=''):
         """Add budget line item"""
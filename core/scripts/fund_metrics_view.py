@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Fund Metrics View - Materialized Per-Fund Performance Table
+
+Computing fund metrics means reading every capital call, distribution and
+NAV and solving an IRR per fund. Reports and API endpoints ask for the same
+numbers over and over, so this module keeps them in a materialized table:
+
+- Dependency check: the source CSVs are stat'ed on every read; if none
+  changed since the last build, lookups are served straight from memory
+- Incremental rebuild: each fund's rows (fund record, calls, distributions,
+  NAVs) are fingerprinted; only funds whose fingerprint changed are
+  recomputed, in one batched solve
+- Persistence: the table is saved under data/cache so a fresh process
+  (CLI run, server restart) starts warm
+
+Portfolio-level numbers (totals, pooled IRR, pooled KS-PME) are rebuilt
+whenever any fund changes, since they depend on every fund's flows.
+"""
+
+import copy
+import hashlib
+import json
+import math
+import threading
+from datetime import datetime
+from pathlib import Path
+from collections import defaultdict
+
+from cashflow_ledger import CashFlowLedger, BenchmarkIndex
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+CACHE_FILE = DATA_DIR / "cache" / "fund_metrics.json"
+
+# Bump when the metric definitions change so stale caches are discarded
+VIEW_VERSION = 2
+
+
+def _file_signature(path):
+    """(mtime_ns, size) of a file, or None if it doesn't exist"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class FundMetricsView:
+    """Materialized fund-metrics table over a PortfolioManager's CSVs"""
+
+    def __init__(self, portfolio_manager, cache_file=None):
+        self.pm = portfolio_manager
+        self.cache_file = Path(cache_file) if cache_file else CACHE_FILE
+        self.benchmark_file = DATA_DIR / "benchmark_index.csv"
+
+        self._lock = threading.RLock()
+        self._signature = None      # source file signatures at last build
+        self._state = None          # persisted table (see _empty_state)
+        self.last_refresh = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, fund_id):
+        """Metrics for one fund, or None if the fund doesn't exist"""
+        with self._lock:
+            self.refresh()
+            metrics = self._state['funds'].get(fund_id)
+            return dict(metrics) if metrics else None
+
+    def all(self):
+        """Dict of fund_id -> metrics, in portfolio file order"""
+        with self._lock:
+            self.refresh()
+            return {fund_id: dict(self._state['funds'][fund_id])
+                    for fund_id in self._state['order']}
+
+    def summary(self):
+        """Portfolio summary (same shape as PortfolioManager.get_portfolio_summary)"""
+        with self._lock:
+            self.refresh()
+            summary = copy.deepcopy(self._state['summary'])
+            summary['funds'] = [dict(self._state['funds'][fund_id])
+                                for fund_id in self._state['order']]
+            return summary
+
+    def invalidate(self, fund_id=None):
+        """
+        Force a dependency check on the next read
+
+        With a fund_id, that fund is recomputed even if its rows look
+        unchanged; otherwise only changed funds are recomputed.
+        """
+        with self._lock:
+            self._signature = None
+            if fund_id and self._state:
+                self._state['fingerprints'].pop(fund_id, None)
+
+    def refresh(self, force=False):
+        """
+        Bring the table up to date with the source files
+
+        Returns:
+            Dict with counts of recomputed, reused and removed funds
+        """
+        with self._lock:
+            signature = self._current_signature()
+            if not force and self._state is not None and signature == self._signature:
+                return {'recomputed': 0, 'reused': len(self._state['order']), 'removed': 0}
+
+            if self._state is None:
+                self._state = self._load_state()
+
+            stats = self._rebuild(signature, force)
+            self._signature = signature
+            self.last_refresh = {**stats, 'at': datetime.now().isoformat()}
+            return stats
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _sources(self):
+        return [self.pm.funds_file, self.pm.capital_calls_file,
+                self.pm.distributions_file, self.pm.fund_navs_file, self.benchmark_file]
+
+    def _current_signature(self):
+        # Funds without a NAV mark are valued as of today, so the date is a dependency too
+        return {
+            'files': [_file_signature(path) for path in self._sources()],
+            'as_of': datetime.now().strftime('%Y-%m-%d')
+        }
+
+    def _empty_state(self):
+        return {'version': VIEW_VERSION, 'benchmark': None, 'order': [],
+                'fingerprints': {}, 'funds': {}, 'summary': {}}
+
+    def _rebuild(self, signature, force):
+        state = self._state
+        funds = self.pm._load_csv(self.pm.funds_file)
+        calls = self.pm._load_csv(self.pm.capital_calls_file)
+        dists = self.pm._load_csv(self.pm.distributions_file)
+        navs = self.pm._load_csv(self.pm.fund_navs_file)
+
+        # The benchmark series feeds every fund's PME
+        benchmark_signature = signature['files'][-1]
+        if force or state['benchmark'] != benchmark_signature:
+            state['fingerprints'] = {}
+            state['benchmark'] = benchmark_signature
+
+        rows_by_fund = defaultdict(lambda: {'calls': [], 'dists': [], 'navs': []})
+        for key, rows in (('calls', calls), ('dists', dists), ('navs', navs)):
+            for row in rows:
+                rows_by_fund[row.get('fund_id')][key].append(row)
+
+        fingerprints = {
+            fund['fund_id']: self._fingerprint(fund, rows_by_fund[fund['fund_id']],
+                                               signature['as_of'])
+            for fund in funds
+        }
+
+        dirty = [fund for fund in funds
+                 if state['fingerprints'].get(fund['fund_id']) != fingerprints[fund['fund_id']]]
+        order = [fund['fund_id'] for fund in funds]
+        removed = [fund_id for fund_id in state['funds'] if fund_id not in fingerprints]
+
+        if dirty:
+            dirty_rows = [rows_by_fund[fund['fund_id']] for fund in dirty]
+            ledger = CashFlowLedger.from_records(
+                dirty,
+                [row for rows in dirty_rows for row in rows['calls']],
+                [row for rows in dirty_rows for row in rows['dists']],
+                [row for rows in dirty_rows for row in rows['navs']]
+            )
+            state['funds'].update(self.pm.get_all_fund_metrics(dirty, ledger))
+
+        for fund_id in removed:
+            state['funds'].pop(fund_id, None)
+
+        if dirty or removed or order != state['order'] or not state['summary']:
+            state['order'] = order
+            state['summary'] = self._build_summary(funds, calls, dists, navs)
+
+        state['fingerprints'] = fingerprints
+        self._save_state()
+
+        return {'recomputed': len(dirty), 'reused': len(funds) - len(dirty),
+                'removed': len(removed)}
+
+    @staticmethod
+    def _fingerprint(fund, rows, as_of):
+        """Hash of everything a fund's metrics depend on"""
+        payload = [
+            sorted(fund.items()),
+            sorted(sorted(r.items()) for r in rows['calls']),
+            sorted(sorted(r.items()) for r in rows['dists']),
+            sorted(sorted(r.items()) for r in rows['navs']),
+            as_of if not rows['navs'] else None
+        ]
+        return hashlib.sha1(json.dumps(payload, default=str).encode('utf-8')).hexdigest()
+
+    def _build_summary(self, funds, calls, dists, navs):
+        """Portfolio totals plus pooled IRR / KS-PME (fund list is attached on read)"""
+        summary = {
+            'total_funds': len(funds),
+            'total_commitment': 0,
+            'total_paid_in': 0,
+            'total_unfunded': 0,
+            'total_distributions': 0,
+            'total_nav': 0,
+            'portfolio_tvpi': 0,
+            'portfolio_dpi': 0,
+            'portfolio_rvpi': 0,
+            'portfolio_irr': None,
+            'portfolio_ks_pme': None,
+            'weighted_irr': None
+        }
+
+        fund_metrics = [self._state['funds'][fund['fund_id']] for fund in funds]
+        for metrics in fund_metrics:
+            summary['total_commitment'] += metrics['commitment']
+            summary['total_paid_in'] += metrics['paid_in']
+            summary['total_unfunded'] += metrics['unfunded']
+            summary['total_distributions'] += metrics['distributions']
+            summary['total_nav'] += metrics['current_nav']
+
+        if summary['total_paid_in'] > 0:
+            summary['portfolio_dpi'] = summary['total_distributions'] / summary['total_paid_in']
+            summary['portfolio_rvpi'] = summary['total_nav'] / summary['total_paid_in']
+            summary['portfolio_tvpi'] = summary['portfolio_dpi'] + summary['portfolio_rvpi']
+
+            # Paid-in weighted average of fund IRRs, for comparison with pooled IRR
+            with_irr = [m for m in fund_metrics if m['irr'] is not None]
+            weight = sum(m['paid_in'] for m in with_irr)
+            if weight > 0:
+                summary['weighted_irr'] = sum(m['irr'] * m['paid_in'] for m in with_irr) / weight
+
+        ledger = CashFlowLedger.from_records(funds, calls, dists, navs)
+
+        pooled_irr = ledger.pooled_irr()
+        summary['portfolio_irr'] = None if math.isnan(pooled_irr) else pooled_irr * 100
+
+        _, pooled_pme = ledger.ks_pme(BenchmarkIndex())
+        summary['portfolio_ks_pme'] = None if math.isnan(pooled_pme) else pooled_pme
+
+        return summary
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_state(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_state()
+
+        if state.get('version') != VIEW_VERSION:
+            return self._empty_state()
+        return state
+
+    def _save_state(self):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(self._state, f)
+            tmp.replace(self.cache_file)
+        except OSError:
+            pass  # The in-memory table still works; we just start cold next time
+
+
+_views = {}
+_views_lock = threading.Lock()
+
+
+def get_view(portfolio_manager):
+    """Return the process-wide view for a PortfolioManager's data files"""
+    key = str(portfolio_manager.funds_file)
+    with _views_lock:
+        view = _views.get(key)
+        if view is None:
+            view = _views[key] = FundMetricsView(portfolio_manager)
+        return view
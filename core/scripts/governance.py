@@ -15,11 +15,14 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 GOV_DIR = DATA_DIR / "governance"
 
 
+@instrumented
 class InstitutionalGovernance:
     """Institutional governance and IC committee management"""
 
@@ -59,7 +59,7 @@ class ContactImporter:
             'last_contact': '',
             'next_action': '',
             'next_action_date': '',
-            'priority_score': '50',
+            'priority_score': '',    # scored by the success model on the next refresh
             'notes': notes,
             'tags': tags
         }
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Interaction Cube - Single-Pass GTM Aggregates
+
+Contacts and interactions are scanned once into:
+- Contact cells: (status, tier, category) -> number of contacts
+- Activity cells: (status, tier, category, week, type) -> number of
+  interactions, keyed by the contact's current status
+- Per-contact activity: first/last interaction timestamp, count, counts
+  by type and by (week, type)
+
+Every analytics method and the weekly report read rollups of these cells
+instead of re-reading the CSVs. ContactManager reports its own writes
+(log_interaction, add/update contact) so the cube is updated in place;
+writes made elsewhere are picked up by comparing file signatures, which
+triggers a rebuild.
+"""
+
+import csv
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+from metrics import CSV_LOADS
+
+CONTACT_DIMENSIONS = ('status', 'tier', 'category')
+ACTIVITY_DIMENSIONS = CONTACT_DIMENSIONS + ('week', 'type')
+
+
+def _file_signature(path):
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _load_csv(path):
+    if not Path(path).exists():
+        return []
+    with CSV_LOADS.labels(Path(path).name).time(), open(path, 'r') as f:
+        return list(csv.DictReader(f))
+
+
+@lru_cache(maxsize=4096)
+def week_of(day):
+    """Monday (YYYY-MM-DD) of the week containing a YYYY-MM-DD date, or None"""
+    try:
+        date = datetime.strptime(day, '%Y-%m-%d')
+    except ValueError:
+        return None
+    return (date - timedelta(days=date.weekday())).strftime('%Y-%m-%d')
+
+
+# Activity of contact ids missing from contacts.csv (counted in weekly totals only)
+UNKNOWN_CONTACT = (None,) * len(CONTACT_DIMENSIONS)
+
+
+def _contact_key(contact):
+    if contact is None:
+        return UNKNOWN_CONTACT
+    return tuple(contact.get(dim, '') for dim in CONTACT_DIMENSIONS)
+
+
+def _rollup(cells, dimensions, by, where):
+    """Sum cells grouped by the `by` dimensions, keeping cells that match `where`"""
+    index = {dim: i for i, dim in enumerate(dimensions)}
+    filters = [(index[dim], value if isinstance(value, (list, tuple, set, frozenset)) else (value,))
+               for dim, value in where.items()]
+    positions = [index[dim] for dim in by]
+
+    out = Counter()
+    for key, n in cells.items():
+        if all(key[i] in values for i, values in filters):
+            group = key[positions[0]] if len(positions) == 1 else tuple(key[i] for i in positions)
+            out[group] += n
+    return out
+
+
+class InteractionCube:
+    """Aggregation cube over the contacts and interactions CSVs"""
+
+    def __init__(self, contacts_file, interactions_file):
+        self.contacts_file = Path(contacts_file)
+        self.interactions_file = Path(interactions_file)
+        self.version = 0
+        self._lock = threading.RLock()
+        self._signature = None
+        self._contacts = None      # contact rows in file order
+        self._by_id = {}           # contact_id -> contact row
+        self._positions = {}       # contact_id -> index in _contacts
+        self._contact_cells = None
+        self._activity_cells = None
+        self._per_contact = {}     # contact_id -> activity summary
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def contacts(self, contact_ids=None):
+        """Contact rows (as of the last scan or update): all, or those in contact_ids"""
+        with self._lock:
+            self._ensure()
+            if contact_ids is None:
+                return list(self._contacts)
+            rows = (self._by_id.get(str(contact_id)) for contact_id in contact_ids)
+            return [row for row in rows if row is not None]
+
+    def contact(self, contact_id):
+        """A single contact row, or None"""
+        with self._lock:
+            self._ensure()
+            return self._by_id.get(str(contact_id))
+
+    def contact_counts(self, by=(), **where):
+        """
+        Contact counts grouped by status/tier/category
+
+        Args:
+            by: Dimensions to group by; a single dimension gives scalar keys
+            **where: Dimension filters (a value or a collection of values)
+        """
+        with self._lock:
+            self._ensure()
+            return _rollup(self._contact_cells, CONTACT_DIMENSIONS, by, where)
+
+    def interaction_counts(self, by=(), **where):
+        """Interaction counts grouped by status/tier/category/week/type"""
+        with self._lock:
+            self._ensure()
+            return _rollup(self._activity_cells, ACTIVITY_DIMENSIONS, by, where)
+
+    def contact_activity(self):
+        """
+        contact_id -> {'first', 'last', 'count', 'types'}
+
+        first/last are the raw interaction timestamps; contacts missing
+        from contacts.csv are included, as the raw files would.
+        """
+        with self._lock:
+            self._ensure()
+            return {contact_id: {'first': stats['first'], 'last': stats['last'],
+                                 'count': stats['count'], 'types': Counter(stats['types'])}
+                    for contact_id, stats in self._per_contact.items()}
+
+    def activity_columns(self, contact_ids, types=()):
+        """
+        Per-contact activity as lists aligned with contact_ids
+
+        Returns:
+            Dict with 'count', 'last' (timestamp or None) and, for each
+            type in `types`, that type's interaction count
+        """
+        with self._lock:
+            self._ensure()
+            empty = {'count': 0, 'last': None, 'types': {}}
+            stats = [self._per_contact.get(contact_id, empty) for contact_id in contact_ids]
+            columns = {'count': [s['count'] for s in stats], 'last': [s['last'] for s in stats]}
+            for kind in types:
+                columns[kind] = [s['types'].get(kind, 0) for s in stats]
+            return columns
+
+    # ------------------------------------------------------------------
+    # Incremental updates (called by ContactManager after each write)
+    # ------------------------------------------------------------------
+
+    def interaction_logged(self, interaction):
+        with self._lock:
+            if self._contacts is None:
+                return  # Not built yet; the first read will scan the files
+            self._add_interaction(interaction)
+            self._mark_synced()
+
+    def contact_saved(self, contact):
+        """A contact was added or updated"""
+        self.contacts_saved([contact])
+
+    def contacts_saved(self, contacts):
+        """Several contacts were added or updated in one write"""
+        with self._lock:
+            if self._contacts is None:
+                return
+            for contact in contacts:
+                self._save_contact(contact)
+            self._mark_synced()
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _sources(self):
+        return (self.contacts_file, self.interactions_file)
+
+    def _ensure(self):
+        signature = tuple(_file_signature(path) for path in self._sources())
+        if self._contacts is None or signature != self._signature:
+            self._rebuild(signature)
+
+    def _rebuild(self, signature):
+        self._contacts = []
+        self._by_id = {}
+        self._positions = {}
+        self._contact_cells = Counter()
+        self._activity_cells = Counter()
+        self._per_contact = {}
+
+        for contact in _load_csv(self.contacts_file):
+            self._add_contact(contact)
+        for interaction in _load_csv(self.interactions_file):
+            self._add_interaction(interaction)
+
+        self._signature = signature
+        self.version += 1
+
+    def _mark_synced(self):
+        self._signature = tuple(_file_signature(path) for path in self._sources())
+        self.version += 1
+
+    def _add_contact(self, contact):
+        # Duplicate ids: interactions attach to the first row, as a lookup would
+        if contact.get('id') not in self._by_id:
+            self._by_id[contact.get('id')] = contact
+            self._positions[contact.get('id')] = len(self._contacts)
+        self._contacts.append(contact)
+        self._contact_cells[_contact_key(contact)] += 1
+
+    def _save_contact(self, contact):
+        # Store the row as the CSV will read back: every column, as text
+        fields = self._contacts[0].keys() if self._contacts else contact.keys()
+        contact = {field: '' if contact.get(field) is None else str(contact[field])
+                   for field in fields}
+        old = self._by_id.get(contact['id'])
+        if old is None:
+            self._add_contact(contact)
+            self._move_activity(contact['id'], UNKNOWN_CONTACT, _contact_key(contact))
+        else:
+            self._move_contact(old, contact)
+            self._contacts[self._positions[contact['id']]] = contact
+            self._by_id[contact['id']] = contact
+
+    def _add_interaction(self, interaction):
+        contact_id = interaction.get('contact_id')
+        timestamp = interaction.get('date') or ''
+        week = week_of(timestamp.split()[0]) if timestamp else None
+        kind = interaction.get('type', '')
+
+        stats = self._per_contact.setdefault(contact_id, {
+            'first': None, 'last': None, 'count': 0, 'types': Counter(), 'weeks': Counter()
+        })
+        stats['count'] += 1
+        stats['types'][kind] += 1
+        if week is None:
+            return  # Unparseable date: counted, but not placed in time
+
+        if stats['first'] is None or timestamp < stats['first']:
+            stats['first'] = timestamp
+        if stats['last'] is None or timestamp > stats['last']:
+            stats['last'] = timestamp
+        stats['weeks'][(week, kind)] += 1
+
+        self._activity_cells[_contact_key(self._by_id.get(contact_id)) + (week, kind)] += 1
+
+    def _move_contact(self, old, new):
+        """Re-key a contact's cells after its status/tier/category changed"""
+        old_key, new_key = _contact_key(old), _contact_key(new)
+        if old_key == new_key:
+            return
+
+        self._contact_cells[old_key] -= 1
+        if not self._contact_cells[old_key]:
+            del self._contact_cells[old_key]
+        self._contact_cells[new_key] += 1
+        self._move_activity(old['id'], old_key, new_key)
+
+    def _move_activity(self, contact_id, old_key, new_key):
+        stats = self._per_contact.get(contact_id)
+        if stats is None:
+            return
+        for (week, kind), n in stats['weeks'].items():
+            cell = old_key + (week, kind)
+            self._activity_cells[cell] -= n
+            if not self._activity_cells[cell]:
+                del self._activity_cells[cell]
+            self._activity_cells[new_key + (week, kind)] += n
+
+
+_cubes = {}
+_cubes_lock = threading.Lock()
+
+
+def get_cube(contacts_file, interactions_file):
+    """Return the process-wide cube for a contacts/interactions file pair"""
+    key = (str(contacts_file), str(interactions_file))
+    with _cubes_lock:
+        cube = _cubes.get(key)
+        if cube is None:
+            cube = _cubes[key] = InteractionCube(contacts_file, interactions_file)
+        return cube
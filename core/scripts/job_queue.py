@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Job Queue - Persistent Background Jobs for Long-Running Analyses
+
+Board decks, LP letters, DD memos, council queries and network analysis
+take seconds to minutes. Instead of running inside the request or CLI
+call, they are submitted as jobs:
+
+- Jobs live in SQLite (data/jobs.db), so queued work and results survive
+  an API restart; jobs left 'running' by a supervisor that died are
+  requeued (up to max_attempts) by the next pool
+- A job process holds a lease on its job while its supervisor lives and
+  exits as soon as the supervisor is gone; an orphaned job is requeued
+  only once its lease has lapsed, so it never runs twice at once
+- Submitting a job identical (same kind and parameters) to one that is
+  still queued or running returns the existing job instead of a new one
+- A WorkerPool claims queued jobs and runs each in its own process
+  (`python job_queue.py run <job_id>`), at most `workers` at a time;
+  cancelling a running job terminates its process
+- Only one pool per database supervises at a time (a lock file next to
+  jobs.db): every gunicorn worker, the reloader's parent and `jobs
+  worker` may start one, but the others wait on standby and take over
+  if the supervising process exits, so `workers` is a global limit
+
+Usage:
+    queue = JobQueue()
+    job, deduplicated = queue.submit('board_deck', {'meeting_date': '2026-01-15'})
+    queue.get(job['job_id'], with_result=True)
+
+    WorkerPool(queue).start()      # background supervisor thread
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+DB_FILE = DATA_DIR / "jobs.db"
+CONFIG_FILE = BASE_DIR / "config" / "config.yaml"
+
+DEFAULT_CONFIG = {
+    'workers': 2,                 # jobs run at once per pool
+    'max_attempts': 3,            # runs before a job lost with its worker is failed
+    'poll_seconds': 1.0,
+    'council_url': 'http://localhost:8010'
+}
+
+LEASE_SECONDS = 30               # a running job's process renews every LEASE_SECONDS / 3
+
+ACTIVE_STATUSES = ('queued', 'running')
+STATUSES = ACTIVE_STATUSES + ('done', 'failed', 'cancelled')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    supervisor_pid INTEGER,
+    lease_until REAL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_in_flight ON jobs (dedup_key)
+    WHERE status IN ('queued', 'running');
+"""
+
+
+def load_config(config_file=CONFIG_FILE):
+    """jobs settings from config.yaml over DEFAULT_CONFIG"""
+    config = dict(DEFAULT_CONFIG)
+    if config_file.exists():
+        with open(config_file, 'r') as f:
+            config.update((yaml.safe_load(f) or {}).get('jobs') or {})
+    return config
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+# ----------------------------------------------------------------------
+# Job kinds (run in the job's own process; results must be JSON-able)
+# ----------------------------------------------------------------------
+
+def board_deck(meeting_date=None, output_format='markdown'):
+    from board_reporting import BoardReportGenerator
+    path = BoardReportGenerator().generate_board_deck(meeting_date, output_format)
+    return {'path': str(path)}
+
+
+def lp_letter(quarter=None, year=None, ceo_message='', market_commentary=''):
+    from lp_reporting import LPReportGenerator
+    path = LPReportGenerator().generate_quarterly_letter(quarter, year, ceo_message, market_commentary)
+    return {'path': str(path)}
+
+
+def dd_memo(dd_data):
+    sys.path.insert(0, str(BASE_DIR.parent / "scripts"))
+    from metal_ai.due_diligence import DueDiligenceWorkflow
+    return DueDiligenceWorkflow().generate_ic_memo(dd_data)
+
+
+def council_query(query, quorum=None, deadline=None):
+    """Ask the LLM council service (agents/agent-orchestrator/llm_council_local.py)"""
+    import urllib.request
+    body = {'query': query}
+    if quorum is not None:
+        body['quorum'] = quorum
+    if deadline is not None:
+        body['deadline'] = deadline
+    request = urllib.request.Request(load_config()['council_url'].rstrip('/') + '/query',
+                                     data=json.dumps(body).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=900) as response:
+        return json.loads(response.read())
+
+
+def network_analysis(top=50):
+    from network_analysis import NetworkAnalysisEngine
+    engine = NetworkAnalysisEngine()
+    graph = engine.export_network_graph()
+    return {
+        'multipliers': engine.identify_network_multipliers()[:top],
+        'brokers': engine.calculate_betweenness_centrality()[:top],
+        'structural_holes': engine.calculate_structural_holes()[:top],
+        'influence': engine.calculate_network_influence_score()[:top],
+        'homophily': engine.analyze_homophily(),
+        'graph': graph['metadata'],
+        'graph_file': str(BASE_DIR / "reports" / "network_graph.json")
+    }
+
+
+JOB_KINDS = {
+    'board_deck': board_deck,
+    'lp_letter': lp_letter,
+    'dd_memo': dd_memo,
+    'council_query': council_query,
+    'network_analysis': network_analysis,
+}
+
+
+# ----------------------------------------------------------------------
+# Queue
+# ----------------------------------------------------------------------
+
+class JobQueue:
+    """SQLite-backed job records shared by the API, CLI and worker pools"""
+
+    def __init__(self, db_file=None):
+        self.db_file = Path(db_file) if db_file else DB_FILE
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            if 'lease_until' not in {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+
+    def submit(self, kind, params=None):
+        """
+        Queue a job, or return the identical job already in flight
+
+        Returns:
+            (job, deduplicated)
+
+        Raises:
+            ValueError: Unknown kind or parameters that aren't JSON
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}. Available: {sorted(JOB_KINDS)}")
+        try:
+            params_json = json.dumps(params or {}, sort_keys=True)
+        except TypeError as e:
+            raise ValueError(f"Job parameters must be JSON: {e}")
+        dedup_key = hashlib.sha256(f"{kind}\n{params_json}".encode()).hexdigest()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT * FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running')",
+                               (dedup_key,)).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return self._job(row), True
+
+            job_id = uuid.uuid4().hex
+            conn.execute("INSERT INTO jobs (job_id, kind, params, dedup_key, status, created_at) "
+                         "VALUES (?, ?, ?, ?, 'queued', ?)",
+                         (job_id, kind, params_json, dedup_key, _now()))
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            conn.execute("COMMIT")
+            return self._job(row), False
+
+    def get(self, job_id, with_result=False):
+        """Job record, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._job(row, with_result) if row else None
+
+    def list(self, status=None, kind=None, limit=50):
+        """Most recent jobs first, without results"""
+        query, args = "SELECT * FROM jobs WHERE 1=1", []
+        if status:
+            query += " AND status = ?"
+            args.append(status)
+        if kind:
+            query += " AND kind = ?"
+            args.append(kind)
+        query += " ORDER BY created_at DESC, rowid DESC LIMIT ?"
+        args.append(limit)
+        with self._connect() as conn:
+            return [self._job(row) for row in conn.execute(query, args)]
+
+    def cancel(self, job_id):
+        """
+        Cancel a queued or running job (a running job's process is stopped
+        by its pool). Returns the job record, or None if unknown.
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                         "WHERE job_id = ? AND status IN ('queued', 'running')", (_now(), job_id))
+        return self.get(job_id)
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def claim(self, supervisor_pid):
+        """Mark the oldest queued job running; returns it, or None"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT job_id FROM jobs WHERE status = 'queued' "
+                               "ORDER BY created_at, rowid LIMIT 1").fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute("UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                         "supervisor_pid = ?, lease_until = ?, started_at = ?, error = NULL "
+                         "WHERE job_id = ?",
+                         (supervisor_pid, time.time() + LEASE_SECONDS, _now(), row['job_id']))
+            job = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row['job_id'],)).fetchone()
+            conn.execute("COMMIT")
+            return self._job(job)
+
+    def renew(self, job_id, attempt):
+        """Extend a running attempt's lease by LEASE_SECONDS"""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET lease_until = ? "
+                         "WHERE job_id = ? AND status = 'running' AND attempts = ?",
+                         (time.time() + LEASE_SECONDS, job_id, attempt))
+
+    def finish(self, job_id, attempt, result=None, error=None):
+        """
+        Record a run's outcome. Ignored if the job was cancelled or
+        requeued since this attempt started.
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? "
+                         "WHERE job_id = ? AND status = 'running' AND attempts = ?",
+                         ('failed' if error is not None else 'done',
+                          json.dumps(result, default=str) if error is None else None,
+                          error, _now(), job_id, attempt))
+
+    def requeue_orphans(self, max_attempts):
+        """
+        Requeue running jobs whose supervisor process is gone (API or
+        worker restarted) and whose lease has lapsed, i.e. whose job
+        process has stopped too; fail those out of attempts. Returns the
+        number requeued.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            orphans = [row for row in conn.execute(
+                "SELECT job_id, attempts, supervisor_pid FROM jobs WHERE status = 'running' "
+                "AND (lease_until IS NULL OR lease_until < ?)", (time.time(),))
+                if not pid_alive(row['supervisor_pid'])]
+            requeued = 0
+            for row in orphans:
+                if row['attempts'] < max_attempts:
+                    conn.execute("UPDATE jobs SET status = 'queued' WHERE job_id = ?", (row['job_id'],))
+                    requeued += 1
+                else:
+                    conn.execute("UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+                                 "WHERE job_id = ?",
+                                 (f"Worker lost after {row['attempts']} attempts", _now(), row['job_id']))
+            conn.execute("COMMIT")
+            return requeued
+
+    def statuses(self, job_ids):
+        """job_id -> status"""
+        if not job_ids:
+            return {}
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT job_id, status FROM jobs WHERE job_id IN "
+                                f"({','.join('?' * len(job_ids))})", list(job_ids))
+            return {row['job_id']: row['status'] for row in rows}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return ClosingConnection(conn)
+
+    @staticmethod
+    def _job(row, with_result=False):
+        job = {key: row[key] for key in ('job_id', 'kind', 'status', 'error', 'attempts',
+                                         'created_at', 'started_at', 'finished_at')}
+        job['params'] = json.loads(row['params'])
+        if with_result:
+            job['result'] = json.loads(row['result']) if row['result'] is not None else None
+        return job
+
+
+class ClosingConnection:
+    """sqlite3 connection as a context manager that closes (not just commits)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+
+def pid_alive(pid):
+    """True if a process with this pid exists on this host"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ----------------------------------------------------------------------
+# Worker pool
+# ----------------------------------------------------------------------
+
+class WorkerPool:
+    """Claims queued jobs and runs each in a child process, `workers` at a time"""
+
+    def __init__(self, queue=None, workers=None, config=None):
+        self.config = config or load_config()
+        self.queue = queue or JobQueue()
+        self.workers = workers if workers is not None else self.config['workers']
+        self.lock_file = self.queue.db_file.with_suffix('.lock')
+        self._running = {}     # job_id -> (attempt, Popen)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Run the supervisor in a background thread"""
+        if self._thread is None and self.workers > 0:
+            self._thread = threading.Thread(target=self.run_forever, name='job-supervisor', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_forever(self):
+        """
+        Supervise until stop(); running jobs are terminated on the way out
+
+        Waits on standby while another pool holds the supervisor lock.
+        """
+        lock = self._lock()
+        if lock is None:
+            return
+        try:
+            next_requeue = 0.0
+            while not self._stop.is_set():
+                # Orphans' leases lapse over time, so look again every lease period
+                if time.monotonic() >= next_requeue:
+                    self.queue.requeue_orphans(self.config['max_attempts'])
+                    next_requeue = time.monotonic() + LEASE_SECONDS
+                self.tick()
+                self._stop.wait(self.config['poll_seconds'])
+        finally:
+            for _, process in self._running.values():
+                process.terminate()
+            lock.close()
+
+    def _lock(self):
+        """The held supervisor lock file, or None if stopped while waiting for it"""
+        import fcntl
+
+        lock = open(self.lock_file, 'a')
+        try:
+            while True:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return lock
+                except BlockingIOError:
+                    if self._stop.wait(self.config['poll_seconds']):
+                        lock.close()
+                        return None
+        except BaseException:
+            lock.close()
+            raise
+
+    def tick(self):
+        """One supervision pass: reap, cancel, launch"""
+        for job_id, (attempt, process) in list(self._running.items()):
+            if process.poll() is not None:
+                del self._running[job_id]
+                # A job process that died before recording an outcome
+                self.queue.finish(job_id, attempt, error=f"Job process exited with code {process.returncode}")
+
+        statuses = self.queue.statuses(list(self._running))
+        for job_id, (_, process) in self._running.items():
+            if statuses.get(job_id) == 'cancelled':
+                process.terminate()
+
+        while len(self._running) < self.workers:
+            job = self.queue.claim(os.getpid())
+            if job is None:
+                break
+            process = subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), 'run', job['job_id'],
+                 '--db', str(self.queue.db_file), '--attempt', str(job['attempts']),
+                 '--supervisor', str(os.getpid())],
+                stdout=subprocess.DEVNULL
+            )
+            self._running[job['job_id']] = (job['attempts'], process)
+
+
+def _hold_lease(queue, job_id, attempt, supervisor_pid):
+    """Renew the job's lease while the supervisor lives; end the process once it's gone"""
+    while True:
+        time.sleep(LEASE_SECONDS / 3)
+        if os.getppid() != supervisor_pid:
+            # Reparented: the supervisor died. Stop so the job can be requeued without running twice
+            os._exit(1)
+        queue.renew(job_id, attempt)
+
+
+def run_job(job_id, attempt, db_file=None, supervisor_pid=None):
+    """Execute one claimed job and record its outcome (job process entry point)"""
+    queue = JobQueue(db_file)
+    job = queue.get(job_id)
+    if job is None or job['status'] != 'running':
+        return
+    if supervisor_pid is not None:
+        threading.Thread(target=_hold_lease, args=(queue, job_id, attempt, supervisor_pid),
+                         name='job-lease', daemon=True).start()
+    try:
+        result = JOB_KINDS[job['kind']](**job['params'])
+    except Exception as e:
+        queue.finish(job_id, attempt, error=f"{type(e).__name__}: {e}")
+    else:
+        queue.finish(job_id, attempt, result=result)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run one queued job (used by WorkerPool)')
+    parser.add_argument('command', choices=['run'])
+    parser.add_argument('job_id')
+    parser.add_argument('--db', help='Job database')
+    parser.add_argument('--attempt', type=int, required=True)
+    parser.add_argument('--supervisor', type=int, help='Supervisor pid (the job stops if it exits)')
+    args = parser.parse_args()
+    run_job(args.job_id, args.attempt, args.db, args.supervisor)
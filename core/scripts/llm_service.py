@@ -8,11 +8,15 @@ for AI-powered analysis, insights, and automation.
 
 import json
 import subprocess
+import time
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 import yaml
 
+from metrics import LLM_CHAT, instrumented
 
+
+@instrumented
 class LLMService:
     """Service for interacting with local Ollama LLM models"""
 
@@ -141,6 +145,13 @@ class LLMService:
         if context:
             full_prompt = f"{context}\n\n{prompt}"
 
+        start = time.perf_counter()
+        result = self._run_ollama(model, model_name, full_prompt)
+        LLM_CHAT.labels(model, str(result['success']).lower()).observe(time.perf_counter() - start)
+        return result
+
+    def _run_ollama(self, model: str, model_name: str, full_prompt: str) -> Dict[str, Any]:
+        """Run one prompt through the ollama CLI; returns chat()'s result"""
         # Call Ollama using subprocess
         try:
             # Use ollama run command for simplicity
@@ -18,6 +18,7 @@ from portfolio_management import PortfolioManager
 from manager_crm import ManagerCRM
 from risk_management import RiskManager
 from public_markets import PublicMarketsEngine
+from metrics import instrumented
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -25,6 +26,7 @@ REPORTS_DIR = BASE_DIR / "reports" / "lp"
 TEMPLATES_DIR = BASE_DIR / "templates" / "lp"
 
 
+@instrumented
 class LPReportGenerator:
     """Generate LP communications and reports"""
 
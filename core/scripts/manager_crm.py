@@ -19,10 +19,13 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+@instrumented
 class ManagerCRM:
     """CRM for fund manager relationships"""
 
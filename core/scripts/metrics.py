@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Metrics - Counters, Gauges and Latency Histograms for the Hot Paths
+
+Process-local instrumentation, cheap enough (about a microsecond per
+timed call) to leave on everywhere:
+
+- @instrumented on an engine class times every public method
+  (newco_engine_call_seconds{engine, method}) and counts the calls that
+  raise (newco_engine_call_errors_total)
+- CSV parses (engines' _load_csv, the interaction cube and data store
+  tables) are timed per file (newco_csv_load_seconds)
+- The API times every route (newco_http_request_seconds); LLMService.chat
+  times each model (newco_llm_chat_seconds)
+- render_prometheus() is the text exposition format served at
+  /api/metrics; snapshot() is the same data as JSON (newco_cli.py stats)
+
+Each process keeps its own numbers: every gunicorn worker, the CLI daemon
+and a one-off CLI run report only the calls they made.
+"""
+
+import bisect
+import functools
+import os
+import threading
+import time
+import types
+
+# CO_GENERATOR | CO_COROUTINE | CO_ASYNC_GENERATOR: timing these would only time their creation
+_DEFERRED_FLAGS = 0x20 | 0x80 | 0x200
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+           1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class _Family:
+    """A named metric with one series per label combination"""
+
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def labels(self, *values, **named):
+        """The series for these label values (created on first use)"""
+        if named:
+            values = tuple(str(named[label]) for label in self.label_names)
+        else:
+            values = tuple(str(value) for value in values)
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def series(self):
+        """(label values, series) pairs that have recorded something"""
+        with self._lock:
+            items = list(self._series.items())
+        return sorted((values, series) for values, series in items if series.used())
+
+
+class _CounterSeries:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def used(self):
+        return self.value != 0
+
+
+class Counter(_Family):
+    type = 'counter'
+
+    def _new_series(self):
+        return _CounterSeries()
+
+
+class _GaugeSeries:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def used(self):
+        return True
+
+
+class Gauge(_Family):
+    type = 'gauge'
+
+    def _new_series(self):
+        return _GaugeSeries()
+
+
+class _Timer:
+    """Context manager that observes its duration into a histogram series"""
+
+    __slots__ = ('series', 'start')
+
+    def __init__(self, series):
+        self.series = series
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.series.observe(time.perf_counter() - self.start)
+
+
+class _HistogramSeries:
+    __slots__ = ('counts', 'sum', 'count', 'max', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+            if seconds > self.max:
+                self.max = seconds
+
+    def time(self):
+        return _Timer(self)
+
+    def used(self):
+        return self.count > 0
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count, self.max
+
+
+class Histogram(_Family):
+    type = 'histogram'
+
+    def _new_series(self):
+        return _HistogramSeries()
+
+
+_registry = []
+
+ENGINE_CALLS = Histogram('newco_engine_call_seconds', 'Engine public method latency',
+                         ('engine', 'method'))
+ENGINE_ERRORS = Counter('newco_engine_call_errors_total', 'Engine public method calls that raised',
+                        ('engine', 'method'))
+HTTP_REQUESTS = Histogram('newco_http_request_seconds', 'API request latency by route',
+                          ('route', 'method', 'status'))
+LLM_CHAT = Histogram('newco_llm_chat_seconds', 'LLMService.chat latency by model', ('model', 'success'))
+CSV_LOADS = Histogram('newco_csv_load_seconds', 'CSV file parses', ('file',))
+
+
+# ----------------------------------------------------------------------
+# Instrumentation
+# ----------------------------------------------------------------------
+
+def _timed_method(fn, engine, method):
+    calls = ENGINE_CALLS.labels(engine, method)
+    errors = ENGINE_ERRORS.labels(engine, method)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            calls.observe(time.perf_counter() - start)
+
+    return wrapper
+
+
+def _timed_csv_load(fn):
+    @functools.wraps(fn)
+    def wrapper(self, filepath, *args, **kwargs):
+        with CSV_LOADS.labels(os.path.basename(filepath)).time():
+            return fn(self, filepath, *args, **kwargs)
+
+    return wrapper
+
+
+def _plain_function(fn):
+    return isinstance(fn, types.FunctionType) and not fn.__code__.co_flags & _DEFERRED_FLAGS
+
+
+def instrumented(cls):
+    """
+    Class decorator: time every public method defined on the class, and
+    its _load_csv(filepath) helper (if any) as a CSV load
+    """
+    for name, attr in list(vars(cls).items()):
+        if name == '_load_csv' and _plain_function(attr):
+            setattr(cls, name, _timed_csv_load(attr))
+        elif name.startswith('_'):
+            continue
+        elif isinstance(attr, (staticmethod, classmethod)):
+            if _plain_function(attr.__func__):
+                setattr(cls, name, type(attr)(_timed_method(attr.__func__, cls.__name__, name)))
+        elif _plain_function(attr):
+            setattr(cls, name, _timed_method(attr, cls.__name__, name))
+    return cls
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format (0.0.4)"""
+    lines = []
+    for family in _registry:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for values, series in family.series():
+            if family.type == 'histogram':
+                counts, total, count, _ = series.snapshot()
+                cumulative = 0
+                for bound, n in zip(BUCKETS + (float('inf'),), counts):
+                    cumulative += n
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    labels = _label_text(family.label_names, values, [('le', le)])
+                    lines.append(f"{family.name}_bucket{labels} {cumulative}")
+                labels = _label_text(family.label_names, values)
+                lines.append(f"{family.name}_sum{labels} {total!r}")
+                lines.append(f"{family.name}_count{labels} {count}")
+            else:
+                lines.append(f"{family.name}{_label_text(family.label_names, values)} {series.value}")
+    return '\n'.join(lines) + '\n'
+
+
+def _quantile(counts, count, q, peak):
+    """q-quantile estimate: upper bound of the bucket holding it, capped at the largest observation"""
+    rank, cumulative = q * count, 0
+    for bound, n in zip(BUCKETS, counts):
+        cumulative += n
+        if cumulative >= rank:
+            return min(bound, peak)
+    return peak
+
+
+def snapshot():
+    """Metric name -> {'type', 'help', 'series': [...]} with per-series labels and values"""
+    result = {}
+    for family in _registry:
+        series_list = []
+        for values, series in family.series():
+            entry = {'labels': dict(zip(family.label_names, values))}
+            if family.type == 'histogram':
+                counts, total, count, peak = series.snapshot()
+                entry.update(count=count, sum=round(total, 6), max=round(peak, 6),
+                             p50=round(_quantile(counts, count, 0.5, peak), 6),
+                             p95=round(_quantile(counts, count, 0.95, peak), 6))
+            else:
+                entry['value'] = series.value
+            series_list.append(entry)
+        result[family.name] = {'type': family.type, 'help': family.help, 'series': series_list}
+    return result
+
@@ -19,10 +19,13 @@ from datetime import datetime
 import json
 import math
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+@instrumented
 class NetworkAnalysisEngine:
     """
     Social network analysis engine for contact relationships
@@ -3,49 +3,90 @@
 NEWCO GTM Management System - Main CLI Tool
 """
 
+import sys
+
+# Time the imports below too when profiling the cold start; otherwise hand
+# the command to the CLI daemon if one is running (see cli_daemon.py)
+import startup_profile
+if startup_profile.requested():
+    startup_profile.start()
+elif __name__ == '__main__':
+    import cli_daemon
+    status = cli_daemon.forward(sys.argv)
+    if status is not None:
+        sys.exit(status)
+
 import argparse
 import csv
-import sys
+import json
+import time
+from functools import cached_property
 from pathlib import Path
 from datetime import datetime, timedelta
-import yaml
 
 # Base directory
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 CONFIG_DIR = BASE_DIR / "config"
 
-# Import submodules
+# Submodules are imported by the engines that use them (see _Engine), so a
+# command only loads what it needs
 sys.path.insert(0, str(BASE_DIR / "scripts"))
-from email_generator import EmailGenerator
-from pipeline_manager import PipelineManager
-from reports import ReportGenerator
-from automation import AutomationEngine
-from network_analysis import NetworkAnalysisEngine
-from relationship_manager import RelationshipManager
-from analytics import AnalyticsEngine
-from public_markets import PublicMarketsEngine, InvestorRelations
-from regulatory_compliance import RegulatoryComplianceEngine
-from portfolio_management import PortfolioManager
-from manager_crm import ManagerCRM
-from risk_management import RiskManager
-from board_reporting import BoardReportGenerator
-from lp_reporting import LPReportGenerator
-from financial_modeling import FinancialModeler
-from competitive_intelligence import CompetitiveIntelligence
-from team_management import TeamManager
-from governance import InstitutionalGovernance
+from metrics import instrumented
+import profiling
+
+
+class _Engine:
+    """NewcoCLI attribute that imports and constructs its engine on first use"""
 
+    def __init__(self, module, factory, cached=False):
+        self.module = module
+        self.factory = factory
+        self.cached = cached    # Factory takes NewcoCLI's cached= option
 
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, cli, owner=None):
+        if cli is None:
+            return self
+        with startup_profile.engine(f"{self.name} ({self.module})"):
+            module = __import__(self.module, fromlist=[self.factory])
+            kwargs = {'cached': cli.cached} if self.cached else {}
+            engine = cli.__dict__[self.name] = getattr(module, self.factory)(**kwargs)
+        return engine
+
+
+@instrumented
 class ContactManager:
     """Manages contact database operations"""
 
-    def __init__(self):
+    def __init__(self, cached=False):
+        """
+        Args:
+            cached: Read contacts from the shared interaction cube instead of
+                the CSV (for long-lived processes such as the CLI daemon)
+        """
         self.contacts_file = DATA_DIR / "contacts.csv"
         self.interactions_file = DATA_DIR / "interactions.csv"
+        self.cached = cached
+
+    @property
+    def cube(self):
+        """Shared interaction cube (built on first use)"""
+        from interaction_cube import get_cube
+        return get_cube(self.contacts_file, self.interactions_file)
+
+    @property
+    def priorities(self):
+        """Shared priority maintainer (loads the success model on first use)"""
+        from priority_maintainer import get_maintainer
+        return get_maintainer(self.contacts_file, self.interactions_file)
 
     def load_contacts(self):
         """Load all contacts from CSV"""
+        if self.cached:
+            return [dict(contact) for contact in self.cube.contacts()]
         contacts = []
         if self.contacts_file.exists():
             with open(self.contacts_file, 'r') as f:
@@ -88,40 +129,46 @@ class ContactManager:
 
     def update_contact(self, contact_id, **updates):
         """Update a contact's fields"""
-        contacts = self.load_contacts()
-        updated = False
-
-        for contact in contacts:
-            if contact['id'] == str(contact_id):
-                contact.update(updates)
-                contact['last_contact'] = datetime.now().strftime('%Y-%m-%d')
-                updated = True
-                break
-
-        if updated:
-            self.save_contacts(contacts)
-            return True
-        return False
+        with self.priorities.updating():
+            contacts = self.load_contacts()
+            updated = None
+
+            for contact in contacts:
+                if contact['id'] == str(contact_id):
+                    contact.update(updates)
+                    contact['last_contact'] = datetime.now().strftime('%Y-%m-%d')
+                    contact['priority_score'] = str(self.priorities.rescore(contact))
+                    updated = contact
+                    break
+
+            if updated:
+                self.save_contacts(contacts)
+                self.cube.contact_saved(updated)
+                return True
+            return False
 
     def add_contact(self, **contact_data):
         """Add a new contact"""
-        contacts = self.load_contacts()
+        with self.priorities.updating():
+            contacts = self.load_contacts()
 
-        # Generate new ID
-        if contacts:
-            max_id = max(int(c['id']) for c in contacts if c['id'])
-            new_id = max_id + 1
-        else:
-            new_id = 1
+            # Generate new ID
+            if contacts:
+                max_id = max(int(c['id']) for c in contacts if c['id'])
+                new_id = max_id + 1
+            else:
+                new_id = 1
 
-        contact_data['id'] = str(new_id)
-        contact_data['last_contact'] = contact_data.get('last_contact', '')
-        contact_data['priority_score'] = contact_data.get('priority_score', '50')
-        contact_data['status'] = contact_data.get('status', 'Cold')
+            contact_data['id'] = str(new_id)
+            contact_data['last_contact'] = contact_data.get('last_contact', '')
+            contact_data['status'] = contact_data.get('status', 'Cold')
+            if 'priority_score' not in contact_data:
+                contact_data['priority_score'] = str(self.priorities.rescore(contact_data))
 
-        contacts.append(contact_data)
-        self.save_contacts(contacts)
-        return new_id
+            contacts.append(contact_data)
+            self.save_contacts(contacts)
+            self.cube.contact_saved(contact_data)
+            return new_id
 
     def search_contacts(self, query):
         """Search contacts by name or company"""
@@ -137,90 +184,107 @@ class ContactManager:
         return results
 
     def get_priority_contacts(self, limit=20):
-        """Get top priority contacts"""
-        contacts = self.load_contacts()
+        """Get top priority contacts (scored by the success model)"""
+        scores = self.priorities.scores()
 
         # Filter out closed/not interested
-        active = [c for c in contacts if c.get('status') not in
+        active = [c for c in self.cube.contacts() if c.get('status') not in
                  ['Committed/Closed', 'Not Interested']]
 
         # Sort by priority score (descending) and tier (ascending)
         sorted_contacts = sorted(
             active,
             key=lambda c: (
-                -float(c.get('priority_score', 50)),
+                -(scores.get(c['id']) or 0),
                 int(c.get('tier', 4))
             )
         )
 
-        return sorted_contacts[:limit]
+        return [{**c, 'priority_score': str(scores.get(c['id']) or 0)}
+                for c in sorted_contacts[:limit]]
 
     def log_interaction(self, contact_id, interaction_type, subject, notes='', outcome='', next_steps=''):
         """Log an interaction with a contact"""
-        interactions = []
-        if self.interactions_file.exists():
-            with open(self.interactions_file, 'r') as f:
-                reader = csv.DictReader(f)
-                interactions = list(reader)
+        with self.priorities.updating():
+            interactions = []
+            if self.interactions_file.exists():
+                with open(self.interactions_file, 'r') as f:
+                    reader = csv.DictReader(f)
+                    interactions = list(reader)
+
+            # Generate new ID
+            if interactions:
+                max_id = max(int(i['id']) for i in interactions if i['id'])
+                new_id = max_id + 1
+            else:
+                new_id = 1
+
+            interaction = {
+                'id': str(new_id),
+                'contact_id': str(contact_id),
+                'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'type': interaction_type,
+                'subject': subject,
+                'notes': notes,
+                'outcome': outcome,
+                'next_steps': next_steps
+            }
 
-        # Generate new ID
-        if interactions:
-            max_id = max(int(i['id']) for i in interactions if i['id'])
-            new_id = max_id + 1
-        else:
-            new_id = 1
-
-        interaction = {
-            'id': str(new_id),
-            'contact_id': str(contact_id),
-            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'type': interaction_type,
-            'subject': subject,
-            'notes': notes,
-            'outcome': outcome,
-            'next_steps': next_steps
-        }
-
-        interactions.append(interaction)
-
-        # Save interactions
-        with open(self.interactions_file, 'w', newline='') as f:
-            fieldnames = ['id', 'contact_id', 'date', 'type', 'subject', 'notes', 'outcome', 'next_steps']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(interactions)
+            interactions.append(interaction)
 
-        return new_id
+            # Save interactions
+            with open(self.interactions_file, 'w', newline='') as f:
+                fieldnames = ['id', 'contact_id', 'date', 'type', 'subject', 'notes', 'outcome', 'next_steps']
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(interactions)
+
+            self.cube.interaction_logged(interaction)
+            self.priorities.contact_touched(contact_id)
+            return new_id
 
 
 class NewcoCLI:
     """Main CLI application"""
 
-    def __init__(self):
-        self.contact_mgr = ContactManager()
-        self.email_gen = EmailGenerator()
-        self.pipeline_mgr = PipelineManager()
-        self.report_gen = ReportGenerator()
-        self.automation = AutomationEngine()
-        self.network_analysis = NetworkAnalysisEngine()
-        self.relationship_mgr = RelationshipManager()
-        self.analytics = AnalyticsEngine()
-        self.public_markets = PublicMarketsEngine()
-        self.investor_relations = InvestorRelations()
-        self.compliance = RegulatoryComplianceEngine()
-        self.portfolio = PortfolioManager()
-        self.manager_crm = ManagerCRM()
-        self.risk = RiskManager()
-        self.board = BoardReportGenerator()
-        self.lp_reporting = LPReportGenerator()
-        self.finance = FinancialModeler()
-        self.intel = CompetitiveIntelligence()
-        self.team = TeamManager()
-        self.governance = InstitutionalGovernance()
-        self.config = self.load_config()
+    email_gen = _Engine('email_generator', 'EmailGenerator')
+    pipeline_mgr = _Engine('pipeline_manager', 'PipelineManager')
+    report_gen = _Engine('reports', 'ReportGenerator')
+    automation = _Engine('automation', 'AutomationEngine', cached=True)
+    network_analysis = _Engine('network_analysis', 'NetworkAnalysisEngine')
+    relationship_mgr = _Engine('relationship_manager', 'RelationshipManager')
+    analytics = _Engine('analytics', 'AnalyticsEngine')
+    public_markets = _Engine('public_markets', 'PublicMarketsEngine')
+    investor_relations = _Engine('public_markets', 'InvestorRelations')
+    compliance = _Engine('regulatory_compliance', 'RegulatoryComplianceEngine')
+    portfolio = _Engine('portfolio_management', 'PortfolioManager')
+    manager_crm = _Engine('manager_crm', 'ManagerCRM')
+    risk = _Engine('risk_management', 'RiskManager')
+    board = _Engine('board_reporting', 'BoardReportGenerator')
+    lp_reporting = _Engine('lp_reporting', 'LPReportGenerator')
+    finance = _Engine('financial_modeling', 'FinancialModeler')
+    intel = _Engine('competitive_intelligence', 'CompetitiveIntelligence')
+    team = _Engine('team_management', 'TeamManager')
+    governance = _Engine('governance', 'InstitutionalGovernance')
+    jobs = _Engine('job_queue', 'JobQueue')
+
+    def __init__(self, cached=False):
+        """
+        Args:
+            cached: Serve contact reads from the shared, signature-checked
+                caches (see ContactManager); used by the CLI daemon
+        """
+        self.cached = cached
+        self.contact_mgr = ContactManager(cached=cached)
+        self._parsers = {}
+
+    @cached_property
+    def config(self):
+        return self.load_config()
 
     def load_config(self):
         """Load configuration"""
+        import yaml
         config_file = CONFIG_DIR / "config.yaml"
         if config_file.exists():
             with open(config_file, 'r') as f:
@@ -229,10 +293,55 @@ class NewcoCLI:
 
     def run(self):
         """Main entry point"""
+        startup_profile.begin('parser + argument parsing')
+        parser = self.build_parser()
+        args = parser.parse_args()
+        startup_profile.begin(f"command {args.command or ''} {getattr(args, 'subcommand', None) or ''}".strip())
+
+        if not args.command:
+            parser.print_help()
+            return
+
+        # Route to appropriate handler
+        handler = getattr(self, f'cmd_{args.command}', None)
+        if handler:
+            handler(args)
+        else:
+            print(f"Unknown command: {args.command}")
+            sys.exit(1)
+
+    def run_profiled(self, mode):
+        """run() under a profiler; the profile goes to reports/profiles/ (see profiling.py)"""
+        words = [arg for arg in sys.argv[1:] if not arg.startswith('-')][:2]
+        try:
+            session = profiling.begin(' '.join(['cli'] + words), mode)
+        except profiling.ProfileRefused as e:
+            print(f"⚠️  Not profiling: {e}", file=sys.stderr)
+            return self.run()
+        try:
+            self.run()
+        finally:
+            profile = session.finish(meta={'Command': ' '.join(sys.argv)})
+            print(f"\n📊 Profile ({mode}, {profile['seconds'] * 1000:.1f} ms):", file=sys.stderr)
+            for path in profile['files']:
+                print(f"   {path}", file=sys.stderr)
+
+    def build_parser(self):
+        """Argument parser for every command group (built once per program name and reused)"""
+        prog = Path(sys.argv[0]).name
+        if prog in self._parsers:
+            return self._parsers[prog]
+
         parser = argparse.ArgumentParser(
+            prog=prog,
             description='NEWCO GTM Management System',
             formatter_class=argparse.RawDescriptionHelpFormatter
         )
+        parser.add_argument(startup_profile.FLAG, action='store_true',
+                            help='Print an import-time breakdown of the startup to stderr')
+        parser.add_argument(profiling.FLAG, action='store_true',
+                            help=f"Profile the command (--profile=sample for a sampling profile) "
+                                 f"and write the profile to {profiling.PROFILES_DIR}")
 
         subparsers = parser.add_subparsers(dest='command', help='Commands')
 
@@ -296,19 +405,17 @@ class NewcoCLI:
         # Institutional governance commands
         self.setup_governance_commands(subparsers)
 
-        args = parser.parse_args()
+        # Background job commands
+        self.setup_jobs_commands(subparsers)
 
-        if not args.command:
-            parser.print_help()
-            return
+        # CLI daemon commands
+        self.setup_daemon_commands(subparsers)
 
-        # Route to appropriate handler
-        handler = getattr(self, f'cmd_{args.command}', None)
-        if handler:
-            handler(args)
-        else:
-            print(f"Unknown command: {args.command}")
-            sys.exit(1)
+        # Timing metrics
+        self.setup_stats_commands(subparsers)
+
+        self._parsers[prog] = parser
+        return parser
 
     def setup_contact_commands(self, subparsers):
         """Setup contact subcommands"""
@@ -415,6 +522,11 @@ class NewcoCLI:
         task_sub.add_parser('week', help='Show this week\'s tasks')
         task_sub.add_parser('overdue', help='Show overdue tasks')
 
+        priorities_parser = task_sub.add_parser(
+            'priorities', help='Apply priority changes from new activity and recency decay (daily)'
+        )
+        priorities_parser.add_argument('--full', action='store_true', help='Rescore every contact')
+
     def setup_report_commands(self, subparsers):
         """Setup report subcommands"""
         report_parser = subparsers.add_parser('report', help='Generate reports')
@@ -569,6 +681,8 @@ class NewcoCLI:
         elif args.subcommand == 'overdue':
             tasks = self.automation.get_overdue_tasks()
             self.print_tasks(tasks, "Overdue Tasks")
+        elif args.subcommand == 'priorities':
+            self.automation.recalculate_priorities(full=args.full)
 
     def cmd_report(self, args):
         """Handle report commands"""
@@ -671,6 +785,7 @@ class NewcoCLI:
         analytics_sub.add_parser('funnel', help='Show conversion funnel')
         analytics_sub.add_parser('stalled', help='Show stalled contacts')
         analytics_sub.add_parser('predictions', help='Show week 12 predictions')
+        analytics_sub.add_parser('train', help='Refit the success model on interaction history')
 
     def cmd_network(self, args):
         """Handle network analysis commands"""
@@ -826,6 +941,22 @@ class NewcoCLI:
                 print(f"  • {hp['name']} ({hp['company']}) - {hp['probability']:.0f}%")
             print()
 
+        elif args.subcommand == 'train':
+            model = self.analytics.model.fit()
+            print("\n🧠 SUCCESS MODEL")
+            print("=" * 60)
+            print(f"Source: {model['source']} | Examples: {model['examples']} "
+                  f"| Positives: {model['positives']} | Horizon: {model['horizon_days']} days")
+            if 'log_loss' in model:
+                print(f"Log loss: {model['log_loss']:.3f} | Brier: {model['brier']:.3f}")
+                print("\nCalibration (predicted vs observed):")
+                for row in model['calibration']:
+                    print(f"  {row['predicted']:>6.1%}  {row['observed']:>6.1%}  (n={row['count']})")
+            print("\nCoefficients:")
+            for feature, weight in self.analytics.model.coefficients.items():
+                print(f"  {feature:<20} {weight:+.3f}")
+            print()
+
     def setup_public_markets_commands(self, subparsers):
         """Setup public markets subcommands"""
         public_parser = subparsers.add_parser('public', help='Public markets (for publicly traded fund)')
@@ -1069,7 +1200,8 @@ class NewcoCLI:
                 print(f"  TVPI:         {fund['tvpi']:.2f}x")
                 print(f"  DPI:          {fund['dpi']:.2f}x")
                 print(f"  RVPI:         {fund['rvpi']:.2f}x")
-                print(f"  IRR:          {fund['irr']:.1f}%")
+                irr = 'n/a' if fund['irr'] is None else f"{fund['irr']:.1f}%"
+                print(f"  IRR:          {irr}")
             print()
 
         elif args.subcommand == 'cashflow':
@@ -1149,8 +1281,14 @@ class NewcoCLI:
         risk_sub.add_parser('dashboard', help='Show comprehensive risk dashboard')
         risk_sub.add_parser('concentration', help='Check concentration risk')
         risk_sub.add_parser('vintage', help='Analyze vintage year risk')
-        risk_sub.add_parser('liquidity', help='Check liquidity risk')
+        liquidity_parser = risk_sub.add_parser('liquidity', help='Check liquidity risk and run stress tests')
+        liquidity_parser.add_argument('--cash', type=float, help='Current cash balance')
+        liquidity_parser.add_argument('--facility', type=float, help='Credit facility size')
         risk_sub.add_parser('correlation', help='Analyze fund correlations')
+        refresh_parser = risk_sub.add_parser('refresh-correlations',
+                                             help='Recompute fund_correlations.csv from portfolio company holdings')
+        refresh_parser.add_argument('--method', default='auto', choices=['auto', 'exact', 'minhash'],
+                                    help='Overlap method (default: auto)')
         risk_sub.add_parser('governance', help='Governance compliance report')
 
     def cmd_risk(self, args):
@@ -1198,12 +1336,22 @@ class NewcoCLI:
             print()
 
         elif args.subcommand == 'liquidity':
-            result = self.risk.check_liquidity_risk()
+            result = self.risk.check_liquidity_risk(cash_balance=args.cash, credit_facility=args.facility)
+            stress = result['stress']
             print("\n💰 LIQUIDITY RISK CHECK")
             print("="*70)
+            print(f"Status: {result['status']}")
             print(f"Unfunded Commitments: ${result['unfunded_commitments']:,.0f}")
             print(f"12-Month Forecast: ${result['forecast_12m']:,.0f}")
             print(f"Required Cash Reserve: ${result['required_cash_reserve']:,.0f}")
+            if result['months_of_coverage'] is not None:
+                print(f"Months of Coverage: {result['months_of_coverage']}")
+
+            print(f"\nStress Tests: {stress['scenarios_run']} scenarios over {stress['horizon_months']} months")
+            print(f"  Breached: {stress['scenarios_breached']} "
+                  f"({stress['breached_within_12m']} within 12 months)")
+            if stress['worst_months_to_breach']:
+                print(f"  Fastest breach: month {stress['worst_months_to_breach']}")
 
             if result['recommendations']:
                 print(f"\nRecommendations:")
@@ -1225,6 +1373,10 @@ class NewcoCLI:
                     print(f"  • {rec}")
             print()
 
+        elif args.subcommand == 'refresh-correlations':
+            rows = self.risk.refresh_correlations(method=args.method)
+            print(f"✓ Wrote {rows} fund pair(s) to {self.risk.correlation_file}")
+
         elif args.subcommand == 'governance':
             self.risk.show_governance_report()
 
@@ -1377,6 +1529,23 @@ class NewcoCLI:
         cashflow_parser.add_argument('--years', type=int, default=3, help='Years to project')
         cashflow_parser.add_argument('--scenario', choices=['bull', 'base', 'bear'], default='base', help='Scenario')
 
+        # Monte Carlo simulation
+        simulate_parser = finance_sub.add_parser('simulate', help='Monte Carlo cash flow simulation')
+        simulate_parser.add_argument('--years', type=int, default=5, help='Years to project')
+        simulate_parser.add_argument('--paths', type=int, default=10000, help='Number of simulated paths')
+        simulate_parser.add_argument('--scenario', choices=['bull', 'base', 'bear'], default='base', help='Scenario')
+        simulate_parser.add_argument('--seed', type=int, help='Random seed (default from assumptions)')
+
+        # What-if / sensitivity
+        whatif_parser = finance_sub.add_parser('what-if', help='Vary one assumption (dotted path)')
+        whatif_parser.add_argument('parameter', help='Assumption path, e.g. management_fees.fee_rate')
+        whatif_parser.add_argument('values', type=float, nargs='+', help='Values to test')
+        whatif_parser.add_argument('--years', type=int, default=3, help='Years to project')
+
+        tornado_parser = finance_sub.add_parser('tornado', help='Tornado sensitivity table')
+        tornado_parser.add_argument('--years', type=int, default=3, help='Years to project')
+        tornado_parser.add_argument('--scenario', choices=['bull', 'base', 'bear'], default='base', help='Scenario')
+
         # Budget variance
         variance_parser = finance_sub.add_parser('variance', help='Budget vs actual variance')
         variance_parser.add_argument('--year', type=int, help='Year to analyze')
@@ -1422,6 +1591,34 @@ class NewcoCLI:
 
             print("\n" + "="*80 + "\n")
 
+        elif args.subcommand == 'simulate':
+            try:
+                self.finance.show_simulation(years=args.years, paths=args.paths,
+                                             scenario=args.scenario, seed=args.seed)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+
+        elif args.subcommand == 'what-if':
+            try:
+                results = self.finance.what_if_analysis(args.parameter, args.values, years=args.years)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+
+            print(f"\n📊 WHAT-IF: {args.parameter} ({args.years} years)")
+            print("="*80)
+            print(f"{'Value':<12} {'Capital Calls':>16} {'Distributions':>16} {'Net Cash Flow':>16} {'Ending NAV':>16}")
+            print("-"*80)
+            for r in results:
+                print(f"{r['parameter_value']:<12g} ${r['total_capital_calls']:>15,.0f} "
+                      f"${r['total_distributions']:>15,.0f} ${r['net_cashflow']:>15,.0f} "
+                      f"${r['ending_nav']:>15,.0f}")
+            print("\n" + "="*80 + "\n")
+
+        elif args.subcommand == 'tornado':
+            self.finance.show_tornado(years=args.years, scenario=args.scenario)
+
         elif args.subcommand == 'variance':
             self.finance.show_budget_variance(year=args.year)
 
@@ -1805,6 +2002,219 @@ class NewcoCLI:
                 next_steps=args.next_steps
             )
 
+    def setup_jobs_commands(self, subparsers):
+        """Setup background job subcommands"""
+        jobs_parser = subparsers.add_parser('jobs', help='Background jobs (long-running analyses)')
+        jobs_sub = jobs_parser.add_subparsers(dest='subcommand')
+
+        submit_parser = jobs_sub.add_parser('submit', help='Submit a job')
+        submit_parser.add_argument('kind', help='Job kind (board_deck, lp_letter, dd_memo, council_query, network_analysis)')
+        submit_parser.add_argument('--param', action='append', default=[], metavar='KEY=VALUE',
+                                   help='Job parameter (value parsed as JSON if possible); repeatable')
+        submit_parser.add_argument('--params-file', help='JSON file of job parameters')
+        submit_parser.add_argument('--wait', action='store_true', help='Wait for the result')
+
+        list_parser = jobs_sub.add_parser('list', help='List recent jobs')
+        list_parser.add_argument('--status', help='Filter by status')
+        list_parser.add_argument('--kind', help='Filter by kind')
+        list_parser.add_argument('--limit', type=int, default=20, help='Number of jobs')
+
+        status_parser = jobs_sub.add_parser('status', help='Show job status')
+        status_parser.add_argument('job_id', help='Job ID')
+
+        result_parser = jobs_sub.add_parser('result', help='Show job result')
+        result_parser.add_argument('job_id', help='Job ID')
+
+        cancel_parser = jobs_sub.add_parser('cancel', help='Cancel a queued or running job')
+        cancel_parser.add_argument('job_id', help='Job ID')
+
+        worker_parser = jobs_sub.add_parser('worker', help='Run a worker pool in the foreground')
+        worker_parser.add_argument('--workers', type=int, help='Jobs run at once (default: config jobs.workers)')
+
+    def cmd_jobs(self, args):
+        """Handle background job commands"""
+        if args.subcommand == 'submit':
+            params = {}
+            if args.params_file:
+                with open(args.params_file, 'r') as f:
+                    params.update(json.load(f))
+            for item in args.param:
+                key, _, value = item.partition('=')
+                try:
+                    params[key] = json.loads(value)
+                except ValueError:
+                    params[key] = value
+
+            try:
+                job, deduplicated = self.jobs.submit(args.kind, params)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            if deduplicated:
+                print(f"\n↺ Identical job already {job['status']}: {job['job_id']}")
+            else:
+                print(f"\n✓ Job queued: {job['job_id']}")
+
+            if args.wait:
+                print("Waiting for a worker (API server or `jobs worker`)...")
+                while job['status'] in ('queued', 'running'):
+                    time.sleep(1)
+                    job = self.jobs.get(job['job_id'])
+                self.print_job_result(job['job_id'])
+            print()
+
+        elif args.subcommand == 'list':
+            jobs = self.jobs.list(status=args.status, kind=args.kind, limit=args.limit)
+            print("\n⚙️  BACKGROUND JOBS")
+            print("=" * 80)
+            if not jobs:
+                print("No jobs found")
+            for job in jobs:
+                print(f"{job['job_id']}  {job['kind']:<18} {job['status']:<10} {job['created_at']}")
+            print()
+
+        elif args.subcommand == 'status':
+            job = self.jobs.get(args.job_id)
+            if not job:
+                print(f"Job not found: {args.job_id}")
+                sys.exit(1)
+            print(json.dumps(job, indent=2))
+
+        elif args.subcommand == 'result':
+            self.print_job_result(args.job_id)
+
+        elif args.subcommand == 'cancel':
+            job = self.jobs.cancel(args.job_id)
+            if not job:
+                print(f"Job not found: {args.job_id}")
+                sys.exit(1)
+            print(f"Job {job['job_id']}: {job['status']}")
+
+        elif args.subcommand == 'worker':
+            from job_queue import WorkerPool
+            pool = WorkerPool(self.jobs, workers=args.workers)
+            print(f"⚙️  Job worker pool running ({pool.workers} at a time). Ctrl+C to stop.")
+            print("   Jobs run here while no other pool (e.g. the API server) holds the supervisor lock.")
+            try:
+                pool.run_forever()
+            except KeyboardInterrupt:
+                print("\nStopped; running jobs were terminated and will be requeued.")
+
+    def setup_daemon_commands(self, subparsers):
+        """Setup CLI daemon subcommands"""
+        daemon_parser = subparsers.add_parser('daemon', help='Warm background CLI process (faster scripted calls)')
+        daemon_sub = daemon_parser.add_subparsers(dest='subcommand')
+        daemon_sub.add_parser('start', help='Start the daemon in the background')
+        daemon_sub.add_parser('stop', help='Stop the daemon')
+        daemon_sub.add_parser('status', help='Show daemon status')
+
+    def cmd_daemon(self, args):
+        """Handle CLI daemon commands"""
+        import cli_daemon
+
+        if args.subcommand == 'start':
+            print("Starting CLI daemon (warming engines and caches)...")
+            status = cli_daemon.start()
+            if not status:
+                print(f"✗ Daemon did not start; see {cli_daemon.LOG_FILE}")
+                sys.exit(1)
+            print(f"✓ CLI daemon running (pid {status['pid']}) on {status['socket']}")
+
+        elif args.subcommand == 'stop':
+            status = cli_daemon.stop()
+            print(f"✓ CLI daemon {status['pid']} stopped" if status else "CLI daemon is not running")
+
+        elif args.subcommand == 'status':
+            status = cli_daemon.status()
+            if not status:
+                print("CLI daemon is not running")
+                sys.exit(1)
+            print(json.dumps(status, indent=2))
+
+    def setup_stats_commands(self, subparsers):
+        """Setup metrics command"""
+        stats_parser = subparsers.add_parser(
+            'stats', help='Timing metrics: engine calls, CSV loads, LLM and API requests')
+        stats_parser.add_argument('--url', help='Read the API server\'s metrics (e.g. http://localhost:5001)')
+        stats_parser.add_argument('--prometheus', action='store_true', help='Print the Prometheus text format')
+        stats_parser.add_argument('--sort', choices=['total', 'mean', 'p95', 'max', 'count'], default='total',
+                                  help='Sort each table by (default: total)')
+        stats_parser.add_argument('--top', type=int, default=20, help='Rows per table')
+
+    def cmd_stats(self, args):
+        """Show timing metrics for this process (the CLI daemon, when running) or the API server"""
+        import metrics
+
+        if args.url:
+            import urllib.request
+            url = args.url.rstrip('/') + '/api/metrics' + ('' if args.prometheus else '?format=json')
+            try:
+                with urllib.request.urlopen(url, timeout=10) as response:
+                    body = response.read().decode()
+            except OSError as e:
+                print(f"Error: could not read {url}: {e}")
+                sys.exit(1)
+            if args.prometheus:
+                print(body, end='')
+                return
+            snapshot = json.loads(body)
+        elif args.prometheus:
+            print(metrics.render_prometheus(), end='')
+            return
+        else:
+            snapshot = metrics.snapshot()
+
+        self.print_metrics(snapshot, sort=args.sort, top=args.top)
+
+    def print_metrics(self, snapshot, sort='total', top=20):
+        """Print each histogram as a latency table and each counter's values"""
+        def ms(seconds):
+            return f"{seconds * 1000:.1f}"
+
+        sort_keys = {'total': lambda s: s['sum'], 'mean': lambda s: s['sum'] / s['count'],
+                     'p95': lambda s: s['p95'],
+                     'max': lambda s: s['max'], 'count': lambda s: s['count']}
+
+        print("\n⏱  TIMING METRICS")
+        print("=" * 100)
+        recorded = False
+        for name, family in snapshot.items():
+            if not family['series']:
+                continue
+            recorded = True
+            print(f"\n{family['help']} ({name})")
+            if family['type'] != 'histogram':
+                for series in family['series']:
+                    labels = ' '.join(value for _, value in sorted(series['labels'].items()))
+                    print(f"  {labels:<60} {series['value']:>10}")
+                continue
+            print(f"  {'':<46} {'calls':>8} {'total s':>9} {'mean ms':>9} {'p50 ms':>9} "
+                  f"{'p95 ms':>9} {'max ms':>9}")
+            rows = sorted(family['series'], key=sort_keys[sort], reverse=True)
+            for series in rows[:top]:
+                labels = ' '.join(value for _, value in sorted(series['labels'].items()))
+                print(f"  {labels[:46]:<46} {series['count']:>8} {series['sum']:>9.3f} "
+                      f"{ms(series['sum'] / series['count']):>9} {ms(series['p50']):>9} "
+                      f"{ms(series['p95']):>9} {ms(series['max']):>9}")
+            if len(rows) > top:
+                print(f"  ... {len(rows) - top} more (--top)")
+
+        if not recorded:
+            print("No timings recorded in this process. Start the CLI daemon (`daemon start`) to collect")
+            print("them across commands, or read the API server's with --url.")
+        print()
+
+    def print_job_result(self, job_id):
+        """Print a job's result, or its status if it has none"""
+        job = self.jobs.get(job_id, with_result=True)
+        if not job:
+            print(f"Job not found: {job_id}")
+            sys.exit(1)
+        if job['status'] != 'done':
+            print(f"Job {job_id} is {job['status']}" + (f": {job['error']}" if job['error'] else ''))
+            return
+        print(json.dumps(job['result'], indent=2))
+
     def print_tasks(self, tasks, title):
         """Print task list"""
         print(f"\n{title}")
@@ -1819,4 +2229,12 @@ class NewcoCLI:
 
 if __name__ == '__main__':
     cli = NewcoCLI()
-    cli.run()
+    try:
+        profile_mode = profiling.take_flag()
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(2)
+    if profile_mode:
+        cli.run_profiled(profile_mode)
+    else:
+        cli.run()
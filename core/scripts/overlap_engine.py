@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Overlap Engine - Look-Through Portfolio Company Overlap Between Funds
+
+Builds a sparse fund x company incidence matrix from portfolio company
+holdings and scores every fund pair at once:
+- Exact: the co-holding matrix A @ A.T, computed sparsely by expanding
+  each company's holders into fund pairs (cost = sum over companies of
+  holders^2, independent of the number of fund pairs with no overlap)
+- MinHash: when that expansion gets too large, per-fund MinHash sketches
+  estimate Jaccard similarity instead
+
+Scores:
+- jaccard: shared companies / companies held by either fund
+- weighted_overlap: cosine similarity of the funds' position weights
+  (valuation if known, otherwise equal weight)
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+MINHASH_PERMUTATIONS = 128
+MAX_EXACT_PAIR_WORK = 20_000_000   # fund pairs expanded before switching to MinHash
+MINHASH_MIN_JACCARD = 0.05         # MinHash pairs below this are dropped
+_HASH_PRIME = 4294967311           # smallest prime above 2^32
+
+
+def company_key(holding):
+    """Identify a company across funds by normalized name (ids are per-fund rows)"""
+    name = holding.get('company_name') or holding.get('company_id') or ''
+    return re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()
+
+
+class Incidence:
+    """Sparse fund x company matrix in coordinate form"""
+
+    def __init__(self, holdings, fund_ids=None):
+        fund_ids = list(fund_ids) if fund_ids is not None else sorted(
+            {h['fund_id'] for h in holdings if h.get('fund_id')}
+        )
+        fund_index = {fund_id: i for i, fund_id in enumerate(fund_ids)}
+        company_index = {}
+        cells = {}
+
+        for holding in holdings:
+            i = fund_index.get(holding.get('fund_id'))
+            key = company_key(holding)
+            if i is None or not key:
+                continue
+            j = company_index.setdefault(key, len(company_index))
+            try:
+                weight = float(holding.get('valuation_estimate') or 0)
+            except ValueError:
+                weight = 0.0
+            # Duplicate rows for the same fund/company collapse into one cell
+            cells[(i, j)] = cells.get((i, j), 0.0) + weight
+
+        self.fund_ids = fund_ids
+        self.companies = list(company_index)
+        self.rows = np.fromiter((i for i, _ in cells), dtype=np.int64, count=len(cells))
+        self.cols = np.fromiter((j for _, j in cells), dtype=np.int64, count=len(cells))
+        weights = np.fromiter(cells.values(), dtype=np.float64, count=len(cells))
+
+        # Funds without valuations fall back to equal weights
+        n_funds = len(fund_ids)
+        valued = np.bincount(self.rows, weights=(weights > 0).astype(np.float64), minlength=n_funds)
+        counts = np.bincount(self.rows, minlength=n_funds).astype(np.float64)
+        fully_valued = valued[self.rows] == counts[self.rows]
+        self.weights = np.where(fully_valued & (weights > 0), weights, 1.0)
+
+        self.sizes = counts
+        self.norms = np.sqrt(np.bincount(self.rows, weights=self.weights ** 2, minlength=n_funds))
+
+    @property
+    def pair_work(self):
+        """Number of fund pairs the exact product would expand"""
+        holders = np.bincount(self.cols, minlength=len(self.companies))
+        return int((holders * (holders - 1) // 2).sum())
+
+
+def exact_overlap(incidence):
+    """
+    Pairwise overlap via the sparse co-holding product A @ A.T
+
+    Returns:
+        Arrays (i, j, shared, jaccard, weighted) for fund pairs i < j that
+        share at least one company
+    """
+    n_funds = len(incidence.fund_ids)
+    order = np.argsort(incidence.cols, kind='stable')
+    cols = incidence.cols[order]
+    rows = incidence.rows[order]
+    weights = incidence.weights[order]
+
+    # Expand each company's holders into (fund, fund) pairs
+    starts = np.r_[0, np.flatnonzero(np.diff(cols)) + 1] if len(cols) else np.array([], dtype=np.int64)
+    lengths = np.diff(np.r_[starts, len(cols)])
+    pair_i, pair_j, pair_w = [], [], []
+    for k in np.unique(lengths[lengths > 1]):
+        group_starts = starts[lengths == k]
+        idx = group_starts[:, None] + np.arange(k)[None, :]       # (groups, k)
+        a, b = np.triu_indices(k, 1)
+        pair_i.append(rows[idx[:, a]].ravel())
+        pair_j.append(rows[idx[:, b]].ravel())
+        pair_w.append((weights[idx[:, a]] * weights[idx[:, b]]).ravel())
+
+    if not pair_i:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty, np.array([]), np.array([])
+
+    i = np.concatenate(pair_i)
+    j = np.concatenate(pair_j)
+    w = np.concatenate(pair_w)
+    lo, hi = np.minimum(i, j), np.maximum(i, j)
+
+    # Sum duplicates (the sparse product's reduction step)
+    keys = lo * n_funds + hi
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    shared = np.bincount(inverse).astype(np.int64)
+    dot = np.bincount(inverse, weights=w)
+    lo, hi = unique_keys // n_funds, unique_keys % n_funds
+
+    union = incidence.sizes[lo] + incidence.sizes[hi] - shared
+    jaccard = shared / union
+    weighted = dot / (incidence.norms[lo] * incidence.norms[hi])
+
+    return lo, hi, shared, jaccard, weighted
+
+
+def minhash_signatures(incidence, num_perm=MINHASH_PERMUTATIONS, seed=1):
+    """(funds, num_perm) MinHash signatures of each fund's company set"""
+    rng = np.random.default_rng(seed)
+    # Universal hashing h(x) = (a*x + b) mod p; with x < 2^32 and a < 2^31
+    # the arithmetic stays below 2^64
+    a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _HASH_PRIME, num_perm, dtype=np.uint64)
+
+    company_hash = np.array([zlib.crc32(c.encode('utf-8')) for c in incidence.companies],
+                            dtype=np.uint64)
+    hashed = (company_hash[incidence.cols][:, None] * a[None, :] + b[None, :]) \
+        % np.uint64(_HASH_PRIME)
+
+    signatures = np.full((len(incidence.fund_ids), num_perm), np.iinfo(np.uint64).max,
+                         dtype=np.uint64)
+    np.minimum.at(signatures, incidence.rows, hashed)
+    return signatures
+
+
+def minhash_overlap(incidence, num_perm=MINHASH_PERMUTATIONS, min_jaccard=MINHASH_MIN_JACCARD,
+                    block=256):
+    """
+    Estimated pairwise Jaccard from MinHash sketches
+
+    Returns the same arrays as exact_overlap; shared counts are estimated
+    from Jaccard and set sizes, weighted overlap is not available (NaN).
+    """
+    signatures = minhash_signatures(incidence, num_perm)
+    n_funds = len(incidence.fund_ids)
+    empty = incidence.sizes == 0
+    out_i, out_j, out_jac = [], [], []
+
+    for start in range(0, n_funds, block):
+        stop = min(start + block, n_funds)
+        # (block, funds) agreement fraction
+        agree = (signatures[start:stop, None, :] == signatures[None, :, :]).mean(axis=2)
+        ii, jj = np.nonzero(agree >= min_jaccard)
+        ii += start
+        keep = (ii < jj) & ~empty[ii] & ~empty[jj]
+        out_i.append(ii[keep])
+        out_j.append(jj[keep])
+        out_jac.append(agree[ii[keep] - start, jj[keep]])
+
+    i = np.concatenate(out_i) if out_i else np.array([], dtype=np.int64)
+    j = np.concatenate(out_j) if out_j else np.array([], dtype=np.int64)
+    jaccard = np.concatenate(out_jac) if out_jac else np.array([])
+
+    sizes = incidence.sizes[i] + incidence.sizes[j]
+    shared = np.rint(jaccard * sizes / (1 + jaccard)).astype(np.int64)
+    return i, j, shared, jaccard, np.full(len(i), np.nan)
+
+
+def compute_overlap(holdings, fund_ids=None, method='auto', max_pair_work=MAX_EXACT_PAIR_WORK):
+    """
+    Pairwise look-through overlap for every fund pair
+
+    Args:
+        holdings: Portfolio company rows (fund_id, company_name, valuation_estimate)
+        fund_ids: Funds to include (default: every fund in holdings)
+        method: 'exact', 'minhash' or 'auto' (exact unless the pair
+                expansion exceeds max_pair_work)
+
+    Returns:
+        List of dicts sorted by jaccard (highest first)
+    """
+    incidence = Incidence(holdings, fund_ids)
+
+    if method == 'auto':
+        method = 'exact' if incidence.pair_work <= max_pair_work else 'minhash'
+
+    if method == 'exact':
+        i, j, shared, jaccard, weighted = exact_overlap(incidence)
+    else:
+        i, j, shared, jaccard, weighted = minhash_overlap(incidence)
+
+    pairs = [
+        {
+            'fund_id_1': incidence.fund_ids[a],
+            'fund_id_2': incidence.fund_ids[b],
+            'shared_companies': int(s),
+            'jaccard': float(jac),
+            'weighted_overlap': None if np.isnan(w) else float(w),
+            'method': method
+        }
+        for a, b, s, jac, w in zip(i.tolist(), j.tolist(), shared, jaccard, weighted)
+    ]
+    pairs.sort(key=lambda p: p['jaccard'], reverse=True)
+    return pairs
+
+
+def look_through_exposure(holdings, commitments):
+    """
+    Share of total commitment exposed to each company, looking through funds
+
+    Each fund's commitment is spread equally over its companies.
+
+    Returns:
+        Dict of company key -> {'company_name', 'exposure', 'funds'}
+    """
+    total = sum(commitments.values())
+    if total <= 0:
+        return {}
+
+    companies_per_fund = {}
+    for holding in holdings:
+        if holding.get('fund_id') in commitments:
+            companies_per_fund.setdefault(holding['fund_id'], set()).add(company_key(holding))
+
+    exposure = {}
+    for holding in holdings:
+        fund_id = holding.get('fund_id')
+        key = company_key(holding)
+        if fund_id not in commitments or not key:
+            continue
+        entry = exposure.setdefault(key, {'company_name': holding.get('company_name', key),
+                                          'exposure': 0.0, 'funds': []})
+        if fund_id in entry['funds']:
+            continue
+        entry['funds'].append(fund_id)
+        entry['exposure'] += commitments[fund_id] / len(companies_per_fund[fund_id]) / total
+
+    return exposure
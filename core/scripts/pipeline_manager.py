@@ -7,10 +7,13 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from collections import Counter
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+@instrumented
 class PipelineManager:
     """Manage pipeline tracking and analytics"""
 
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Portfolio Aggregates - Incrementally Maintained Group-By Tables
+
+Commitment, called and paid-in capital grouped by fund, vintage, sector,
+manager, stage and geography. The tables are built once from the CSVs and
+then updated in place when PortfolioManager adds a fund or capital call,
+so risk checks never re-scan the raw files.
+
+Writes made outside this process are picked up by comparing file
+signatures: if the files changed behind our back, the tables are rebuilt.
+"""
+
+import threading
+from pathlib import Path
+
+# dimension -> fund column
+DIMENSIONS = {
+    'fund': 'fund_id',
+    'vintage': 'vintage_year',
+    'sector': 'sector_focus',
+    'manager': 'manager_name',
+    'stage': 'stage_focus',
+    'geography': 'geography'
+}
+
+FIELDS = ('commitment', 'called', 'paid_in')
+
+
+def _file_signature(path):
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _amount(value):
+    try:
+        return float(value or 0)
+    except ValueError:
+        return 0.0
+
+
+class PortfolioAggregates:
+    """Group-by tables over a PortfolioManager's funds and capital calls"""
+
+    def __init__(self, portfolio_manager):
+        self.pm = portfolio_manager
+        self.version = 0
+        self._lock = threading.RLock()
+        self._signature = None
+        self._tables = None
+        self._totals = None
+        self._fund_keys = {}       # fund_id -> {dimension: group key}
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def table(self, dimension):
+        """Dict of group key -> {'commitment', 'called', 'paid_in', 'count', 'funds'}"""
+        with self._lock:
+            self._ensure()
+            return self._tables[dimension]
+
+    def totals(self):
+        """Portfolio totals for each field, plus the fund count"""
+        with self._lock:
+            self._ensure()
+            return self._totals
+
+    def snapshot(self):
+        """(version, tables, totals) read consistently under the lock"""
+        with self._lock:
+            self._ensure()
+            return self.version, self._tables, self._totals
+
+    # ------------------------------------------------------------------
+    # Incremental updates (called by PortfolioManager after each write)
+    # ------------------------------------------------------------------
+
+    def fund_added(self, fund):
+        with self._lock:
+            if self._tables is None:
+                return  # Not built yet; the first read will scan the files
+            self._add_fund(fund)
+            self._mark_synced()
+
+    def capital_call_added(self, call):
+        with self._lock:
+            if self._tables is None:
+                return
+            self._add_call(call)
+            self._mark_synced()
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _sources(self):
+        return (self.pm.funds_file, self.pm.capital_calls_file)
+
+    def _ensure(self):
+        signature = tuple(_file_signature(path) for path in self._sources())
+        if self._tables is None or signature != self._signature:
+            self._rebuild(signature)
+
+    def _rebuild(self, signature):
+        self._tables = {dimension: {} for dimension in DIMENSIONS}
+        self._totals = {field: 0.0 for field in FIELDS}
+        self._totals['count'] = 0
+        self._fund_keys = {}
+
+        for fund in self.pm._load_csv(self.pm.funds_file):
+            self._add_fund(fund)
+        for call in self.pm._load_csv(self.pm.capital_calls_file):
+            self._add_call(call)
+
+        self._signature = signature
+        self.version += 1
+
+    def _mark_synced(self):
+        self._signature = tuple(_file_signature(path) for path in self._sources())
+        self.version += 1
+
+    def _add_fund(self, fund):
+        commitment = _amount(fund.get('commitment_amount'))
+        keys = {}
+
+        for dimension, column in DIMENSIONS.items():
+            key = fund.get(column, '')
+            if not key:
+                continue  # Unclassified funds don't count toward a group
+            keys[dimension] = key
+            group = self._tables[dimension].setdefault(
+                key, {'commitment': 0.0, 'called': 0.0, 'paid_in': 0.0, 'count': 0, 'funds': []}
+            )
+            group['commitment'] += commitment
+            group['count'] += 1
+            group['funds'].append(fund.get('fund_name', key))
+
+        self._fund_keys[fund['fund_id']] = keys
+        self._totals['commitment'] += commitment
+        self._totals['count'] += 1
+
+    def _add_call(self, call):
+        keys = self._fund_keys.get(call.get('fund_id'))
+        if keys is None:
+            return  # Call for an unknown fund
+
+        amount = _amount(call.get('amount'))
+        paid = amount if call.get('status') == 'Paid' else 0.0
+
+        for dimension, key in keys.items():
+            group = self._tables[dimension][key]
+            group['called'] += amount
+            group['paid_in'] += paid
+
+        self._totals['called'] += amount
+        self._totals['paid_in'] += paid
+
+
+_aggregates = {}
+_aggregates_lock = threading.Lock()
+
+
+def get_aggregates(portfolio_manager):
+    """Return the process-wide aggregates for a PortfolioManager's data files"""
+    key = str(portfolio_manager.funds_file)
+    with _aggregates_lock:
+        aggregates = _aggregates.get(key)
+        if aggregates is None:
+            aggregates = _aggregates[key] = PortfolioAggregates(portfolio_manager)
+        return aggregates
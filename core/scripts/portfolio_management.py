@@ -4,7 +4,7 @@ Portfolio Management System for VC Fund-of-Funds
 
 Tracks underlying fund investments:
 - Fund commitments and capital calls
-- NAV and performance metrics (TVPI, DPI, RVPI, IRR)
+- NAV and performance metrics (TVPI, DPI, RVPI, XIRR, TWR, PME)
 - Cash flow forecasting
 - Portfolio construction analysis
 - Risk and concentration monitoring
@@ -15,11 +15,22 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 import json
+import math
+from cashflow_ledger import CashFlowLedger, BenchmarkIndex
+from fund_metrics_view import get_view
+from portfolio_aggregates import get_aggregates
+from metrics import instrumented
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+def _pct_text(value):
+    """Percentage for display; 'n/a' when undefined (e.g. IRR with no cash flows)"""
+    return 'n/a' if value is None else f"{value:.1f}%"
+
+
+@instrumented
 class PortfolioManager:
     """Manage portfolio of fund investments"""
 
@@ -30,6 +41,8 @@ class PortfolioManager:
         self.fund_navs_file = DATA_DIR / "fund_navs.csv"
 
         self._initialize_files()
+        self.metrics_view = get_view(self)
+        self.aggregates = get_aggregates(self)
 
     def _initialize_files(self):
         """Initialize portfolio tracking files"""
@@ -79,6 +92,8 @@ class PortfolioManager:
 
         funds.append(fund)
         self._save_csv(self.funds_file, funds)
+        self.metrics_view.invalidate(fund_id)
+        self.aggregates.fund_added(fund)
 
         print(f"✓ Added fund: {fund_name} ({fund_id})")
         print(f"  Manager: {manager_name}")
@@ -106,6 +121,8 @@ class PortfolioManager:
 
         calls.append(call)
         self._save_csv(self.capital_calls_file, calls)
+        self.metrics_view.invalidate(fund_id)
+        self.aggregates.capital_call_added(call)
 
         return call_id
 
@@ -126,6 +143,7 @@ class PortfolioManager:
 
         dists.append(dist)
         self._save_csv(self.distributions_file, dists)
+        self.metrics_view.invalidate(fund_id)
 
         return dist_id
 
@@ -148,9 +166,82 @@ class PortfolioManager:
 
         navs.append(nav)
         self._save_csv(self.fund_navs_file, navs)
+        self.metrics_view.invalidate(fund_id)
 
         return nav_id
 
+    def build_cashflow_ledger(self, funds=None):
+        """Build the dated cash-flow ledger for all funds (one read per CSV)"""
+        if funds is None:
+            funds = self._load_csv(self.funds_file)
+
+        return CashFlowLedger.from_records(
+            funds,
+            self._load_csv(self.capital_calls_file),
+            self._load_csv(self.distributions_file),
+            self._load_csv(self.fund_navs_file)
+        )
+
+    def get_all_fund_metrics(self, funds=None, ledger=None):
+        """
+        Calculate metrics for every fund in one pass
+
+        IRRs are solved for all funds at once from the dated cash flows.
+
+        Returns:
+            Dict of fund_id -> metrics (see get_fund_metrics)
+        """
+        if funds is None:
+            funds = self._load_csv(self.funds_file)
+        if ledger is None:
+            ledger = self.build_cashflow_ledger(funds)
+
+        irrs = ledger.fund_irrs()
+        twrs = ledger.time_weighted_returns()
+        benchmark = BenchmarkIndex()
+        ks_pme, _ = ledger.ks_pme(benchmark)
+        pme_irrs = ledger.pme_irrs(benchmark)
+
+        def pct(value):
+            return None if math.isnan(value) else float(value) * 100
+
+        metrics = {}
+        for i, fund in enumerate(funds):
+            paid_in = float(ledger.paid_in[i])
+            distributions = float(ledger.distributions[i])
+            current_nav = float(ledger.nav[i])  # cost basis if no NAV mark
+            commitment = float(fund['commitment_amount'])
+
+            if paid_in > 0:
+                dpi = distributions / paid_in
+                rvpi = current_nav / paid_in
+                tvpi = dpi + rvpi
+            else:
+                dpi = rvpi = tvpi = 0
+
+            metrics[fund['fund_id']] = {
+                'fund_id': fund['fund_id'],
+                'fund_name': fund['fund_name'],
+                'manager': fund['manager_name'],
+                'commitment': commitment,
+                'paid_in': paid_in,
+                'unfunded': commitment - paid_in,
+                'distributions': distributions,
+                'current_nav': current_nav,
+                'tvpi': tvpi,
+                'dpi': dpi,
+                'rvpi': rvpi,
+                'irr': pct(irrs[i]),  # as percentage, None if undefined
+                'twr': pct(twrs[i]),
+                'ks_pme': None if math.isnan(ks_pme[i]) else float(ks_pme[i]),
+                'pme_irr': pct(pme_irrs[i]),
+                'vintage_year': fund['vintage_year'],
+                'stage': fund['stage_focus'],
+                'sector': fund['sector_focus']
+            }
+
+        return metrics
+
     def get_fund_metrics(self, fund_id):
         """
         Calculate key metrics for a fund
@@ -159,104 +250,25 @@ class PortfolioManager:
         - TVPI (Total Value / Paid In): Total value created
         - DPI (Distributions / Paid In): Cash returned
         - RVPI (Residual Value / Paid In): Unrealized value remaining
-        - IRR: Internal Rate of Return
+        - IRR: XIRR on dated calls, distributions and the latest NAV
+        - TWR: Time-weighted return between NAV marks
+        - KS-PME / PME IRR: Performance vs. the public benchmark index
 
         Formula: TVPI = DPI + RVPI
-        """
-        funds = self._load_csv(self.funds_file)
-        fund = next((f for f in funds if f['fund_id'] == fund_id), None)
-
-        if not fund:
-            return None
 
-        # Get capital calls (paid in capital)
-        calls = self._load_csv(self.capital_calls_file)
-        fund_calls = [c for c in calls if c['fund_id'] == fund_id and c['status'] == 'Paid']
-        paid_in = sum(float(c['amount']) for c in fund_calls)
-
-        # Get distributions
-        dists = self._load_csv(self.distributions_file)
-        fund_dists = [d for d in dists if d['fund_id'] == fund_id]
-        distributions = sum(float(d['amount']) for d in fund_dists)
-
-        # Get current NAV (most recent)
-        navs = self._load_csv(self.fund_navs_file)
-        fund_navs = [n for n in navs if n['fund_id'] == fund_id]
-        if fund_navs:
-            fund_navs_sorted = sorted(fund_navs, key=lambda x: x['nav_date'], reverse=True)
-            current_nav = float(fund_navs_sorted[0]['nav_value'])
-        else:
-            current_nav = paid_in  # Default to cost basis if no NAV
-
-        # Calculate metrics
-        if paid_in > 0:
-            dpi = distributions / paid_in
-            rvpi = current_nav / paid_in
-            tvpi = dpi + rvpi
-
-            # Simple IRR approximation (need cash flow timing for real IRR)
-            # Using holding period return as proxy
-            years_held = (datetime.now() - datetime.strptime(fund['commitment_date'], '%Y-%m-%d')).days / 365.25
-            if years_held > 0:
-                irr_approx = ((distributions + current_nav) / paid_in) ** (1 / years_held) - 1
-            else:
-                irr_approx = 0
-        else:
-            dpi = rvpi = tvpi = irr_approx = 0
-
-        return {
-            'fund_id': fund_id,
-            'fund_name': fund['fund_name'],
-            'manager': fund['manager_name'],
-            'commitment': float(fund['commitment_amount']),
-            'paid_in': paid_in,
-            'unfunded': float(fund['commitment_amount']) - paid_in,
-            'distributions': distributions,
-            'current_nav': current_nav,
-            'tvpi': tvpi,
-            'dpi': dpi,
-            'rvpi': rvpi,
-            'irr': irr_approx * 100,  # as percentage
-            'vintage_year': fund['vintage_year'],
-            'stage': fund['stage_focus'],
-            'sector': fund['sector_focus']
-        }
+        Served from the materialized metrics view; only funds whose cash
+        flows changed since the last build are recomputed.
+        """
+        return self.metrics_view.get(fund_id)
 
     def get_portfolio_summary(self):
-        """Get summary of entire portfolio"""
-        funds = self._load_csv(self.funds_file)
-
-        summary = {
-            'total_funds': len(funds),
-            'total_commitment': 0,
-            'total_paid_in': 0,
-            'total_unfunded': 0,
-            'total_distributions': 0,
-            'total_nav': 0,
-            'portfolio_tvpi': 0,
-            'portfolio_dpi': 0,
-            'portfolio_rvpi': 0,
-            'weighted_irr': 0,
-            'funds': []
-        }
+        """
+        Get summary of entire portfolio
 
-        for fund in funds:
-            metrics = self.get_fund_metrics(fund['fund_id'])
-            if metrics:
-                summary['total_commitment'] += metrics['commitment']
-                summary['total_paid_in'] += metrics['paid_in']
-                summary['total_unfunded'] += metrics['unfunded']
-                summary['total_distributions'] += metrics['distributions']
-                summary['total_nav'] += metrics['current_nav']
-                summary['funds'].append(metrics)
-
-        # Portfolio-level metrics
-        if summary['total_paid_in'] > 0:
-            summary['portfolio_dpi'] = summary['total_distributions'] / summary['total_paid_in']
-            summary['portfolio_rvpi'] = summary['total_nav'] / summary['total_paid_in']
-            summary['portfolio_tvpi'] = summary['portfolio_dpi'] + summary['portfolio_rvpi']
-
-        return summary
+        Portfolio IRR and KS-PME are computed from the pooled cash flows of
+        all funds, not aggregated from per-fund numbers.
+        """
+        return self.metrics_view.summary()
 
     def forecast_capital_calls(self, months=12):
         """
@@ -269,17 +281,17 @@ class PortfolioManager:
         - Year 4+: 10-20% of commitment
         """
         funds = self._load_csv(self.funds_file)
+        fund_metrics = self.metrics_view.all()
 
         forecast = []
         today = datetime.now()
 
         for fund in funds:
-            if fund['status'] != 'Active':
+            if fund['status'] != 'Active' or fund['fund_id'] not in fund_metrics:
                 continue
 
             commitment = float(fund['commitment_amount'])
-            metrics = self.get_fund_metrics(fund['fund_id'])
-            unfunded = metrics['unfunded'] if metrics else commitment
+            unfunded = fund_metrics[fund['fund_id']]['unfunded']
 
             if unfunded <= 0:
                 continue  # Fully deployed
@@ -436,13 +448,16 @@ class PortfolioManager:
         print(f"  TVPI (Total Value / Paid In):  {summary['portfolio_tvpi']:.2f}x")
         print(f"  DPI (Distributions / Paid In): {summary['portfolio_dpi']:.2f}x")
         print(f"  RVPI (Residual / Paid In):     {summary['portfolio_rvpi']:.2f}x")
+        print(f"  IRR (pooled cash flows):       {_pct_text(summary['portfolio_irr'])}")
+        if summary['portfolio_ks_pme'] is not None:
+            print(f"  KS-PME (vs. benchmark):        {summary['portfolio_ks_pme']:.2f}")
 
         # Top performers
         if summary['funds']:
             top_performers = sorted(summary['funds'], key=lambda x: x['tvpi'], reverse=True)[:5]
             print(f"\n⭐ TOP 5 PERFORMERS")
             for i, fund in enumerate(top_performers, 1):
-                print(f"  {i}. {fund['fund_name']:<30} TVPI: {fund['tvpi']:.2f}x  IRR: {fund['irr']:.1f}%")
+                print(f"  {i}. {fund['fund_name']:<30} TVPI: {fund['tvpi']:.2f}x  IRR: {_pct_text(fund['irr'])}")
 
         print("\n" + "="*80 + "\n")
 
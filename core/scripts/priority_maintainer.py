@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Priority Maintainer - Event-Driven Contact Priority Scores
+
+Priority scores come from the success model. The only input that changes
+with time is recency (days since last touch), and it only matters when it
+crosses a bucket boundary (7/14/30 days). So instead of rescoring every
+contact every day:
+
+- Events: ContactManager rescores a contact when it logs an interaction
+  or saves the contact (status updates, new contacts)
+- Sweep: a per-day index of boundary crossings (last touch + 8/15/31
+  days) lists the contacts whose recency bucket changes that day; the
+  sweep rescores only those, catching up on any days it missed
+
+Scores live in contacts.csv (priority_score). Event scores for saved
+contacts are written with the save; other changed scores are kept as
+pending in data/cache/priority_state.json and written back in one pass
+by refresh(). If the files changed outside ContactManager, or the model
+was retrained, everything is rescored once.
+"""
+
+import csv
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from interaction_cube import get_cube
+from success_model import RECENCY_EDGES, get_model
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+STATE_FILE = DATA_DIR / "cache" / "priority_state.json"
+
+STATE_VERSION = 1
+
+
+def _file_signature(path):
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _today():
+    """Today as days since the epoch"""
+    return int(np.datetime64(datetime.now().strftime('%Y-%m-%d'), 'D').astype(np.int64))
+
+
+class PriorityMaintainer:
+    """Keeps priority scores current with O(changed) work per event and per day"""
+
+    def __init__(self, contacts_file, interactions_file, state_file=None):
+        self.contacts_file = Path(contacts_file)
+        self.interactions_file = Path(interactions_file)
+        self.state_file = Path(state_file) if state_file else STATE_FILE
+        self.cube = get_cube(self.contacts_file, self.interactions_file)
+        self.model = get_model(self.contacts_file, self.interactions_file)
+        self._lock = threading.RLock()
+        self._state = None
+        self._touch = {}        # contact_id -> last touch (epoch day)
+        self._crossings = {}    # epoch day -> contact ids whose recency bucket changes that day
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def scores(self):
+        """contact_id -> priority score (0-100), swept through today"""
+        with self._lock:
+            self.sweep()
+            pending = self._state['pending']
+            return {c['id']: pending.get(c['id'], _score_value(c.get('priority_score')))
+                    for c in self.cube.contacts()}
+
+    # ------------------------------------------------------------------
+    # Events (called by ContactManager around its writes)
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def updating(self):
+        """
+        Wrap a ContactManager write: validate state against the files
+        before it, record the new file signatures after it
+        """
+        with self._lock:
+            self._ensure()
+            yield self
+            self._state['signature'] = self._signature()
+            self._save_state()
+
+    def rescore(self, contact):
+        """Score a contact row that the caller is about to save; returns the score"""
+        with self._lock:
+            score = self._rescore([contact])[contact['id']]
+            self._state['pending'].pop(contact['id'], None)
+            return score
+
+    def contact_touched(self, contact_id):
+        """An interaction was logged for a contact: rescore it from the current row"""
+        with self._lock:
+            contact = self.cube.contact(contact_id)
+            if contact is not None:
+                self._set_pending(contact, self._rescore([contact])[contact['id']])
+
+    # ------------------------------------------------------------------
+    # Sweep and write-back
+    # ------------------------------------------------------------------
+
+    def sweep(self, today=None):
+        """
+        Rescore contacts whose recency bucket changed since the last sweep
+
+        Returns:
+            Number of contacts rescored
+        """
+        with self._lock:
+            self._ensure()
+            today = _today() if today is None else today
+            swept_through = self._state['swept_through']
+            if today <= swept_through:
+                return 0
+
+            due = set()
+            for day in range(swept_through + 1, today + 1):
+                due |= self._crossings.pop(day, set())
+            self._state['swept_through'] = today
+
+            contacts = self.cube.contacts(due)
+            if contacts:
+                scores = self._rescore(contacts, today)
+                for contact in contacts:
+                    self._set_pending(contact, scores[contact['id']])
+
+            self._save_state()
+            return len(contacts)
+
+    def refresh(self, full=False):
+        """
+        Sweep (or rescore everything if full) and write pending scores to
+        contacts.csv in one pass
+
+        Returns:
+            Dict with 'rescored' and 'written' counts
+        """
+        with self._lock:
+            rescored = self._ensure()
+            if not rescored:
+                rescored = self._rescore_all() if full else self.sweep()
+            return {'rescored': rescored, 'written': self._write_back()}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _signature(self):
+        return [_file_signature(self.contacts_file), _file_signature(self.interactions_file)]
+
+    def _ensure(self):
+        """
+        Load state on first use; rescore everything if it no longer matches
+        the data. Returns the number of contacts rescored.
+        """
+        trained_at = self.model.ensure_fitted()['trained_at']
+        state = self._state if self._state is not None else self._load_state()
+        if state is not None and state['model'] == trained_at \
+                and state['signature'] == self._signature():
+            if self._state is None:
+                self._state = state
+                self._index(self.cube.contacts())
+            return 0
+
+        self._state = {'version': STATE_VERSION, 'model': trained_at, 'pending': {},
+                       'swept_through': _today(), 'signature': self._signature()}
+        rescored = self._rescore_all()
+        self._save_state()
+        return rescored
+
+    def _rescore_all(self):
+        contacts = self.cube.contacts()
+        self._touch, self._crossings = {}, {}
+        self._state['swept_through'] = _today()
+        scores = self._rescore(contacts)
+        self._state['pending'] = {}
+        for contact in contacts:
+            self._set_pending(contact, scores[contact['id']])
+        return len(contacts)
+
+    def _rescore(self, contacts, today=None):
+        """Score contacts (as of an epoch day, default today) and re-index their crossings"""
+        as_of = None if today is None else np.datetime64(today, 'D')
+        probabilities = self.model.predict(contacts, as_of)
+        self._index(contacts)
+        return {c['id']: int(round(p * 100)) for c, p in zip(contacts, probabilities)}
+
+    def _index(self, contacts):
+        """Record each contact's last touch and its upcoming bucket-boundary days"""
+        touch = self.model.last_touch(contacts)
+        days = np.where(np.isnat(touch), -1, touch.astype(np.int64)).tolist()
+        swept_through = self._state['swept_through']
+
+        for contact, day in zip(contacts, days):
+            contact_id = contact['id']
+            old = self._touch.pop(contact_id, None)
+            if old is not None:
+                for edge in RECENCY_EDGES:
+                    self._crossings.get(old + edge, set()).discard(contact_id)
+            if day < 0:
+                continue  # Never touched: recency can't change
+            self._touch[contact_id] = day
+            for edge in RECENCY_EDGES:
+                if day + edge > swept_through:
+                    self._crossings.setdefault(day + edge, set()).add(contact_id)
+
+    def _set_pending(self, contact, score):
+        if _score_value(contact.get('priority_score')) == score:
+            self._state['pending'].pop(contact['id'], None)
+        else:
+            self._state['pending'][contact['id']] = score
+
+    def _write_back(self):
+        pending = self._state['pending']
+        if not pending:
+            return 0
+
+        with open(self.contacts_file, 'r') as f:
+            contacts = list(csv.DictReader(f))
+        changed = []
+        for contact in contacts:
+            if contact['id'] in pending:
+                contact['priority_score'] = str(pending[contact['id']])
+                changed.append(contact)
+
+        if contacts:
+            with open(self.contacts_file, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=contacts[0].keys())
+                writer.writeheader()
+                writer.writerows(contacts)
+
+        self.cube.contacts_saved(changed)
+        self._state['pending'] = {}
+        self._state['signature'] = self._signature()
+        self._save_state()
+        return len(changed)
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('version') != STATE_VERSION:
+            return None
+        return state
+
+    def _save_state(self):
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(self._state, f)
+            tmp.replace(self.state_file)
+        except OSError:
+            pass  # Pending scores stay in memory; the next process rescores from scratch
+
+
+def _score_value(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+_maintainers = {}
+_maintainers_lock = threading.Lock()
+
+
+def get_maintainer(contacts_file, interactions_file):
+    """Return the process-wide priority maintainer for a contacts/interactions file pair"""
+    key = (str(contacts_file), str(interactions_file))
+    with _maintainers_lock:
+        maintainer = _maintainers.get(key)
+        if maintainer is None:
+            maintainer = _maintainers[key] = PriorityMaintainer(contacts_file, interactions_file)
+        return maintainer
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Profiling - On-Demand Profiles of CLI Commands and API Requests
+
+`newco_cli.py --profile <command>` profiles one command; an API request
+with the `X-Newco-Profile` header (or `?_profile=1`) profiles that
+request. Each profile is written to reports/profiles/ as:
+
+- <name>.collapsed: folded stacks ("outer;inner;leaf weight"), ready
+  for flamegraph.pl, inferno or speedscope
+- <name>.txt: top-N functions by cumulative and own time
+- <name>.prof: the pstats dump (cProfile mode), for pstats or snakeviz
+
+Modes:
+- cprofile (default): every call timed; folded stacks are rebuilt from
+  caller/callee times, so a function reached by several paths has its
+  time split between them in proportion to each caller's share
+- sample: the profiled thread's stack is sampled every few milliseconds;
+  exact stacks and low overhead, statistical times
+
+Guards, so a profiling flag can be left reachable in production:
+- One profile at a time per process
+- At most one profile per NEWCO_PROFILE_INTERVAL seconds (default 30)
+  across all processes sharing the profiles directory; a refused
+  request or command runs unprofiled
+- Only the newest NEWCO_PROFILE_KEEP profiles (default 50) are kept
+- API only: off by default. Setting NEWCO_PROFILE_TOKEN enables it for
+  requests that send the token in X-Newco-Profile-Token;
+  NEWCO_PROFILE_API=1 enables it without a token (trusted networks
+  only); NEWCO_PROFILE_API=0 keeps it off either way
+"""
+
+import io
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import metrics
+
+BASE_DIR = Path(__file__).parent.parent
+PROFILES_DIR = BASE_DIR / "reports" / "profiles"
+
+FLAG = '--profile'
+MODES = ('cprofile', 'sample')
+MIN_INTERVAL_SECONDS = float(os.environ.get('NEWCO_PROFILE_INTERVAL', 30))
+KEEP_PROFILES = int(os.environ.get('NEWCO_PROFILE_KEEP', 50))
+SAMPLE_INTERVAL = 0.005
+TOP_N = 40
+MAX_DEPTH = 128
+
+PROFILES = metrics.Counter('newco_profiles_total', 'Profiles requested, by outcome',
+                           ('source', 'outcome'))
+
+_active = threading.Lock()
+
+
+class ProfileRefused(Exception):
+    """A profile was requested but not started (rate limit, already profiling)"""
+
+    def __init__(self, reason, retry_after=None):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+# ----------------------------------------------------------------------
+# CLI flag
+# ----------------------------------------------------------------------
+
+def take_flag(argv=None):
+    """
+    Remove --profile / --profile=<mode> from argv
+
+    Returns:
+        The requested mode, or None if the flag is absent
+
+    Raises:
+        ValueError: Unknown mode
+    """
+    argv = sys.argv if argv is None else argv
+    mode = None
+    for arg in list(argv[1:]):
+        name, _, value = arg.partition('=')
+        if name == FLAG:
+            argv.remove(arg)
+            mode = value or MODES[0]
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"Unknown profile mode: {mode} (use {' or '.join(MODES)})")
+    return mode
+
+
+# ----------------------------------------------------------------------
+# Profilers
+# ----------------------------------------------------------------------
+
+class _CProfile:
+    def __init__(self):
+        import cProfile
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, stem, top):
+        import pstats
+
+        self.profile.dump_stats(f"{stem}.prof")
+        out = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=out)
+        _write_folded(f"{stem}.collapsed", _fold_pstats(stats.stats))
+        stats.sort_stats('cumulative').print_stats(top)
+        stats.sort_stats('tottime').print_stats(top)
+        return out.getvalue()
+
+
+class _Sampler:
+    """Samples one thread's stack from a background thread"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                code = frame.f_code
+                stack.append(_frame_name(code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def write(self, stem, top):
+        _write_folded(f"{stem}.collapsed", self.stacks)
+
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for name in set(stack):
+                total[name] += count
+        ms = self.interval * 1000
+        lines = [f"{self.samples} samples every {ms:g} ms\n",
+                 f"{'samples':>8} {'%':>6}  cumulative"]
+        lines += [f"{n:>8} {n / max(1, self.samples):>6.1%}  {name}" for name, n in total.most_common(top)]
+        lines += ['', f"{'samples':>8} {'%':>6}  own"]
+        lines += [f"{n:>8} {n / max(1, self.samples):>6.1%}  {name}" for name, n in own.most_common(top)]
+        return '\n'.join(lines) + '\n'
+
+
+def _frame_name(function, filename, line):
+    # Semicolons separate frames and the last space the weight in the folded format
+    return f"{function} ({os.path.basename(filename)}:{line})".replace(';', ',')
+
+
+def _pstats_name(func):
+    filename, line, function = func
+    if filename == '~':     # built-in
+        return function.replace(';', ',')
+    return _frame_name(function, filename, line)
+
+
+def _fold_pstats(stats):
+    """
+    Folded stacks (name tuple -> microseconds) from pstats caller/callee
+    times: each call edge gets its caller's time budget scaled by the
+    edge's share of the callee's cumulative time
+    """
+    children = defaultdict(list)
+    roots = []
+    for func, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            children[caller].append((func, edge[3]))
+
+    total = sum(stats[func][3] for func in roots) or 1.0
+    floor = total * 1e-5      # prune branches under 0.001% of the run
+    folded = Counter()
+
+    def walk(func, budget, path, names):
+        _, _, own, cumulative, _ = stats[func]
+        scale = budget / cumulative if cumulative else 0.0
+        names = names + (_pstats_name(func),)
+        if own * scale > 0:
+            folded[names] += own * scale * 1e6
+        if len(names) >= MAX_DEPTH:
+            return
+        path = path | {func}
+        for child, edge_cumulative in children.get(func, ()):
+            share = edge_cumulative * scale
+            if child not in path and share >= floor:
+                walk(child, share, path, names)
+
+    for root in roots:
+        walk(root, stats[root][3], frozenset(), ())
+    return folded
+
+
+def _write_folded(path, stacks):
+    with open(path, 'w') as f:
+        for stack, weight in sorted(stacks.items()):
+            weight = int(round(weight))
+            if weight > 0:
+                f.write(f"{';'.join(stack)} {weight}\n")
+
+
+# ----------------------------------------------------------------------
+# Guards
+# ----------------------------------------------------------------------
+
+def _claim_slot(directory, interval):
+    """Seconds until the next profile is allowed (0: allowed, and the slot is taken)"""
+    import fcntl
+
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / ".last_profile", 'a+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        try:
+            last = float(f.read().strip() or 0)
+        except ValueError:
+            last = 0.0
+        now = time.time()
+        if now < last + interval:
+            return last + interval - now
+        f.seek(0)
+        f.truncate()
+        f.write(repr(now))
+    return 0
+
+
+def _prune(directory, keep):
+    stems = defaultdict(list)
+    for path in directory.iterdir():
+        if path.suffix in ('.collapsed', '.txt', '.prof'):
+            stems[path.with_suffix('')].append(path)
+    newest = sorted(stems, key=lambda stem: max(p.stat().st_mtime for p in stems[stem]), reverse=True)
+    for stem in newest[keep:]:
+        for path in stems[stem]:
+            path.unlink(missing_ok=True)
+
+
+def api_allowed(token=None):
+    """
+    Whether an API request may ask for a profile
+
+    Opt-in: with NEWCO_PROFILE_TOKEN set the request must carry that token;
+    otherwise only NEWCO_PROFILE_API=1 allows it. NEWCO_PROFILE_API=0
+    always refuses.
+    """
+    flag = os.environ.get('NEWCO_PROFILE_API')
+    if flag == '0':
+        return False
+    required = os.environ.get('NEWCO_PROFILE_TOKEN')
+    if required:
+        import hmac
+        return hmac.compare_digest(str(token or ''), required)
+    return flag == '1'
+
+
+# ----------------------------------------------------------------------
+# Sessions
+# ----------------------------------------------------------------------
+
+class Session:
+    """One running profile; created by begin(), ended by finish()"""
+
+    def __init__(self, profiler, mode, label, source, directory):
+        self.profiler = profiler
+        self.mode = mode
+        self.label = label
+        self.source = source
+        self.directory = directory
+        self.started = time.perf_counter()
+        self.started_at = datetime.now()
+
+    def finish(self, meta=None, top=TOP_N):
+        """
+        Stop profiling and write the profile
+
+        Returns:
+            Dict with 'name', 'seconds' and the written 'files'
+        """
+        try:
+            self.profiler.stop()
+            seconds = time.perf_counter() - self.started
+            slug = re.sub(r'[^A-Za-z0-9_]+', '-', self.label).strip('-')[:80]
+            stamp = f"{self.started_at:%Y%m%d-%H%M%S}{self.started_at.microsecond // 1000:03d}"
+            name = f"{stamp}-{os.getpid()}-{slug or 'profile'}"
+            stem = self.directory / name
+
+            header = [f"Profile: {self.label}", f"Mode: {self.mode}",
+                      f"Started: {self.started_at.isoformat(timespec='seconds')}",
+                      f"Wall time: {seconds * 1000:.1f} ms"]
+            header += [f"{key}: {value}" for key, value in (meta or {}).items()]
+            summary = self.profiler.write(stem, top)
+            Path(f"{stem}.txt").write_text('\n'.join(header) + '\n\n' + summary)
+            _prune(self.directory, KEEP_PROFILES)
+        finally:
+            _active.release()
+
+        PROFILES.labels(self.source, 'written').inc()
+        files = sorted(str(path) for path in self.directory.glob(f"{name}.*"))
+        return {'name': name, 'seconds': round(seconds, 6), 'files': files}
+
+
+def begin(label, mode=MODES[0], source='cli', directory=None, interval=None):
+    """
+    Start profiling the calling thread
+
+    Raises:
+        ProfileRefused: Another profile is running in this process, or
+            the last one (in any process) was under `interval` seconds ago
+        ValueError: Unknown mode
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown profile mode: {mode} (use {' or '.join(MODES)})")
+    directory = Path(directory or PROFILES_DIR)
+    if not _active.acquire(blocking=False):
+        PROFILES.labels(source, 'busy').inc()
+        raise ProfileRefused("another profile is running in this process")
+    try:
+        wait = _claim_slot(directory, MIN_INTERVAL_SECONDS if interval is None else interval)
+        if wait:
+            PROFILES.labels(source, 'rate_limited').inc()
+            raise ProfileRefused(f"rate limited; next profile allowed in {wait:.0f}s", retry_after=wait)
+        profiler = _CProfile() if mode == 'cprofile' else _Sampler()
+        session = Session(profiler, mode, label, source, directory)
+        profiler.start()
+        return session
+    except BaseException:
+        _active.release()
+        raise
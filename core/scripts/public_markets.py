@@ -18,10 +18,13 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import json
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+@instrumented
 class PublicMarketsEngine:
     """Public markets tools for traded VC fund-of-funds"""
 
@@ -493,6 +496,7 @@ class PublicMarketsEngine:
             writer.writerows(data)
 
 
+@instrumented
 class InvestorRelations:
     """
     Investor Relations for Public + Private Investors
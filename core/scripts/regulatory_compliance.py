@@ -17,10 +17,13 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+@instrumented
 class RegulatoryComplianceEngine:
     """Regulatory compliance tracking"""
 
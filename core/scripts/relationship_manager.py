@@ -10,10 +10,13 @@ import csv
 from pathlib import Path
 from datetime import datetime
 
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+@instrumented
 class RelationshipManager:
     """Manage relationships between contacts"""
 
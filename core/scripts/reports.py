@@ -7,20 +7,43 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from collections import Counter
 
+from interaction_cube import get_cube
+from metrics import instrumented
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 REPORTS_DIR = BASE_DIR / "reports"
 
 
+def _top_priorities(contacts, scores, limit):
+    """
+    Open contacts by priority score (success probability, 0-100), then
+    tier; unscored contacts rank last
+    """
+    open_contacts = [c for c in contacts if c['status'] not in ['Committed/Closed', 'Not Interested']]
+    return sorted(
+        open_contacts,
+        key=lambda c: (-(scores.get(c['id']) or 0), int(c.get('tier', 4)))
+    )[:limit]
+
+
+@instrumented
 class ReportGenerator:
     """Generate various reports and dashboards"""
 
     def __init__(self):
         self.contacts_file = DATA_DIR / "contacts.csv"
         self.interactions_file = DATA_DIR / "interactions.csv"
+        self.cube = get_cube(self.contacts_file, self.interactions_file)
         self.reports_dir = REPORTS_DIR / "weekly"
         self.reports_dir.mkdir(parents=True, exist_ok=True)
 
+    @property
+    def priorities(self):
+        """Shared priority maintainer (includes sweep scores not yet written to contacts.csv)"""
+        from priority_maintainer import get_maintainer
+        return get_maintainer(self.contacts_file, self.interactions_file)
+
     def load_contacts(self):
         """Load all contacts"""
         contacts = []
@@ -43,25 +66,13 @@ class ReportGenerator:
         """Generate weekly markdown report"""
         today = datetime.now()
         week_start = today - timedelta(days=today.weekday())
-        week_end = week_start + timedelta(days=7)
-
-        # Get data
-        contacts = self.load_contacts()
-        interactions = self.load_interactions()
 
-        # Filter this week's interactions
-        week_interactions = []
-        for interaction in interactions:
-            try:
-                int_date = datetime.strptime(interaction['date'].split()[0], '%Y-%m-%d')
-                if week_start <= int_date < week_end:
-                    week_interactions.append(interaction)
-            except:
-                pass
+        # This week's interactions by type
+        activity = self.cube.interaction_counts(by=('type',), week=week_start.strftime('%Y-%m-%d'))
 
         # Generate report
         report = self.build_weekly_report_markdown(
-            week_start, contacts, week_interactions
+            week_start, self.cube.contacts(), activity, self.priorities.scores()
         )
 
         # Save report
@@ -71,14 +82,22 @@ class ReportGenerator:
         print(f"✓ Weekly report generated: {report_file}")
         print(f"\n{report}\n")
 
-    def build_weekly_report_markdown(self, week_start, contacts, interactions):
-        """Build weekly report in markdown format"""
+    def build_weekly_report_markdown(self, week_start, contacts, activity, scores):
+        """
+        Build weekly report in markdown format
+
+        Args:
+            week_start: Monday of the report week
+            contacts: Contact rows
+            activity: Counter of the week's interactions by type
+            scores: contact_id -> priority score (PriorityMaintainer.scores)
+        """
         week_str = week_start.strftime('%Y-%m-%d')
 
         # Calculate metrics
-        emails_sent = sum(1 for i in interactions if i['type'] == 'email_sent')
-        meetings = sum(1 for i in interactions if i['type'] == 'meeting')
-        calls = sum(1 for i in interactions if i['type'] == 'call')
+        emails_sent = activity['email_sent']
+        meetings = activity['meeting']
+        calls = activity['call']
 
         # Pipeline stats
         status_counts = Counter(c['status'] for c in contacts)
@@ -88,12 +107,7 @@ class ReportGenerator:
         ])
 
         # Top priorities
-        active_contacts = [c for c in contacts if c['status'] not in
-                          ['Committed/Closed', 'Not Interested']]
-        top_contacts = sorted(
-            active_contacts,
-            key=lambda c: (-float(c.get('priority_score', 50)), int(c.get('tier', 4)))
-        )[:10]
+        top_contacts = _top_priorities(contacts, scores, 10)
 
         report = f"""# NEWCO Weekly Report
 ## Week of {week_str}
@@ -102,7 +116,7 @@ class ReportGenerator:
 - **Emails Sent:** {emails_sent}
 - **Meetings:** {meetings}
 - **Calls:** {calls}
-- **Total Interactions:** {len(interactions)}
+- **Total Interactions:** {sum(activity.values())}
 
 ### Pipeline Overview
 - **Active Conversations:** {active}
@@ -139,8 +153,7 @@ class ReportGenerator:
 
     def show_dashboard(self):
         """Display CLI dashboard"""
-        contacts = self.load_contacts()
-        interactions = self.load_interactions()
+        contacts = self.cube.contacts()
 
         # Calculate current week number (simple calculation)
         start_date = datetime(2026, 1, 1)
@@ -149,31 +162,22 @@ class ReportGenerator:
 
         # Get this week's interactions
         week_start = today - timedelta(days=today.weekday())
-        week_end = week_start + timedelta(days=7)
-        week_interactions = []
-        for interaction in interactions:
-            try:
-                int_date = datetime.strptime(interaction['date'].split()[0], '%Y-%m-%d')
-                if week_start <= int_date < week_end:
-                    week_interactions.append(interaction)
-            except:
-                pass
+        activity = self.cube.interaction_counts(by=('type',), week=week_start.strftime('%Y-%m-%d'))
+        week_total = sum(activity.values())
 
         # Calculate metrics
-        emails_sent = sum(1 for i in week_interactions if i['type'] == 'email_sent')
-        meetings = sum(1 for i in week_interactions if i['type'] == 'meeting')
-
-        status_counts = Counter(c['status'] for c in contacts)
-        platform_convos = sum(1 for c in contacts if
-                            c['category'] == 'Platform Gatekeeper' and
-                            c['status'] in ['Meeting Completed', 'Active Conversation'])
+        emails_sent = activity['email_sent']
+        meetings = activity['meeting']
+
+        status_counts = self.cube.contact_counts(by=('status',))
+        platform_convos = sum(self.cube.contact_counts(
+            category='Platform Gatekeeper',
+            status=['Meeting Completed', 'Active Conversation']
+        ).values())
         lp_commits = status_counts.get('Committed/Closed', 0)
 
         # Top priorities
-        top_contacts = sorted(
-            [c for c in contacts if c['status'] not in ['Committed/Closed', 'Not Interested']],
-            key=lambda c: (-float(c.get('priority_score', 50)), int(c.get('tier', 4)))
-        )[:5]
+        top_contacts = _top_priorities(contacts, self.priorities.scores(), 5)
 
         # Overdue actions
         overdue = []
@@ -201,8 +205,8 @@ class ReportGenerator:
         print("│ This Week:" + " " * 51 + "│")
         print(f"│ ├─ Meetings: {meetings}" + " " * (49 - len(str(meetings))) + "│")
         print(f"│ ├─ Emails Sent: {emails_sent}" + " " * (45 - len(str(emails_sent))) + "│")
-        print(f"│ ├─ Total Interactions: {len(week_interactions)}" +
-              " " * (39 - len(str(len(week_interactions)))) + "│")
+        print(f"│ ├─ Total Interactions: {week_total}" +
+              " " * (39 - len(str(week_total))) + "│")
         print(f"│ └─ Overdue Actions: {len(overdue)}" + " " * (44 - len(str(len(overdue)))) + "│")
         print("│" + " " * 61 + "│")
         print("│ Top Priorities:" + " " * 46 + "│")
@@ -15,37 +15,72 @@ Key Risks:
 import csv
 from pathlib import Path
 from datetime import datetime, timedelta
-from collections import defaultdict
+import numpy as np
 from portfolio_management import PortfolioManager
+from overlap_engine import compute_overlap, look_through_exposure
+from risk_rules import RiskRuleEngine
+from liquidity_stress import (
+    scenario_grid, run_stress,
+    DEFAULT_ACCELERATIONS, DEFAULT_FREEZE_MONTHS, DEFAULT_DRAWDOWNS
+)
+from metrics import instrumented
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
+def _file_signature(path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@instrumented
 class RiskManager:
     """Portfolio risk monitoring and governance compliance"""
 
-    # Risk limits from investment policy
-    LIMITS = {
-        'single_fund_max': 0.15,      # 15% max in any single fund
-        'vintage_year_max': 0.30,     # 30% max in any vintage year
-        'sector_max': 0.40,           # 40% max in any sector
-        'top_3_funds_max': 0.40,      # 40% max in top 3 funds
+    # Risk limits from investment policy. Concentration limits are rules in
+    # config.yaml (risk.rules); these defaults cover the remaining checks.
+    DEFAULT_LIMITS = {
         'cash_reserve_min': 0.10,     # 10% min cash reserves
-        'min_fund_count': 10          # Minimum 10 fund investments
+        'single_company_max': 0.05,   # 5% max look-through exposure to one company
+        'fund_overlap_max': 0.30,     # 30% max company overlap between two funds
+    }
+
+    # Liquidity stress inputs (cash and facility can be overridden per call)
+    LIQUIDITY = {
+        'cash_balance': None,         # Unknown until provided
+        'credit_facility': 0,         # Facility commitment size
+        'facility_ltv': 0.25,         # Borrowing base: 25% of NAV
+        'distribution_yield': 0.10,   # Annual distributions / NAV if no recent history
+        'horizon_months': 24
     }
 
+    CORRELATION_FIELDS = ['fund_id_1', 'fund_id_2', 'shared_companies', 'overlap_score',
+                          'weighted_overlap', 'method', 'notes']
+
     def __init__(self):
         self.pm = PortfolioManager()
+        self.rules = RiskRuleEngine(self.pm.aggregates)
+        self._look_through = (None, None)   # (cache key, sorted exposures)
+        self._correlations = (None, None)   # (cache key, correlation rows)
         self.correlation_file = DATA_DIR / "fund_correlations.csv"
+        self.portfolio_companies_file = DATA_DIR / "portfolio_companies.csv"
         self.risk_events_file = DATA_DIR / "risk_events.csv"
         self._initialize_files()
 
+    @property
+    def LIMITS(self):
+        """Policy limits, with the current config.yaml rules over DEFAULT_LIMITS"""
+        return {**self.DEFAULT_LIMITS, **self.rules.limits}
+
     def _initialize_files(self):
         """Initialize risk tracking files"""
         if not self.correlation_file.exists():
             self.correlation_file.write_text(
-                "fund_id_1,fund_id_2,shared_companies,overlap_score,notes\n"
+                ",".join(self.CORRELATION_FIELDS) + "\n"
             )
 
         if not self.risk_events_file.exists():
@@ -54,112 +89,50 @@ class RiskManager:
             )
 
     def check_concentration_risk(self):
-        """Check portfolio concentration against limits"""
-        funds = self.pm._load_csv(self.pm.funds_file)
+        """
+        Check portfolio concentration against limits
+
+        Limits come from the declarative rules in config.yaml, evaluated
+        over the incrementally maintained portfolio aggregates.
+        """
+        totals = self.pm.aggregates.totals()
 
-        if not funds:
+        if not totals['count']:
             return {
                 'status': 'ALERT',
                 'message': 'No funds in portfolio',
                 'violations': []
             }
 
-        # Calculate total commitment
-        total_commitment = sum(float(f['commitment_amount']) for f in funds)
-
-        if total_commitment == 0:
+        if totals['commitment'] == 0:
             return {
                 'status': 'ALERT',
                 'message': 'No capital committed',
                 'violations': []
             }
 
-        violations = []
-        warnings = []
-
-        # Check 1: Fund count
-        fund_count = len(funds)
-        if fund_count < self.LIMITS['min_fund_count']:
-            violations.append({
-                'type': 'MIN_FUND_COUNT',
-                'severity': 'HIGH',
-                'message': f"Only {fund_count} funds (minimum {self.LIMITS['min_fund_count']})",
-                'limit': self.LIMITS['min_fund_count'],
-                'actual': fund_count
+        results = self.rules.evaluate()
+        violations = list(results['violations'])
+        warnings = list(results['warnings'])
+
+        # Look-through company concentration
+        limit = self.LIMITS['single_company_max']
+        top_companies = self._company_exposure()
+        for company in top_companies:
+            if company['exposure'] <= limit:
+                break
+            warnings.append({
+                'type': 'SINGLE_COMPANY',
+                'severity': 'MEDIUM',
+                'message': (f"{company['company_name']}: {company['exposure']:.1%} look-through "
+                            f"via {len(company['funds'])} fund(s) "
+                            f"(max {limit:.0%})"),
+                'company_name': company['company_name'],
+                'funds': company['funds'],
+                'limit': limit,
+                'actual': company['exposure']
             })
 
-        # Check 2: Single fund concentration
-        for fund in funds:
-            fund_pct = float(fund['commitment_amount']) / total_commitment
-            if fund_pct > self.LIMITS['single_fund_max']:
-                violations.append({
-                    'type': 'SINGLE_FUND',
-                    'severity': 'HIGH',
-                    'message': f"{fund['fund_name']}: {fund_pct:.1%} (max {self.LIMITS['single_fund_max']:.0%})",
-                    'fund_name': fund['fund_name'],
-                    'limit': self.LIMITS['single_fund_max'],
-                    'actual': fund_pct
-                })
-            elif fund_pct > self.LIMITS['single_fund_max'] * 0.9:
-                warnings.append({
-                    'type': 'SINGLE_FUND_WARNING',
-                    'severity': 'MEDIUM',
-                    'message': f"{fund['fund_name']}: {fund_pct:.1%} approaching limit",
-                    'fund_name': fund['fund_name'],
-                    'limit': self.LIMITS['single_fund_max'],
-                    'actual': fund_pct
-                })
-
-        # Check 3: Top 3 funds concentration
-        sorted_funds = sorted(funds, key=lambda x: float(x['commitment_amount']), reverse=True)
-        top_3_total = sum(float(f['commitment_amount']) for f in sorted_funds[:3])
-        top_3_pct = top_3_total / total_commitment
-
-        if top_3_pct > self.LIMITS['top_3_funds_max']:
-            violations.append({
-                'type': 'TOP_3_FUNDS',
-                'severity': 'HIGH',
-                'message': f"Top 3 funds: {top_3_pct:.1%} (max {self.LIMITS['top_3_funds_max']:.0%})",
-                'limit': self.LIMITS['top_3_funds_max'],
-                'actual': top_3_pct
-            })
-
-        # Check 4: Vintage year concentration
-        vintage_totals = defaultdict(float)
-        for fund in funds:
-            if fund['vintage_year']:
-                vintage_totals[fund['vintage_year']] += float(fund['commitment_amount'])
-
-        for vintage, amount in vintage_totals.items():
-            vintage_pct = amount / total_commitment
-            if vintage_pct > self.LIMITS['vintage_year_max']:
-                violations.append({
-                    'type': 'VINTAGE_YEAR',
-                    'severity': 'HIGH',
-                    'message': f"Vintage {vintage}: {vintage_pct:.1%} (max {self.LIMITS['vintage_year_max']:.0%})",
-                    'vintage': vintage,
-                    'limit': self.LIMITS['vintage_year_max'],
-                    'actual': vintage_pct
-                })
-
-        # Check 5: Sector concentration
-        sector_totals = defaultdict(float)
-        for fund in funds:
-            if fund['sector_focus']:
-                sector_totals[fund['sector_focus']] += float(fund['commitment_amount'])
-
-        for sector, amount in sector_totals.items():
-            sector_pct = amount / total_commitment
-            if sector_pct > self.LIMITS['sector_max']:
-                violations.append({
-                    'type': 'SECTOR',
-                    'severity': 'MEDIUM',
-                    'message': f"{sector}: {sector_pct:.1%} (max {self.LIMITS['sector_max']:.0%})",
-                    'sector': sector,
-                    'limit': self.LIMITS['sector_max'],
-                    'actual': sector_pct
-                })
-
         # Determine overall status
         if violations:
             status = 'VIOLATION'
@@ -170,69 +143,180 @@ class RiskManager:
 
         return {
             'status': status,
-            'fund_count': fund_count,
-            'total_commitment': total_commitment,
+            'fund_count': totals['count'],
+            'total_commitment': totals['commitment'],
             'violations': violations,
             'warnings': warnings,
-            'vintage_breakdown': dict(vintage_totals),
-            'sector_breakdown': dict(sector_totals)
+            'vintage_breakdown': {k: g['commitment'] for k, g in self.pm.aggregates.table('vintage').items()},
+            'sector_breakdown': {k: g['commitment'] for k, g in self.pm.aggregates.table('sector').items()},
+            'top_company_exposure': top_companies[:10]
         }
 
-    def check_liquidity_risk(self):
-        """Check ability to meet capital calls"""
-        funds = self.pm._load_csv(self.pm.funds_file)
-
-        # Calculate unfunded commitments
-        total_unfunded = 0
-        for fund in funds:
-            commitment = float(fund['commitment_amount'])
-            capital_calls = self.pm._load_csv(self.pm.capital_calls_file)
-            paid_in = sum(
-                float(call['amount'])
-                for call in capital_calls
-                if call['fund_id'] == fund['fund_id'] and call['status'] == 'Paid'
+    def _company_exposure(self):
+        """Look-through company exposure, cached until funds or holdings change"""
+        holdings_signature = (self.portfolio_companies_file.stat().st_mtime_ns
+                              if self.portfolio_companies_file.exists() else None)
+        key = (self.pm.aggregates.version, holdings_signature)
+
+        if self._look_through[0] != key:
+            commitments = {fund_id: group['commitment']
+                           for fund_id, group in self.pm.aggregates.table('fund').items()}
+            exposure = look_through_exposure(self._load_csv(self.portfolio_companies_file),
+                                             commitments)
+            ranked = sorted(exposure.values(), key=lambda e: e['exposure'], reverse=True)
+            # Version may have moved while we computed; the next call recomputes
+            self._look_through = (key, ranked)
+
+        return self._look_through[1]
+
+    def check_liquidity_risk(self, cash_balance=None, credit_facility=None):
+        """
+        Check ability to meet capital calls
+
+        Coverage and status come from the base liquidity scenario (forecast
+        calls, recent distribution pace, no NAV drawdown); the stress grid
+        shows how quickly liquidity runs out under adverse scenarios.
+        """
+        if cash_balance is None:
+            cash_balance = self.LIQUIDITY['cash_balance']
+
+        stress = self.stress_test_liquidity(cash_balance=cash_balance or 0,
+                                            credit_facility=credit_facility)
+        base = stress['base']
+        horizon = stress['horizon_months']
+
+        # Cash needed so the base scenario never breaches within 12 months
+        required_cash = max(0.0, (cash_balance or 0) - min(base['liquidity'][:12]))
+
+        if cash_balance is None:
+            status = 'MONITOR'  # No cash balance provided
+            months_of_coverage = None
+        else:
+            months_of_coverage = (base['months_to_breach'] - 1
+                                  if base['months_to_breach'] else horizon)
+            if base['months_to_breach'] and base['months_to_breach'] <= 12:
+                status = 'ALERT'
+            elif stress['breached_within_12m'] / max(stress['scenarios_run'], 1) > 0.25:
+                status = 'WARNING'
+            else:
+                status = 'OK'
+
+        recommendations = [f"Maintain ${required_cash:,.0f} cash reserve"]
+        if cash_balance is None:
+            recommendations.append("Provide cash balance to compute coverage")
+        if stress['breached_within_12m']:
+            recommendations.append(
+                f"{stress['breached_within_12m']} of {stress['scenarios_run']} stress "
+                f"scenarios breach within 12 months - review credit facility"
             )
-            total_unfunded += (commitment - paid_in)
-
-        # Forecast capital calls
-        forecast = self.pm.forecast_capital_calls(months=12)
-        total_forecast_12m = sum(f['amount'] for f in forecast)
-
-        # Assume we need to track cash separately
-        # For now, use a simple heuristic: should have 25% of 12m forecast
-        required_cash = total_forecast_12m * 0.25
+        recommendations.append("Monitor fund deployment pace")
 
         return {
-            'unfunded_commitments': total_unfunded,
-            'forecast_12m': total_forecast_12m,
+            'unfunded_commitments': stress['unfunded_commitments'],
+            'forecast_12m': sum(base['calls'][:12]),
             'required_cash_reserve': required_cash,
-            'months_of_coverage': None,  # Would need actual cash balance
-            'status': 'MONITOR',  # Would check against actual cash
-            'recommendations': [
-                f"Maintain ${required_cash:,.0f} cash reserve",
-                "Monitor fund deployment pace",
-                "Review credit facility if needed"
-            ]
+            'months_of_coverage': months_of_coverage,
+            'status': status,
+            'stress': stress,
+            'recommendations': recommendations
         }
 
-    def check_vintage_risk(self):
-        """Analyze vintage year exposure"""
-        funds = self.pm._load_csv(self.pm.funds_file)
+    def stress_test_liquidity(self, cash_balance=0, credit_facility=None, months=None,
+                              accelerations=DEFAULT_ACCELERATIONS,
+                              freeze_months=DEFAULT_FREEZE_MONTHS,
+                              drawdowns=DEFAULT_DRAWDOWNS):
+        """
+        Run the liquidity stress grid against cash and the credit facility
+
+        Args:
+            cash_balance: Cash on hand
+            credit_facility: Facility size (defaults to LIQUIDITY['credit_facility'])
+            months: Horizon in months
+            accelerations / freeze_months / drawdowns: Stress levels; every
+                combination is run
+
+        Returns:
+            Dictionary with the base scenario's monthly path, per-scenario
+            coverage / time-to-breach, and breach counts
+        """
+        if credit_facility is None:
+            credit_facility = self.LIQUIDITY['credit_facility']
+        if months is None:
+            months = self.LIQUIDITY['horizon_months']
+
+        summary = self.pm.get_portfolio_summary()
+        nav = summary['total_nav']
+        unfunded = max(summary['total_unfunded'], 0)
+
+        base_calls = np.zeros(months)
+        for call in self.pm.forecast_capital_calls(months=months):
+            base_calls[call['month'] - 1] += call['amount']
+
+        base_distributions = np.full(months, self._monthly_distribution_pace(nav))
+
+        accel, freeze, drawdown = scenario_grid(accelerations, freeze_months, drawdowns)
+        # Make sure the unstressed case is scenario 0
+        accel = np.concatenate([[1.0], accel])
+        freeze = np.concatenate([[0], freeze])
+        drawdown = np.concatenate([[0.0], drawdown])
+
+        result = run_stress(base_calls, base_distributions, unfunded, nav, cash_balance,
+                            credit_facility, self.LIQUIDITY['facility_ltv'],
+                            accel, freeze, drawdown)
+
+        def finite(values):
+            return [None if not np.isfinite(v) else float(v) for v in values]
+
+        breach = result['months_to_breach']
+        scenarios = [
+            {
+                'call_acceleration': float(accel[i]),
+                'distribution_freeze_months': int(freeze[i]),
+                'nav_drawdown': float(drawdown[i]),
+                'facility_available': float(result['facility_available'][i]),
+                'min_coverage': finite([result['coverage'][i].min()])[0],
+                'ending_liquidity': float(result['liquidity'][i, -1]),
+                'months_to_breach': int(breach[i]) if breach[i] > 0 else None
+            }
+            for i in range(1, len(accel))
+        ]
 
-        vintage_analysis = defaultdict(lambda: {
-            'commitment': 0,
-            'count': 0,
-            'funds': []
-        })
+        return {
+            'cash_balance': cash_balance,
+            'credit_facility': credit_facility,
+            'unfunded_commitments': unfunded,
+            'nav': nav,
+            'horizon_months': months,
+            'base': {
+                'calls': result['calls'][0].tolist(),
+                'distributions': result['distributions'][0].tolist(),
+                'liquidity': result['liquidity'][0].tolist(),
+                'coverage': finite(result['coverage'][0]),
+                'months_to_breach': int(breach[0]) if breach[0] > 0 else None
+            },
+            'scenarios_run': len(scenarios),
+            'scenarios_breached': int((breach[1:] > 0).sum()),
+            'breached_within_12m': int(((breach[1:] > 0) & (breach[1:] <= 12)).sum()),
+            'worst_months_to_breach': int(breach[1:][breach[1:] > 0].min()) if (breach[1:] > 0).any() else None,
+            'scenarios': scenarios
+        }
 
-        total_commitment = sum(float(f['commitment_amount']) for f in funds)
+    def _monthly_distribution_pace(self, nav):
+        """Trailing 12-month distribution pace, or a NAV yield if there's no recent history"""
+        cutoff = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        recent = sum(
+            float(d['amount'])
+            for d in self.pm._load_csv(self.pm.distributions_file)
+            if d.get('dist_date', '') >= cutoff
+        )
+        if recent > 0:
+            return recent / 12
+        return nav * self.LIQUIDITY['distribution_yield'] / 12
 
-        for fund in funds:
-            if fund['vintage_year']:
-                vintage = fund['vintage_year']
-                vintage_analysis[vintage]['commitment'] += float(fund['commitment_amount'])
-                vintage_analysis[vintage]['count'] += 1
-                vintage_analysis[vintage]['funds'].append(fund['fund_name'])
+    def check_vintage_risk(self):
+        """Analyze vintage year exposure"""
+        vintage_analysis = self.pm.aggregates.table('vintage')
+        total_commitment = self.pm.aggregates.totals()['commitment']
 
         # Add risk assessment for each vintage
         # 2020-2021 = peak bubble (high risk)
@@ -264,7 +348,7 @@ class RiskManager:
                 'commitment': data['commitment'],
                 'percentage': pct,
                 'count': data['count'],
-                'funds': data['funds'],
+                'funds': list(data['funds']),
                 'risk_level': risk_level
             }
 
@@ -291,17 +375,83 @@ class RiskManager:
 
         return recs
 
-    def analyze_correlation_risk(self):
-        """Analyze correlation between funds (portfolio company overlap)"""
-        # This would require portfolio company data from each fund
-        # For now, load any tracked correlations
+    def _correlation_rows(self, method='auto'):
+        """
+        Fund overlap rows: every fund pair sharing a company (overlap_score
+        = Jaccard), plus hand-entered rows for pairs the holdings data
+        doesn't cover. Computed in memory and cached until funds, holdings
+        or fund_correlations.csv change; nothing is written.
+        """
+        key = (self.pm.aggregates.version, _file_signature(self.portfolio_companies_file),
+               _file_signature(self.correlation_file), method)
+        if self._correlations[0] == key:
+            return self._correlations[1]
+
+        funds = self.pm._load_csv(self.pm.funds_file)
+        holdings = self._load_csv(self.portfolio_companies_file)
+        fund_ids = [f['fund_id'] for f in funds] or None
+
+        pairs = compute_overlap(holdings, fund_ids=fund_ids, method=method)
+        computed = {tuple(sorted((p['fund_id_1'], p['fund_id_2']))) for p in pairs}
+
+        rows = [
+            {
+                'fund_id_1': p['fund_id_1'],
+                'fund_id_2': p['fund_id_2'],
+                'shared_companies': str(p['shared_companies']),
+                'overlap_score': f"{p['jaccard']:.4f}",
+                'weighted_overlap': '' if p['weighted_overlap'] is None else f"{p['weighted_overlap']:.4f}",
+                'method': p['method'],
+                'notes': 'look-through'
+            }
+            for p in pairs
+        ]
+
+        for row in self._load_csv(self.correlation_file):
+            pair = tuple(sorted((row['fund_id_1'], row['fund_id_2'])))
+            if row.get('method') or pair in computed:
+                continue  # previously computed, or superseded by holdings data
+            rows.append({field: row.get(field, '') for field in self.CORRELATION_FIELDS})
+
+        self._correlations = (key, rows)
+        return rows
+
+    def refresh_correlations(self, method='auto'):
+        """
+        Recompute fund overlap from portfolio company holdings and write
+        it to fund_correlations.csv (`risk refresh-correlations`)
+
+        Returns:
+            Number of rows written
+        """
+        rows = self._correlation_rows(method)
 
-        correlations = self._load_csv(self.correlation_file)
+        tmp = self.correlation_file.with_suffix('.tmp')
+        with open(tmp, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.CORRELATION_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        tmp.replace(self.correlation_file)
+
+        return len(rows)
+
+    def analyze_correlation_risk(self):
+        """
+        Analyze correlation between funds (portfolio company overlap)
+
+        Read-only: overlap comes from the current holdings when there are
+        any, otherwise from fund_correlations.csv as stored.
+        """
+        if self.portfolio_companies_file.exists():
+            correlations = self._correlation_rows()
+        else:
+            correlations = self._load_csv(self.correlation_file)
 
         # Calculate high overlap pairs
+        overlap_max = self.LIMITS['fund_overlap_max']
         high_overlap = [
             c for c in correlations
-            if float(c.get('overlap_score', 0)) > 0.30
+            if float(c.get('overlap_score') or 0) > overlap_max
         ]
 
         return {
@@ -310,8 +460,8 @@ class RiskManager:
             'details': high_overlap,
             'status': 'HIGH' if high_overlap else 'LOW',
             'recommendations': [
-                "Track portfolio company overlap across funds",
-                "Avoid funds with >30% company overlap",
+                f"Avoid funds with >{overlap_max:.0%} company overlap",
+                "Review look-through exposure to companies held by several funds",
                 "Consider syndicate patterns in manager selection"
             ]
         }
@@ -403,7 +553,7 @@ class RiskManager:
 
         conc = dashboard['concentration']
         print(f"Status: {conc['status']}")
-        print(f"Fund Count: {conc['fund_count']} (minimum {self.LIMITS['min_fund_count']})")
+        print(f"Fund Count: {conc['fund_count']} (minimum {self.LIMITS.get('min_fund_count', 0)})")
 
         if conc['violations']:
             print(f"\n⚠️  VIOLATIONS ({len(conc['violations'])}):")
@@ -496,7 +646,7 @@ class RiskManager:
         # Check 1: Diversification requirements
         compliance_checks.append({
             'requirement': 'Minimum 10 fund investments',
-            'status': '✓ PASS' if conc['fund_count'] >= self.LIMITS['min_fund_count'] else '✗ FAIL',
+            'status': '✓ PASS' if conc['fund_count'] >= self.LIMITS.get('min_fund_count', 0) else '✗ FAIL',
             'actual': f"{conc['fund_count']} funds"
         })
 
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Risk Rules - Declarative Limit Checks over Portfolio Aggregates
+
+Each rule names a dimension (fund, vintage, sector, manager, ...), a
+measure and a limit. Measures are evaluated generically over the group-by
+tables in portfolio_aggregates, so a new limit is a config entry, not a
+new loop:
+
+    - id: manager_max
+      type: MANAGER
+      dimension: manager
+      measure: share          # group field / portfolio total
+      field: commitment
+      max: 0.25
+      warn_at: 0.9            # warn at 90% of the limit
+      severity: HIGH
+      label: "Manager {key}"
+
+Measures:
+- share: each group's share of the portfolio total (one result per group)
+- top_n_share: combined share of the n largest groups
+- count: number of groups in the dimension
+
+Rules are re-read when config.yaml changes, and results are cached per
+aggregates version and rules, so repeated dashboard reads cost nothing
+until a fund, capital call or limit changes.
+"""
+
+import threading
+from pathlib import Path
+
+import yaml
+
+CONFIG_FILE = Path(__file__).parent.parent / "config" / "config.yaml"
+
+# Used when config.yaml has no risk.rules section
+DEFAULT_RULES = [
+    {'id': 'min_fund_count', 'type': 'MIN_FUND_COUNT', 'dimension': 'fund',
+     'measure': 'count', 'min': 10, 'severity': 'HIGH', 'label': 'Fund count'},
+    {'id': 'single_fund_max', 'type': 'SINGLE_FUND', 'dimension': 'fund',
+     'measure': 'share', 'max': 0.15, 'warn_at': 0.9, 'severity': 'HIGH', 'label': '{name}'},
+    {'id': 'top_3_funds_max', 'type': 'TOP_3_FUNDS', 'dimension': 'fund',
+     'measure': 'top_n_share', 'n': 3, 'max': 0.40, 'severity': 'HIGH', 'label': 'Top 3 funds'},
+    {'id': 'vintage_year_max', 'type': 'VINTAGE_YEAR', 'dimension': 'vintage',
+     'measure': 'share', 'max': 0.30, 'severity': 'HIGH', 'label': 'Vintage {key}'},
+    {'id': 'sector_max', 'type': 'SECTOR', 'dimension': 'sector',
+     'measure': 'share', 'max': 0.40, 'severity': 'MEDIUM', 'label': '{key}'},
+]
+
+# Extra result field naming the group, per dimension (kept from the old checks)
+GROUP_FIELDS = {'fund': 'fund_name', 'vintage': 'vintage', 'sector': 'sector',
+                'manager': 'manager', 'stage': 'stage', 'geography': 'geography'}
+
+
+def load_rules(config_file=CONFIG_FILE):
+    """Risk rules from config.yaml (risk.rules), falling back to DEFAULT_RULES"""
+    if config_file.exists():
+        with open(config_file, 'r') as f:
+            config = yaml.safe_load(f) or {}
+        rules = (config.get('risk') or {}).get('rules')
+        if rules:
+            return rules
+    return DEFAULT_RULES
+
+
+def _share(table, totals, rule):
+    field = rule.get('field', 'commitment')
+    total = totals[field]
+    if total <= 0:
+        return
+    for key, group in table.items():
+        yield key, group, group[field] / total
+
+
+def _top_n_share(table, totals, rule):
+    field = rule.get('field', 'commitment')
+    total = totals[field]
+    if total <= 0:
+        return
+    top = sorted((group[field] for group in table.values()), reverse=True)[:rule.get('n', 3)]
+    yield None, None, sum(top) / total
+
+
+def _count(table, totals, rule):
+    yield None, None, len(table)
+
+
+MEASURES = {
+    'share': _share,
+    'top_n_share': _top_n_share,
+    'count': _count,
+}
+
+
+def _file_signature(path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class RiskRuleEngine:
+    """Evaluate declarative limits against portfolio aggregates"""
+
+    def __init__(self, aggregates, rules=None, config_file=CONFIG_FILE):
+        self.aggregates = aggregates
+        # Explicit rules are fixed; otherwise they follow config.yaml
+        self.config_file = None if rules is not None else Path(config_file)
+        self._rules = (None, rules)    # (config signature, rules)
+        self._lock = threading.Lock()
+        self._cache = (None, None)     # ((aggregates version, rules), results)
+
+    @property
+    def rules(self):
+        """Current rules, reloaded when config.yaml has changed"""
+        if self.config_file is None:
+            return self._rules[1]
+        signature = _file_signature(self.config_file)
+        with self._lock:
+            if self._rules[1] is None or self._rules[0] != signature:
+                self._rules = (signature, load_rules(self.config_file))
+            return self._rules[1]
+
+    @property
+    def limits(self):
+        """rule id -> limit value"""
+        return {rule['id']: rule.get('max', rule.get('min')) for rule in self.rules}
+
+    def evaluate(self):
+        """
+        Evaluate every rule
+
+        Returns:
+            Dict with 'violations' and 'warnings' lists and the aggregates
+            version they were computed from
+        """
+        version, tables, totals = self.aggregates.snapshot()
+        rules = self.rules
+
+        with self._lock:
+            cached_key, results = self._cache
+            if cached_key is not None and cached_key[0] == version and cached_key[1] is rules:
+                return results
+
+            violations, warnings = [], []
+            for rule in rules:
+                measure = MEASURES[rule.get('measure', 'share')]
+                for key, group, actual in measure(tables[rule['dimension']], totals, rule):
+                    finding = self._check(rule, key, group, actual)
+                    if finding is None:
+                        continue
+                    (warnings if finding['type'].endswith('_WARNING') else violations).append(finding)
+
+            results = {'violations': violations, 'warnings': warnings, 'version': version}
+            self._cache = ((version, rules), results)
+            return results
+
+    @staticmethod
+    def _check(rule, key, group, actual):
+        """Compare one measured value against a rule's limits"""
+        is_count = rule.get('measure') == 'count'
+        name = group['funds'][0] if group and group.get('funds') else key
+        label = rule.get('label', '{key}').format(key=key, name=name, n=rule.get('n', ''))
+        value = f"{actual}" if is_count else f"{actual:.1%}"
+
+        finding = {'severity': rule.get('severity', 'MEDIUM'), 'actual': actual}
+        if key is not None:
+            finding[GROUP_FIELDS.get(rule['dimension'], 'key')] = name if rule['dimension'] == 'fund' else key
+
+        if 'max' in rule:
+            limit = rule['max']
+            limit_text = f"{limit}" if is_count else f"{limit:.0%}"
+            if actual > limit:
+                return {**finding, 'type': rule['type'], 'limit': limit,
+                        'message': f"{label}: {value} (max {limit_text})"}
+            if 'warn_at' in rule and actual > limit * rule['warn_at']:
+                return {**finding, 'type': f"{rule['type']}_WARNING", 'severity': 'MEDIUM',
+                        'limit': limit, 'message': f"{label}: {value} approaching limit"}
+
+        if 'min' in rule:
+            limit = rule['min']
+            limit_text = f"{limit}" if is_count else f"{limit:.0%}"
+            if actual < limit:
+                return {**finding, 'type': rule['type'], 'limit': limit,
+                        'message': f"{label}: {value} (minimum {limit_text})"}
+
+        return None
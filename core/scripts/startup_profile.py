@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Startup Profile - Import-Time Breakdown for CLI Cold Starts
+
+`newco_cli.py --profile-startup <command>` times where a cold start goes:
+
+- Stages: top-level imports, argument parser setup, the command itself
+- Engines: import + construction of each engine the command touched
+- Imports: every module imported for the first time, cumulative (with
+  everything it imported) and self time, slowest first
+
+The breakdown is printed to stderr when the process exits, so the
+command's own output is unchanged.
+"""
+
+import atexit
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+
+FLAG = '--profile-startup'
+
+_original_import = builtins.__import__
+_active = False
+_started = None
+_stage = None            # (label, start)
+_stages = []             # (label, seconds)
+_engines = []            # (label, seconds)
+_imports = {}            # module -> (cumulative seconds, self seconds)
+_stack = []              # cumulative seconds of child imports, per open import
+
+
+def requested(argv=None):
+    return FLAG in (sys.argv if argv is None else argv)
+
+
+def start(stage='imports'):
+    """Start timing imports and stages; strips the flag from sys.argv"""
+    global _active, _started
+    if _active:
+        return
+    while FLAG in sys.argv:
+        sys.argv.remove(FLAG)
+    _active = True
+    _started = time.perf_counter()
+    builtins.__import__ = _timed_import
+    begin(stage)
+    atexit.register(report)
+
+
+def begin(label):
+    """Close the current stage and open a new one"""
+    global _stage
+    if not _active:
+        return
+    now = time.perf_counter()
+    if _stage is not None:
+        _stages.append((_stage[0], now - _stage[1]))
+    _stage = (label, now)
+
+
+@contextmanager
+def engine(label):
+    """Time importing and constructing one engine"""
+    if not _active:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _engines.append((label, time.perf_counter() - start))
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    _stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        _imports[name] = (elapsed, elapsed - children)
+
+
+def report(top=15, file=None):
+    """Print the breakdown (once) and stop timing imports"""
+    global _active
+    if not _active:
+        return
+    begin(None)
+    _active = False
+    builtins.__import__ = _original_import
+    out = file or sys.stderr
+    total = time.perf_counter() - _started
+
+    print("\n⏱  STARTUP PROFILE", file=out)
+    print("=" * 60, file=out)
+    print(f"{'Stage':<44} {'ms':>8}", file=out)
+    for label, seconds in _stages:
+        print(f"  {label:<42} {seconds * 1000:>8.1f}", file=out)
+    for label, seconds in _engines:
+        print(f"    engine {label:<33} {seconds * 1000:>8.1f}", file=out)
+    print(f"{'Total':<44} {total * 1000:>8.1f}", file=out)
+
+    if _imports:
+        slowest = sorted(_imports.items(), key=lambda item: -item[1][0])[:top]
+        print(f"\n{'Slowest imports':<36} {'cumul ms':>10} {'self ms':>10}", file=out)
+        for name, (cumulative, own) in slowest:
+            print(f"  {name:<34} {cumulative * 1000:>10.1f} {own * 1000:>10.1f}", file=out)
+        print(f"  {len(_imports)} modules imported", file=out)
+    print(file=out)
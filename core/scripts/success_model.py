@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Success Model - Logistic Regression over Contact Pipeline History
+
+Scores the probability that a contact is at the meeting stage or
+committed at the end of the horizon (default 30 days) without having
+been lost: cold contacts succeed by getting to a meeting, contacts in
+meetings by staying in play or committing, so hot prospects rank first. Analytics (success probability, week 12
+projections) and automation (priority scores) share the same model.
+
+Training data is reconstructed from interactions.csv: each interaction
+implies a stage (email_sent -> outreach, email_received/call -> engaged,
+meeting -> meeting) and the contact's current status adds a final stage.
+Along each contact's timeline we take snapshots 0/7/14/30/60 days after
+an interaction (until the next one) and label whether the contact was
+at the meeting stage or beyond, and not lost, by the end of the horizon.
+Snapshots whose horizon hasn't elapsed yet are dropped. The share of
+successful meeting-stage snapshots that committed is kept as commit_rate,
+so a success probability can be turned into expected commitments.
+
+The fit is L2-regularized toward PRIOR_WEIGHTS (the old hand-tuned point
+system, on the logit scale), so with little history the model behaves
+like the heuristic and moves toward observed conversion as data grows.
+Coefficients persist under data/cache and are refit when older than
+retrain_days.
+"""
+
+import csv
+import json
+import math
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from interaction_cube import get_cube
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+CONFIG_FILE = BASE_DIR / "config" / "config.yaml"
+MODEL_FILE = DATA_DIR / "cache" / "success_model.json"
+
+# Bump when the feature definitions change so persisted models are discarded
+MODEL_VERSION = 2
+
+DEFAULT_CONFIG = {
+    'horizon_days': 30,
+    'l2': 5.0,
+    'retrain_days': 7,
+    'min_examples': 50
+}
+
+# Pipeline stages: 0 cold, 1 outreach, 2 engaged, 3 meeting, 4 committed, 5 lost
+STAGES = ('cold', 'outreach', 'engaged', 'meeting', 'committed', 'lost')
+MEETING, COMMITTED, LOST = 3, 4, 5
+
+STATUS_STAGES = {
+    'Cold': 0,
+    'Warm Intro Requested': 1,
+    'Warm Intro Received': 1,
+    'Initial Outreach Sent': 1,
+    'Meeting Scheduled': 2,
+    'Active Conversation': 3,
+    'Meeting Completed': 3,
+    'Follow-up Sent': 3,
+    'Future Follow-up': 1,
+    'Committed/Closed': COMMITTED,
+    'Not Interested': LOST
+}
+
+INTERACTION_STAGES = {'email_sent': 1, 'email_received': 2, 'call': 2, 'meeting': 3}
+RESPONSE_TYPES = ('email_received', 'call', 'meeting')
+
+SNAPSHOT_OFFSETS = (0, 7, 14, 30, 60)
+RECENCY_EDGES = (8, 15, 31)       # days since last touch: <=7, <=14, <=30, older
+RECENCY_BUCKETS = ('recency_7', 'recency_14', 'recency_30', 'recency_stale', 'recency_none')
+
+FEATURES = (
+    ['intercept']
+    + [f"tier_{t}" for t in range(5)]
+    + [f"stage_{s}" for s in STAGES]
+    + list(RECENCY_BUCKETS)
+    + ['log_interactions', 'responded']
+)
+
+PRIOR_WEIGHTS = {
+    'intercept': -2.0,
+    'tier_0': 1.0, 'tier_1': 0.75, 'tier_2': 0.5, 'tier_3': 0.25,
+    'stage_outreach': 0.5, 'stage_engaged': 1.0, 'stage_meeting': 1.5,
+    'stage_committed': 3.0, 'stage_lost': -3.0,
+    'recency_7': 0.75, 'recency_14': 0.5, 'recency_30': 0.25, 'recency_stale': -0.25,
+    'log_interactions': 0.2,
+    'responded': 0.5
+}
+
+
+def load_config(config_file=CONFIG_FILE):
+    """analytics.success_model settings from config.yaml over DEFAULT_CONFIG"""
+    config = dict(DEFAULT_CONFIG)
+    if config_file.exists():
+        with open(config_file, 'r') as f:
+            settings = (yaml.safe_load(f) or {}).get('analytics') or {}
+        config.update(settings.get('success_model') or {})
+    return config
+
+
+TIER_INDEX = {str(t): t for t in range(5)}
+
+
+def _tier(value):
+    try:
+        return min(max(int(value), 0), 4)
+    except (TypeError, ValueError):
+        return 4
+
+
+def _day(value):
+    """Date part of a 'YYYY-MM-DD[ HH:MM:SS]' string as a date ordinal, or None"""
+    try:
+        return datetime.strptime(value.split()[0], '%Y-%m-%d').toordinal()
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def parse_dates(values):
+    """Vectorized YYYY-MM-DD parse to datetime64[D] (NaT for blanks or bad values)"""
+    values = [(v or '')[:10] or 'NaT' for v in values]
+    try:
+        return np.array(values, dtype='datetime64[D]')
+    except ValueError:
+        out = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[D]')
+        for i, value in enumerate(values):
+            try:
+                out[i] = np.datetime64(value, 'D')
+            except ValueError:
+                pass
+        return out
+
+
+def design_matrix(tier, stage, days_since, interactions, responded):
+    """
+    Feature matrix in FEATURES order
+
+    Args:
+        tier, stage: Integer arrays (tier 0-4, stage index into STAGES)
+        days_since: Days since last touch (NaN if never touched)
+        interactions: Interaction counts to date
+        responded: Whether the contact has ever responded
+    """
+    n = len(tier)
+    days_since = np.asarray(days_since, dtype=np.float64)
+    recency = np.where(np.isnan(days_since), len(RECENCY_BUCKETS) - 1,
+                       np.digitize(np.nan_to_num(days_since), RECENCY_EDGES))
+
+    X = np.zeros((n, len(FEATURES)))
+    rows = np.arange(n)
+    X[:, 0] = 1.0
+    X[rows, 1 + np.asarray(tier)] = 1.0
+    X[rows, 6 + np.asarray(stage)] = 1.0
+    X[rows, 6 + len(STAGES) + recency] = 1.0
+    X[:, -2] = np.log1p(np.asarray(interactions, dtype=np.float64))
+    X[:, -1] = np.asarray(responded, dtype=np.float64)
+    return X
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35, 35)))
+
+
+def fit_logistic(X, y, prior, l2, max_iter=50, tol=1e-8):
+    """Newton-Raphson fit of a logistic regression with an L2 pull toward prior"""
+    w = prior.copy()
+    penalty = l2 * np.eye(len(w))
+    for _ in range(max_iter):
+        p = _sigmoid(X @ w)
+        gradient = X.T @ (p - y) + l2 * (w - prior)
+        hessian = (X * (p * (1 - p))[:, None]).T @ X + penalty
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.max(np.abs(step)) < tol:
+            break
+    return w
+
+
+class SuccessModel:
+    """Trainable, batch-scored contact success probability"""
+
+    def __init__(self, contacts_file, interactions_file, model_file=None, config=None):
+        self.contacts_file = Path(contacts_file)
+        self.interactions_file = Path(interactions_file)
+        self.model_file = Path(model_file) if model_file else MODEL_FILE
+        self.config = config or load_config()
+        self.cube = get_cube(self.contacts_file, self.interactions_file)
+        self._lock = threading.RLock()
+        self._state = None
+        self._scores = (None, None)    # (cache key, contact_id -> probability)
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    @property
+    def coefficients(self):
+        return dict(zip(FEATURES, self._weights()))
+
+    def predict(self, contacts, today=None):
+        """
+        Success probabilities for a batch of contact rows
+
+        Returns:
+            Array of probabilities in [0, 1], one per contact
+        """
+        if not contacts:
+            return np.array([])
+        today = np.datetime64(datetime.now().strftime('%Y-%m-%d') if today is None else today, 'D')
+        activity = self.cube.activity_columns([c.get('id') for c in contacts], RESPONSE_TYPES)
+
+        tier = np.array([TIER_INDEX.get(str(c.get('tier')), 4) for c in contacts])
+        stage = np.array([STATUS_STAGES.get(c.get('status'), 0) for c in contacts])
+        interactions = np.array(activity['count'])
+        responded = sum(np.array(activity[kind]) for kind in RESPONSE_TYPES) > 0
+
+        last_touch = self.last_touch(contacts, activity)
+        days_since = np.where(np.isnat(last_touch), np.nan,
+                              (today - last_touch).astype(np.float64))
+
+        X = design_matrix(tier, stage, days_since, interactions, responded)
+        return _sigmoid(X @ self._weights())
+
+    def last_touch(self, contacts, activity=None):
+        """
+        Last touch per contact as datetime64[D]: last_contact or the latest
+        interaction, whichever is later (NaT if never touched)
+
+        Recency is the only time-dependent feature, so a contact's score
+        only changes with time when days since this date crosses one of
+        RECENCY_EDGES.
+        """
+        if activity is None:
+            activity = self.cube.activity_columns([c.get('id') for c in contacts])
+        last_contact = parse_dates([c.get('last_contact') for c in contacts])
+        return np.fmax(last_contact, parse_dates(activity['last']))
+
+    def scores(self):
+        """contact_id -> probability for every contact, cached per data version and day"""
+        with self._lock:
+            trained_at = self.ensure_fitted()['trained_at']
+            contacts = self.cube.contacts()
+            key = (self.cube.version, datetime.now().strftime('%Y-%m-%d'), trained_at)
+            cached_key, scores = self._scores
+            if cached_key == key:
+                return scores
+
+            probabilities = self.predict(contacts)
+            scores = {c['id']: float(p) for c, p in zip(contacts, probabilities)}
+            self._scores = (key, scores)
+            return scores
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    def training_set(self, today=None):
+        """(X, y, committed) snapshots reconstructed from interaction history"""
+        today = (today or datetime.now()).toordinal()
+        horizon = self.config['horizon_days']
+
+        interactions = []
+        if self.interactions_file.exists():
+            with open(self.interactions_file, 'r') as f:
+                interactions = list(csv.DictReader(f))
+
+        timelines = {}
+        for interaction in interactions:
+            day = _day(interaction.get('date'))
+            if day is None:
+                continue
+            kind = interaction.get('type', '')
+            timelines.setdefault(interaction.get('contact_id'), []).append(
+                (day, INTERACTION_STAGES.get(kind, 0), kind in RESPONSE_TYPES)
+            )
+
+        rows = []
+        for contact in self.cube.contacts():
+            events = sorted(timelines.get(contact['id'], []))
+            final_stage = STATUS_STAGES.get(contact.get('status'), 0)
+            if final_stage > max((e[1] for e in events), default=0):
+                # The current status is the last transition we know of
+                last_day = _day(contact.get('last_contact'))
+                if events:
+                    last_day = max(last_day or events[-1][0], events[-1][0])
+                if last_day is not None:
+                    events.append((last_day, final_stage, final_stage == COMMITTED))
+            rows.extend(self._snapshots(_tier(contact.get('tier')), events, horizon, today))
+
+        if not rows:
+            return np.zeros((0, len(FEATURES))), np.zeros(0), np.zeros(0, dtype=bool)
+        tier, stage, days_since, count, responded, label, committed = (np.array(col) for col in zip(*rows))
+        X = design_matrix(tier, stage, days_since, count, responded)
+        return X, label.astype(np.float64), committed
+
+    @staticmethod
+    def _snapshots(tier, events, horizon, today):
+        stage, responded = 0, False
+        for idx, (day, event_stage, response) in enumerate(events):
+            stage = max(stage, event_stage)
+            responded = responded or response
+            next_day = events[idx + 1][0] if idx + 1 < len(events) else math.inf
+            if next_day == day or stage in (COMMITTED, LOST):
+                continue  # Snapshot after the day's last event, and only while still open
+
+            for offset in SNAPSHOT_OFFSETS:
+                at = day + offset
+                if at >= next_day or at > today:
+                    break
+                if at + horizon > today:
+                    break  # Outcome not known yet
+                window = [s for d, s, _ in events[idx + 1:] if at < d <= at + horizon]
+                succeeded = max([stage] + window) >= MEETING and LOST not in window
+                yield tier, stage, offset, idx + 1, responded, succeeded, COMMITTED in window
+
+    def fit(self):
+        """
+        Fit the model on interaction history and persist the coefficients
+
+        Returns:
+            Dict with training summary (examples, positives, log loss, calibration)
+        """
+        with self._lock:
+            X, y, committed = self.training_set()
+            prior = np.array([PRIOR_WEIGHTS.get(f, 0.0) for f in FEATURES])
+
+            enough = len(y) >= self.config['min_examples'] and 0 < y.sum() < len(y)
+            weights = fit_logistic(X, y, prior, self.config['l2']) if enough else prior
+
+            state = {
+                'version': MODEL_VERSION,
+                'features': FEATURES,
+                'coefficients': weights.tolist(),
+                'source': 'fit' if enough else 'prior',
+                'trained_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'horizon_days': self.config['horizon_days'],
+                'examples': int(len(y)),
+                'positives': int(y.sum()),
+                'commit_rate': _commit_rate(X, y, committed)
+            }
+            if len(y):
+                p = np.clip(_sigmoid(X @ weights), 1e-12, 1 - 1e-12)
+                state['log_loss'] = float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+                state['brier'] = float(np.mean((p - y) ** 2))
+                state['calibration'] = _calibration(p, y)
+
+            self._state = state
+            self._save_state()
+            return state
+
+    def ensure_fitted(self):
+        """Load persisted coefficients, refitting if missing or older than retrain_days"""
+        with self._lock:
+            if self._state is None:
+                self._state = self._load_state()
+            if self._state is None or self._is_stale(self._state):
+                self.fit()
+            return self._state
+
+    def _weights(self):
+        return np.asarray(self.ensure_fitted()['coefficients'])
+
+    def _is_stale(self, state):
+        trained_at = datetime.strptime(state['trained_at'], '%Y-%m-%d %H:%M:%S')
+        return (datetime.now() - trained_at).days >= self.config['retrain_days']
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_state(self):
+        try:
+            with open(self.model_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('version') != MODEL_VERSION or state.get('features') != FEATURES:
+            return None
+        return state
+
+    def _save_state(self):
+        try:
+            self.model_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.model_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(self._state, f, indent=2)
+            tmp.replace(self.model_file)
+        except OSError:
+            pass  # Keep scoring with the in-memory coefficients
+
+
+def _commit_rate(X, y, committed):
+    """Share of successful meeting-stage snapshots that committed within the horizon"""
+    meeting = (X[:, FEATURES.index('stage_meeting')] == 1) & (y == 1)
+    return float(committed[meeting].mean()) if meeting.any() else 0.0
+
+
+def _calibration(p, y, bins=5):
+    """Mean predicted vs observed rate per probability quantile bin"""
+    order = np.argsort(p)
+    table = []
+    for idx in np.array_split(order, min(bins, len(p))):
+        table.append({'predicted': float(p[idx].mean()), 'observed': float(y[idx].mean()),
+                      'count': int(len(idx))})
+    return table
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_model(contacts_file, interactions_file):
+    """Return the process-wide success model for a contacts/interactions file pair"""
+    key = (str(contacts_file), str(interactions_file))
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            model = _models[key] = SuccessModel(contacts_file, interactions_file)
+        return model
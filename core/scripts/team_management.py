@@ -15,12 +15,14 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 from manager_crm import ManagerCRM
+from metrics import instrumented
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 TEAM_DIR = DATA_DIR / "team"
 
 
+@instrumented
 class TeamManager:
     """Team management and development tracking"""
 
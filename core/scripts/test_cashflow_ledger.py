@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Known-value tests for the batched XIRR solver
+
+Run with: python3 -m pytest core/scripts/test_cashflow_ledger.py
+"""
+
+import math
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).parent))
+from cashflow_ledger import RATE_CEILING, xirr, xirr_batch
+
+
+def test_one_year_round_trip():
+    rates = xirr_batch([0, 0], [0.0, 1.0], [-100.0, 110.0], 1)
+
+    assert rates[0] == pytest.approx(0.10, abs=1e-9)
+
+
+def test_dated_flows_use_actual_days():
+    # 2024 is a leap year: 366 days is slightly more than one year
+    rate = xirr([datetime(2024, 1, 1), datetime(2025, 1, 1)], [-100.0, 110.0])
+
+    assert rate == pytest.approx(1.1 ** (365 / 366) - 1, abs=1e-9)
+    assert rate == pytest.approx(0.0997, abs=1e-4)
+
+
+def test_no_sign_change_is_nan():
+    rates = xirr_batch([0, 0, 1, 1], [0.0, 1.0, 0.0, 1.0],
+                       [-100.0, -50.0, 100.0, 50.0], 2)
+
+    assert np.isnan(rates).all()
+
+
+def test_rate_above_ceiling_is_nan():
+    multiple = 10 * (1 + RATE_CEILING)
+    rates = xirr_batch([0, 0], [0.0, 1.0], [-1.0, multiple], 1)
+
+    assert np.isnan(rates[0])
+
+
+def test_empty_series_is_nan():
+    assert math.isnan(xirr([], []))
+
+
+def test_batch_matches_scalar():
+    series = [
+        ([datetime(2020, 1, 1), datetime(2021, 6, 30), datetime(2023, 3, 15)],
+         [-1000.0, 300.0, 1100.0]),
+        ([datetime(2019, 5, 1), datetime(2019, 11, 1), datetime(2024, 5, 1)],
+         [-500.0, -500.0, 800.0]),
+        ([datetime(2022, 1, 1), datetime(2022, 7, 1), datetime(2023, 1, 1), datetime(2025, 1, 1)],
+         [-200.0, -100.0, 50.0, 450.0]),
+        ([datetime(2021, 1, 1), datetime(2022, 1, 1)], [100.0, 100.0]),
+    ]
+    group, years, amounts = [], [], []
+    for index, (dates, flows) in enumerate(series):
+        start = min(dates)
+        group += [index] * len(dates)
+        years += [(d - start).days / 365.0 for d in dates]
+        amounts += flows
+
+    batched = xirr_batch(group, years, amounts, len(series))
+    scalar = np.array([xirr(dates, flows) for dates, flows in series])
+
+    np.testing.assert_allclose(batched, scalar, rtol=0, atol=1e-9)
+    assert batched[1] < 0 < batched[0]
+    assert np.isnan(batched[3])
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Document Chunking & Map-Reduce Pipeline - Metal.ai Inspired
+
+Long documents (LPAs, DD reports) don't fit in a local model's context
+window. This module splits them along their section structure, runs a
+per-chunk extraction concurrently, and caches each chunk's result by
+content hash so re-analyzing an amended document only re-processes the
+sections that changed. The reduce step condenses the chunk results in
+groups, round after round, until they fit in one prompt.
+"""
+
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BASE_DIR = Path(__file__).parent.parent.parent
+CACHE_DIR = BASE_DIR / "data" / "cache" / "document_chunks"
+
+DEFAULT_CHUNK_CHARS = 12000
+DEFAULT_MAX_WORKERS = 5
+MAX_REDUCE_ROUNDS = 4
+TRUNCATED_MARKER = "\n\n[... remaining notes truncated]"
+
+# Lines that start a new section: "ARTICLE IV", "Section 8.2", "12. Distributions",
+# markdown headings, or short ALL-CAPS headings
+SECTION_HEADING = re.compile(
+    r"^\s*(?:"
+    r"(?:ARTICLE|Article|SECTION|Section|SCHEDULE|Schedule|EXHIBIT|Exhibit|ANNEX|Annex)\s+[\dIVXLC]+[\w.]*"
+    r"|#{1,6}\s+\S"
+    r"|\d+(?:\.\d+)*\.?\s+[A-Z][^\n]{0,80}$"
+    r"|[A-Z][A-Z0-9 &,'/()-]{3,80}$"
+    r")"
+)
+
+
+def split_sections(text: str) -> List[str]:
+    """Split a document into sections at heading lines"""
+    sections = []
+    current = []
+
+    for line in text.splitlines(keepends=True):
+        if SECTION_HEADING.match(line) and any(l.strip() for l in current):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+
+    if any(l.strip() for l in current):
+        sections.append("".join(current))
+
+    return sections
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """Break a section larger than max_chars on paragraph, then line boundaries"""
+    pieces = []
+    buffer = ""
+
+    for paragraph in re.split(r"(\n\s*\n)", section):
+        if len(paragraph) > max_chars:
+            if buffer:
+                pieces.append(buffer)
+                buffer = ""
+            pieces.extend(paragraph[i:i + max_chars] for i in range(0, len(paragraph), max_chars))
+            continue
+        if len(buffer) + len(paragraph) > max_chars and buffer:
+            pieces.append(buffer)
+            buffer = ""
+        buffer += paragraph
+
+    if buffer:
+        pieces.append(buffer)
+
+    return pieces
+
+
+def chunk_document(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    Split a document into chunks of at most max_chars along section boundaries
+
+    Adjacent small sections are packed together; a section is only split
+    internally when it alone exceeds max_chars. Chunk boundaries therefore
+    stay stable when an unrelated section is edited, which keeps the
+    chunk cache effective across document amendments.
+    """
+    chunks = []
+    buffer = ""
+
+    for section in split_sections(text):
+        if len(section) > max_chars:
+            if buffer:
+                chunks.append(buffer)
+                buffer = ""
+            chunks.extend(_split_oversized(section, max_chars))
+            continue
+        if len(buffer) + len(section) > max_chars and buffer:
+            chunks.append(buffer)
+            buffer = ""
+        buffer += section
+
+    if buffer:
+        chunks.append(buffer)
+
+    return chunks
+
+
+def chunk_hash(chunk: str, task: str, model: str) -> str:
+    """Cache key: normalized chunk text plus the extraction task and model"""
+    normalized = re.sub(r"\s+", " ", chunk).strip()
+    return hashlib.sha256(f"{task}\x00{model}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+class ChunkCache:
+    """On-disk cache of per-chunk extraction results, keyed by chunk hash"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl_hours: Optional[float] = 24,
+                 enabled: bool = True):
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+        self.ttl = timedelta(hours=ttl_hours) if ttl_hours else None
+        self.enabled = enabled
+
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached result for a chunk, or None if missing/expired"""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl and datetime.now() - datetime.fromisoformat(entry['cached_at']) > self.ttl:
+            return None
+
+        return entry['result']
+
+    def put(self, key: str, result: str):
+        """Store a chunk result"""
+        if not self.enabled:
+            return
+
+        tmp = self._path(key).with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump({'cached_at': datetime.now().isoformat(), 'result': result}, f)
+        tmp.replace(self._path(key))
+
+
+def map_chunks(chunks: List[str], extract: Callable[[str], Optional[str]], task: str,
+               model: str, cache: Optional[ChunkCache] = None,
+               max_workers: int = DEFAULT_MAX_WORKERS) -> Dict:
+    """
+    Run extract(chunk) over all chunks concurrently, reusing cached results
+
+    extract returns the extraction text, or None on failure (failures are
+    not cached). Results are returned in document order.
+
+    Returns:
+        Dict with 'results' (list aligned with chunks) and 'stats'
+    """
+    results: List[Optional[str]] = [None] * len(chunks)
+    keys = [chunk_hash(chunk, task, model) for chunk in chunks]
+    pending = []
+
+    for i, key in enumerate(keys):
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append(i)
+
+    def run(i: int):
+        result = extract(chunks[i])
+        if result is not None and cache:
+            cache.put(keys[i], result)
+        return i, result
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+            for i, result in pool.map(run, pending):
+                results[i] = result
+
+    return {
+        'results': results,
+        'stats': {
+            'chunks': len(chunks),
+            'cached': len(chunks) - len(pending),
+            'processed': len(pending),
+            'failed': sum(1 for r in results if r is None)
+        }
+    }
+
+
+def group_by_chars(texts: List[str], max_chars: int, separator: str = "\n\n") -> List[List[str]]:
+    """
+    Pack consecutive texts into groups whose joined length stays within
+    max_chars; a text longer than max_chars gets a group of its own
+    """
+    groups: List[List[str]] = []
+    size = 0
+    for text in texts:
+        if groups and size + len(separator) + len(text) <= max_chars:
+            groups[-1].append(text)
+            size += len(separator) + len(text)
+        else:
+            groups.append([text])
+            size = len(text)
+    return groups
+
+
+def reduce_notes(notes: List[str], condense: Callable[[str], Optional[str]], task: str,
+                 model: str, max_chars: int = DEFAULT_CHUNK_CHARS,
+                 cache: Optional[ChunkCache] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS) -> Dict:
+    """
+    Hierarchical reduce: condense notes until their joined text fits max_chars
+
+    Each round groups consecutive notes up to max_chars and runs
+    condense(group_text) over the groups via map_chunks (so rounds are
+    cached too); the condensed notes feed the next round. A group whose
+    condensing fails keeps its notes. If a round doesn't shrink the
+    notes, or after MAX_REDUCE_ROUNDS, the text is cut at max_chars.
+
+    Returns:
+        Dict with 'content' (at most max_chars) and 'stats'
+    """
+    separator = "\n\n"
+    text = separator.join(notes)
+    rounds = failed = 0
+
+    while len(text) > max_chars and rounds < MAX_REDUCE_ROUNDS:
+        groups = [separator.join(group) for group in group_by_chars(notes, max_chars, separator)]
+        mapped = map_chunks(groups, condense, task=f"reduce:{task}", model=model,
+                            cache=cache, max_workers=max_workers)
+        rounds += 1
+        failed += mapped['stats']['failed']
+        condensed = [result.strip() if result else group
+                     for group, result in zip(groups, mapped['results'])]
+        if len(separator.join(condensed)) >= len(text):
+            break
+        notes = condensed
+        text = separator.join(notes)
+
+    truncated = len(text) > max_chars
+    if truncated:
+        text = text[:max_chars - len(TRUNCATED_MARKER)] + TRUNCATED_MARKER
+
+    return {'content': text, 'stats': {'rounds': rounds, 'failed': failed, 'truncated': truncated}}
@@ -15,7 +15,23 @@ from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent))
 from llm_service import LLMService
+from chunking import ChunkCache, chunk_document, map_chunks, reduce_notes, DEFAULT_CHUNK_CHARS
+
+# What the per-chunk extraction pass looks for, by document type
+EXTRACTION_FOCUS = {
+    'lpa': "fund size and term, investment period and extensions, management fee and "
+           "step-downs, carried interest, hurdle and catch-up, GP commitment, key person, "
+           "investment restrictions, governance and LPAC, GP removal, distribution "
+           "waterfall, LP information/co-invest/transfer rights, and any unusual or "
+           "GP-favorable provisions",
+    'dd_report': "executive conclusions, strengths, concerns and mitigants, track record "
+                 "(IRR, MOIC, DPI, vintages, exits, write-offs), team and compensation, "
+                 "sourcing and decision process, value-add, operations/compliance/reporting, "
+                 "reference checks, portfolio visits, competitive positioning, red flags "
+                 "and recommendations",
+}
 
 
 class DocumentIntelligence:
@@ -34,6 +50,79 @@ class DocumentIntelligence:
 
         self.models = self.config.get('models', {})
 
+        # Long-document (map-reduce) settings
+        documents = self.config.get('documents', {})
+        performance = self.config.get('performance', {})
+        cache = self.config.get('cache', {})
+
+        self.chunk_chars = documents.get('chunk_size_chars', DEFAULT_CHUNK_CHARS)
+        self.max_workers = (performance.get('max_concurrent_tasks', 5)
+                            if performance.get('parallel_processing', True) else 1)
+        self.chunk_cache = ChunkCache(ttl_hours=documents.get('chunk_cache_ttl_hours'),
+                                      enabled=cache.get('enabled', True))
+
+    def _prepare_long_document(self, content: str, doc_type: str) -> Dict[str, Any]:
+        """
+        Map step for documents longer than one chunk
+
+        Splits by section, extracts the relevant terms from each chunk
+        concurrently (cached by chunk hash), then condenses the notes in
+        groups until they fit one chunk, so the existing structured prompt
+        can run over the whole document.
+
+        Returns:
+            Dict with 'content' (text to put in the final prompt) and
+            'chunking' (stats, or None when the document fit in one chunk)
+        """
+        if len(content) <= self.chunk_chars:
+            return {'content': content, 'chunking': None}
+
+        model = self.models.get('document_extraction', 'deepseek-coder')
+        focus = EXTRACTION_FOCUS[doc_type]
+
+        def extract(chunk: str) -> Optional[str]:
+            prompt = f"""Extract every fact from this document excerpt that bears on: {focus}.
+
+Quote figures, percentages, dates and defined terms exactly and note the section
+reference. Be terse - bullet points only. If nothing in the excerpt is relevant,
+reply with exactly: NONE
+
+EXCERPT:
+{chunk}"""
+            result = self.llm_service.chat(prompt, model=model, temperature=0.1, max_tokens=2048)
+            return result['response'] if result.get('success') else None
+
+        chunks = chunk_document(content, self.chunk_chars)
+        mapped = map_chunks(chunks, extract, task=f"extract:{doc_type}", model=model,
+                            cache=self.chunk_cache, max_workers=self.max_workers)
+
+        notes = [
+            f"### Part {i} of {len(chunks)}\n{text.strip()}"
+            for i, text in enumerate(mapped['results'], 1)
+            if text and text.strip().upper() != 'NONE'
+        ]
+
+        def condense(group: str) -> Optional[str]:
+            prompt = f"""Merge these extraction notes from consecutive parts of one document
+into a single shorter set of notes on: {focus}.
+
+Keep every figure, percentage, date, defined term and section reference exactly;
+drop repetition and filler. Bullet points only.
+
+NOTES:
+{group}"""
+            result = self.llm_service.chat(prompt, model=model, temperature=0.1, max_tokens=2048)
+            return result['response'] if result.get('success') else None
+
+        header = (f"[Extracted notes covering all {len(chunks)} sections of the document; "
+                  f"{mapped['stats']['failed']} section(s) could not be processed]\n\n")
+        reduced = reduce_notes(notes, condense, task=doc_type, model=model,
+                               max_chars=self.chunk_chars - len(header),
+                               cache=self.chunk_cache, max_workers=self.max_workers)
+
+        return {'content': header + reduced['content'],
+                'chunking': dict(mapped['stats'], reduce=reduced['stats'])}
+
     def analyze_pitch_deck(self, deck_content: str, company_name: str = "Unknown") -> Dict[str, Any]:
         """
         Analyze a pitch deck and extract key information
@@ -113,6 +202,10 @@ Format the response as structured JSON."""
         """
         Analyze a Limited Partnership Agreement (LPA) and extract key terms
 
+        LPAs longer than one chunk are processed map-reduce style: each
+        section is extracted separately and only changed sections are
+        re-sent to the model on re-analysis.
+
         Args:
             lpa_content: Text content of the LPA
             fund_name: Name of the fund
@@ -120,10 +213,12 @@ Format the response as structured JSON."""
         Returns:
             Dict with extracted information
         """
+        prepared = self._prepare_long_document(lpa_content, 'lpa')
+
         prompt = f"""Analyze this Limited Partnership Agreement (LPA) for {fund_name} and extract key terms.
 
 LPA CONTENT:
-{lpa_content}
+{prepared['content']}
 
 Please provide a structured analysis covering:
 
@@ -191,13 +286,16 @@ Format the response as structured JSON where possible."""
             'timestamp': datetime.now().isoformat(),
             'analysis': result['response'],
             'model_used': result['model'],
-            'document_type': 'lpa'
+            'document_type': 'lpa',
+            'chunking': prepared['chunking']
         }
 
     def analyze_dd_report(self, report_content: str, manager_name: str = "Unknown") -> Dict[str, Any]:
         """
         Analyze a due diligence report and extract key findings
 
+        Long reports are chunked by section the same way as analyze_lpa.
+
         Args:
             report_content: Text content of the DD report
             manager_name: Name of the manager
@@ -205,10 +303,12 @@ Format the response as structured JSON where possible."""
         Returns:
             Dict with extracted information
         """
+        prepared = self._prepare_long_document(report_content, 'dd_report')
+
         prompt = f"""Analyze this due diligence report for {manager_name} and extract key findings.
 
 DUE DILIGENCE REPORT:
-{report_content}
+{prepared['content']}
 
 Please provide a structured analysis covering:
 
@@ -284,7 +384,8 @@ Format the response as structured analysis."""
             'timestamp': datetime.now().isoformat(),
             'analysis': result['response'],
             'model_used': result['model'],
-            'document_type': 'dd_report'
+            'document_type': 'dd_report',
+            'chunking': prepared['chunking']
         }
 
     def extract_key_metrics(self, document_content: str, doc_type: str = 'general') -> Dict[str, Any]:
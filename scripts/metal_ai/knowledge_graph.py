@@ -11,7 +11,10 @@ from typing import Dict, Any, Optional
 import yaml
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent))
 from llm_service import LLMService
+from chunking import ChunkCache, chunk_document, map_chunks, reduce_notes, DEFAULT_CHUNK_CHARS
+from retrieval import Retriever, format_records, NUMPY_AVAILABLE
 
 
 class KnowledgeGraph:
@@ -29,15 +32,105 @@ class KnowledgeGraph:
 
         self.models = self.config.get('models', {})
 
-    def search(self, query: str, context_data: str = "") -> Dict[str, Any]:
-        """Natural language search across all data"""
+        documents = self.config.get('documents', {})
+        performance = self.config.get('performance', {})
+        self.chunk_chars = documents.get('chunk_size_chars', DEFAULT_CHUNK_CHARS)
+        self.max_workers = (performance.get('max_concurrent_tasks', 5)
+                            if performance.get('parallel_processing', True) else 1)
+        self.chunk_cache = ChunkCache(ttl_hours=documents.get('chunk_cache_ttl_hours'),
+                                      enabled=self.config.get('cache', {}).get('enabled', True))
+
+        self.retrieval_config = self.config.get('retrieval', {})
+        self._retriever = None
+
+    @property
+    def retriever(self) -> Retriever:
+        """Vector retriever over the platform's data files (built on first use)"""
+        if self._retriever is None:
+            self._retriever = Retriever(self.retrieval_config)
+        return self._retriever
+
+    def _retrieved_context(self, query: str, top_k: Optional[int] = None) -> Dict[str, Any]:
+        """Top-k records from the embedding index, formatted as prompt context"""
+        top_k = top_k or self.retrieval_config.get('top_k', 20)
+        records = self.retriever.retrieve(query, top_k)
+        return {
+            'content': format_records(records),
+            'records': [{'id': r['id'], 'score': round(r['score'], 4)} for r in records]
+        }
+
+    def _relevant_context(self, query: str, context_data: str) -> Dict[str, Any]:
+        """
+        Reduce context larger than one chunk to the facts relevant to the query
+
+        Each chunk is filtered concurrently (cached by chunk hash + query),
+        so the whole context is considered instead of only its first chunk;
+        the filtered facts are then condensed until they fit one chunk.
+        """
+        if len(context_data) <= self.chunk_chars:
+            return {'content': context_data, 'chunking': None}
+
+        model = self.models.get('graph_search', 'mistral')
+
+        def extract(chunk: str) -> Optional[str]:
+            prompt = f"""From the data below, copy out every record or fact that could help answer:
+
+QUERY: {query}
+
+Keep names, figures and dates exactly as written. If nothing is relevant,
+reply with exactly: NONE
+
+DATA:
+{chunk}"""
+            result = self.llm_service.chat(prompt, model=model, temperature=0.1, max_tokens=2048)
+            return result['response'] if result.get('success') else None
+
+        chunks = chunk_document(context_data, self.chunk_chars)
+        mapped = map_chunks(chunks, extract, task=f"search:{query}", model=model,
+                            cache=self.chunk_cache, max_workers=self.max_workers)
+
+        relevant = [text.strip() for text in mapped['results']
+                    if text and text.strip().upper() != 'NONE']
+
+        def condense(group: str) -> Optional[str]:
+            prompt = f"""Merge these extracted facts into one shorter list, keeping only what
+could help answer:
+
+QUERY: {query}
+
+Keep names, figures and dates exactly as written.
+
+FACTS:
+{group}"""
+            result = self.llm_service.chat(prompt, model=model, temperature=0.1, max_tokens=2048)
+            return result['response'] if result.get('success') else None
+
+        reduced = reduce_notes(relevant, condense, task=f"search:{query}", model=model,
+                               max_chars=self.chunk_chars, cache=self.chunk_cache,
+                               max_workers=self.max_workers)
+
+        return {'content': reduced['content'],
+                'chunking': dict(mapped['stats'], reduce=reduced['stats'])}
+
+    def search(self, query: str, context_data: str = "", top_k: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Natural language search across all data
+
+        With explicit context_data the text is used directly (filtered chunk
+        by chunk when large). Otherwise the top_k most relevant records are
+        retrieved from the embedding index over the whole dataset.
+        """
+        if context_data or not NUMPY_AVAILABLE or not self.retrieval_config.get('enabled', True):
+            context = self._relevant_context(query, context_data)
+        else:
+            context = self._retrieved_context(query, top_k)
 
         prompt = f"""Answer this query using the available data:
 
 QUERY: {query}
 
 AVAILABLE DATA:
-{context_data[:8000]}...
+{context['content']}
 
 Provide a comprehensive answer with:
 - Direct answer to the question
@@ -51,7 +144,9 @@ Provide a comprehensive answer with:
         return {
             'query': query,
             'answer': result['response'],
-            'model_used': result['model']
+            'model_used': result['model'],
+            'chunking': context.get('chunking'),
+            'records': context.get('records')
         }
 
 
@@ -62,6 +157,7 @@ def main():
     parser = argparse.ArgumentParser(description='Knowledge Graph Search')
     parser.add_argument('query', help='Natural language query')
     parser.add_argument('--data', help='Path to context data file')
+    parser.add_argument('--top-k', type=int, help='Records to retrieve from the index')
 
     args = parser.parse_args()
 
@@ -72,7 +168,7 @@ def main():
         with open(args.data, 'r') as f:
             context = f.read()
 
-    result = kg.search(args.query, context)
+    result = kg.search(args.query, context, top_k=args.top_k)
     print(result['answer'])
 
 
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Retrieval Layer - Metal.ai Inspired
+
+Embeds CRM, manager, fund, portfolio-company, DD and document records with a
+local embedding model and keeps them in an on-disk vector index, so knowledge
+search can send the model only the top-k relevant records instead of the
+first few thousand characters of a file.
+
+- Embeddings: Ollama embeddings endpoint, falling back to a deterministic
+  hashing embedder when the embedding model can't be reached (also
+  selectable outright for offline use and tests)
+- Index: exact cosine search for small corpora, IVF (k-means coarse
+  quantizer over NumPy) once the corpus grows
+- Incremental: only records whose content changed since the last sync are
+  re-embedded; source files are skipped entirely when unchanged
+"""
+
+import csv
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from chunking import chunk_document
+
+BASE_DIR = Path(__file__).parent.parent.parent
+
+
+def _resolve_data_dir() -> Path:
+    """The platform data directory: core/data, or data-storage/data in the deployed layout"""
+    for candidate in (BASE_DIR / "core" / "data", BASE_DIR / "data-storage" / "data"):
+        if candidate.exists():
+            return candidate
+    return BASE_DIR / "core" / "data"
+
+
+DATA_DIR = _resolve_data_dir()
+INDEX_DIR = DATA_DIR / "cache" / "embeddings"
+DOCUMENTS_DIR = DATA_DIR / "documents"
+
+OLLAMA_HOST = "http://localhost:11434"
+
+# source name -> (csv path relative to DATA_DIR, id column)
+RECORD_SOURCES = {
+    'contact': ("contacts.csv", "id"),
+    'manager': ("fund_managers.csv", "manager_id"),
+    'universe_manager': ("intelligence/manager_universe.csv", "manager_id"),
+    'fund': ("portfolio_funds.csv", "fund_id"),
+    'portfolio_company': ("portfolio_companies.csv", "company_id"),
+    'due_diligence': ("due_diligence.csv", "dd_id"),
+}
+
+DOCUMENT_SUFFIXES = {'.txt', '.md'}
+
+
+# ----------------------------------------------------------------------
+# Embedders
+# ----------------------------------------------------------------------
+
+class OllamaEmbedder:
+    """Embeddings from a local Ollama embedding model"""
+
+    def __init__(self, model: str = "nomic-embed-text", ollama_host: str = OLLAMA_HOST,
+                 batch_size: int = 64, timeout: float = 120):
+        self.model = model
+        self.ollama_host = ollama_host.rstrip("/")
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    @property
+    def name(self) -> str:
+        return f"ollama:{self.model}"
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            response = self.session.post(f"{self.ollama_host}/api/embed",
+                                         json={"model": self.model, "input": batch},
+                                         timeout=self.timeout)
+            if response.status_code == 404:
+                # Older Ollama: one prompt per request
+                for text in batch:
+                    legacy = self.session.post(f"{self.ollama_host}/api/embeddings",
+                                               json={"model": self.model, "prompt": text},
+                                               timeout=self.timeout)
+                    legacy.raise_for_status()
+                    vectors.append(legacy.json()['embedding'])
+                continue
+            response.raise_for_status()
+            vectors.extend(response.json()['embeddings'])
+
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-words feature hashing embedder
+
+    No model required - used when Ollama is unavailable and as the stub
+    embedder in scripted runs. Captures lexical overlap only.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    @property
+    def name(self) -> str:
+        return f"hashing:{self.dim}"
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in re.findall(r"[a-z0-9]+", text.lower()):
+                digest = hashlib.md5(token.encode("utf-8")).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dim
+                sign = 1.0 if digest[4] & 1 else -1.0
+                matrix[row, bucket] += sign
+        return matrix
+
+
+def get_embedder(config: Dict[str, Any]):
+    """Build the embedder named in the retrieval config"""
+    if config.get('embedder', 'ollama') == 'hashing':
+        return HashingEmbedder(config.get('dim', 512))
+    return OllamaEmbedder(config.get('embedding_model', 'nomic-embed-text'),
+                          config.get('ollama_host', OLLAMA_HOST))
+
+
+# ----------------------------------------------------------------------
+# Records
+# ----------------------------------------------------------------------
+
+def _file_signature(path: Path) -> List[float]:
+    stat = path.stat()
+    return [stat.st_mtime, stat.st_size]
+
+
+def _row_text(source: str, row: Dict[str, str]) -> str:
+    fields = "; ".join(f"{key}: {value}" for key, value in row.items() if value not in (None, ""))
+    return f"[{source}] {fields}"
+
+
+def load_source_records(source: str, path: Path, id_column: str) -> Dict[str, str]:
+    """Read one CSV source into {record_id: text}"""
+    records = {}
+    with open(path, 'r', newline='') as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            record_id = row.get(id_column) or str(i)
+            records[f"{source}:{record_id}"] = _row_text(source, row)
+    return records
+
+
+def load_document_records(path: Path, chunk_chars: int = 2000) -> Dict[str, str]:
+    """Split a text document into section chunks {record_id: text}"""
+    with open(path, 'r', errors='replace') as f:
+        text = f.read()
+    return {
+        f"document:{path.name}#{i}": f"[document {path.name}] {chunk}"
+        for i, chunk in enumerate(chunk_document(text, chunk_chars))
+    }
+
+
+# ----------------------------------------------------------------------
+# Index
+# ----------------------------------------------------------------------
+
+class VectorIndex:
+    """
+    On-disk cosine-similarity index with an IVF coarse quantizer
+
+    Vectors are L2-normalized and stored as a float32 .npy matrix next to a
+    JSON manifest (record ids, content hashes, source signatures, centroids
+    and list assignments).
+    """
+
+    def __init__(self, index_dir: Optional[Path] = None, ivf_threshold: int = 5000,
+                 nprobe: int = 8):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy not available. Install with: pip install numpy")
+
+        self.index_dir = Path(index_dir) if index_dir else INDEX_DIR
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.hashes: List[str] = []
+        self.sources: Dict[str, Any] = {}
+        self.embedder_name: Optional[str] = None
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.centroids: Optional["np.ndarray"] = None
+        self.assignments: Optional["np.ndarray"] = None
+        self.trained_size = 0
+
+        self.load()
+
+    # -- persistence ---------------------------------------------------
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.index_dir / "manifest.json"
+
+    def load(self):
+        if not self._manifest_path.exists():
+            return
+
+        with open(self._manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+        self.ids = manifest['ids']
+        self.texts = manifest['texts']
+        self.hashes = manifest['hashes']
+        self.sources = manifest['sources']
+        self.embedder_name = manifest['embedder']
+        self.trained_size = manifest.get('trained_size', 0)
+        self.vectors = np.load(self.index_dir / "vectors.npy")
+
+        if (self.index_dir / "centroids.npy").exists():
+            self.centroids = np.load(self.index_dir / "centroids.npy")
+            self.assignments = np.load(self.index_dir / "assignments.npy")
+
+    def save(self):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        np.save(self.index_dir / "vectors.npy", self.vectors)
+        if self.centroids is not None:
+            np.save(self.index_dir / "centroids.npy", self.centroids)
+            np.save(self.index_dir / "assignments.npy", self.assignments)
+        else:
+            for name in ("centroids.npy", "assignments.npy"):
+                (self.index_dir / name).unlink(missing_ok=True)
+
+        tmp = self._manifest_path.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump({
+                'ids': self.ids,
+                'texts': self.texts,
+                'hashes': self.hashes,
+                'sources': self.sources,
+                'embedder': self.embedder_name,
+                'trained_size': self.trained_size,
+            }, f)
+        tmp.replace(self._manifest_path)
+
+    # -- updates -------------------------------------------------------
+
+    @staticmethod
+    def _normalize(vectors: "np.ndarray") -> "np.ndarray":
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+
+    def upsert_source(self, source_key: str, records: Dict[str, str], embedder) -> Dict[str, int]:
+        """
+        Replace all records belonging to one source, embedding only new or
+        changed records
+
+        Returns:
+            Counts of added, updated, removed and unchanged records
+        """
+        existing = {rid: i for i, rid in enumerate(self.ids) if self._source_of(rid) == source_key}
+
+        new_hashes = {rid: hashlib.sha1(text.encode("utf-8")).hexdigest()
+                      for rid, text in records.items()}
+
+        keep = [i for i in range(len(self.ids)) if self.ids[i] not in existing]
+        unchanged = [existing[rid] for rid, h in new_hashes.items()
+                     if rid in existing and self.hashes[existing[rid]] == h]
+        to_embed = [rid for rid, h in new_hashes.items()
+                    if rid not in existing or self.hashes[existing[rid]] != h]
+
+        stats = {
+            'added': sum(1 for rid in to_embed if rid not in existing),
+            'updated': sum(1 for rid in to_embed if rid in existing),
+            'removed': sum(1 for rid in existing if rid not in records),
+            'unchanged': len(unchanged),
+        }
+
+        if not to_embed and not stats['removed']:
+            return stats
+
+        rows = keep + unchanged
+        new_vectors = (self._normalize(embedder.embed([records[rid] for rid in to_embed]))
+                       if to_embed else None)
+
+        parts = ([self.vectors[rows]] if rows else []) + ([new_vectors] if new_vectors is not None else [])
+        self.vectors = np.vstack(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+
+        if self.assignments is not None:
+            kept_assignments = self.assignments[rows] if rows else np.zeros(0, dtype=np.int32)
+            if new_vectors is not None:
+                added = np.argmax(new_vectors @ self.centroids.T, axis=1).astype(np.int32)
+                kept_assignments = np.concatenate([kept_assignments, added])
+            self.assignments = kept_assignments
+
+        self.ids = [self.ids[i] for i in rows] + to_embed
+        self.texts = [self.texts[i] for i in rows] + [records[rid] for rid in to_embed]
+        self.hashes = [self.hashes[i] for i in rows] + [new_hashes[rid] for rid in to_embed]
+
+        return stats
+
+    @staticmethod
+    def _source_of(record_id: str) -> str:
+        if record_id.startswith("document:"):
+            return "document:" + record_id[len("document:"):].split("#", 1)[0]
+        return record_id.split(":", 1)[0]
+
+    # -- IVF -----------------------------------------------------------
+
+    def train(self, iterations: int = 10, seed: int = 0):
+        """(Re)build the IVF coarse quantizer with spherical k-means"""
+        n = len(self.ids)
+        if n < self.ivf_threshold:
+            self.centroids = None
+            self.assignments = None
+            self.trained_size = 0
+            return
+
+        nlist = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        centroids = self.vectors[rng.choice(n, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = np.argmax(self.vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, self.vectors)
+            empty = np.bincount(assignments, minlength=nlist) == 0
+            sums[empty] = centroids[empty]
+            centroids = self._normalize(sums)
+
+        self.centroids = centroids
+        self.assignments = np.argmax(self.vectors @ centroids.T, axis=1).astype(np.int32)
+        self.trained_size = n
+
+    def maybe_train(self):
+        """Retrain when crossing the IVF threshold or after the corpus doubles"""
+        n = len(self.ids)
+        if n < self.ivf_threshold:
+            if self.centroids is not None:
+                self.train()
+            return
+        if self.centroids is None or n > 2 * self.trained_size or n < self.trained_size / 2:
+            self.train()
+
+    # -- queries -------------------------------------------------------
+
+    def search(self, query_vector: "np.ndarray", top_k: int = 20) -> List[Dict[str, Any]]:
+        """Return the top_k most similar records"""
+        if not self.ids:
+            return []
+
+        query = self._normalize(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))[0]
+
+        if self.centroids is not None:
+            probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+            candidates = np.flatnonzero(np.isin(self.assignments, probes))
+        else:
+            candidates = np.arange(len(self.ids))
+
+        if len(candidates) == 0:
+            return []
+
+        scores = self.vectors[candidates] @ query
+        k = min(top_k, len(candidates))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+
+        return [
+            {'id': self.ids[candidates[i]], 'score': float(scores[i]), 'text': self.texts[candidates[i]]}
+            for i in best
+        ]
+
+
+# ----------------------------------------------------------------------
+# Retriever
+# ----------------------------------------------------------------------
+
+class Retriever:
+    """Keeps the vector index in sync with the data files and answers top-k queries"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, embedder=None,
+                 data_dir: Optional[Path] = None, index_dir: Optional[Path] = None,
+                 documents_dir: Optional[Path] = None):
+        self.config = config or {}
+        self.embedder = embedder or get_embedder(self.config)
+        self.data_dir = Path(data_dir) if data_dir else DATA_DIR
+        self.documents_dir = Path(documents_dir) if documents_dir else DOCUMENTS_DIR
+        self.index = VectorIndex(index_dir,
+                                 ivf_threshold=self.config.get('ivf_threshold', 5000),
+                                 nprobe=self.config.get('nprobe', 8))
+
+    def _sources(self) -> Dict[str, Path]:
+        sources = {}
+        for source, (relative, _) in RECORD_SOURCES.items():
+            path = self.data_dir / relative
+            if path.exists():
+                sources[source] = path
+        if self.documents_dir.exists():
+            for path in sorted(self.documents_dir.iterdir()):
+                if path.suffix.lower() in DOCUMENT_SUFFIXES:
+                    sources[f"document:{path.name}"] = path
+        return sources
+
+    def _fall_back(self, error: Exception):
+        """Switch to the hashing embedder after the configured one failed"""
+        if isinstance(self.embedder, HashingEmbedder):
+            raise error
+        print(f"⚠️  Embeddings from {self.embedder.name} unavailable ({error}); "
+              f"falling back to lexical hashing embeddings", file=sys.stderr)
+        self.embedder = HashingEmbedder(self.config.get('dim', 512))
+
+    def sync(self, force: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        Bring the index up to date with the data files
+
+        Sources whose file signature hasn't changed are skipped; changed
+        sources only re-embed the records whose text changed. If the
+        embedding model can't be reached the index is rebuilt with the
+        hashing embedder instead.
+        """
+        try:
+            return self._sync(force)
+        except (requests.RequestException, KeyError) as e:
+            self._fall_back(e)
+            return self._sync(force)
+
+    def _sync(self, force: bool) -> Dict[str, Dict[str, int]]:
+        if self.index.embedder_name not in (None, self.embedder.name):
+            # Different embedding model - vectors aren't comparable
+            force = True
+            self.index.ids, self.index.texts, self.index.hashes = [], [], []
+            self.index.vectors = np.zeros((0, 0), dtype=np.float32)
+            self.index.centroids = self.index.assignments = None
+            self.index.sources = {}
+
+        self.index.embedder_name = self.embedder.name
+        report = {}
+        sources = self._sources()
+
+        for source_key, path in sources.items():
+            signature = _file_signature(path)
+            if not force and self.index.sources.get(source_key) == signature:
+                continue
+
+            if source_key.startswith("document:"):
+                records = load_document_records(path)
+            else:
+                records = load_source_records(source_key, path, RECORD_SOURCES[source_key][1])
+
+            report[source_key] = self.index.upsert_source(source_key, records, self.embedder)
+            self.index.sources[source_key] = signature
+
+        for source_key in [key for key in self.index.sources if key not in sources]:
+            report[source_key] = self.index.upsert_source(source_key, {}, self.embedder)
+            del self.index.sources[source_key]
+
+        if report:
+            self.index.maybe_train()
+            self.index.save()
+
+        return report
+
+    def retrieve(self, query: str, top_k: int = 20, sync: bool = True) -> List[Dict[str, Any]]:
+        """Top-k records for a natural-language query"""
+        if sync:
+            self.sync()
+        try:
+            query_vector = self.embedder.embed([query])[0]
+        except (requests.RequestException, KeyError) as e:
+            self._fall_back(e)
+            self.sync()
+            query_vector = self.embedder.embed([query])[0]
+        return self.index.search(query_vector, top_k)
+
+
+def format_records(records: List[Dict[str, Any]]) -> str:
+    """Render retrieved records as prompt context"""
+    return "\n".join(f"- ({r['score']:.2f}) {r['text']}" for r in records)
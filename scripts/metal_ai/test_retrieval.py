@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the retrieval layer against a temporary data directory
+
+Run with: python3 -m pytest scripts/metal_ai/test_retrieval.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent))
+import retrieval
+from retrieval import HashingEmbedder, OllamaEmbedder, Retriever
+
+pytest.importorskip("numpy")
+
+
+def write_csv(path: Path, header: str, *rows: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join((header,) + rows) + "\n")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data = tmp_path / "data"
+    write_csv(data / "contacts.csv", "id,name,company,notes",
+              "1,Ada Park,Northwind Ventures,climate software seed investor",
+              "2,Ben Ruiz,Harbor Capital,healthcare growth equity")
+    write_csv(data / "portfolio_funds.csv", "fund_id,fund_name,sector",
+              "F1,Greenline Fund III,climate",
+              "F2,Meridian Health II,healthcare")
+    (data / "documents").mkdir()
+    (data / "documents" / "memo.md").write_text("# Memo\n\nBattery storage thesis for grid scale climate deals.\n")
+    return data
+
+
+def make_retriever(data_dir, embedder=None, **config):
+    return Retriever(config, embedder=embedder or HashingEmbedder(256), data_dir=data_dir,
+                     index_dir=data_dir / "cache" / "embeddings",
+                     documents_dir=data_dir / "documents")
+
+
+def test_record_sources_exist_in_deployed_data():
+    deployed = retrieval.BASE_DIR / "data-storage" / "data"
+    if not deployed.exists():
+        pytest.skip("no deployed data directory")
+    missing = [relative for relative, _ in retrieval.RECORD_SOURCES.values()
+               if not (deployed / relative).exists()]
+    assert missing == []
+
+
+def test_sync_indexes_every_source(data_dir):
+    report = make_retriever(data_dir).sync()
+
+    assert report['contact']['added'] == 2
+    assert report['fund']['added'] == 2
+    assert report['document:memo.md']['added'] == 1
+
+
+def test_sync_is_incremental(data_dir):
+    make_retriever(data_dir).sync()
+
+    assert make_retriever(data_dir).sync() == {}
+
+    write_csv(data_dir / "contacts.csv", "id,name,company,notes",
+              "1,Ada Park,Northwind Ventures,climate software seed investor",
+              "3,Cy Dee,Lakeside Partners,fintech")
+    report = make_retriever(data_dir).sync()
+    assert report == {'contact': {'added': 1, 'updated': 0, 'removed': 1, 'unchanged': 1}}
+
+
+def test_search_ranks_lexical_matches_first(data_dir):
+    records = make_retriever(data_dir).retrieve("healthcare growth equity", top_k=2)
+
+    assert [r['id'] for r in records][0] == "contact:2"
+    assert len(records) == 2
+
+
+def test_unreachable_embedding_model_falls_back_to_hashing(data_dir, capsys):
+    embedder = OllamaEmbedder(ollama_host="http://127.0.0.1:9", timeout=1)
+    retriever = make_retriever(data_dir, embedder=embedder)
+
+    records = retriever.retrieve("battery storage", top_k=1)
+
+    assert isinstance(retriever.embedder, HashingEmbedder)
+    assert records[0]['id'] == "document:memo.md#0"
+    assert "falling back" in capsys.readouterr().err
+
+
+def test_hashing_embedder_errors_are_not_swallowed(data_dir, monkeypatch):
+    def fail(self, texts):
+        raise requests.ConnectionError("boom")
+
+    monkeypatch.setattr(HashingEmbedder, "embed", fail)
+    with pytest.raises(requests.ConnectionError):
+        make_retriever(data_dir).sync()
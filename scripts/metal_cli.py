@@ -55,6 +55,7 @@ Examples:
 
   # Knowledge Search
   ./metal_cli.py search "Show me all seed stage SaaS funds with IRR > 25%"
+  ./metal_cli.py search "Which managers focus on climate?" --top-k 30 --reindex
 
   # Market Intelligence
   ./metal_cli.py market sector-trends
@@ -124,7 +125,9 @@ Examples:
     # Search
     search_parser = subparsers.add_parser('search', help='Knowledge graph search')
     search_parser.add_argument('query', help='Natural language query')
-    search_parser.add_argument('--data', help='Path to context data file')
+    search_parser.add_argument('--data', help='Path to context data file (default: retrieve from index)')
+    search_parser.add_argument('--top-k', type=int, help='Number of records to retrieve')
+    search_parser.add_argument('--reindex', action='store_true', help='Rebuild the embedding index first')
 
     # Market Intelligence
     market_parser = subparsers.add_parser('market', help='Market intelligence')
@@ -219,8 +222,10 @@ def main():
             if args.data:
                 with open(args.data, 'r') as f:
                     context = f.read()
+            elif args.reindex:
+                kg.retriever.sync(force=True)
 
-            result = kg.search(args.query, context)
+            result = kg.search(args.query, context, top_k=args.top_k)
             print(result['answer'])
 
         # Market Intelligence